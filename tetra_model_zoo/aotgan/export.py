@@ -4,10 +4,11 @@ from typing import Any, List
 
 import torch
 
-import tetra_hub as hub
 from tetra_model_zoo.aotgan.model import AOTGAN, DEFAULT_WEIGHTS, WEIGHTS_HELP_MSG
 from tetra_model_zoo.utils.args import vision_export_parser
 from tetra_model_zoo.utils.hub import download_hub_models
+from tetra_model_zoo.utils.local_profiling import submit_local_profile_job
+from tetra_model_zoo.utils.shape_buckets import export_shape_buckets
 
 
 def trace(model: AOTGAN, input_shape: List[int] = [1, 3, 512, 512]) -> Any:
@@ -25,6 +26,7 @@ def main():
     parser = vision_export_parser(
         default_x=640,
         default_y=640,
+        include_shape_bucket_options=True,
     )
     parser.add_argument(
         "--weights", type=str, default=DEFAULT_WEIGHTS, help=WEIGHTS_HELP_MSG
@@ -36,9 +38,37 @@ def main():
     # Instantiate the model & a sample input.
     model = AOTGAN.from_pretrained(args.weights)
 
+    if args.shape_buckets:
+        export_shape_buckets(
+            "aotgan",
+            model,
+            lambda size: [
+                torch.ones(args.b, args.c, *size),
+                torch.ones(args.b, 1, *size),
+            ],
+            args.shape_buckets,
+            args.output_dir,
+            args.dynamic_shapes,
+        )
+        return
+
     # Trace the model.
     traced_model = trace(model, [args.b, args.c, args.y, args.x])
 
+    if args.local:
+        submit_local_profile_job(
+            name="aotgan",
+            model=traced_model,
+            input_shapes=model.get_input_spec(
+                image_size=[args.y, args.x], batch_size=args.b, num_channels=args.c
+            ),
+            runtimes=args.local_runtimes,
+            output_dir=args.local_output_dir,
+        )
+        return
+
+    import tetra_hub as hub
+
     # Select the device(s) you'd like to optimize for.
     devices = [hub.Device(x) for x in args.devices]
 
@@ -5,6 +5,8 @@ import torch.nn as nn
 
 from tetra_model_zoo.utils.asset_loaders import SourceAsRoot, maybe_download_s3_data
 from tetra_model_zoo.utils.input_spec import InputSpec
+from tetra_model_zoo.utils.mmap_weights import assign_state_dict, load_state_dict_mmap
+from tetra_model_zoo.utils.snapshot import load_or_create_snapshot
 
 AOTGAN_SOURCE_REPOSITORY = "https://github.com/researchmm/AOT-GAN-for-Inpainting/"
 AOTGAN_SOURCE_REPO_COMMIT = "418034627392289bdfc118d62bc49e6abd3bb185"
@@ -23,11 +25,28 @@ class AOTGAN(torch.nn.Module):
         self.model = model
 
     @staticmethod
-    def from_pretrained(ckpt_name: str = DEFAULT_WEIGHTS):
+    def from_pretrained(ckpt_name: str = DEFAULT_WEIGHTS, use_snapshot: bool = True):
+        """
+        Load AOTGAN from a pretrained checkpoint.
+
+        Parameters:
+            ckpt_name: Either 'celebahq' or 'places2'.
+            use_snapshot: Load from (or save) a snapshot of the constructed model.
+                See utils.snapshot.
+        """
         if ckpt_name not in SUPPORTED_PRETRAINED_MODELS:
             raise ValueError(
                 "Unsupported pre_trained model requested. Please provide either 'celeabhq' or 'places2'."
             )
+        if use_snapshot:
+            return load_or_create_snapshot(
+                MODEL_NAME,
+                ["AOTGAN", ckpt_name],
+                lambda: AOTGAN.from_pretrained(ckpt_name, use_snapshot=False),
+                SourceAsRoot(
+                    AOTGAN_SOURCE_REPOSITORY, AOTGAN_SOURCE_REPO_COMMIT, MODEL_NAME
+                ),
+            )
         downloaded_model_path = maybe_download_s3_data(
             f"aotgan/v1/pretrained_models/{ckpt_name}/G0000000.pt",
             MODEL_NAME,
@@ -49,7 +68,9 @@ class AOTGAN(torch.nn.Module):
 
             args = InpaintArgs()
             model = InpaintGenerator(args)
-            model.load_state_dict(torch.load(downloaded_model_path, map_location="cpu"))
+            assign_state_dict(
+                model, load_state_dict_mmap(downloaded_model_path, MODEL_NAME)
+            )
             return AOTGAN(model)
 
     def forward(self, image: torch.Tensor, mask: torch.Tensor):
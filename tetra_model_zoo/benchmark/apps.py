@@ -0,0 +1,250 @@
+"""
+End to end app benchmarks with a per-stage time breakdown.
+
+Each app is run on synthetic inputs (random images / spectrograms), so no test
+assets are needed. Unless a model is passed in, weights are loaded through
+`from_pretrained` and must already be in the local cache to run offline. Stage
+timings are collected from the `profile_stage` instrumentation in each app.
+
+Example:
+    python -m tetra_model_zoo.benchmark.apps --apps yolov7 ddrnetslim --num_iterations 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+import torch
+from PIL import Image
+
+from tetra_model_zoo._version import __version__
+from tetra_model_zoo.utils.benchmark import (
+    BenchmarkRecord,
+    compute_latency_stats,
+    write_csv,
+    write_json,
+)
+from tetra_model_zoo.utils.profiling import StageTimings, record_stage_timings
+
+
+def _synthetic_image(height: int, width: int) -> Image.Image:
+    rng = np.random.default_rng(0)
+    return Image.fromarray(rng.integers(0, 256, (height, width, 3), dtype=np.uint8))
+
+
+def _yolov7_app(model: Any = None) -> Callable[[], Any]:
+    from tetra_model_zoo.yolov7.app import YoloV7App
+    from tetra_model_zoo.yolov7.model import YoloV7
+
+    if model is None:
+        model = YoloV7.from_pretrained()
+    app = YoloV7App(model)
+    image = _synthetic_image(640, 640)
+    return lambda: app.predict_boxes_from_image(image)
+
+
+def _yolov6_app(model: Any = None) -> Callable[[], Any]:
+    from tetra_model_zoo.yolov6.app import YoloV6DetectionApp
+    from tetra_model_zoo.yolov6.model import YoloV6
+
+    if model is None:
+        model = YoloV6.from_pretrained()
+    app = YoloV6DetectionApp(model)
+    image = _synthetic_image(640, 640)
+    return lambda: app.predict_boxes_from_image(image)
+
+
+def _yolov8_det_app(model: Any = None) -> Callable[[], Any]:
+    from tetra_model_zoo.yolov8_det.app import YoloV8DetectionApp
+    from tetra_model_zoo.yolov8_det.model import YoloV8Detector
+
+    if model is None:
+        model = YoloV8Detector.from_pretrained()
+    app = YoloV8DetectionApp(model)
+    image = _synthetic_image(640, 640)
+    return lambda: app.predict_boxes_from_image(image)
+
+
+def _mediapipe_face_app(model: Any = None) -> Callable[[], Any]:
+    from tetra_model_zoo.mediapipe_face.app import MediaPipeFaceApp
+    from tetra_model_zoo.mediapipe_face.model import MediaPipeFace
+
+    if model is None:
+        model = MediaPipeFace.from_pretrained()
+    # A score threshold of 0 ensures the ROI / landmark stages run on random input.
+    app = MediaPipeFaceApp(model, 0.0)
+    image = _synthetic_image(480, 640)
+    return lambda: app.predict_landmarks_from_image(image)
+
+
+def _mediapipe_hand_app(model: Any = None) -> Callable[[], Any]:
+    from tetra_model_zoo.mediapipe_hand.app import MediaPipeHandApp
+    from tetra_model_zoo.mediapipe_hand.model import MediaPipeHand
+
+    if model is None:
+        model = MediaPipeHand.from_pretrained()
+    app = MediaPipeHandApp(model, 0.0)
+    image = _synthetic_image(480, 640)
+    return lambda: app.predict_landmarks_from_image(image)
+
+
+def _mediapipe_pose_app(model: Any = None) -> Callable[[], Any]:
+    from tetra_model_zoo.mediapipe_pose.app import MediaPipePoseApp
+    from tetra_model_zoo.mediapipe_pose.model import MediaPipePose
+
+    if model is None:
+        model = MediaPipePose.from_pretrained()
+    app = MediaPipePoseApp(model, 0.0)
+    image = _synthetic_image(480, 640)
+    return lambda: app.predict_landmarks_from_image(image)
+
+
+def _whisper_asr_app(model: Any = None) -> Callable[[], Any]:
+    from tetra_model_zoo.whisper_asr.app import WhisperApp
+    from tetra_model_zoo.whisper_asr.model import Whisper
+
+    if model is None:
+        model = Whisper.from_pretrained()
+    app = WhisperApp(model)
+    mel_input = np.random.default_rng(0).standard_normal((1, 80, 3000), np.float32)
+    return lambda: app.transcribe(mel_input)
+
+
+def _trocr_app(model: Any = None) -> Callable[[], Any]:
+    from tetra_model_zoo.trocr.app import TrOCRApp
+    from tetra_model_zoo.trocr.model import TrOCR
+
+    if model is None:
+        model = TrOCR.from_pretrained()
+    app = TrOCRApp(model)
+    image = _synthetic_image(64, 384)
+    return lambda: app.predict_text_from_image(image)
+
+
+def _sam_app(model: Any = None) -> Callable[[], Any]:
+    from tetra_model_zoo.sam.app import SAMApp
+
+    # model is a SAMTetraWrapper; SAMApp loads one when it is not given.
+    app = SAMApp(sam_tetra_wrapper=model)
+    image = np.asarray(_synthetic_image(720, 1280))
+    points = np.array([[500, 375]])
+    labels = np.array([1])
+
+    def run():
+        app.prepare(image)
+        return app.generate_mask_from_points(points, labels)
+
+    return run
+
+
+def _ddrnetslim_app(model: Any = None) -> Callable[[], Any]:
+    from tetra_model_zoo.ddrnetslim.app import DDRNetApp
+    from tetra_model_zoo.ddrnetslim.model import DDRNet
+
+    if model is None:
+        model = DDRNet.from_pretrained()
+    app = DDRNetApp(model)
+    image = _synthetic_image(1024, 2048)
+    return lambda: app.segment_image(image)
+
+
+# App name -> function that loads the app and returns a callable running it once.
+# Apps built around a single zoo model optionally take that model as an argument.
+APP_BENCHMARKS: Dict[str, Callable[..., Callable[[], Any]]] = {
+    "yolov6": _yolov6_app,
+    "yolov7": _yolov7_app,
+    "yolov8_det": _yolov8_det_app,
+    "mediapipe_face": _mediapipe_face_app,
+    "mediapipe_hand": _mediapipe_hand_app,
+    "mediapipe_pose": _mediapipe_pose_app,
+    "whisper_asr": _whisper_asr_app,
+    "trocr": _trocr_app,
+    "sam": _sam_app,
+    "ddrnetslim": _ddrnetslim_app,
+}
+
+
+def summarize_stage_timings(
+    timings: StageTimings, num_iterations: int, total_ms: float
+) -> List[Tuple[str, float, float]]:
+    """
+    Returns:
+        List of (stage, mean ms per app call, fraction of total time) tuples.
+        Time not covered by any instrumented stage is reported as "other".
+    """
+    per_stage_ms = {
+        stage: seconds * 1000 / num_iterations
+        for stage, seconds in timings.total_seconds_per_stage().items()
+    }
+    per_stage_ms["other"] = max(0.0, total_ms - sum(per_stage_ms.values()))
+    return [(stage, ms, ms / total_ms) for stage, ms in per_stage_ms.items()]
+
+
+def benchmark_app(
+    app_name: str, num_warmup: int = 2, num_iterations: int = 10, model: Any = None
+) -> List[BenchmarkRecord]:
+    """
+    Runs an app end to end and breaks its latency down by stage.
+
+    Parameters:
+        model: Model to run the app with. Defaults to the pretrained zoo model.
+
+    Returns:
+        One record per stage, plus one "total" record.
+    """
+    load_app = APP_BENCHMARKS[app_name]
+    run = load_app() if model is None else load_app(model)
+    with torch.inference_mode():
+        for _ in range(num_warmup):
+            run()
+        latencies_ms = []
+        with record_stage_timings() as timings:
+            for _ in range(num_iterations):
+                start = time.perf_counter()
+                run()
+                latencies_ms.append((time.perf_counter() - start) * 1000)
+
+    stats = compute_latency_stats(latencies_ms)
+    base_record = dict(app=app_name, zoo_version=__version__)
+    records: List[BenchmarkRecord] = [dict(base_record, stage="total", **stats)]
+    for stage, mean_ms, fraction in summarize_stage_timings(
+        timings, num_iterations, stats["mean_ms"]
+    ):
+        records.append(dict(base_record, stage=stage, mean_ms=mean_ms, fraction=fraction))
+
+    print(f"{app_name}: {stats['mean_ms']:.2f}ms mean, {stats['p99_ms']:.2f}ms p99")
+    for record in records[1:]:
+        print(
+            f"    {record['stage']:<22}{record['mean_ms']:>10.2f}ms {record['fraction']:>7.1%}"
+        )
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--apps",
+        nargs="+",
+        default=list(APP_BENCHMARKS.keys()),
+        choices=list(APP_BENCHMARKS.keys()),
+        help="Apps to benchmark.",
+    )
+    parser.add_argument("--num_warmup", type=int, default=2)
+    parser.add_argument("--num_iterations", type=int, default=10)
+    parser.add_argument("--output_json", type=str, default="app_benchmark.json")
+    parser.add_argument("--output_csv", type=str, default="app_benchmark.csv")
+    args = parser.parse_args()
+
+    records: List[BenchmarkRecord] = []
+    for app_name in args.apps:
+        records.extend(benchmark_app(app_name, args.num_warmup, args.num_iterations))
+    write_json(records, args.output_json)
+    write_csv(records, args.output_csv)
+    print(f"Wrote {len(records)} results to {args.output_json} and {args.output_csv}")
+
+
+if __name__ == "__main__":
+    main()
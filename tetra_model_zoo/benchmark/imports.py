@@ -0,0 +1,162 @@
+"""
+Import time benchmark.
+
+Measures how long `import tetra_model_zoo.<model>` takes in a fresh Python
+process, and which heavy optional dependencies each import pulls in. torch
+(needed by every model) is imported first and timed separately, so that the
+zoo's own import overhead can be tracked.
+
+Example:
+    python -m tetra_model_zoo.benchmark.imports --models yolov7 resnet50 \\
+        --num_repeats 5 --max_overhead_ms 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from typing import List
+
+import numpy as np
+
+from tetra_model_zoo._version import __version__
+from tetra_model_zoo.benchmark.models import discover_model_names
+from tetra_model_zoo.utils.benchmark import BenchmarkRecord, write_csv, write_json
+
+# Dependencies that are slow to import and only needed by some code paths.
+HEAVY_MODULES = [
+    "cv2",
+    "gdown",
+    "git",
+    "requests",
+    "tetra_hub",
+    "torchvision",
+    "transformers",
+    "whisper",
+]
+
+_MEASURE_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import torch
+torch_seconds = time.perf_counter() - start
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps(dict(
+    torch_seconds=torch_seconds,
+    seconds=seconds,
+    num_modules=len(sys.modules),
+    heavy_modules=[m for m in {heavy_modules!r} if m in sys.modules],
+)))
+"""
+
+
+def measure_import(module: str, num_repeats: int = 3) -> BenchmarkRecord:
+    """
+    Imports a module in `num_repeats` fresh interpreters, after importing torch.
+
+    Returns:
+        Record with the median time to import torch and then the module (ms),
+        the number of modules loaded, and the heavy modules (see HEAVY_MODULES)
+        that the import loaded.
+    """
+    script = _MEASURE_SCRIPT.format(module=module, heavy_modules=HEAVY_MODULES)
+    torch_times_ms = []
+    times_ms = []
+    result = {}
+    for _ in range(num_repeats):
+        proc = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, text=True
+        )
+        if proc.returncode != 0:
+            error = proc.stderr.strip().splitlines()
+            return dict(module=module, error=error[-1] if error else "failed")
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        torch_times_ms.append(result["torch_seconds"] * 1000)
+        times_ms.append(result["seconds"] * 1000)
+    return dict(
+        module=module,
+        torch_import_ms=float(np.median(torch_times_ms)),
+        import_ms=float(np.median(times_ms)),
+        num_modules=result["num_modules"],
+        heavy_modules=" ".join(result["heavy_modules"]),
+    )
+
+
+def benchmark_imports(
+    modules: List[str], num_repeats: int = 3
+) -> List[BenchmarkRecord]:
+    """
+    Measures the import time of each module (see `measure_import`).
+    """
+    records = []
+    for module in modules:
+        record = measure_import(module, num_repeats)
+        record["zoo_version"] = __version__
+        if "import_ms" in record:
+            print(
+                f"{module}: {record['import_ms']:.0f}ms "
+                f"(after {record['torch_import_ms']:.0f}ms for torch), "
+                f"heavy modules: {record['heavy_modules'] or 'none'}"
+            )
+        else:
+            print(f"{module}: FAILED ({record.get('error')})")
+        records.append(record)
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--models",
+        nargs="+",
+        default=["all"],
+        help="Zoo packages to import (e.g. resnet50 yolov7), or 'all'.",
+    )
+    parser.add_argument(
+        "--modules",
+        nargs="+",
+        default=[],
+        help="Additional modules to import, e.g. tetra_model_zoo.utils.asset_loaders.",
+    )
+    parser.add_argument(
+        "--num_repeats",
+        type=int,
+        default=3,
+        help="Fresh interpreters per module. The median time is reported.",
+    )
+    parser.add_argument(
+        "--max_overhead_ms",
+        type=float,
+        default=None,
+        help="Exit with an error if importing any module (after torch) takes "
+        "longer than this.",
+    )
+    parser.add_argument("--output_json", type=str, default="import_benchmark.json")
+    parser.add_argument("--output_csv", type=str, default="import_benchmark.csv")
+    args = parser.parse_args()
+
+    model_names = discover_model_names() if args.models == ["all"] else args.models
+    modules = [f"tetra_model_zoo.{name}" for name in model_names] + args.modules
+
+    records = benchmark_imports(modules, args.num_repeats)
+    write_json(records, args.output_json)
+    write_csv(records, args.output_csv)
+    print(f"Wrote {len(records)} results to {args.output_json} and {args.output_csv}")
+
+    if args.max_overhead_ms is not None:
+        too_slow = [
+            r["module"]
+            for r in records
+            if "error" in r or r["import_ms"] > args.max_overhead_ms
+        ]
+        if too_slow:
+            print(f"Failed or over {args.max_overhead_ms}ms: {', '.join(too_slow)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
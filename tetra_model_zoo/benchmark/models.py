@@ -0,0 +1,287 @@
+"""
+Cross-model latency / throughput benchmark.
+
+Runs every selected zoo model on CPU in PyTorch, using synthetic inputs built
+from the model's own input spec. Weights are loaded through `from_pretrained`,
+so they come from the local cache once downloaded. Tetra Hub is never called.
+
+Example:
+    python -m tetra_model_zoo.benchmark.models --models resnet50 yolov7 \\
+        --batch_sizes 1 4 --num_threads 1 4 --output_json bench.json --output_csv bench.csv
+
+With --optimize, each configuration is also timed after the CPU optimization
+pass (see utils.cpu_optimization), and the speedup is reported.
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import importlib
+import inspect
+import os
+import platform
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+import torch
+
+import tetra_model_zoo
+from tetra_model_zoo._version import __version__
+from tetra_model_zoo.utils.benchmark import (
+    BenchmarkRecord,
+    compute_latency_stats,
+    time_function,
+    write_csv,
+    write_json,
+)
+from tetra_model_zoo.utils.cpu_optimization import optimize_network_for_cpu
+from tetra_model_zoo.utils.input_spec import InputSpec, make_torch_inputs
+from tetra_model_zoo.utils.precision import PRECISIONS, set_model_precision
+
+
+def discover_model_names() -> List[str]:
+    """
+    Lists every model package in the zoo, i.e. each package that exports `Model`.
+    """
+    zoo_dir = os.path.dirname(tetra_model_zoo.__file__)
+    names = []
+    for name in sorted(os.listdir(zoo_dir)):
+        init_path = os.path.join(zoo_dir, name, "__init__.py")
+        if os.path.exists(init_path):
+            with open(init_path) as f:
+                if " as Model" in f.read():
+                    names.append(name)
+    return names
+
+
+def get_benchmark_targets(model: Any) -> List[Tuple[str, Callable]]:
+    """
+    Finds the runnable networks of a model. This is the model itself if it
+    defines `get_input_spec`, otherwise each of its components that does
+    (e.g. the encoder and decoder of Whisper).
+
+    Returns:
+        List of (component name, network) pairs. Component name is "" for
+        the model itself.
+    """
+    if callable(model) and hasattr(model, "get_input_spec"):
+        return [("", model)]
+    if isinstance(model, torch.nn.Module):
+        components = dict(model.named_children())
+    else:
+        components = vars(model)
+    return [
+        (name, component)
+        for name, component in components.items()
+        if callable(component) and hasattr(component, "get_input_spec")
+    ]
+
+
+def get_input_spec_for_batch(
+    network: Any,
+    batch_size: int,
+    image_size: Tuple[int, int] | None = None,
+) -> InputSpec:
+    """
+    Calls the network's `get_input_spec` with the given batch size (and image
+    size, if provided and supported).
+
+    Raises:
+        ValueError if the network's input spec does not support the batch size.
+    """
+    params = inspect.signature(network.get_input_spec).parameters
+    kwargs: Dict[str, Any] = {}
+    if "batch_size" in params:
+        kwargs["batch_size"] = batch_size
+    elif batch_size != 1:
+        raise ValueError("get_input_spec does not take a batch size.")
+    if image_size is not None and "image_size" in params:
+        kwargs["image_size"] = image_size
+    return network.get_input_spec(**kwargs)
+
+
+def benchmark_model(
+    model_name: str,
+    batch_sizes: List[int],
+    num_threads: List[int],
+    num_warmup: int = 3,
+    num_iterations: int = 20,
+    image_size: Tuple[int, int] | None = None,
+    precision: str = "fp32",
+    optimize: bool = False,
+) -> List[BenchmarkRecord]:
+    """
+    Benchmarks one zoo model across batch sizes and thread counts.
+    The model is run in the given precision (see utils.precision).
+    If `optimize` is set, each configuration is also timed after
+    `optimize_network_for_cpu`, and records include `optimized_p50_ms`
+    and `speedup` (or `optimize_error`).
+
+    Returns:
+        One record per (component, batch size, thread count). Configurations
+        that could not be run are recorded with an `error` field.
+    """
+    base_record: BenchmarkRecord = dict(
+        model=model_name,
+        zoo_version=__version__,
+        torch_version=torch.__version__,
+        platform=platform.platform(),
+        precision=precision,
+    )
+
+    start = time.perf_counter()
+    try:
+        model_module = importlib.import_module(f"tetra_model_zoo.{model_name}")
+        model = set_model_precision(model_module.Model.from_pretrained(), precision)
+    except Exception as e:
+        return [dict(base_record, error=f"load failed: {e!r}")]
+    load_time_ms = (time.perf_counter() - start) * 1000
+
+    targets = get_benchmark_targets(model)
+    if not targets:
+        return [dict(base_record, error="no component defines get_input_spec")]
+
+    initial_num_threads = torch.get_num_threads()
+    records = []
+    try:
+        for component_name, network in targets:
+            if isinstance(network, torch.nn.Module):
+                network.eval()
+            # Batch size -> optimized copy of the network (traced for that batch size).
+            optimized_networks: Dict[int, torch.nn.Module] = {}
+            for batch_size in batch_sizes:
+                for threads in num_threads:
+                    record = dict(
+                        base_record,
+                        component=component_name,
+                        batch_size=batch_size,
+                        num_threads=threads,
+                        load_time_ms=load_time_ms,
+                    )
+                    try:
+                        spec = get_input_spec_for_batch(network, batch_size, image_size)
+                        inputs = make_torch_inputs(spec)
+                        torch.set_num_threads(threads)
+                        with torch.inference_mode():
+                            warmup_ms, latencies_ms = time_function(
+                                lambda: network(*inputs), num_warmup, num_iterations
+                            )
+                    except Exception as e:
+                        records.append(dict(record, error=repr(e)))
+                        continue
+                    stats = compute_latency_stats(latencies_ms)
+                    record.update(
+                        input_shapes=str({name: sp[0] for name, sp in spec.items()}),
+                        warmup_ms=warmup_ms,
+                        **stats,
+                        throughput_per_s=batch_size * 1000 / stats["mean_ms"],
+                    )
+                    summary = ""
+                    if optimize and isinstance(network, torch.nn.Module):
+                        try:
+                            if batch_size not in optimized_networks:
+                                optimized_networks[
+                                    batch_size
+                                ] = optimize_network_for_cpu(
+                                    copy.deepcopy(network), inputs
+                                )
+                            optimized = optimized_networks[batch_size]
+                            with torch.inference_mode():
+                                _, optimized_latencies_ms = time_function(
+                                    lambda: optimized(*inputs),
+                                    num_warmup,
+                                    num_iterations,
+                                )
+                        except Exception as e:
+                            record["optimize_error"] = repr(e)
+                        else:
+                            optimized_stats = compute_latency_stats(
+                                optimized_latencies_ms
+                            )
+                            optimized_p50_ms = optimized_stats["p50_ms"]
+                            record["optimized_p50_ms"] = optimized_p50_ms
+                            record["speedup"] = stats["p50_ms"] / optimized_p50_ms
+                            summary = (
+                                f" optimized_p50={record['optimized_p50_ms']:.2f}ms "
+                                f"speedup={record['speedup']:.2f}x"
+                            )
+                    records.append(record)
+                    print(
+                        f"{model_name}{'.' + component_name if component_name else ''} "
+                        f"batch={batch_size} threads={threads}: "
+                        f"p50={stats['p50_ms']:.2f}ms p99={stats['p99_ms']:.2f}ms "
+                        f"throughput={record['throughput_per_s']:.1f}/s" + summary
+                    )
+    finally:
+        # Later benchmarks (and the caller) run with the original thread count.
+        torch.set_num_threads(initial_num_threads)
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--models",
+        nargs="+",
+        default=["all"],
+        help="Zoo packages to benchmark (e.g. resnet50 yolov7), or 'all'.",
+    )
+    parser.add_argument("--batch_sizes", nargs="+", type=int, default=[1])
+    parser.add_argument(
+        "--num_threads",
+        nargs="+",
+        type=int,
+        default=[torch.get_num_threads()],
+        help="Intra-op thread counts to benchmark with.",
+    )
+    parser.add_argument("--num_warmup", type=int, default=3)
+    parser.add_argument("--num_iterations", type=int, default=20)
+    parser.add_argument(
+        "--image_size",
+        nargs=2,
+        type=int,
+        default=None,
+        help="Input (height, width) for models whose input spec takes an image size.",
+    )
+    parser.add_argument(
+        "--precision",
+        type=str,
+        default="fp32",
+        choices=PRECISIONS,
+        help="Precision to run the models in. On CPU, use bf16 for reduced precision.",
+    )
+    parser.add_argument(
+        "--optimize",
+        action="store_true",
+        help="Also time each model after folding BN, converting to channels_last "
+        "and freezing (see utils.cpu_optimization), and report the speedup.",
+    )
+    parser.add_argument("--output_json", type=str, default="model_benchmark.json")
+    parser.add_argument("--output_csv", type=str, default="model_benchmark.csv")
+    args = parser.parse_args()
+
+    model_names = discover_model_names() if args.models == ["all"] else args.models
+    image_size = tuple(args.image_size) if args.image_size else None
+
+    records: List[BenchmarkRecord] = []
+    for model_name in model_names:
+        records.extend(
+            benchmark_model(
+                model_name,
+                args.batch_sizes,
+                args.num_threads,
+                args.num_warmup,
+                args.num_iterations,
+                image_size,  # type: ignore
+                args.precision,
+                args.optimize,
+            )
+        )
+    write_json(records, args.output_json)
+    write_csv(records, args.output_csv)
+    print(f"Wrote {len(records)} results to {args.output_json} and {args.output_csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import pytest
+import torch
+
+from tetra_model_zoo.benchmark.apps import benchmark_app
+from tetra_model_zoo.ddrnetslim.model import NUM_CLASSES
+
+
+class _StubDetector(torch.nn.Module):
+    """Predicts the same box with score 1 for every image."""
+
+    STRIDE_MULTIPLE = 32
+
+    def forward(self, image: torch.Tensor):
+        batch_size = image.shape[0]
+        return (
+            torch.tensor([[[10.0, 20.0, 110.0, 220.0]]]).repeat(batch_size, 1, 1),
+            torch.ones(batch_size, 1),
+            torch.zeros(batch_size, 1),
+        )
+
+
+class _StubSegmenter(torch.nn.Module):
+    """Returns 8x downsampled logits, like DDRNet."""
+
+    def forward(self, image: torch.Tensor):
+        pooled = torch.nn.functional.avg_pool2d(image, 8)
+        return pooled[:, :1].repeat(1, NUM_CLASSES, 1, 1)
+
+
+@pytest.mark.parametrize(
+    "app_name,model,stages",
+    [
+        (
+            "yolov7",
+            _StubDetector(),
+            ["input_conversion", "model_forward", "nms", "drawing"],
+        ),
+        ("ddrnetslim", _StubSegmenter(), ["input_conversion", "model_forward"]),
+    ],
+)
+def test_benchmark_app(app_name, model, stages):
+    records = benchmark_app(app_name, num_warmup=1, num_iterations=3, model=model)
+
+    total = records[0]
+    assert total["app"] == app_name
+    assert total["stage"] == "total"
+    assert total["mean_ms"] > 0
+
+    stage_records = {record["stage"]: record for record in records[1:]}
+    assert set(stages) <= set(stage_records)
+    assert list(stage_records)[-1] == "other"
+    assert sum(record["mean_ms"] for record in stage_records.values()) == (
+        pytest.approx(total["mean_ms"])
+    )
+    assert sum(record["fraction"] for record in stage_records.values()) == (
+        pytest.approx(1.0)
+    )
@@ -0,0 +1,62 @@
+from types import SimpleNamespace
+from typing import Iterator
+
+import pytest
+import torch
+
+from tetra_model_zoo.benchmark import models
+from tetra_model_zoo.benchmark.models import benchmark_model
+
+
+class _Network(torch.nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.conv = torch.nn.Conv2d(3, 4, 3)
+        self.num_threads = []
+
+    def forward(self, image: torch.Tensor):
+        self.num_threads.append(torch.get_num_threads())
+        return self.conv(image)
+
+    def get_input_spec(self, batch_size: int = 1):
+        return {"image": ((batch_size, 3, 16, 16), "float32")}
+
+
+@pytest.fixture
+def network(monkeypatch) -> Iterator[_Network]:
+    network = _Network()
+    model_class = SimpleNamespace(from_pretrained=lambda: network)
+    monkeypatch.setattr(
+        models,
+        "importlib",
+        SimpleNamespace(import_module=lambda name: SimpleNamespace(Model=model_class)),
+    )
+    initial_num_threads = torch.get_num_threads()
+    yield network
+    torch.set_num_threads(initial_num_threads)
+
+
+def test_benchmark_model_restores_num_threads(network):
+    torch.set_num_threads(3)
+    records = benchmark_model("stub", [1, 2], [1, 2], num_warmup=1, num_iterations=2)
+    assert torch.get_num_threads() == 3
+
+    assert [(r["batch_size"], r["num_threads"]) for r in records] == [
+        (1, 1),
+        (1, 2),
+        (2, 1),
+        (2, 2),
+    ]
+    assert all("error" not in r and r["p50_ms"] > 0 for r in records)
+    assert network.num_threads == [1] * 3 + [2] * 3 + [1] * 3 + [2] * 3
+
+
+def test_benchmark_model_restores_num_threads_on_error(network, monkeypatch):
+    def fail(*args, **kwargs):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(models, "time_function", fail)
+    torch.set_num_threads(3)
+    with pytest.raises(KeyboardInterrupt):
+        benchmark_model("stub", [1], [1])
+    assert torch.get_num_threads() == 3
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-import tetra_hub as hub
 from tetra_model_zoo.convnext_tiny.model import MODEL_NAME, ConvNextTiny
 from tetra_model_zoo.imagenet_classifier.model import trace_imagenet_classifier
 from tetra_model_zoo.utils.args import base_export_parser
 from tetra_model_zoo.utils.hub import download_hub_models
+from tetra_model_zoo.utils.local_profiling import submit_local_profile_job
 
 
 def main():
@@ -19,6 +19,18 @@ def main():
     # Trace the model.
     traced_model = trace_imagenet_classifier(model)
 
+    if args.local:
+        submit_local_profile_job(
+            name=MODEL_NAME,
+            model=traced_model,
+            input_shapes=model.get_input_spec(),
+            runtimes=args.local_runtimes,
+            output_dir=args.local_output_dir,
+        )
+        return
+
+    import tetra_hub as hub
+
     # Select the device(s) you'd like to optimize for.
     devices = [hub.Device(x) for x in args.devices]
 
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Callable, List
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
 
 import numpy as np
 import torch
@@ -12,6 +12,7 @@ from tetra_model_zoo.utils.image_processing import (
     app_to_net_image_inputs,
     normalize_image_tranform,
 )
+from tetra_model_zoo.utils.profiling import profile_stage
 
 
 def create_color_map(num_classes):
@@ -32,6 +33,107 @@ def create_color_map(num_classes):
 
 COLOR_MAP = create_color_map(NUM_CLASSES)
 
+# How the network's (8x downsampled) output is upsampled to the image size:
+#   * logits: bilinear upsampling of every class's logits, then argmax. Exact.
+#   * top_logits: bilinear upsampling of the logits of the classes that are the
+#     argmax of any output pixel, then argmax. Nearly exact, and faster when
+#     few classes are present.
+#   * labels: argmax at the output resolution, then nearest neighbor upsampling
+#     of the labels. Fastest, with blockier class boundaries.
+UPSAMPLE_MODES = ("logits", "top_logits", "labels")
+
+# Formats of raw outputs:
+#   * logits: float32 [N, classes, H, W] logits, upsampled bilinearly.
+#   * labels: uint8 [N, H, W] class labels.
+#   * rle: run-length encoded labels per image (see encode_labels_rle).
+RAW_OUTPUT_FORMATS = ("logits", "labels", "rle")
+
+# How segment_video segments frames between keyframes:
+#   * low_res: the network runs on the frame downscaled by low_res_scale.
+#   * propagate: the labels of the last keyframe are reused.
+VIDEO_INTERMEDIATE_MODES = ("low_res", "propagate")
+# Mode reported for each frame by segment_video.
+VIDEO_FRAME_MODES = ("keyframe", "low_res", "propagated")
+# Pixels whose top class probability is below this are unreliable.
+LOW_CONFIDENCE_THRESHOLD = 0.5
+# Pixels that changed (in any channel) by more than this fraction of the value
+# range since the last keyframe are unreliable.
+CHANGED_PIXEL_THRESHOLD = 0.1
+# Frames are compared at 1 / this resolution.
+FRAME_DIFFERENCE_STRIDE = 8
+# Low resolution inputs are rounded to a multiple of the network's output stride.
+OUTPUT_STRIDE = 8
+
+
+def encode_labels_rle(labels: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Run-length encodes a label map in row major order.
+
+    Inputs:
+        labels: np.ndarray
+            Label map. Shape is [H, W]
+
+    Returns:
+        rle: Dict
+            size: [H, W]
+            values: label of each run
+            counts: length of each run
+    """
+    flat = labels.ravel()
+    starts = np.concatenate([[0], np.flatnonzero(flat[1:] != flat[:-1]) + 1])
+    counts = np.diff(np.append(starts, flat.size)).astype(np.uint32)
+    return dict(size=np.array(labels.shape), values=flat[starts], counts=counts)
+
+
+def decode_labels_rle(rle: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Inverse of encode_labels_rle.
+
+    Returns:
+        labels: np.ndarray
+            Label map. Shape is [H, W]
+    """
+    return np.repeat(rle["values"], rle["counts"]).reshape(rle["size"])
+
+
+def _check_upsample_mode(upsample: str) -> None:
+    if upsample not in UPSAMPLE_MODES:
+        raise ValueError(
+            f"Unknown upsample mode {upsample}. "
+            f"Expected one of {', '.join(UPSAMPLE_MODES)}."
+        )
+
+
+def overlay_labels(
+    frames: np.ndarray,
+    labels: np.ndarray,
+    color_map: np.ndarray = COLOR_MAP,
+    alpha: float = 0.5,
+) -> np.ndarray:
+    """
+    Blends the color of each pixel's class onto a batch of frames, with a
+    single lookup table indexed by (class, pixel value). Matches PIL's
+    Image.blend(frame, color_map[labels], alpha).
+
+    Inputs:
+        frames: np.ndarray
+            Frames. Shape is [N, H, W, 3], dtype uint8
+        labels: np.ndarray
+            Class of each pixel. Shape is [N, H, W]
+        color_map: np.ndarray
+            RGB color of each class. Shape is [classes, 3], dtype uint8
+        alpha: float
+            alpha=1 is colors only, alpha=0 is frames only.
+
+    Returns:
+        Blended frames. Shape is [N, H, W, 3], dtype uint8
+    """
+    values = np.arange(256, dtype=np.float32)[None, :, None]
+    colors = color_map.astype(np.float32)[:, None, :]
+    # lut[class, value, channel]. PIL truncates the blended values.
+    lut = np.trunc(values + alpha * (colors - values)).astype(np.uint8)
+    return lut[labels[..., None], frames, np.arange(3)]
+
 
 class DDRNetApp:
     """
@@ -61,7 +163,9 @@ class DDRNetApp:
         | Image.Image
         | List[Image.Image],
         raw_output: bool = False,
-    ) -> List[Image.Image] | np.ndarray:
+        upsample: str = "logits",
+        raw_output_format: str = "logits",
+    ) -> List[Image.Image] | np.ndarray | List[Dict[str, np.ndarray]]:
         """
         Return the input image with the segmentation mask overlayed on it.
 
@@ -76,49 +180,236 @@ class DDRNetApp:
             raw_output: bool
                 See "returns" doc section for details.
 
+            upsample: str
+                How the network output is upsampled to the image size to compute
+                labels. One of UPSAMPLE_MODES.
+
+            raw_output_format: str
+                Format of the raw output. One of RAW_OUTPUT_FORMATS.
+
         Returns:
-            If raw_output is true, returns:
+            If raw_output is true, returns, depending on raw_output_format:
                 masks: np.ndarray
-                    A list of predicted masks.
+                    Predicted logits per class, shape [N, classes, H, W].
+                labels: np.ndarray
+                    Predicted class per pixel, shape [N, H, W], dtype uint8.
+                rles: List[Dict]
+                    Run-length encoded labels of each image (see encode_labels_rle).
 
             Otherwise, returns:
                 segmented_images: List[PIL.Image]
                     Images with segmentation map overlaid with an alpha of 0.5.
         """
-        NHWC_int_numpy_frames, NCHW_fp32_torch_frames = app_to_net_image_inputs(
-            pixel_values_or_image
-        )
-        input_transform = normalize_image_tranform()
-        NCHW_fp32_torch_frames = input_transform(NCHW_fp32_torch_frames)
+        _check_upsample_mode(upsample)
+        if raw_output_format not in RAW_OUTPUT_FORMATS:
+            raise ValueError(
+                f"Unknown raw output format {raw_output_format}. "
+                f"Expected one of {', '.join(RAW_OUTPUT_FORMATS)}."
+            )
+
+        with profile_stage(self, "input_conversion"):
+            NHWC_int_numpy_frames, NCHW_fp32_torch_frames = app_to_net_image_inputs(
+                pixel_values_or_image
+            )
+            input_transform = normalize_image_tranform()
+            NCHW_fp32_torch_frames = input_transform(NCHW_fp32_torch_frames)
 
-        with torch.no_grad():
+        with profile_stage(self, "model_forward"), torch.no_grad():
             # pred_mask is 8x downsampled
             pred_masks = self.model(NCHW_fp32_torch_frames)
 
-        # Upsample pred mask to original image size
-        # Need to upsample in the probability space, not in class labels
-        pred_masks = F.interpolate(
-            input=pred_masks,
-            size=NCHW_fp32_torch_frames.shape[-2:],
-            mode="bilinear",
-            align_corners=False,
-        )
-
-        if raw_output:
+        image_size = NCHW_fp32_torch_frames.shape[-2:]
+        if raw_output and raw_output_format == "logits":
+            with profile_stage(self, "upsample"):
+                pred_masks = F.interpolate(
+                    input=pred_masks,
+                    size=image_size,
+                    mode="bilinear",
+                    align_corners=False,
+                )
             return pred_masks.detach().numpy()
 
-        # Create color map and convert segmentation mask to RGB image
-        pred_mask_img = torch.argmax(pred_masks, 1)
+        labels = self._upsample_labels(pred_masks, image_size, upsample)
+        if raw_output:
+            if raw_output_format == "labels":
+                return labels
+            return [encode_labels_rle(frame_labels) for frame_labels in labels]
 
         # Overlay the segmentation mask on the image. alpha=1 is mask only,
         # alpha=0 is image only.
-        out = []
-        for i, img_tensor in enumerate(NHWC_int_numpy_frames):
-            out.append(
-                Image.blend(
-                    Image.fromarray(img_tensor),
-                    Image.fromarray(COLOR_MAP[pred_mask_img[i]]),
-                    alpha=0.5,
+        with profile_stage(self, "drawing"):
+            segmented_frames = overlay_labels(
+                np.stack(NHWC_int_numpy_frames), labels, alpha=0.5
+            )
+        return [Image.fromarray(frame) for frame in segmented_frames]
+
+    def segment_video(
+        self,
+        frames: Iterable[np.ndarray | Image.Image],
+        keyframe_interval: int = 10,
+        intermediate_mode: str = "low_res",
+        low_res_scale: float = 0.5,
+        refresh_threshold: float = 0.2,
+        upsample: str = "labels",
+        raw_output: bool = False,
+    ) -> Iterator[Tuple[Image.Image | np.ndarray, str]]:
+        """
+        Segments the frames of a video, running the network at full resolution
+        only on keyframes. Frames in between are segmented more cheaply
+        (see VIDEO_INTERMEDIATE_MODES), unless too many of their pixels are
+        unreliable, in which case they are segmented as keyframes.
+
+        Parameters:
+            frames: Video frames. PIL images or numpy arrays (H W C x uint8), RGB.
+
+            keyframe_interval: A keyframe is segmented (at least) every
+                `keyframe_interval` frames. 1 segments every frame at full resolution.
+
+            intermediate_mode: How frames between keyframes are segmented.
+                One of VIDEO_INTERMEDIATE_MODES.
+
+            low_res_scale: Scale of the network input for low_res frames, in (0, 1].
+
+            refresh_threshold: Fraction of unreliable pixels above which a frame
+                between keyframes is segmented as a keyframe instead. Unreliable pixels are
+                low confidence pixels (see LOW_CONFIDENCE_THRESHOLD) of low_res frames,
+                and changed pixels (see CHANGED_PIXEL_THRESHOLD) of propagated frames.
+
+            upsample: See segment_image.
+
+            raw_output: If true, yields labels instead of images.
+
+        Yields:
+            For each frame, (output, mode), where output is:
+                If raw_output is true, labels: np.ndarray
+                    Predicted class per pixel, shape [H, W], dtype uint8.
+                Otherwise, segmented_image: PIL.Image
+                    Frame with segmentation map overlaid with an alpha of 0.5.
+            and mode is the way the frame was segmented, one of VIDEO_FRAME_MODES.
+        """
+        if keyframe_interval < 1:
+            raise ValueError("keyframe_interval must be positive.")
+        if intermediate_mode not in VIDEO_INTERMEDIATE_MODES:
+            raise ValueError(
+                f"Unknown intermediate mode {intermediate_mode}. "
+                f"Expected one of {', '.join(VIDEO_INTERMEDIATE_MODES)}."
+            )
+        if not 0 < low_res_scale <= 1:
+            raise ValueError("low_res_scale must be in (0, 1].")
+        _check_upsample_mode(upsample)
+
+        input_transform = normalize_image_tranform()
+        keyframe_labels: np.ndarray | None = None
+        keyframe_thumbnail: np.ndarray | None = None
+        frames_since_keyframe = 0
+        for frame in frames:
+            with profile_stage(self, "input_conversion"):
+                NHWC_int_numpy_frames, NCHW_fp32_torch_frames = app_to_net_image_inputs(
+                    frame
                 )
+                NCHW_fp32_torch_frames = input_transform(NCHW_fp32_torch_frames)
+                image_size = tuple(NCHW_fp32_torch_frames.shape[-2:])
+                thumbnail = NHWC_int_numpy_frames[0][
+                    ::FRAME_DIFFERENCE_STRIDE, ::FRAME_DIFFERENCE_STRIDE
+                ].astype(np.int16)
+
+            labels, mode = None, "keyframe"
+            if (
+                keyframe_labels is not None
+                and keyframe_labels.shape == image_size
+                and frames_since_keyframe + 1 < keyframe_interval
+            ):
+                if intermediate_mode == "propagate":
+                    with profile_stage(self, "frame_difference"):
+                        changed = np.abs(thumbnail - keyframe_thumbnail).max(-1)
+                        changed = changed > CHANGED_PIXEL_THRESHOLD * 255
+                    if changed.mean() <= refresh_threshold:
+                        labels, mode = keyframe_labels, "propagated"
+                else:
+                    low_res_size = [
+                        max(1, round(size * low_res_scale / OUTPUT_STRIDE))
+                        * OUTPUT_STRIDE
+                        for size in image_size
+                    ]
+                    with profile_stage(self, "input_conversion"):
+                        low_res_frames = F.interpolate(
+                            NCHW_fp32_torch_frames,
+                            size=low_res_size,
+                            mode="bilinear",
+                            align_corners=False,
+                            antialias=True,
+                        )
+                    with profile_stage(self, "model_forward"), torch.no_grad():
+                        pred_masks = self.model(low_res_frames)
+                    confidence = pred_masks.softmax(1).amax(1)
+                    low_confidence = (confidence < LOW_CONFIDENCE_THRESHOLD).float()
+                    if low_confidence.mean() <= refresh_threshold:
+                        labels = self._upsample_labels(pred_masks, image_size, upsample)
+                        labels, mode = labels[0], "low_res"
+
+            if labels is None:
+                with profile_stage(self, "model_forward"), torch.no_grad():
+                    pred_masks = self.model(NCHW_fp32_torch_frames)
+                labels = self._upsample_labels(pred_masks, image_size, upsample)[0]
+                keyframe_labels, keyframe_thumbnail = labels, thumbnail
+                frames_since_keyframe = 0
+            else:
+                frames_since_keyframe += 1
+
+            if raw_output:
+                yield labels, mode
+                continue
+            with profile_stage(self, "drawing"):
+                segmented_frame = overlay_labels(
+                    NHWC_int_numpy_frames[0][None], labels[None], alpha=0.5
+                )[0]
+            yield Image.fromarray(segmented_frame), mode
+
+    def _upsample_labels(
+        self,
+        pred_masks: torch.Tensor,
+        image_size: Tuple[int, int],
+        upsample: str = "logits",
+    ) -> np.ndarray:
+        """
+        Computes the class label of each image pixel from the network output.
+
+        Inputs:
+            pred_masks: torch.Tensor
+                Network output (logits). Shape is [N, classes, h, w]
+            image_size: Tuple[int, int]
+                (H, W) to upsample to.
+            upsample: str
+                One of UPSAMPLE_MODES.
+
+        Returns:
+            labels: np.ndarray
+                Shape is [N, H, W], dtype uint8
+        """
+        _check_upsample_mode(upsample)
+        with profile_stage(self, "upsample"):
+            if upsample == "labels":
+                labels = pred_masks.argmax(1, keepdim=True).byte()
+                labels = F.interpolate(labels, size=image_size, mode="nearest-exact")
+                return labels[:, 0].numpy()
+
+            # Upsampling in the probability space, rather than class labels, is
+            # exact.
+            classes = None
+            if upsample == "top_logits":
+                classes = pred_masks.argmax(1).unique()
+                pred_masks = pred_masks.index_select(1, classes)
+            # Interpolation, and the argmax over classes, are several times faster
+            # with the classes as the innermost dimension.
+            pred_masks = F.interpolate(
+                input=pred_masks.contiguous(memory_format=torch.channels_last),
+                size=image_size,
+                mode="bilinear",
+                align_corners=False,
             )
-        return out
+
+        with profile_stage(self, "argmax"):
+            labels = pred_masks.argmax(1)
+            if classes is not None:
+                labels = classes[labels]
+            return labels.byte().numpy()
@@ -7,6 +7,8 @@ import torch
 
 from tetra_model_zoo.ddrnetslim.model import DDRNet
 from tetra_model_zoo.utils.args import vision_export_parser
+from tetra_model_zoo.utils.local_profiling import submit_local_profile_job
+from tetra_model_zoo.utils.shape_buckets import export_shape_buckets
 
 
 def trace(model: DDRNet, input_shape: List[int] = [1, 3, 1024, 2048]) -> Any:
@@ -18,12 +20,14 @@ def trace(model: DDRNet, input_shape: List[int] = [1, 3, 1024, 2048]) -> Any:
 
 
 def main():
-    import tetra_hub as hub
     from tetra_model_zoo.utils.hub import download_hub_models
 
     # Export parameters
     parser = vision_export_parser(
-        default_x=1280, default_y=640, include_trace_option=True
+        default_x=1280,
+        default_y=640,
+        include_trace_option=True,
+        include_shape_bucket_options=True,
     )
     parser.add_argument("--c", type=int, default=3, help="Number of image channels.")
 
@@ -32,6 +36,17 @@ def main():
     # Instantiate the model & a sample input.
     ddrnet_model = DDRNet.from_pretrained()
 
+    if args.shape_buckets:
+        export_shape_buckets(
+            "ddrnetslim",
+            ddrnet_model,
+            lambda size: [torch.ones(args.b, args.c, *size)],
+            args.shape_buckets,
+            args.output_dir,
+            args.dynamic_shapes,
+        )
+        return
+
     # Trace the model.
     traced_ddrnet = trace(ddrnet_model, [args.b, args.c, args.y, args.x])
 
@@ -42,6 +57,18 @@ def main():
         print(f"Saved torchscript to {model_path}")
         exit(0)
 
+    if args.local:
+        submit_local_profile_job(
+            name="ddrnetslim",
+            model=traced_ddrnet,
+            input_shapes=ddrnet_model.get_input_spec(image_size=(2048, 1024)),
+            runtimes=args.local_runtimes,
+            output_dir=args.local_output_dir,
+        )
+        return
+
+    import tetra_hub as hub
+
     # Select the device(s) you'd like to optimize for.
     devices = [hub.Device(x) for x in args.devices]
 
@@ -7,6 +7,7 @@ import torch.nn as nn
 
 from tetra_model_zoo.utils.asset_loaders import SourceAsRoot, download_google_drive
 from tetra_model_zoo.utils.input_spec import InputSpec
+from tetra_model_zoo.utils.snapshot import load_or_create_snapshot
 
 DDRNET_SOURCE_REPOSITORY = "https://github.com/chenjun2hao/DDRNet.pytorch"
 DDRNET_SOURCE_REPO_COMMIT = "bc0e193e87ead839dbc715c48e6bfb059cf21b27"
@@ -25,12 +26,28 @@ class DDRNet(torch.nn.Module):
         self.model = model
 
     @staticmethod
-    def from_pretrained(checkpoint_path: str | None = None):
-        """Load DDRNetSlim from a weightfile created by the source DDRNetSlim repository."""
+    def from_pretrained(checkpoint_path: str | None = None, use_snapshot: bool = True):
+        """
+        Load DDRNetSlim from a weightfile created by the source DDRNetSlim repository.
+
+        Parameters:
+            checkpoint_path: Path to a checkpoint. Downloads the default weights if not provided.
+            use_snapshot: Load from (or save) a snapshot of the constructed model.
+                See utils.snapshot.
+        """
+        if use_snapshot:
+            return load_or_create_snapshot(
+                MODEL_NAME,
+                ["DDRNet", checkpoint_path],
+                lambda: DDRNet.from_pretrained(checkpoint_path, use_snapshot=False),
+                SourceAsRoot(
+                    DDRNET_SOURCE_REPOSITORY, DDRNET_SOURCE_REPO_COMMIT, MODEL_NAME
+                ),
+            )
         with SourceAsRoot(
             DDRNET_SOURCE_REPOSITORY, DDRNET_SOURCE_REPO_COMMIT, MODEL_NAME
-        ):
-            bad_init_file = Path("lib/models/__init__.py")
+        ) as repo_path:
+            bad_init_file = Path(repo_path) / "lib/models/__init__.py"
             if bad_init_file.exists():
                 bad_init_file.unlink()
 
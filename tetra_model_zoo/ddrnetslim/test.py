@@ -1,6 +1,14 @@
 import numpy as np
+import pytest
+import torch
+from PIL import Image
 
-from tetra_model_zoo.ddrnetslim.app import DDRNetApp
+from tetra_model_zoo.ddrnetslim.app import (
+    COLOR_MAP,
+    DDRNetApp,
+    decode_labels_rle,
+    overlay_labels,
+)
 from tetra_model_zoo.ddrnetslim.model import MODEL_ASSET_VERSION, MODEL_NAME, DDRNet
 from tetra_model_zoo.utils.asset_loaders import load_image
 from tetra_model_zoo.utils.testing import assert_most_same, skip_clone_repo_check
@@ -20,3 +28,144 @@ def test_numerical():
     assert_most_same(
         np.asarray(output_image), np.asarray(output_image_oracle), tolerance=0.01
     )
+
+
+class _RandomSegmenter(torch.nn.Module):
+    """Smooth random logits at 1/8 of the input resolution."""
+
+    def forward(self, image):
+        N, _, H, W = image.shape
+        generator = torch.Generator().manual_seed(0)
+        logits = torch.randn(N, 19, H // 32, W // 32, generator=generator)
+        return torch.nn.functional.interpolate(
+            logits, size=(H // 8, W // 8), mode="bilinear"
+        )
+
+
+def test_upsample_and_raw_output_formats():
+    app = DDRNetApp(_RandomSegmenter())
+    frames = np.random.randint(0, 256, (2, 256, 512, 3), dtype=np.uint8)
+    logits = app.segment_image(frames, raw_output=True)
+    expected_labels = logits.argmax(1)
+
+    for upsample, max_mismatch in [
+        ("logits", 1e-4),
+        ("top_logits", 1e-4),
+        ("labels", 0.2),
+    ]:
+        labels = app.segment_image(
+            frames, raw_output=True, upsample=upsample, raw_output_format="labels"
+        )
+        assert labels.dtype == np.uint8 and labels.shape == (2, 256, 512)
+        assert (labels != expected_labels).mean() <= max_mismatch
+
+        rles = app.segment_image(
+            frames, raw_output=True, upsample=upsample, raw_output_format="rle"
+        )
+        for rle, frame_labels in zip(rles, labels):
+            np.testing.assert_array_equal(decode_labels_rle(rle), frame_labels)
+
+        images = app.segment_image(frames, upsample=upsample)
+        np.testing.assert_array_equal(
+            np.stack([np.asarray(image) for image in images]),
+            overlay_labels(frames, labels),
+        )
+
+
+def test_overlay_labels():
+    frames = np.random.randint(0, 256, (2, 32, 48, 3), dtype=np.uint8)
+    labels = np.random.randint(0, len(COLOR_MAP), (2, 32, 48), dtype=np.uint8)
+    for alpha in [0.5, 0.3]:
+        expected = [
+            np.asarray(
+                Image.blend(
+                    Image.fromarray(frame),
+                    Image.fromarray(COLOR_MAP[frame_labels]),
+                    alpha=alpha,
+                )
+            )
+            for frame, frame_labels in zip(frames, labels)
+        ]
+        np.testing.assert_array_equal(
+            overlay_labels(frames, labels, alpha=alpha), np.stack(expected)
+        )
+
+
+class _ConstantSegmenter(torch.nn.Module):
+    """Predicts class 1 everywhere, with a confidence set by `logit`."""
+
+    def __init__(self, logit: float):
+        super().__init__()
+        self.logit = logit
+        self.input_sizes = []
+
+    def forward(self, image):
+        self.input_sizes.append(tuple(image.shape[-2:]))
+        N, _, H, W = image.shape
+        logits = torch.zeros(N, 19, H // 8, W // 8)
+        logits[:, 1] = self.logit
+        return logits
+
+
+def _segment_video(model, frames, **kwargs):
+    outputs = list(DDRNetApp(model).segment_video(frames, raw_output=True, **kwargs))
+    for labels, _ in outputs:
+        assert labels.shape == (128, 256) and (labels == 1).all()
+    return [mode for _, mode in outputs]
+
+
+def test_segment_video():
+    frames = [np.zeros((128, 256, 3), dtype=np.uint8)] * 7
+
+    # Keyframes every 3 frames, low resolution frames in between.
+    model = _ConstantSegmenter(logit=5)
+    modes = _segment_video(model, frames, keyframe_interval=3)
+    assert modes == ["keyframe", "low_res", "low_res"] * 2 + ["keyframe"]
+    assert model.input_sizes == [(128, 256), (64, 128), (64, 128)] * 2 + [(128, 256)]
+
+    # Low confidence low resolution frames are refreshed with keyframes.
+    model = _ConstantSegmenter(logit=0.1)
+    modes = _segment_video(model, frames, keyframe_interval=3)
+    assert modes == ["keyframe"] * 7
+
+    # Propagated labels are refreshed once the frame has changed.
+    frames = frames[:3] + [np.full((128, 256, 3), 255, dtype=np.uint8)] * 4
+    model = _ConstantSegmenter(logit=0.1)
+    modes = _segment_video(
+        model, frames, keyframe_interval=10, intermediate_mode="propagate"
+    )
+    assert modes == ["keyframe", "propagated", "propagated", "keyframe"] + [
+        "propagated"
+    ] * 3
+    assert len(model.input_sizes) == 2
+
+    outputs = list(DDRNetApp(_ConstantSegmenter(logit=5)).segment_video(frames[:2]))
+    assert [mode for _, mode in outputs] == ["keyframe", "low_res"]
+    assert all(isinstance(image, Image.Image) for image, _ in outputs)
+
+
+@pytest.mark.parametrize(
+    "kwargs,message",
+    [
+        (dict(upsample="bicubic"), "Unknown upsample mode"),
+        (dict(low_res_scale=0), "low_res_scale"),
+        (dict(low_res_scale=-0.5), "low_res_scale"),
+        (dict(low_res_scale=1.5), "low_res_scale"),
+        (dict(keyframe_interval=0), "keyframe_interval"),
+        (dict(intermediate_mode="skip"), "Unknown intermediate mode"),
+    ],
+)
+def test_segment_video_invalid_arguments(kwargs, message):
+    app = DDRNetApp(_ConstantSegmenter(logit=5))
+    frames = [np.zeros((128, 256, 3), dtype=np.uint8)]
+    with pytest.raises(ValueError, match=message):
+        list(app.segment_video(frames, **kwargs))
+
+
+def test_invalid_upsample_mode():
+    app = DDRNetApp(_ConstantSegmenter(logit=5))
+    frames = np.zeros((1, 128, 256, 3), dtype=np.uint8)
+    with pytest.raises(ValueError, match="Unknown upsample mode"):
+        app.segment_image(frames, upsample="bicubic")
+    with pytest.raises(ValueError, match="Unknown upsample mode"):
+        app._upsample_labels(torch.zeros(1, 19, 16, 32), (128, 256), "bicubic")
@@ -7,6 +7,8 @@ import torch
 import torchvision.transforms as transforms
 from PIL.Image import Image, fromarray
 
+from tetra_model_zoo.utils.profiling import profile_stage
+
 
 class ESRGANApp:
     """
@@ -46,13 +48,16 @@ class ESRGANApp:
         """
 
         # preprocess
-        pixel_values = preprocess_image(pixel_values_or_image)
+        with profile_stage(self, "input_conversion"):
+            pixel_values = preprocess_image(pixel_values_or_image)
 
         # Run prediction
-        upscaled_image = self.model(pixel_values)
+        with profile_stage(self, "model_forward"):
+            upscaled_image = self.model(pixel_values)
 
         # post-process
-        output_image = postprocess_image(upscaled_image)
+        with profile_stage(self, "postprocess"):
+            output_image = postprocess_image(upscaled_image)
 
         return output_image
 
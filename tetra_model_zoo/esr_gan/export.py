@@ -6,6 +6,8 @@ import torch
 
 from tetra_model_zoo.esr_gan.model import ESRGAN
 from tetra_model_zoo.utils.args import vision_export_parser
+from tetra_model_zoo.utils.local_profiling import submit_local_profile_job
+from tetra_model_zoo.utils.shape_buckets import export_shape_buckets
 
 
 def trace(model: ESRGAN, input_shape: List[int] = [1, 3, 224, 224]) -> Any:
@@ -17,11 +19,14 @@ def trace(model: ESRGAN, input_shape: List[int] = [1, 3, 224, 224]) -> Any:
 
 
 def main():
-    import tetra_hub as hub
     from tetra_model_zoo.utils.hub import download_hub_models
 
     # Export parameters
-    parser = vision_export_parser(default_x=223, default_y=224)
+    parser = vision_export_parser(
+        default_x=223,
+        default_y=224,
+        include_shape_bucket_options=True,
+    )
     parser.add_argument("--c", type=int, default=3, help="Number of image channels.")
 
     args = parser.parse_args()
@@ -29,9 +34,32 @@ def main():
     # Instantiate the model & a sample input.
     esrgan_model = ESRGAN.from_pretrained()
 
+    if args.shape_buckets:
+        export_shape_buckets(
+            "esrgan",
+            esrgan_model,
+            lambda size: [torch.ones(args.b, args.c, *size)],
+            args.shape_buckets,
+            args.output_dir,
+            args.dynamic_shapes,
+        )
+        return
+
     # Trace the model.
     traced_esrgan = trace(esrgan_model, [args.b, args.c, args.x, args.y])
 
+    if args.local:
+        submit_local_profile_job(
+            name="esrgan",
+            model=traced_esrgan,
+            input_shapes={"image": ((args.b, args.c, args.x, args.y), "float32")},
+            runtimes=args.local_runtimes,
+            output_dir=args.local_output_dir,
+        )
+        return
+
+    import tetra_hub as hub
+
     # Select the device(s) you'd like to optimize for.
     devices = [hub.Device(x) for x in args.devices]
 
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-import os
-
 import torch
 
-from tetra_model_zoo.utils.asset_loaders import SourceAsRoot
+from tetra_model_zoo.utils.asset_loaders import SourceAsRoot, download_data
 from tetra_model_zoo.utils.input_spec import InputSpec
+from tetra_model_zoo.utils.mmap_weights import assign_state_dict, load_state_dict_mmap
+from tetra_model_zoo.utils.precision import set_model_precision
+from tetra_model_zoo.utils.snapshot import load_or_create_snapshot
 
 ESRGAN_SOURCE_REPOSITORY = "https://github.com/xinntao/ESRGAN"
 ESRGAN_SOURCE_REPO_COMMIT = "73e9b634cf987f5996ac2dd33f4050922398a921"
@@ -24,13 +25,35 @@ class ESRGAN(torch.nn.Module):
         self.model = esrgan_model
 
     @staticmethod
-    def from_pretrained(weights_path: str | None = None) -> ESRGAN:
-        """Load ESRGAN from a weightfile created by the source ESRGAN repository."""
+    def from_pretrained(
+        weights_path: str | None = None,
+        use_snapshot: bool = True,
+        precision: str = "fp32",
+    ) -> ESRGAN:
+        """
+        Load ESRGAN from a weightfile created by the source ESRGAN repository.
+
+        Parameters:
+            weights_path: Path to a checkpoint. Downloads the default weights if not provided.
+            use_snapshot: Load from (or save) a snapshot of the constructed model.
+                See utils.snapshot.
+            precision: "fp32", "bf16" or "fp16". See utils.precision.
+        """
+        if use_snapshot:
+            model = load_or_create_snapshot(
+                MODEL_NAME,
+                ["ESRGAN", weights_path],
+                lambda: ESRGAN.from_pretrained(weights_path, use_snapshot=False),
+                SourceAsRoot(
+                    ESRGAN_SOURCE_REPOSITORY, ESRGAN_SOURCE_REPO_COMMIT, MODEL_NAME
+                ),
+            )
+            return set_model_precision(model, precision)
 
         # Load PyTorch model from disk
         esrgan_model = _load_esrgan_source_model_from_weights(weights_path)
 
-        return ESRGAN(esrgan_model)
+        return set_model_precision(ESRGAN(esrgan_model), precision)
 
     def forward(self, image: torch.Tensor) -> torch.Tensor:
         """
@@ -69,23 +92,13 @@ def _load_esrgan_source_model_from_weights(
     # Load ESRGAN model from the source repository using the given weights.
     weights_url = f"https://tetra-public-assets.s3.us-west-2.amazonaws.com/model-zoo/esrgan/v{MODEL_ASSET_VERSION}/RRDB_ESRGAN_x4.pth"
 
-    with SourceAsRoot(ESRGAN_SOURCE_REPOSITORY, ESRGAN_SOURCE_REPO_COMMIT, MODEL_NAME):
-        # download the weights file
-        import requests
-
-        if not weights_path:
-            response = requests.get(weights_url)
-            weights_path = os.path.join(os.getcwd(), "RRDB_ESRGAN_x4.pth")
-            with open(weights_path, "wb") as file:
-                file.write(response.content)
-
-            print(f"Weights file downloaded as {weights_path}")
+    if not weights_path:
+        weights_path = download_data(weights_url, MODEL_NAME)
 
+    with SourceAsRoot(ESRGAN_SOURCE_REPOSITORY, ESRGAN_SOURCE_REPO_COMMIT, MODEL_NAME):
         # necessary import. `esrgan.RRDBNet_arch` comes from the esrgan repo.
         import RRDBNet_arch as arch
 
         esrgan_model = arch.RRDBNet(3, 3, 64, 23, gc=32)
-        esrgan_model.load_state_dict(
-            torch.load(weights_path, map_location=torch.device("cpu")), strict=True
-        )
+        assign_state_dict(esrgan_model, load_state_dict_mmap(weights_path, MODEL_NAME))
         return esrgan_model
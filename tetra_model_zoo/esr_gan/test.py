@@ -3,6 +3,8 @@ import numpy as np
 from tetra_model_zoo.esr_gan.app import ESRGANApp
 from tetra_model_zoo.esr_gan.model import ESRGAN, MODEL_ASSET_VERSION, MODEL_NAME
 from tetra_model_zoo.utils.asset_loaders import load_image
+from tetra_model_zoo.utils.image_processing import preprocess_PIL_image
+from tetra_model_zoo.utils.precision import compare_precision
 from tetra_model_zoo.utils.testing import skip_clone_repo_check
 
 IMAGE_ADDRESS = f"https://tetra-public-assets.s3.us-west-2.amazonaws.com/model-zoo/esrgan/v{MODEL_ASSET_VERSION}/esrgan_demo.jpg"
@@ -21,3 +23,11 @@ def test_esrgan_app():
         rtol=0.02,
         atol=0.2,
     )
+
+
+@skip_clone_repo_check
+def test_esrgan_bf16():
+    image = preprocess_PIL_image(load_image(IMAGE_ADDRESS, MODEL_NAME))
+    compare_precision(
+        ESRGAN.from_pretrained(), [image[..., :128, :128]], "bf16", psnr_threshold=30
+    )
@@ -1,11 +1,32 @@
 from __future__ import annotations
 
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Deque, Iterator, List, NamedTuple, Sequence, Tuple
+
 import torch
+from PIL import Image as ImageModule
 from PIL.Image import Image
 from torchvision import transforms
 
 from tetra_model_zoo.imagenet_classifier.model import IMAGENET_DIM, ImagenetClassifier
 from tetra_model_zoo.utils.image_processing import normalize_image_tranform
+from tetra_model_zoo.utils.profiling import profile_stage
+
+IMAGE_FILE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".webp")
+
+# Built once at import; the transform is stateless so it can be shared by
+# every app instance and every preprocessing worker thread.
+IMAGENET_TRANSFORM = transforms.Compose(
+    [
+        transforms.Resize(256),
+        transforms.CenterCrop(IMAGENET_DIM),
+        transforms.ToTensor(),
+        normalize_image_tranform(),
+    ]
+)
 
 
 def preprocess_image(image: Image) -> torch.Tensor:
@@ -20,18 +41,47 @@ def preprocess_image(image: Image) -> torch.Tensor:
     Returns:
         torch tensor to be directly passed to the model.
     """
-    transform = transforms.Compose(
-        [
-            transforms.Resize(256),
-            transforms.CenterCrop(IMAGENET_DIM),
-            transforms.ToTensor(),
-            normalize_image_tranform(),
-        ]
-    )
-    out_tensor: torch.Tensor = transform(image)  # type: ignore
+    out_tensor: torch.Tensor = IMAGENET_TRANSFORM(image)  # type: ignore
     return out_tensor.unsqueeze(0)
 
 
+def load_and_preprocess_image(path: str) -> torch.Tensor:
+    """
+    Decode the image at the given path and preprocess it for classification.
+
+    Returns:
+        torch tensor of shape [3, 224, 224].
+    """
+    with ImageModule.open(path) as image:
+        out_tensor: torch.Tensor = IMAGENET_TRANSFORM(image.convert("RGB"))  # type: ignore
+    return out_tensor
+
+
+def list_image_files(image_dir_or_paths: str | Sequence[str]) -> List[str]:
+    """
+    Resolve a directory (searched non-recursively, sorted by name) or an
+    explicit list of paths into a list of image file paths.
+    """
+    if isinstance(image_dir_or_paths, str):
+        if not os.path.isdir(image_dir_or_paths):
+            return [image_dir_or_paths]
+        return [
+            os.path.join(image_dir_or_paths, name)
+            for name in sorted(os.listdir(image_dir_or_paths))
+            if name.lower().endswith(IMAGE_FILE_EXTENSIONS)
+        ]
+    return list(image_dir_or_paths)
+
+
+class ImageClassification(NamedTuple):
+    """Top-k classification result for a single image."""
+
+    path: str
+    class_indices: List[int]
+    probabilities: List[float]
+    labels: List[str]
+
+
 class ImagenetClassifierApp:
     """
     This class consists of light-weight "app code" that is required to
@@ -45,6 +95,7 @@ class ImagenetClassifierApp:
 
     def __init__(self, model: ImagenetClassifier):
         self.model = model
+        self.model.eval()
 
     def predict(self, image: Image) -> torch.Tensor:
         """
@@ -59,8 +110,119 @@ class ImagenetClassifierApp:
             to a different Imagenet1K class.
         """
 
-        input_tensor = preprocess_image(image)
-        with torch.no_grad():
-            self.model.eval()
+        with profile_stage(self, "input_conversion"):
+            input_tensor = preprocess_image(image)
+        with profile_stage(self, "model_forward"), torch.inference_mode():
             output = self.model(input_tensor)
         return torch.softmax(output[0], dim=0)
+
+    def predict_batch(self, images: List[Image]) -> torch.Tensor:
+        """
+        Predict probability distributions for several images with a single
+        forward pass.
+
+        Parameters:
+            images: PIL Images in RGB format.
+
+        Returns:
+            A (N, 1000) size torch tensor of probabilities.
+        """
+        with profile_stage(self, "input_conversion"):
+            input_tensor = torch.cat([preprocess_image(image) for image in images])
+        with profile_stage(self, "model_forward"), torch.inference_mode():
+            output = self.model(input_tensor)
+        return torch.softmax(output, dim=1)
+
+    def classify_images(
+        self,
+        image_dir_or_paths: str | Sequence[str],
+        batch_size: int = 16,
+        num_workers: int = 4,
+        top_k: int = 5,
+        class_names: Sequence[str] | None = None,
+        prefetch_batches: int = 2,
+        pad_last_batch: bool | None = None,
+    ) -> Tuple[List[ImageClassification], float]:
+        """
+        Classify every image in a directory (or a list of image paths).
+
+        Images are decoded and preprocessed by a pool of worker threads while
+        the model runs, and are fed to the model in batches of `batch_size`.
+
+        Parameters:
+            image_dir_or_paths: Directory of images, or a list of image paths.
+            batch_size: Number of images per forward pass.
+            num_workers: Number of decode / preprocess threads.
+            top_k: Number of classes to report per image.
+            class_names: Optional list of 1000 Imagenet class names. If not
+                provided, labels are the class indices as strings.
+            prefetch_batches: Number of batches to decode ahead of the model.
+            pad_last_batch: Zero-pad the final batch up to `batch_size`, for
+                models that only accept a fixed input shape. Default: pad only
+                traced / scripted (torch.jit.ScriptModule) models.
+
+        Returns:
+            results: One ImageClassification per input image, in input order.
+            images_per_second: End to end throughput, including decoding.
+        """
+        paths = list_image_files(image_dir_or_paths)
+        if pad_last_batch is None:
+            pad_last_batch = isinstance(self.model, torch.jit.ScriptModule)
+        results: List[ImageClassification] = []
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=num_workers) as pool:
+            for batch_paths, batch in self._iter_batches(
+                pool, paths, batch_size, prefetch_batches, pad_last_batch
+            ):
+                with profile_stage(self, "model_forward"), torch.inference_mode():
+                    logits = self.model(batch)[: len(batch_paths)]
+                probabilities, indices = torch.softmax(logits, dim=1).topk(
+                    top_k, dim=1
+                )
+                for path, probs, idxs in zip(
+                    batch_paths, probabilities.tolist(), indices.tolist()
+                ):
+                    labels = [
+                        class_names[i] if class_names is not None else str(i)
+                        for i in idxs
+                    ]
+                    results.append(ImageClassification(path, idxs, probs, labels))
+        elapsed = time.perf_counter() - start
+        images_per_second = len(results) / elapsed if elapsed > 0 else 0.0
+        return results, images_per_second
+
+    @staticmethod
+    def _iter_batches(
+        pool: ThreadPoolExecutor,
+        paths: List[str],
+        batch_size: int,
+        prefetch_batches: int,
+        pad_last_batch: bool = False,
+    ) -> Iterator[Tuple[List[str], torch.Tensor]]:
+        """
+        Yield (paths, [N, 3, 224, 224] tensor) pairs, keeping at most
+        `prefetch_batches` batches of decode work in flight. N is `batch_size`,
+        except for a final partial batch that is not padded.
+        """
+        pad_to = batch_size if pad_last_batch else 0
+        pending: Deque[Tuple[List[str], List[Future]]] = deque()
+        chunks = (
+            paths[i : i + batch_size] for i in range(0, len(paths), batch_size)
+        )
+        for chunk in chunks:
+            pending.append(
+                (chunk, [pool.submit(load_and_preprocess_image, p) for p in chunk])
+            )
+            if len(pending) > prefetch_batches:
+                yield ImagenetClassifierApp._collect_batch(*pending.popleft(), pad_to)
+        while pending:
+            yield ImagenetClassifierApp._collect_batch(*pending.popleft(), pad_to)
+
+    @staticmethod
+    def _collect_batch(
+        chunk: List[str], futures: List[Future], pad_to: int = 0
+    ) -> Tuple[List[str], torch.Tensor]:
+        batch = torch.zeros(max(len(futures), pad_to), 3, IMAGENET_DIM, IMAGENET_DIM)
+        for i, future in enumerate(futures):
+            batch[i] = future.result()
+        return chunk, batch
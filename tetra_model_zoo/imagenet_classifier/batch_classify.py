@@ -0,0 +1,87 @@
+import argparse
+import importlib
+
+import torch
+import torchvision.models as tv_models
+
+from tetra_model_zoo.imagenet_classifier.app import ImagenetClassifierApp
+from tetra_model_zoo.imagenet_classifier.quantization import QUANTIZE_MODES
+
+
+#
+# Classify a directory of images with any of the Imagenet classifiers in the zoo.
+# Prints the top-k labels for each image and the end to end throughput.
+#
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--model",
+        type=str,
+        default="resnet50",
+        help="Name of the classifier package in the model zoo, e.g. resnet50 or mobilenet_v2.",
+    )
+    parser.add_argument(
+        "--images",
+        type=str,
+        required=True,
+        help="Directory of images, or a single image path.",
+    )
+    parser.add_argument("--batch_size", type=int, default=16)
+    parser.add_argument(
+        "--num_workers",
+        type=int,
+        default=4,
+        help="Number of threads used to decode and preprocess images.",
+    )
+    parser.add_argument("--top_k", type=int, default=5)
+    parser.add_argument(
+        "--num_threads",
+        type=int,
+        default=None,
+        help="Number of intra-op threads used by torch. Defaults to torch's default.",
+    )
+    parser.add_argument(
+        "--quantize",
+        type=str,
+        default=None,
+        choices=QUANTIZE_MODES,
+        help="Run an int8 version of the classifier (see quantization.py).",
+    )
+    parser.add_argument(
+        "--calibration_images",
+        type=str,
+        default=None,
+        help="Images used to calibrate --quantize static. Default: --images.",
+    )
+    args = parser.parse_args()
+
+    if args.num_threads is not None:
+        torch.set_num_threads(args.num_threads)
+
+    model_module = importlib.import_module(f"tetra_model_zoo.{args.model}")
+    model = model_module.Model.from_pretrained(
+        quantize=args.quantize,
+        calibration_images=args.calibration_images or args.images,
+    )
+    app = ImagenetClassifierApp(model)
+    # All torchvision Imagenet weights share the same list of categories.
+    class_names = tv_models.ResNet50_Weights.IMAGENET1K_V1.meta["categories"]
+
+    results, images_per_second = app.classify_images(
+        args.images,
+        batch_size=args.batch_size,
+        num_workers=args.num_workers,
+        top_k=args.top_k,
+        class_names=class_names,
+    )
+    for result in results:
+        predictions = ", ".join(
+            f"{label} ({prob:.3f})"
+            for label, prob in zip(result.labels, result.probabilities)
+        )
+        print(f"{result.path}: {predictions}")
+    print(f"Classified {len(results)} images at {images_per_second:.1f} images/sec")
+
+
+if __name__ == "__main__":
+    main()
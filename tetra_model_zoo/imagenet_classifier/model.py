@@ -1,4 +1,6 @@
-from typing import Any
+from __future__ import annotations
+
+from typing import Any, Sequence
 
 import torch
 
@@ -27,8 +29,12 @@ class DocstringInheritorMeta(type):
 class ImagenetClassifier(torch.nn.Module, metaclass=DocstringInheritorMeta):
     """
     Base class for all Imagenet Classifier models within the model zoo.
+
+    Subclasses set DEFAULT_WEIGHTS and implement `load_net`.
     """
 
+    DEFAULT_WEIGHTS = "IMAGENET1K_V1"
+
     def __init__(self, net: torch.nn.Module):
         """
         Basic initializer which takes in a pretrained classifier network.
@@ -37,6 +43,36 @@ class ImagenetClassifier(torch.nn.Module, metaclass=DocstringInheritorMeta):
         super().__init__()
         self.net = net
 
+    @staticmethod
+    def load_net(weights: str) -> torch.nn.Module:
+        """
+        Returns the pretrained torchvision classifier network for `weights`.
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def from_pretrained(
+        cls,
+        weights: str | None = None,
+        quantize: str | None = None,
+        calibration_images: str | Sequence[str] | None = None,
+    ) -> ImagenetClassifier:
+        """
+        Parameters:
+            weights: Torchvision weights to load. Default: DEFAULT_WEIGHTS.
+            quantize: Optional int8 quantization mode (see quantization.py).
+            calibration_images: Images used to calibrate static quantization.
+        """
+        model = cls(cls.load_net(weights or cls.DEFAULT_WEIGHTS))
+        if quantize is None:
+            return model
+        # Imported lazily: quantization pulls in torch.ao.quantization.
+        from tetra_model_zoo.imagenet_classifier.quantization import (
+            quantize_imagenet_classifier,
+        )
+
+        return quantize_imagenet_classifier(model, quantize, calibration_images)
+
     def forward(self, image_tensor: torch.Tensor):
         """
         Predict class probabilities for an input `image`.
@@ -58,12 +94,13 @@ class ImagenetClassifier(torch.nn.Module, metaclass=DocstringInheritorMeta):
 
     def get_input_spec(
         self,
+        batch_size: int = 1,
     ) -> InputSpec:
         """
         Returns the input specification (name -> (shape, type). This can be
         used to submit profiling job on TetraHub.
         """
-        return {"image": ((1, 3, IMAGENET_DIM, IMAGENET_DIM), "float32")}
+        return {"image": ((batch_size, 3, IMAGENET_DIM, IMAGENET_DIM), "float32")}
 
 
 def trace_imagenet_classifier(model: ImagenetClassifier) -> Any:
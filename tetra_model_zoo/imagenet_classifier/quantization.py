@@ -0,0 +1,105 @@
+"""
+Post-training int8 quantization of Imagenet classifiers, for CPU inference.
+
+Classifiers are quantized with FX graph mode quantization:
+    * "static": weights and activations are int8. Activation ranges are
+      calibrated by running the model on a small folder of local images.
+    * "dynamic": weights of linear layers are int8, and activations are
+      quantized on the fly. No calibration is needed. This mostly benefits
+      models dominated by linear layers (e.g. ViT); convolutions stay fp32.
+"""
+
+from __future__ import annotations
+
+import copy
+from typing import List, Sequence
+
+import torch
+from torch.ao.quantization import (
+    QConfigMapping,
+    default_dynamic_qconfig,
+    get_default_qconfig_mapping,
+)
+from torch.ao.quantization.quantize_fx import convert_fx, prepare_fx
+
+from tetra_model_zoo.imagenet_classifier.app import (
+    list_image_files,
+    load_and_preprocess_image,
+)
+from tetra_model_zoo.imagenet_classifier.model import ImagenetClassifier
+
+QUANTIZE_MODES = ("dynamic", "static")
+DEFAULT_NUM_CALIBRATION_IMAGES = 64
+CALIBRATION_BATCH_SIZE = 8
+
+
+def load_calibration_batches(
+    image_dir_or_paths: str | Sequence[str],
+    num_images: int = DEFAULT_NUM_CALIBRATION_IMAGES,
+    batch_size: int = CALIBRATION_BATCH_SIZE,
+) -> List[torch.Tensor]:
+    """
+    Loads and preprocesses (up to) `num_images` images for calibration.
+
+    Returns:
+        List of [N, 3, 224, 224] batches.
+    """
+    paths = list_image_files(image_dir_or_paths)[:num_images]
+    if not paths:
+        raise ValueError(f"No calibration images found in {image_dir_or_paths}.")
+    images = [load_and_preprocess_image(path) for path in paths]
+    return [
+        torch.stack(images[i : i + batch_size])
+        for i in range(0, len(images), batch_size)
+    ]
+
+
+def quantize_imagenet_classifier(
+    model: ImagenetClassifier,
+    quantize: str | None,
+    calibration_images: str | Sequence[str] | None = None,
+    num_calibration_images: int = DEFAULT_NUM_CALIBRATION_IMAGES,
+) -> ImagenetClassifier:
+    """
+    Quantizes an Imagenet classifier to int8 for CPU inference.
+
+    Parameters:
+        model: The fp32 classifier. It is not modified.
+        quantize: One of QUANTIZE_MODES, or None to return `model` unchanged.
+        calibration_images: Directory of images (or list of image paths) used to
+            calibrate activation ranges. Required for static quantization.
+        num_calibration_images: Maximum number of calibration images to use.
+
+    Returns:
+        The quantized classifier. Takes the same fp32 inputs, and returns
+        fp32 logits, as the original model.
+    """
+    if quantize is None:
+        return model
+    if quantize not in QUANTIZE_MODES:
+        raise ValueError(
+            f"Unsupported quantization mode {quantize}. Choose one of {QUANTIZE_MODES}."
+        )
+    if quantize == "static" and calibration_images is None:
+        raise ValueError("Static quantization requires calibration_images.")
+
+    net = copy.deepcopy(model.net).eval()
+    input_shape = model.get_input_spec(batch_size=CALIBRATION_BATCH_SIZE)["image"][0]
+    example_inputs = (torch.zeros(input_shape),)
+    if quantize == "static":
+        qconfig_mapping = get_default_qconfig_mapping(torch.backends.quantized.engine)
+    else:
+        qconfig_mapping = QConfigMapping().set_object_type(
+            torch.nn.Linear, default_dynamic_qconfig
+        )
+    prepared = prepare_fx(net, qconfig_mapping, example_inputs)
+
+    if quantize == "static":
+        assert calibration_images is not None
+        with torch.no_grad():
+            for batch in load_calibration_batches(
+                calibration_images, num_calibration_images
+            ):
+                prepared(batch)
+
+    return type(model)(convert_fx(prepared))
@@ -0,0 +1,276 @@
+"""
+Accuracy vs. latency report for int8 quantized Imagenet classifiers.
+
+For each classifier, compares the fp32 model with its dynamic and static int8
+versions (see imagenet_classifier.quantization) on CPU:
+    * latency (p50 / p99) and throughput at the given batch size
+    * serialized model size
+    * top-1 agreement with fp32 predictions, and the mean absolute difference
+      of predicted probabilities, on a folder of evaluation images
+    * top-1 / top-5 accuracy, if a labels file is provided
+
+Example:
+    python -m tetra_model_zoo.imagenet_classifier.quantization_report \\
+        --models resnet50 mobilenet_v2 --calibration_images calib/ \\
+        --eval_images val/ --labels val_labels.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import io
+import json
+import os
+from typing import Dict, List, Sequence
+
+import torch
+
+from tetra_model_zoo._version import __version__
+from tetra_model_zoo.imagenet_classifier.app import (
+    list_image_files,
+    load_and_preprocess_image,
+)
+from tetra_model_zoo.imagenet_classifier.model import ImagenetClassifier
+from tetra_model_zoo.imagenet_classifier.quantization import QUANTIZE_MODES
+from tetra_model_zoo.utils.benchmark import (
+    BenchmarkRecord,
+    compute_latency_stats,
+    time_function,
+    write_csv,
+    write_json,
+)
+
+
+def get_model_size_mb(model: torch.nn.Module) -> float:
+    """Size of the model's serialized state dict, in MB."""
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell() / 2**20
+
+
+def predict_probabilities(
+    model: ImagenetClassifier, images: torch.Tensor, batch_size: int
+) -> torch.Tensor:
+    """Returns the [N, 1000] class probabilities of the images."""
+    outputs = []
+    with torch.inference_mode():
+        for i in range(0, images.shape[0], batch_size):
+            outputs.append(torch.softmax(model(images[i : i + batch_size]), dim=1))
+    return torch.cat(outputs)
+
+
+def evaluate_model(
+    model: ImagenetClassifier,
+    eval_images: torch.Tensor,
+    reference_probabilities: torch.Tensor | None,
+    labels: torch.Tensor | None,
+    batch_size: int,
+    num_warmup: int,
+    num_iterations: int,
+) -> BenchmarkRecord:
+    """
+    Measures the latency, size and accuracy of a classifier.
+
+    Parameters:
+        model: Classifier to evaluate.
+        eval_images: [N, 3, 224, 224] preprocessed images.
+        reference_probabilities: fp32 model probabilities for eval_images, if any.
+        labels: [N] Imagenet class index of each image (-1 if unknown), if any.
+        batch_size: Batch size for timing and evaluation.
+        num_warmup: Untimed forward passes before measuring.
+        num_iterations: Timed forward passes.
+
+    Returns:
+        Flat record of the measurements.
+    """
+    model.eval()
+    batch = eval_images[:batch_size]
+    if batch.shape[0] < batch_size:
+        batch = torch.cat(
+            [batch, torch.zeros(batch_size - batch.shape[0], *batch.shape[1:])]
+        )
+    with torch.inference_mode():
+        warmup_ms, latencies_ms = time_function(
+            lambda: model(batch), num_warmup, num_iterations
+        )
+    stats = compute_latency_stats(latencies_ms)
+    record: BenchmarkRecord = dict(
+        model_size_mb=get_model_size_mb(model),
+        warmup_ms=warmup_ms,
+        p50_ms=stats["p50_ms"],
+        p99_ms=stats["p99_ms"],
+        throughput_per_s=batch_size * 1000 / stats["mean_ms"],
+    )
+
+    probabilities = predict_probabilities(model, eval_images, batch_size)
+    if reference_probabilities is not None:
+        record["top1_agreement"] = float(
+            (
+                probabilities.argmax(dim=1) == reference_probabilities.argmax(dim=1)
+            ).float().mean()
+        )
+        record["mean_abs_prob_diff"] = float(
+            (probabilities - reference_probabilities).abs().mean()
+        )
+    if labels is not None and bool((labels >= 0).any()):
+        known = labels >= 0
+        top5 = probabilities[known].topk(5, dim=1).indices
+        record["top1_accuracy"] = float(
+            (top5[:, 0] == labels[known]).float().mean()
+        )
+        record["top5_accuracy"] = float(
+            (top5 == labels[known].unsqueeze(1)).any(dim=1).float().mean()
+        )
+    return record
+
+
+def load_labels(labels_path: str, image_paths: Sequence[str]) -> torch.Tensor:
+    """
+    Loads a JSON file mapping image file names to Imagenet class indices.
+
+    Returns:
+        [N] class index of each image, or -1 if the image is not in the file.
+    """
+    with open(labels_path) as f:
+        labels: Dict[str, int] = json.load(f)
+    return torch.tensor(
+        [labels.get(os.path.basename(path), -1) for path in image_paths]
+    )
+
+
+def quantization_report(
+    model_name: str,
+    calibration_images: str,
+    eval_images: torch.Tensor,
+    labels: torch.Tensor | None = None,
+    modes: Sequence[str] = QUANTIZE_MODES,
+    batch_size: int = 8,
+    num_warmup: int = 3,
+    num_iterations: int = 20,
+) -> List[BenchmarkRecord]:
+    """
+    Compares the fp32 classifier with each of its quantized versions.
+
+    Returns:
+        One record per quantization mode ("fp32" for the baseline), including
+        latency and accuracy relative to fp32.
+    """
+    model_module = importlib.import_module(f"tetra_model_zoo.{model_name}")
+    base_record: BenchmarkRecord = dict(
+        model=model_name,
+        zoo_version=__version__,
+        torch_version=torch.__version__,
+        quantized_engine=torch.backends.quantized.engine,
+        batch_size=batch_size,
+        num_threads=torch.get_num_threads(),
+        num_eval_images=eval_images.shape[0],
+    )
+
+    fp32_model = model_module.Model.from_pretrained()
+    fp32_record = evaluate_model(
+        fp32_model, eval_images, None, labels, batch_size, num_warmup, num_iterations
+    )
+    reference = predict_probabilities(fp32_model, eval_images, batch_size)
+    records = [dict(base_record, mode="fp32", **fp32_record)]
+
+    for mode in modes:
+        try:
+            model = model_module.Model.from_pretrained(
+                quantize=mode, calibration_images=calibration_images
+            )
+            record = evaluate_model(
+                model,
+                eval_images,
+                reference,
+                labels,
+                batch_size,
+                num_warmup,
+                num_iterations,
+            )
+        except Exception as e:
+            records.append(dict(base_record, mode=mode, error=repr(e)))
+            continue
+        record["speedup"] = fp32_record["p50_ms"] / record["p50_ms"]
+        records.append(dict(base_record, mode=mode, **record))
+
+    for record in records:
+        if "error" in record:
+            print(f"{model_name} {record['mode']}: FAILED ({record['error']})")
+            continue
+        print(
+            f"{model_name} {record['mode']}: p50={record['p50_ms']:.2f}ms "
+            f"size={record['model_size_mb']:.1f}MB "
+            f"speedup={record.get('speedup', 1.0):.2f}x "
+            f"top1_agreement={record.get('top1_agreement', 1.0):.3f}"
+        )
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--models",
+        nargs="+",
+        default=["resnet50"],
+        help="Classifier packages in the model zoo, e.g. resnet50 mobilenet_v2.",
+    )
+    parser.add_argument(
+        "--calibration_images",
+        type=str,
+        required=True,
+        help="Directory of images used to calibrate static quantization.",
+    )
+    parser.add_argument(
+        "--eval_images",
+        type=str,
+        default=None,
+        help="Directory of images to evaluate on. Default: the calibration images.",
+    )
+    parser.add_argument(
+        "--labels",
+        type=str,
+        default=None,
+        help="JSON file mapping eval image file names to Imagenet class indices.",
+    )
+    parser.add_argument(
+        "--modes", nargs="+", default=list(QUANTIZE_MODES), choices=QUANTIZE_MODES
+    )
+    parser.add_argument("--batch_size", type=int, default=8)
+    parser.add_argument("--num_threads", type=int, default=None)
+    parser.add_argument("--num_warmup", type=int, default=3)
+    parser.add_argument("--num_iterations", type=int, default=20)
+    parser.add_argument(
+        "--output_json", type=str, default="quantization_report.json"
+    )
+    parser.add_argument("--output_csv", type=str, default="quantization_report.csv")
+    args = parser.parse_args()
+
+    if args.num_threads is not None:
+        torch.set_num_threads(args.num_threads)
+
+    image_paths = list_image_files(args.eval_images or args.calibration_images)
+    eval_images = torch.stack([load_and_preprocess_image(p) for p in image_paths])
+    labels = load_labels(args.labels, image_paths) if args.labels else None
+
+    records: List[BenchmarkRecord] = []
+    for model_name in args.models:
+        records.extend(
+            quantization_report(
+                model_name,
+                args.calibration_images,
+                eval_images,
+                labels,
+                args.modes,
+                args.batch_size,
+                args.num_warmup,
+                args.num_iterations,
+            )
+        )
+    write_json(records, args.output_json)
+    write_csv(records, args.output_csv)
+    print(f"Wrote {len(records)} results to {args.output_json} and {args.output_csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+import torch
+from PIL import Image
+
+from tetra_model_zoo.imagenet_classifier.app import ImagenetClassifierApp
+from tetra_model_zoo.imagenet_classifier.model import IMAGENET_DIM, ImagenetClassifier
+
+
+class _BatchSizeRecorder(torch.nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.batch_sizes = []
+
+    def forward(self, image: torch.Tensor):
+        self.batch_sizes.append(image.shape[0])
+        return image.mean(dim=(2, 3)).repeat(1, 334)[:, :1000]
+
+
+def _make_image_dir(path, num_images: int) -> str:
+    rng = np.random.default_rng(0)
+    for i in range(num_images):
+        pixels = rng.integers(0, 255, (256, 256, 3), dtype=np.uint8)
+        Image.fromarray(pixels).save(path / f"{i}.png")
+    return str(path)
+
+
+@pytest.mark.parametrize(
+    "pad_last_batch,batch_sizes",
+    [(None, [2, 2, 1]), (False, [2, 2, 1]), (True, [2, 2, 2])],
+)
+def test_classify_images_last_batch(tmp_path, pad_last_batch, batch_sizes):
+    net = _BatchSizeRecorder()
+    app = ImagenetClassifierApp(ImagenetClassifier(net))
+    results, _ = app.classify_images(
+        _make_image_dir(tmp_path, 5),
+        batch_size=2,
+        num_workers=2,
+        top_k=1,
+        pad_last_batch=pad_last_batch,
+    )
+    assert [r.path for r in results] == [str(tmp_path / f"{i}.png") for i in range(5)]
+    assert net.batch_sizes == batch_sizes
+
+
+class _FixedBatchNet(torch.nn.Module):
+    """Only accepts batches of 2 once traced (the reshape sizes are constants)."""
+
+    def forward(self, image: torch.Tensor):
+        pixels = image.reshape(2, 3, IMAGENET_DIM * IMAGENET_DIM)
+        return pixels.mean(dim=2).repeat(1, 334)[:, :1000]
+
+
+def test_classify_images_pads_traced_model(tmp_path):
+    traced = torch.jit.trace(
+        ImagenetClassifier(_FixedBatchNet()).eval(), torch.zeros(2, 3, 224, 224)
+    )
+    app = ImagenetClassifierApp(traced)
+    image_dir = _make_image_dir(tmp_path, 3)
+    results, _ = app.classify_images(image_dir, batch_size=2, num_workers=1, top_k=3)
+    assert len(results) == 3
+
+    with pytest.raises(RuntimeError):
+        app.classify_images(
+            image_dir, batch_size=2, num_workers=1, pad_last_batch=False
+        )
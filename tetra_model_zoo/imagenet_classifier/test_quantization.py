@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+import torch
+import torchvision.models as tv_models
+from PIL import Image
+
+from tetra_model_zoo.imagenet_classifier.model import ImagenetClassifier
+from tetra_model_zoo.imagenet_classifier.quantization import (
+    quantize_imagenet_classifier,
+)
+from tetra_model_zoo.imagenet_classifier.quantization_report import evaluate_model
+
+
+def _make_image_dir(path, num_images: int = 4) -> str:
+    rng = np.random.default_rng(0)
+    for i in range(num_images):
+        pixels = rng.integers(0, 255, (256, 320, 3), dtype=np.uint8)
+        Image.fromarray(pixels).save(path / f"{i}.png")
+    return str(path)
+
+
+class _MobileNetV2(ImagenetClassifier):
+    @staticmethod
+    def load_net(weights: str) -> torch.nn.Module:
+        torch.manual_seed(0)
+        return tv_models.mobilenet_v2(weights=None)
+
+
+def _make_model() -> ImagenetClassifier:
+    torch.manual_seed(0)
+    return ImagenetClassifier(tv_models.mobilenet_v2(weights=None))
+
+
+def test_static_quantization(tmp_path):
+    model = _make_model().eval()
+    quantized = quantize_imagenet_classifier(model, "static", _make_image_dir(tmp_path))
+    modules = [type(m).__module__ for m in quantized.modules()]
+    assert any(".quantized." in name for name in modules)
+    # The original model is left untouched.
+    assert not any(".quantized." in type(m).__module__ for m in model.modules())
+
+    x = torch.rand(2, 3, 224, 224)
+    with torch.inference_mode():
+        assert quantized(x).shape == model(x).shape == (2, 1000)
+
+
+def test_dynamic_quantization():
+    model = _make_model().eval()
+    quantized = quantize_imagenet_classifier(model, "dynamic")
+    assert any(
+        isinstance(m, torch.ao.nn.quantized.dynamic.Linear) for m in quantized.modules()
+    )
+    with torch.inference_mode():
+        assert quantized(torch.rand(1, 3, 224, 224)).shape == (1, 1000)
+
+
+def test_from_pretrained_quantize():
+    model = _MobileNetV2.from_pretrained()
+    assert type(model) is _MobileNetV2
+    quantized = _MobileNetV2.from_pretrained(quantize="dynamic")
+    assert type(quantized) is _MobileNetV2
+    assert any(
+        isinstance(m, torch.ao.nn.quantized.dynamic.Linear) for m in quantized.modules()
+    )
+
+
+def test_quantization_errors():
+    model = _make_model()
+    assert quantize_imagenet_classifier(model, None) is model
+    with pytest.raises(ValueError):
+        quantize_imagenet_classifier(model, "int4")
+    with pytest.raises(ValueError):
+        quantize_imagenet_classifier(model, "static")
+
+
+def test_evaluate_model():
+    model = _make_model()
+    images = torch.rand(3, 3, 224, 224)
+    reference = torch.softmax(model.eval()(images), dim=1).detach()
+    record = evaluate_model(
+        model,
+        images,
+        reference,
+        labels=torch.tensor([1, -1, 2]),
+        batch_size=2,
+        num_warmup=1,
+        num_iterations=2,
+    )
+    assert record["top1_agreement"] == 1.0
+    assert 0.0 <= record["top1_accuracy"] <= 1.0
+    assert record["model_size_mb"] > 0
@@ -1,3 +1,6 @@
+import os
+import tempfile
+
 import numpy as np
 import torch
 
@@ -52,3 +55,20 @@ def run_imagenet_classifier_test(
     assert (
         predicted_class == TEST_IMAGENET_CLASS
     ), f"Model predicted class {predicted_class} when correct class was {TEST_IMAGENET_CLASS}."
+
+    # The batch engine must agree with the single image path,
+    # whether or not the final batch is zero-padded.
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for i in range(3):
+            img.save(os.path.join(tmpdir, f"dog_{i}.png"))
+        for pad_last_batch in (False, True):
+            results, images_per_second = app.classify_images(
+                tmpdir,
+                batch_size=2,
+                num_workers=2,
+                top_k=1,
+                pad_last_batch=pad_last_batch,
+            )
+            assert len(results) == 3 and images_per_second > 0
+            for result in results:
+                assert result.class_indices == [TEST_IMAGENET_CLASS]
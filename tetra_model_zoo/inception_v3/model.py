@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import torch
 import torchvision.models as tv_models
 
 from tetra_model_zoo.imagenet_classifier.model import ImagenetClassifier
@@ -9,6 +10,5 @@ MODEL_NAME = "inception_v3"
 
 class InceptionNetV3(ImagenetClassifier):
     @staticmethod
-    def from_pretrained(weights: str = "IMAGENET1K_V1") -> ImagenetClassifier:
-        net = tv_models.inception_v3(weights=weights)
-        return ImagenetClassifier(net)
+    def load_net(weights: str) -> torch.nn.Module:
+        return tv_models.inception_v3(weights=weights)
@@ -4,10 +4,11 @@ from typing import Any, List
 
 import torch
 
-import tetra_hub as hub
 from tetra_model_zoo.lama_dilated.model import DEFAULT_WEIGHTS, LamaDilated
 from tetra_model_zoo.utils.args import vision_export_parser
 from tetra_model_zoo.utils.hub import download_hub_models
+from tetra_model_zoo.utils.local_profiling import submit_local_profile_job
+from tetra_model_zoo.utils.shape_buckets import export_shape_buckets
 
 
 def trace(model: LamaDilated, input_shape: List[int]) -> Any:
@@ -30,6 +31,7 @@ def main():
     parser = vision_export_parser(
         default_x=512,
         default_y=512,
+        include_shape_bucket_options=True,
     )
     parser.add_argument("--c", type=int, default=3, help="Number of image channels.")
 
@@ -38,9 +40,37 @@ def main():
     # Instantiate the model & a sample input.
     model = LamaDilated.from_pretrained(DEFAULT_WEIGHTS)
 
+    if args.shape_buckets:
+        export_shape_buckets(
+            "lama_dilated",
+            model,
+            lambda size: [
+                torch.randn(args.b, args.c, *size),
+                torch.randn(args.b, 1, *size),
+            ],
+            args.shape_buckets,
+            args.output_dir,
+            args.dynamic_shapes,
+        )
+        return
+
     # Trace the model.
     traced_model = trace(model, [args.b, args.c, args.y, args.x])
 
+    if args.local:
+        submit_local_profile_job(
+            name="lama_dilated",
+            model=traced_model,
+            input_shapes=model.get_input_spec(
+                image_size=[args.y, args.x], batch_size=args.b, num_channels=args.c
+            ),
+            runtimes=args.local_runtimes,
+            output_dir=args.local_output_dir,
+        )
+        return
+
+    import tetra_hub as hub
+
     # Select the device(s) you'd like to optimize for.
     devices = [hub.Device(x) for x in args.devices]
 
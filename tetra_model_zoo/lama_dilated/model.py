@@ -1,13 +1,18 @@
 from __future__ import annotations
 
 import json
-import os
 
 import torch
 from omegaconf import OmegaConf
 
-from tetra_model_zoo.utils.asset_loaders import MODEL_ZOO_ASSET_PATH, SourceAsRoot
+from tetra_model_zoo.utils.asset_loaders import (
+    MODEL_ZOO_ASSET_PATH,
+    SourceAsRoot,
+    download_assets,
+)
 from tetra_model_zoo.utils.input_spec import InputSpec
+from tetra_model_zoo.utils.mmap_weights import assign_state_dict, load_state_dict_mmap
+from tetra_model_zoo.utils.snapshot import load_or_create_snapshot
 
 LAMA_SOURCE_REPOSITORY = "https://github.com/advimman/lama"
 LAMA_SOURCE_REPO_COMMIT = "7dee0e4a3cf5f73f86a820674bf471454f52b74f"
@@ -27,8 +32,26 @@ class LamaDilated(torch.nn.Module):
         self.model = lama_dilated_model
 
     @staticmethod
-    def from_pretrained(weights_name: str = DEFAULT_WEIGHTS) -> LamaDilated:
-        """Load LamaDilated from a weights file created by the source LaMa repository."""
+    def from_pretrained(
+        weights_name: str = DEFAULT_WEIGHTS, use_snapshot: bool = True
+    ) -> LamaDilated:
+        """
+        Load LamaDilated from a weights file created by the source LaMa repository.
+
+        Parameters:
+            weights_name: Name of the weights file.
+            use_snapshot: Load from (or save) a snapshot of the constructed model.
+                See utils.snapshot.
+        """
+        if use_snapshot:
+            return load_or_create_snapshot(
+                MODEL_NAME,
+                ["LamaDilated", weights_name],
+                lambda: LamaDilated.from_pretrained(weights_name, use_snapshot=False),
+                SourceAsRoot(
+                    LAMA_SOURCE_REPOSITORY, LAMA_SOURCE_REPO_COMMIT, MODEL_NAME
+                ),
+            )
 
         # Load PyTorch model from disk
         lama_dilated_model = _load_lama_dilated_source_model_from_weights(weights_name)
@@ -96,23 +119,10 @@ def _load_lama_dilated_source_model_from_weights(weights_name: str) -> torch.nn.
     weights_url = _get_weightsfile_from_name(weights_name)
     config_url = _get_config_url()
 
-    with SourceAsRoot(LAMA_SOURCE_REPOSITORY, LAMA_SOURCE_REPO_COMMIT, MODEL_NAME):
-
-        # download the weights and config file
-        import requests
-
-        response = requests.get(weights_url)
-        weights_path = os.path.join(os.getcwd(), weights_name + ".ckpt")
-        with open(weights_path, "wb") as file:
-            file.write(response.content)
-        print(f"Weights file downloaded as {weights_path}")
-
-        response = requests.get(config_url)
-        config_path = os.path.join(os.getcwd(), "training_config.json")
-        with open(config_path, "wb") as file:
-            file.write(response.content)
-        print(f"Weights file downloaded as {config_path}")
+    # Download the weights and config file.
+    weights_path, config_path = download_assets([weights_url, config_url], MODEL_NAME)
 
+    with SourceAsRoot(LAMA_SOURCE_REPOSITORY, LAMA_SOURCE_REPO_COMMIT, MODEL_NAME):
         # Import module
         from saicinpainting.training.trainers.default import (
             DefaultInpaintingTrainingModule,
@@ -125,9 +135,11 @@ def _load_lama_dilated_source_model_from_weights(weights_name: str) -> torch.nn.
         kwargs = dict(config.training_model)
         kwargs.pop("kind")
         kwargs["use_ddp"] = True
-        state = torch.load(weights_path, map_location="cpu")
+        state_dict = load_state_dict_mmap(
+            weights_path, MODEL_NAME, state_dict_keys=["state_dict"]
+        )
         lama_dilated_model = DefaultInpaintingTrainingModule(config, **kwargs)
-        lama_dilated_model.load_state_dict(state["state_dict"], strict=False)
-        lama_dilated_model.on_load_checkpoint(state)
+        assign_state_dict(lama_dilated_model, state_dict, strict=False)
+        lama_dilated_model.on_load_checkpoint(dict(state_dict=state_dict))
         lama_dilated_model.freeze()
         return lama_dilated_model
@@ -4,11 +4,79 @@ from typing import Any, Callable, List, Tuple
 
 import numpy as np
 import torch
-from mmpose.codecs.utils import refine_keypoints
 from PIL.Image import Image, fromarray
 
 from tetra_model_zoo.utils.draw import draw_points
-from tetra_model_zoo.utils.image_processing import app_to_net_image_inputs
+from tetra_model_zoo.utils.image_processing import (
+    app_to_net_image_inputs,
+    apply_batched_affines_to_frame,
+)
+from tetra_model_zoo.utils.profiling import profile_stage
+
+# Person boxes are padded by this factor before cropping (like MMPose does).
+BOX_PADDING = 1.25
+
+
+def box_xyxy_to_center_scale(
+    boxes: np.ndarray, aspect_ratio: float, padding: float = BOX_PADDING
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Converts person boxes to the region that is cropped for the network.
+
+    Inputs:
+        boxes: np.ndarray
+            Person boxes. Shape is [N, 4], where 4 == (x0, y0, x1, y1)
+        aspect_ratio: float
+            Aspect ratio (width / height) of the network input.
+        padding: float
+            Factor by which the boxes are enlarged.
+
+    Outputs:
+        centers: np.ndarray
+            Center of each region. Shape is [N, 2], where 2 == (x, y)
+        scales: np.ndarray
+            Size of each region, padded and expanded to the given aspect ratio.
+            Shape is [N, 2], where 2 == (w, h)
+    """
+    centers = (boxes[:, :2] + boxes[:, 2:4]) / 2
+    w = (boxes[:, 2] - boxes[:, 0]) * padding
+    h = (boxes[:, 3] - boxes[:, 1]) * padding
+    wider = w > h * aspect_ratio
+    scales = np.stack(
+        [np.where(wider, w, h * aspect_ratio), np.where(wider, w / aspect_ratio, h)],
+        axis=-1,
+    )
+    return centers, scales
+
+
+def compute_topdown_affines(
+    centers: np.ndarray, scales: np.ndarray, input_size: Tuple[int, int]
+) -> List[np.ndarray]:
+    """
+    Computes the affine transforms that crop and resize each region
+    (see box_xyxy_to_center_scale) to the network input.
+
+    Inputs:
+        centers: np.ndarray
+            Center of each region. Shape is [N, 2], where 2 == (x, y)
+        scales: np.ndarray
+            Size of each region, with the network input's aspect ratio.
+            Shape is [N, 2], where 2 == (w, h)
+        input_size: Tuple[int, int]
+            Network input size (height, width).
+
+    Outputs:
+        affines: List[np.ndarray]
+            Affine transform matrices. Shape is (2 x 3)
+    """
+    factors = input_size[1] / scales[:, 0]
+    affines = np.zeros((len(centers), 2, 3), dtype=np.float32)
+    affines[:, 0, 0] = factors
+    affines[:, 1, 1] = factors
+    affines[:, :, 2] = (
+        np.array([input_size[1], input_size[0]]) / 2 - factors[:, None] * centers
+    )
+    return list(affines)
 
 
 class LiteHRNetApp:
@@ -22,6 +90,9 @@ class LiteHRNetApp:
         * pre-process the image
         * Run LiteHRNet inference
         * Convert the output into a list of keypoint coordiates
+
+    Every person (in every image) is cropped into one batch, which is run
+    through LiteHRNet in a single forward pass.
     """
 
     def __init__(
@@ -30,9 +101,18 @@ class LiteHRNetApp:
             [torch.Tensor], Tuple[torch.Tensor, torch.Tensor, torch.Tensor]
         ],
         inferencer: Any,
+        input_size: Tuple[int, int] = (256, 192),
     ):
+        """
+        Parameters:
+            model: LiteHRNet.
+            inferencer: MMPose inferencer, used to detect the people in images
+                passed to predict_pose_keypoints.
+            input_size: Network input size (height, width) of each person crop.
+        """
         self.inferencer = inferencer
         self.model = model
+        self.input_size = input_size
 
     def predict(self, *args, **kwargs):
         # See predict_pose_keypoints.
@@ -44,7 +124,8 @@ class LiteHRNetApp:
         raw_output=False,
     ) -> np.ndarray | List[Image]:
         """
-        Predicts pose keypoints for a person in the image.
+        Predicts pose keypoints for the people in the image(s), which are
+        detected by the MMPose inferencer.
 
         Parameters:
             pixel_values_or_image
@@ -59,41 +140,146 @@ class LiteHRNetApp:
 
         Returns:
             If raw_output is true, returns:
-                keypoints: np.ndarray, shape [B, N, 2]
-                    Numpy array of keypoints within the images Each keypoint is an (x, y) pair of coordinates within the image.
+                keypoints: np.ndarray, shape [N, K, 2]
+                    Numpy array of the keypoints of each detected person, in image order.
+                    Each keypoint is an (x, y) pair of coordinates within the image.
 
             Otherwise, returns:
                 predicted_images: List[PIL.Image]
                     Images with keypoints drawn.
         """
         # Preprocess image to get data required for post processing
-        NHWC_int_numpy_frames, _ = app_to_net_image_inputs(pixel_values_or_image)
-        inputs = self.inferencer.preprocess(NHWC_int_numpy_frames, batch_size=1)
-        proc_inputs, _ = list(inputs)[0]
-        proc_inputs_ = proc_inputs["inputs"][0]
-
-        # run inference
-        predictions, _, heatmaps = self.model(proc_inputs_)
-
-        # get the bounding box from the preprocessing
-        center = proc_inputs["data_samples"][0].gt_instances.bbox_centers[0]
-        scale = proc_inputs["data_samples"][0].gt_instances.bbox_scales[0]
-
-        # perform refinement
-        keypoints = refine_keypoints(
-            predictions.unsqueeze(0).detach().numpy(), heatmaps.detach().numpy()
-        )
-        scale_factor = np.array([4.0, 4.0])
-        keypoints = keypoints * scale_factor
-        input_size = proc_inputs["data_samples"][0].metainfo["input_size"]
-        keypoints = keypoints / input_size * scale + center - 0.5 * scale
-        keypoints = np.round(keypoints).astype(np.int32)
+        with profile_stage(self, "input_conversion"):
+            NHWC_int_numpy_frames, _ = app_to_net_image_inputs(pixel_values_or_image)
+            inputs, centers, scales, frame_indices = [], [], [], []
+            # The inferencer yields the person crops of one image at a time.
+            for frame_idx, (proc_inputs, _) in enumerate(
+                self.inferencer.preprocess(NHWC_int_numpy_frames, batch_size=1)
+            ):
+                for person_input, data_sample in zip(
+                    proc_inputs["inputs"], proc_inputs["data_samples"]
+                ):
+                    inputs.append(person_input)
+                    centers.append(data_sample.gt_instances.bbox_centers[0])
+                    scales.append(data_sample.gt_instances.bbox_scales[0])
+                    frame_indices.append(frame_idx)
 
+        keypoints = self._predict_keypoints(inputs, centers, scales)
         if raw_output:
             return keypoints
 
-        predicted_images = []
-        for i, img in enumerate(NHWC_int_numpy_frames):
-            draw_points(img, keypoints[i], color=(255, 0, 0), size=2)
-            predicted_images.append(fromarray(img))
-        return predicted_images
+        with profile_stage(self, "drawing"):
+            frame_indices_array = np.asarray(frame_indices)
+            for frame_idx, img in enumerate(NHWC_int_numpy_frames):
+                draw_points(
+                    img,
+                    keypoints[frame_indices_array == frame_idx],
+                    color=(255, 0, 0),
+                    size=2,
+                )
+        return [fromarray(img) for img in NHWC_int_numpy_frames]
+
+    def predict_pose_keypoints_from_boxes(
+        self,
+        pixel_values_or_image: torch.Tensor | np.ndarray | Image | List[Image],
+        boxes: torch.Tensor | np.ndarray | List[torch.Tensor | np.ndarray],
+        raw_output=False,
+    ) -> List[np.ndarray] | List[Image]:
+        """
+        Top-down pose estimation: predicts pose keypoints for each given person box,
+        e.g. the person boxes predicted by a YOLO app.
+
+        Parameters:
+            pixel_values_or_image
+                See predict_pose_keypoints.
+
+            boxes
+                Person boxes in each image. Shape is [N, 4+], where 4 == (x0, y0, x1, y1).
+                Extra columns are ignored.
+                A single array applies to the first image.
+
+            raw_output: bool
+                See "returns" doc section for details.
+
+        Returns:
+            If raw_output is true, returns:
+                keypoints: List[np.ndarray], shape [N, K, 2]
+                    Keypoints of each box, per image.
+                    Each keypoint is an (x, y) pair of coordinates within the image.
+
+            Otherwise, returns:
+                predicted_images: List[PIL.Image]
+                    Images with keypoints drawn.
+        """
+        with profile_stage(self, "input_conversion"):
+            NHWC_int_numpy_frames, _ = app_to_net_image_inputs(pixel_values_or_image)
+            if isinstance(boxes, (torch.Tensor, np.ndarray)):
+                boxes = [boxes]
+            if len(boxes) != len(NHWC_int_numpy_frames):
+                raise ValueError(
+                    f"Got boxes for {len(boxes)} images, "
+                    f"but {len(NHWC_int_numpy_frames)} images."
+                )
+            height, width = self.input_size
+            inputs, centers, scales, num_people = [], [], [], []
+            for frame, frame_boxes in zip(NHWC_int_numpy_frames, boxes):
+                if isinstance(frame_boxes, torch.Tensor):
+                    frame_boxes = frame_boxes.detach().numpy()
+                frame_boxes = np.asarray(frame_boxes, dtype=np.float32)
+                num_people.append(len(frame_boxes))
+                if len(frame_boxes) == 0:
+                    continue
+                frame_centers, frame_scales = box_xyxy_to_center_scale(
+                    frame_boxes[:, :4], width / height
+                )
+                affines = compute_topdown_affines(
+                    frame_centers, frame_scales, self.input_size
+                )
+                crops = apply_batched_affines_to_frame(frame, affines, (width, height))
+                inputs.extend(torch.from_numpy(crops).permute(0, 3, 1, 2))
+                centers.extend(frame_centers)
+                scales.extend(frame_scales)
+
+        keypoints = self._predict_keypoints(inputs, centers, scales)
+        keypoints_per_frame = np.split(keypoints, np.cumsum(num_people)[:-1])
+        if raw_output:
+            return keypoints_per_frame
+
+        with profile_stage(self, "drawing"):
+            for img, frame_keypoints in zip(NHWC_int_numpy_frames, keypoints_per_frame):
+                draw_points(img, frame_keypoints, color=(255, 0, 0), size=2)
+        return [fromarray(img) for img in NHWC_int_numpy_frames]
+
+    def _predict_keypoints(
+        self,
+        inputs: List[torch.Tensor],
+        centers: List[np.ndarray],
+        scales: List[np.ndarray],
+    ) -> np.ndarray:
+        """
+        Runs LiteHRNet on a batch of person crops.
+
+        Parameters:
+            inputs: Person crops, each of shape [3, H, W].
+            centers: Center (x, y) of each crop in its image.
+            scales: Size (w, h) of each crop in its image.
+
+        Returns:
+            keypoints: np.ndarray, shape [N, K, 2]
+                Keypoints of each crop, in image coordinates.
+        """
+        if not inputs:
+            return np.zeros((0, 0, 2), dtype=np.int32)
+
+        # run inference
+        with profile_stage(self, "model_forward"):
+            predictions, _, heatmaps = self.model(torch.stack(inputs))
+
+        # map keypoints from heatmaps to the images
+        with profile_stage(self, "keypoint_decode"):
+            keypoints = predictions.detach()
+            heatmap_size = torch.tensor(heatmaps.shape[-1:-3:-1], dtype=torch.float32)
+            scales_ = torch.from_numpy(np.stack(scales)).float().unsqueeze(1)
+            centers_ = torch.from_numpy(np.stack(centers)).float().unsqueeze(1)
+            keypoints = keypoints / heatmap_size * scales_ + centers_ - 0.5 * scales_
+            return keypoints.round().int().numpy()
@@ -4,10 +4,11 @@ from typing import Any, List
 
 import torch
 
-import tetra_hub as hub
 from tetra_model_zoo.litehrnet.model import LiteHRNet
 from tetra_model_zoo.utils.args import vision_export_parser
+from tetra_model_zoo.utils.heatmap_decoding import HEATMAP_REFINEMENTS
 from tetra_model_zoo.utils.hub import download_hub_models
+from tetra_model_zoo.utils.local_profiling import submit_local_profile_job
 
 
 def trace(model: LiteHRNet, input_shape: List[int] = [3, 256, 192]) -> Any:
@@ -24,15 +25,33 @@ def main():
         default_x=256, default_y=192, include_trace_option=True
     )
     parser.add_argument("--c", type=int, default=3, help="Number of image channels.")
+    parser.add_argument(
+        "--refinement",
+        choices=HEATMAP_REFINEMENTS,
+        default="quarter_offset",
+        help="Sub-pixel keypoint refinement traced into the exported model.",
+    )
 
     args = parser.parse_args()
 
     # Instantiate the model & a sample input.
-    litehrnet_model = LiteHRNet.from_pretrained()
+    litehrnet_model = LiteHRNet.from_pretrained(refinement=args.refinement)
 
     # Trace the model.
     traced_litehrnet = trace(litehrnet_model, [args.b, args.c, args.x, args.y])
 
+    if args.local:
+        submit_local_profile_job(
+            name="litehrnet",
+            model=traced_litehrnet,
+            input_shapes=litehrnet_model.get_input_spec((args.x, args.y), args.b, args.c),
+            runtimes=args.local_runtimes,
+            output_dir=args.local_output_dir,
+        )
+        return
+
+    import tetra_hub as hub
+
     # Select the device(s) you'd like to optimize for.
     devices = [hub.Device(x) for x in args.devices]
 
@@ -5,6 +5,7 @@ from typing import Tuple
 import torch
 from mmpose.apis import MMPoseInferencer
 
+from tetra_model_zoo.utils.heatmap_decoding import decode_heatmaps
 from tetra_model_zoo.utils.input_spec import InputSpec
 
 MODEL_NAME = "litehrnet"
@@ -18,22 +19,32 @@ DEFAULT_INFERENCER_ARCH = "td-hm_litehrnet-18_8xb64-210e_coco-256x192"
 class LiteHRNet(torch.nn.Module):
     """Exportable LiteHRNet pose joint detector, end-to-end."""
 
-    def __init__(self, inferencer) -> None:
+    def __init__(self, inferencer, refinement: str = "quarter_offset") -> None:
+        """
+        Parameters:
+            inferencer: MMPose inferencer holding the LiteHRNet network.
+            refinement: Sub-pixel refinement of the keypoints, one of
+                utils.heatmap_decoding.HEATMAP_REFINEMENTS. The default matches
+                the decoding MMPose uses for the default config.
+        """
         super().__init__()
 
         self.inferencer = inferencer
         self.model = self.inferencer.inferencer.model
         self.pre_processor = self.inferencer.inferencer.model.data_preprocessor
-        self.H, self.W = self.inferencer.inferencer.model.head.decoder.heatmap_size
+        # MMPose sizes are (width, height).
+        self.W, self.H = self.inferencer.inferencer.model.head.decoder.heatmap_size
         self.K = self.inferencer.inferencer.model.head.out_channels
-        self.B = 1
+        self.refinement = refinement
 
     @staticmethod
-    def from_pretrained(inferencer_arch=DEFAULT_INFERENCER_ARCH) -> LiteHRNet:
+    def from_pretrained(
+        inferencer_arch=DEFAULT_INFERENCER_ARCH, refinement: str = "quarter_offset"
+    ) -> LiteHRNet:
         """LiteHRNet comes from the MMPose library, so we load using an internal config
         rather than a public weights file"""
         inferencer = MMPoseInferencer(inferencer_arch, device=torch.device(type="cpu"))
-        return LiteHRNet(inferencer)
+        return LiteHRNet(inferencer, refinement)
 
     def forward(
         self, image: torch.Tensor
@@ -43,36 +54,33 @@ class LiteHRNet(torch.nn.Module):
 
         Parameters:
             image: Pixel values pre-processed for encoder consumption.
-                   Range: float[0, 1]
-                   3-channel Color Space: RGB
+                   Shape: [3, H, W] (one person crop) or [B, 3, H, W] (a batch of crops)
+                   Range: float[0, 255]
+                   3-channel Color Space: BGR
 
         Returns:
-            keypoints: 1x17x2 array of coordinate pairs (in x,y format) denoting joint keypoints in the original image
-            scores: 1x17 array of float[0,1] denoting the score of each corresponding keypoint
-            heatmaps: 1x17 array of 64x48 heatmaps. These hold the raw confidence values of the locations
+            keypoints: [(B,) 17, 2] array of sub-pixel coordinate pairs (in x,y format) denoting joint keypoints
+                       in the heatmaps
+            scores: [(B,) 17] array of float[0,1] denoting the score of each corresponding keypoint
+            heatmaps: [(B,) 17, 64, 48] array of heatmaps. These hold the raw confidence values of the locations
                       of each joint in the image. The keypoints and scores are derived from this
+            The batch dimension is only present if the input has one.
         """
         # Preprocess
-        x = image[[2, 1, 0], ...]
+        unbatched = image.dim() == 3
+        x = image.unsqueeze(0) if unbatched else image
+        x = x[:, [2, 1, 0]]
         x = (x - self.pre_processor.mean) / self.pre_processor.std
-        x = torch.unsqueeze(x, 0)
 
         # Model prediction
         heatmaps = self.model._forward(x)
 
         # Convert from heatmap to keypoints and scores
-        # heatmap is 1 x 17 x 64 x 48, BxKxHxW
-        heatmaps = torch.squeeze(heatmaps)
-        heatmaps_flatten = heatmaps.flatten(1)
-        indices = torch.argmax(heatmaps_flatten, dim=1)
-        # get the (x,y) coords of the maxes in the original heatmap shape - (H, W)
-        y_locs = (indices // self.H).type(torch.float32)
-        x_locs = (indices % self.H).type(torch.float32)
-
-        # get the max scores and corresponding keypoints
-        scores, _ = torch.max(heatmaps_flatten, dim=1)
-        keypoints = torch.stack((x_locs, y_locs), dim=-1)
+        # heatmap is B x 17 x 64 x 48, BxKxHxW
+        keypoints, scores = decode_heatmaps(heatmaps, self.refinement)
 
+        if unbatched:
+            return keypoints[0], scores[0], heatmaps[0]
         return keypoints, scores, heatmaps
 
     def get_input_spec(
@@ -85,4 +93,4 @@ class LiteHRNet(torch.nn.Module):
         #
         # This can be used with the tetra_hub python API to declare
         # the model input specification upon submitting a profile job.
-        return {"image": ((num_channels, *image_size), "float32")}
+        return {"image": ((batch_size, num_channels, *image_size), "float32")}
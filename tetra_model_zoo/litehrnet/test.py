@@ -1,6 +1,8 @@
 import numpy as np
+import torch
 
 from tetra_model_zoo.litehrnet.app import LiteHRNetApp
+from tetra_model_zoo.litehrnet.export import trace
 from tetra_model_zoo.litehrnet.model import MODEL_ASSET_VERSION, MODEL_NAME, LiteHRNet
 from tetra_model_zoo.utils.asset_loaders import MODEL_ZOO_ASSET_PATH, load_image
 
@@ -47,3 +49,40 @@ def test_numerical():
         rtol=0.02,
         atol=1.5,
     )
+
+
+def test_batched():
+    image = np.asarray(load_image(IMAGE_ADDRESS, MODEL_NAME).convert("RGB"))
+    litehrnet = LiteHRNet.from_pretrained()
+    app = LiteHRNetApp(litehrnet, litehrnet.inferencer)
+
+    # Every image in a batch is processed, in one forward pass.
+    keypoints = app.predict_pose_keypoints(np.stack([image, image]), True)
+    np.testing.assert_allclose(
+        np.concatenate([EXPECTED_KEYPOINTS] * 2).astype(np.float32),
+        keypoints.astype(np.float32),
+        rtol=0.02,
+        atol=1.5,
+    )
+
+    # Top-down: one batch for all boxes, with the same results as one box at a time.
+    height, width = image.shape[:2]
+    boxes = torch.tensor([[0, 0, width, height], [0, 0, width / 2, height]])
+    batched_keypoints = app.predict_pose_keypoints_from_boxes(image, boxes, True)[0]
+    assert batched_keypoints.shape == (2, 17, 2)
+    for box, box_keypoints in zip(boxes, batched_keypoints):
+        single_keypoints = app.predict_pose_keypoints_from_boxes(
+            image, box.unsqueeze(0), True
+        )[0]
+        np.testing.assert_array_equal(single_keypoints[0], box_keypoints)
+
+
+def test_trace():
+    # Heatmap decoding is part of the traced model.
+    litehrnet = LiteHRNet.from_pretrained(refinement="dark")
+    inputs = torch.rand(2, 3, 256, 192) * 255
+    traced = trace(litehrnet, [2, 3, 256, 192])
+    for expected, actual in zip(litehrnet(inputs), traced(inputs)):
+        np.testing.assert_allclose(
+            expected.detach().numpy(), actual.detach().numpy(), atol=1e-4
+        )
@@ -18,7 +18,7 @@ from tetra_model_zoo.utils.bounding_box_processing import (
 )
 from tetra_model_zoo.utils.draw import (
     draw_box_from_corners,
-    draw_box_from_xyxy,
+    draw_boxes_from_xyxy,
     draw_connections,
     draw_points,
 )
@@ -31,6 +31,7 @@ from tetra_model_zoo.utils.image_processing import (
     numpy_image_to_torch,
     resize_pad,
 )
+from tetra_model_zoo.utils.profiling import profile_stage
 
 
 class MediaPipeApp:
@@ -216,9 +217,10 @@ class MediaPipeApp:
                 ... (additional outputs if necessary)
         """
         # Input Prep
-        NHWC_int_numpy_frames, NCHW_fp32_torch_frames = app_to_net_image_inputs(
-            pixel_values_or_image
-        )
+        with profile_stage(self, "input_conversion"):
+            NHWC_int_numpy_frames, NCHW_fp32_torch_frames = app_to_net_image_inputs(
+                pixel_values_or_image
+            )
 
         # Run Bounding Box & Keypoint Detector
         batched_selected_boxes, batched_selected_keypoints = self._run_box_detector(
@@ -230,9 +232,10 @@ class MediaPipeApp:
         # where 2 == (x, y)
         #
         # A list element will be None if there is no selected ROI.
-        batched_roi_4corners = self._compute_object_roi(
-            batched_selected_boxes, batched_selected_keypoints
-        )
+        with profile_stage(self, "roi"):
+            batched_roi_4corners = self._compute_object_roi(
+                batched_selected_boxes, batched_selected_keypoints
+            )
 
         # selected landmarks for the ROI (if any)
         # List[torch.Tensor(shape=[Num Selected Landmarks, K, 3])],
@@ -251,13 +254,14 @@ class MediaPipeApp:
                 *landmarks_out,
             )
 
-        self._draw_predictions(
-            NHWC_int_numpy_frames,
-            batched_selected_boxes,
-            batched_selected_keypoints,
-            batched_roi_4corners,
-            *landmarks_out,
-        )
+        with profile_stage(self, "drawing"):
+            self._draw_predictions(
+                NHWC_int_numpy_frames,
+                batched_selected_boxes,
+                batched_selected_keypoints,
+                batched_roi_4corners,
+                *landmarks_out,
+            )
 
         return NHWC_int_numpy_frames
 
@@ -289,69 +293,73 @@ class MediaPipeApp:
         """
 
         # Resize input frames such that they're the appropriate size for detector inference.
-        box_detector_net_inputs, pd_net_input_scale, pd_net_input_pad = resize_pad(
-            NCHW_fp32_torch_frames, self.detector_input_dims
-        )
+        with profile_stage(self, "resize_pad"):
+            box_detector_net_inputs, pd_net_input_scale, pd_net_input_pad = resize_pad(
+                NCHW_fp32_torch_frames, self.detector_input_dims
+            )
 
         # Run object detector.
         # Outputs:
         # - box_coords: <B, N, C>, where N == # of anchors & C == # of of coordinates
         #       Layout of C is (box_cx, boc_cw, box_w, box_h, keypoint_0_x, keypoint_0_y, ..., keypoint_maxKey_x, keypoint_maxKey_y)
         # - box_scores: <B, N>, where N == # of anchors.
-        box_coords, box_scores = self.detector(box_detector_net_inputs)
-        box_scores = box_scores.clamp(
-            -self.detector_score_clipping_threshold,
-            self.detector_score_clipping_threshold,
-        )
-        box_scores = box_scores.sigmoid().squeeze(dim=-1)
+        with profile_stage(self, "detector_forward"):
+            box_coords, box_scores = self.detector(box_detector_net_inputs)
 
-        # Reshape outputs so that they have shape [..., # of coordinates, 2], where 2 == (x, y)
-        box_coords = box_coords.view(list(box_coords.shape)[:-1] + [-1, 2])
-        anchors = self.detector_anchors.view(
-            list(self.detector_anchors.shape)[:-1] + [-1, 2]
-        )
+        with profile_stage(self, "decode_nms"):
+            box_scores = box_scores.clamp(
+                -self.detector_score_clipping_threshold,
+                self.detector_score_clipping_threshold,
+            )
+            box_scores = box_scores.sigmoid().squeeze(dim=-1)
 
-        # Decode to output coordinates using the model's trained anchors.
-        decode_preds_from_anchors(box_coords, self.detector_input_dims, anchors)
+            # Reshape outputs so that they have shape [..., # of coordinates, 2], where 2 == (x, y)
+            box_coords = box_coords.view(list(box_coords.shape)[:-1] + [-1, 2])
+            anchors = self.detector_anchors.view(
+                list(self.detector_anchors.shape)[:-1] + [-1, 2]
+            )
 
-        # Convert box coordinates from CWH -> XYXY format for NMS.
-        box_coords[:2] = box_xywh_to_xyxy(box_coords[:2])
+            # Decode to output coordinates using the model's trained anchors.
+            decode_preds_from_anchors(box_coords, self.detector_input_dims, anchors)
 
-        # flatten coords (remove final [2] dim) for NMS
-        flattened_box_coords = box_coords.view(list(box_coords.shape)[:-2] + [-1])
+            # Convert box coordinates from CWH -> XYXY format for NMS.
+            box_coords[:2] = box_xywh_to_xyxy(box_coords[:2])
 
-        # Run non maximum suppression on the output
-        # batched_selected_coords = List[torch.Tensor(shape=[Num Boxes, 4])],
-        # where 4 = (x0, y0, x1, y1)
-        batched_selected_coords, _ = batched_nms(
-            self.nms_iou_threshold,
-            self.min_detector_box_score,
-            flattened_box_coords,
-            box_scores,
-        )
+            # flatten coords (remove final [2] dim) for NMS
+            flattened_box_coords = box_coords.view(list(box_coords.shape)[:-2] + [-1])
 
-        selected_boxes = []
-        selected_keypoints = []
-        for i in range(0, len(batched_selected_coords)):
-            selected_coords = batched_selected_coords[i]
-            if len(selected_coords) != 0:
-                # Reshape outputs again so that they have shape [..., # of boxes, 2], where 2 == (x, y)
-                selected_coords = batched_selected_coords[i].view(
-                    list(batched_selected_coords[i].shape)[:-1] + [-1, 2]
-                )
+            # Run non maximum suppression on the output
+            # batched_selected_coords = List[torch.Tensor(shape=[Num Boxes, 4])],
+            # where 4 = (x0, y0, x1, y1)
+            batched_selected_coords, _ = batched_nms(
+                self.nms_iou_threshold,
+                self.min_detector_box_score,
+                flattened_box_coords,
+                box_scores,
+            )
 
-                denormalize_coordinates(
-                    selected_coords,
-                    self.detector_input_dims,
-                    pd_net_input_scale,
-                    pd_net_input_pad,
-                )
+            selected_boxes = []
+            selected_keypoints = []
+            for i in range(0, len(batched_selected_coords)):
+                selected_coords = batched_selected_coords[i]
+                if len(selected_coords) != 0:
+                    # Reshape outputs again so that they have shape [..., # of boxes, 2], where 2 == (x, y)
+                    selected_coords = batched_selected_coords[i].view(
+                        list(batched_selected_coords[i].shape)[:-1] + [-1, 2]
+                    )
+
+                    denormalize_coordinates(
+                        selected_coords,
+                        self.detector_input_dims,
+                        pd_net_input_scale,
+                        pd_net_input_pad,
+                    )
 
-                selected_boxes.append(selected_coords[:, :2])
-                selected_keypoints.append(selected_coords[:, 2:])
-            else:
-                selected_boxes.append(None)
-                selected_keypoints.append(None)
+                    selected_boxes.append(selected_coords[:, :2])
+                    selected_keypoints.append(selected_coords[:, 2:])
+                else:
+                    selected_boxes.append(None)
+                    selected_keypoints.append(None)
 
         return selected_boxes, selected_keypoints
 
@@ -387,44 +395,74 @@ class MediaPipeApp:
                 Shape of each list element is [num_selected_boxes, 4, 2], where 2 == (x, y)
                 The order of points is  (top left point, bottom left point, top right point, bottom right point)
         """
-        batched_selected_roi = []
-        for boxes, keypoints in zip(batched_selected_boxes, batched_selected_keypoints):
-            if boxes is None or keypoints is None:
-                batched_selected_roi.append(None)
-                continue
-
-            # Compute bounding box center and rotation
-            theta = compute_vector_rotation(
-                keypoints[:, self.keypoint_rotation_vec_start_idx, ...],
-                keypoints[:, self.keypoint_rotation_vec_end_idx, ...],
-                self.rotation_offset_rads,
-            )
-            selected_boxes_cwh = box_xyxy_to_xywh(boxes)
-            xc = selected_boxes_cwh[..., 0, 0]
-            yc = selected_boxes_cwh[..., 0, 1]
-            w = selected_boxes_cwh[..., 1, 0]
-            h = selected_boxes_cwh[..., 1, 1]
-
-            # The bounding box often misses the entire object.
-            # Move the bounding box slightly (if necessary) to center it with the object.
-            apply_directional_box_offset(
-                self.detect_box_offset_xy * w,
-                keypoints[..., self.keypoint_rotation_vec_start_idx, :],
-                keypoints[..., self.keypoint_rotation_vec_end_idx, :],
-                xc,
-                yc,
+        # The ROIs of all images are computed at once, on the boxes of every image
+        # concatenated, and then split back per image.
+        batched_roi_4corners: List[torch.Tensor | None] = [None] * len(
+            batched_selected_boxes
+        )
+        image_indices = [
+            i
+            for i, (boxes, keypoints) in enumerate(
+                zip(batched_selected_boxes, batched_selected_keypoints)
             )
+            if boxes is not None and keypoints is not None
+        ]
+        if not image_indices:
+            return batched_roi_4corners
+
+        roi_4corners = self._compute_roi_4corners(
+            torch.cat([batched_selected_boxes[i] for i in image_indices]),
+            torch.cat([batched_selected_keypoints[i] for i in image_indices]),
+        )
+        num_boxes = [len(batched_selected_boxes[i]) for i in image_indices]
+        for i, image_roi_4corners in zip(image_indices, roi_4corners.split(num_boxes)):
+            batched_roi_4corners[i] = image_roi_4corners
+        return batched_roi_4corners
+
+    def _compute_roi_4corners(
+        self, boxes: torch.Tensor, keypoints: torch.Tensor
+    ) -> torch.Tensor:
+        """
+        Computes the region of interest of each box, for the boxes of all images.
 
-            # Apply scaling to enlargen the bounding box
-            w *= self.detect_box_scale
-            h *= self.detect_box_scale
+        Parameters:
+            boxes: torch.Tensor
+                Bounding box coordinates. Shape is [total_num_boxes, 2, 2].
+            keypoints: torch.Tensor
+                Bounding box keypoints. Shape is [total_num_boxes, # of keypoints, 2].
 
-            # Compute box corners from box center, width, height
-            batched_selected_roi.append(
-                compute_box_corners_with_rotation(xc, yc, w, h, theta)
-            )
+        Returns
+            roi_4corners: torch.Tensor
+                Shape is [total_num_boxes, 4, 2]. See _compute_object_roi.
+        """
+        # Compute bounding box center and rotation
+        theta = compute_vector_rotation(
+            keypoints[:, self.keypoint_rotation_vec_start_idx, ...],
+            keypoints[:, self.keypoint_rotation_vec_end_idx, ...],
+            self.rotation_offset_rads,
+        )
+        selected_boxes_cwh = box_xyxy_to_xywh(boxes)
+        xc = selected_boxes_cwh[..., 0, 0]
+        yc = selected_boxes_cwh[..., 0, 1]
+        w = selected_boxes_cwh[..., 1, 0]
+        h = selected_boxes_cwh[..., 1, 1]
+
+        # The bounding box often misses the entire object.
+        # Move the bounding box slightly (if necessary) to center it with the object.
+        apply_directional_box_offset(
+            self.detect_box_offset_xy * w,
+            keypoints[..., self.keypoint_rotation_vec_start_idx, :],
+            keypoints[..., self.keypoint_rotation_vec_end_idx, :],
+            xc,
+            yc,
+        )
 
-        return batched_selected_roi
+        # Apply scaling to enlargen the bounding box
+        w *= self.detect_box_scale
+        h *= self.detect_box_scale
+
+        # Compute box corners from box center, width, height
+        return compute_box_corners_with_rotation(xc, yc, w, h, theta)
 
     def _run_landmark_detector(
         self,
@@ -476,43 +514,48 @@ class MediaPipeApp:
         for batch_idx, roi_4corners in enumerate(batched_roi_4corners):
             if roi_4corners is None:
                 continue
-            affines = compute_box_affine_crop_resize_matrix(
-                roi_4corners[:, :3], self.landmark_input_dims
-            )
+            with profile_stage(self, "roi_affine"):
+                affines = compute_box_affine_crop_resize_matrix(
+                    roi_4corners[:, :3], self.landmark_input_dims
+                )
 
-            # Create input images by applying the affine transforms.
-            keypoint_net_inputs = numpy_image_to_torch(
-                apply_batched_affines_to_frame(
-                    NHWC_int_numpy_frames[batch_idx], affines, self.landmark_input_dims
+                # Create input images by applying the affine transforms.
+                keypoint_net_inputs = numpy_image_to_torch(
+                    apply_batched_affines_to_frame(
+                        NHWC_int_numpy_frames[batch_idx],
+                        affines,
+                        self.landmark_input_dims,
+                    )
                 )
-            )
 
             # Compute landmarks.
-            ld_scores, landmarks = self.landmark_detector(  # type: ignore
-                keypoint_net_inputs
-            )
-
-            # Convert [0-1] ranged values of landmarks to integer pixel space.
-            landmarks[:, :, 0] *= self.landmark_input_dims[0]
-            landmarks[:, :, 1] *= self.landmark_input_dims[1]
-
-            # 1 landmark is predicted for each ROI of each input image.
-            # For each region of interest & associated predicted landmarks...
-            all_landmarks = []
-            for ld_batch_idx in range(landmarks.shape[0]):
-                # Exclude landmarks that don't meet the appropriate score threshold.
-                if ld_scores[ld_batch_idx] >= self.min_detector_box_score:
-                    # Apply the inverse of affine transform used above to the landmark coordinates.
-                    # This will convert the coordinates to their locations in the original input image.
-                    inverted_affine = torch.from_numpy(
-                        cv2.invertAffineTransform(affines[ld_batch_idx])
-                    ).float()
-                    landmarks[ld_batch_idx][:, :2] = apply_affine_to_coordinates(
-                        landmarks[ld_batch_idx][:, :2], inverted_affine
-                    )
+            with profile_stage(self, "landmark_forward"):
+                ld_scores, landmarks = self.landmark_detector(  # type: ignore
+                    keypoint_net_inputs
+                )
 
-                    # Add the predicted landmarks to our list.
-                    all_landmarks.append(landmarks[ld_batch_idx])
+            with profile_stage(self, "landmark_postprocess"):
+                # Convert [0-1] ranged values of landmarks to integer pixel space.
+                landmarks[:, :, 0] *= self.landmark_input_dims[0]
+                landmarks[:, :, 1] *= self.landmark_input_dims[1]
+
+                # 1 landmark is predicted for each ROI of each input image.
+                # For each region of interest & associated predicted landmarks...
+                all_landmarks = []
+                for ld_batch_idx in range(landmarks.shape[0]):
+                    # Exclude landmarks that don't meet the appropriate score threshold.
+                    if ld_scores[ld_batch_idx] >= self.min_detector_box_score:
+                        # Apply the inverse of affine transform used above to the landmark coordinates.
+                        # This will convert the coordinates to their locations in the original input image.
+                        inverted_affine = torch.from_numpy(
+                            cv2.invertAffineTransform(affines[ld_batch_idx])
+                        ).float()
+                        landmarks[ld_batch_idx][:, :2] = apply_affine_to_coordinates(
+                            landmarks[ld_batch_idx][:, :2], inverted_affine
+                        )
+
+                        # Add the predicted landmarks to our list.
+                        all_landmarks.append(landmarks[ld_batch_idx])
 
             # Add this batch of landmarks to the output list.
             batched_selected_landmarks.append(
@@ -558,14 +601,13 @@ class MediaPipeApp:
         Returns
             Nothing; drawing is done on input frame.
         """
-        for roi, box, kp in zip(roi_4corners, selected_boxes, selected_keypoints):
-            # Draw detector bounding box
-            draw_box_from_xyxy(NHWC_int_numpy_frame, box[0], box[1], (255, 0, 0), 1)
-            # Draw detector keypoints
-            draw_points(NHWC_int_numpy_frame, kp)
-            # Draw region of interest box computed from the detector box & keypoints
-            # (this is the input to the landmark detector)
-            draw_box_from_corners(NHWC_int_numpy_frame, roi, (0, 255, 0))
+        # Draw detector bounding boxes
+        draw_boxes_from_xyxy(NHWC_int_numpy_frame, selected_boxes, (255, 0, 0), 1)
+        # Draw detector keypoints
+        draw_points(NHWC_int_numpy_frame, selected_keypoints)
+        # Draw region of interest boxes computed from the detector boxes & keypoints
+        # (this is the input to the landmark detector)
+        draw_box_from_corners(NHWC_int_numpy_frame, roi_4corners, (0, 255, 0))
 
     def _draw_landmarks(
         self,
@@ -593,18 +635,19 @@ class MediaPipeApp:
         Returns
             Nothing; drawing is done on input frame.
         """
-        for ldm in selected_landmarks:
-            # Draw landmark points
-            draw_points(NHWC_int_numpy_frame, ldm[:, :2], (0, 255, 0))
-            # Draw connections between landmark points
-            if self.landmark_connections:
-                draw_connections(
-                    NHWC_int_numpy_frame,
-                    ldm[:, :2],
-                    self.landmark_connections,
-                    (255, 0, 0),
-                    2,
-                )
+        # All landmarks are drawn at once (one numpy conversion, one OpenCV call).
+        points = selected_landmarks[..., :2].detach().numpy()
+        # Draw landmark points
+        draw_points(NHWC_int_numpy_frame, points, (0, 255, 0))
+        # Draw connections between landmark points
+        if self.landmark_connections:
+            draw_connections(
+                NHWC_int_numpy_frame,
+                points,
+                self.landmark_connections,
+                (255, 0, 0),
+                2,
+            )
 
     def _draw_predictions(
         self,
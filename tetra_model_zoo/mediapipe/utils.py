@@ -8,8 +8,8 @@ from tetra_model_zoo.utils.input_spec import InputSpec
 
 class MediaPipePyTorchAsRoot(SourceAsRoot):
     """
-    ContextManager for running code with MediaPipePyTorch in python path
-    and the root directory of MediaPipePyTorch set as cwd
+    ContextManager for running code with MediaPipePyTorch modules importable.
+    Returns the root directory of MediaPipePyTorch, which holds the model weights.
     """
 
     MEDIAPIPE_SOURCE_REPOSITORY = "https://github.com/zmurez/MediaPipePyTorch"
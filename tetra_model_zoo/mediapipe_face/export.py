@@ -4,11 +4,11 @@ from typing import Any, Tuple
 
 import torch
 
-import tetra_hub as hub
 from tetra_model_zoo.mediapipe.utils import trace_mediapipe
 from tetra_model_zoo.mediapipe_face.model import MediaPipeFace
 from tetra_model_zoo.utils.args import base_export_parser
 from tetra_model_zoo.utils.hub import download_hub_models
+from tetra_model_zoo.utils.local_profiling import submit_local_profile_job
 
 
 def trace(
@@ -48,6 +48,25 @@ def main():
     # Trace the model.
     traced_encoder, traced_decoder = trace(face_detector, face_landmark)  # type: ignore
 
+    if args.local:
+        submit_local_profile_job(
+            name="face_detector",
+            model=traced_encoder,
+            input_shapes=MediaPipeFace.get_face_detector_input_spec(),
+            runtimes=args.local_runtimes,
+            output_dir=args.local_output_dir,
+        )
+        submit_local_profile_job(
+            name="face_landmark_detector",
+            model=traced_decoder,
+            input_shapes=MediaPipeFace.get_face_landmark_detector_input_spec(1),
+            runtimes=args.local_runtimes,
+            output_dir=args.local_output_dir,
+        )
+        return
+
+    import tetra_hub as hub
+
     # Select the device you'd like to optimize for.
     devices = [hub.Device(device) for device in args.devices]
 
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import os
 from typing import Callable, Tuple
 
 import torch
 
 from tetra_model_zoo.mediapipe.utils import MediaPipePyTorchAsRoot
 from tetra_model_zoo.utils.input_spec import InputSpec
+from tetra_model_zoo.utils.snapshot import load_or_create_snapshot
 
 MODEL_NAME = "mediapipe_face"
 
@@ -198,7 +200,34 @@ class MediaPipeFace:
         detector_weights: str = "blazefaceback.pth",
         detector_anchors: str = "anchors_face_back.npy",
         landmark_detector_weights: str = "blazeface_landmark.pth",
+        use_snapshot: bool = True,
     ) -> MediaPipeFace:
+        """
+        Load the detector and landmark detector from the MediaPipePyTorch repository.
+
+        Parameters:
+            detector_weights, detector_anchors, landmark_detector_weights:
+                File names within the MediaPipePyTorch repository.
+            use_snapshot: Load from (or save) a snapshot of the constructed model.
+                See utils.snapshot.
+        """
+        if use_snapshot:
+            return load_or_create_snapshot(
+                MODEL_NAME,
+                [
+                    "MediaPipeFace",
+                    detector_weights,
+                    detector_anchors,
+                    landmark_detector_weights,
+                ],
+                lambda: MediaPipeFace.from_pretrained(
+                    detector_weights,
+                    detector_anchors,
+                    landmark_detector_weights,
+                    use_snapshot=False,
+                ),
+                MediaPipePyTorchAsRoot(),
+            )
         return MediaPipeFace(
             *MediaPipeFace._load_mediapipe_face_models(
                 detector_weights, detector_anchors, landmark_detector_weights
@@ -229,14 +258,16 @@ class MediaPipeFace:
         Load mediapipe models from the source repository.
         Returns tuple[<source repository>.blazeface.BlazeFace, BlazeFace Anchors, <source repository>.blazeface_landmark.BlazeFaceLandmark]
         """
-        with MediaPipePyTorchAsRoot():
+        with MediaPipePyTorchAsRoot() as repo_path:
             from blazeface import BlazeFace
             from blazeface_landmark import BlazeFaceLandmark
 
             face_detector = BlazeFace(back_model=True)
-            face_detector.load_weights(detector_weights)
-            face_detector.load_anchors(detector_anchors)
+            face_detector.load_weights(os.path.join(repo_path, detector_weights))
+            face_detector.load_anchors(os.path.join(repo_path, detector_anchors))
             face_regressor = BlazeFaceLandmark()
-            face_regressor.load_weights(landmark_detector_weights)
+            face_regressor.load_weights(
+                os.path.join(repo_path, landmark_detector_weights)
+            )
 
             return (face_detector, face_detector.anchors, face_regressor)
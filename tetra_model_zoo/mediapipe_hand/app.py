@@ -27,6 +27,7 @@ from tetra_model_zoo.utils.image_processing import (
     apply_batched_affines_to_frame,
     numpy_image_to_torch,
 )
+from tetra_model_zoo.utils.profiling import profile_stage
 
 
 class MediaPipeHandApp(MediaPipeApp):
@@ -152,14 +153,16 @@ class MediaPipeHandApp(MediaPipeApp):
         Override of mediapipe::app.py::MediaPipeApp::draw_landmarks
         Also draws whether the detection is a right or left hand.
         """
-        for ldm, irh in zip(landmarks, is_right_hand):
-            # Draw landmark points
-            draw_points(NHWC_int_numpy_frame, ldm[:, :2], (0, 255, 0))
-            # Draw connections between landmark points
-            if self.landmark_connections:
+        points = landmarks[..., :2].detach().numpy()
+        # Draw landmark points
+        draw_points(NHWC_int_numpy_frame, points, (0, 255, 0))
+        # Draw connections between landmark points, for all right / left hands at once
+        if self.landmark_connections:
+            is_right_hand_mask = np.asarray(is_right_hand, dtype=bool)
+            for irh in (True, False):
                 draw_connections(
                     NHWC_int_numpy_frame,
-                    ldm[:, :2],
+                    points[is_right_hand_mask == irh],
                     self.landmark_connections,
                     (255 if irh else 0, 0, 0 if irh else 255),
                     2,
@@ -191,45 +194,50 @@ class MediaPipeHandApp(MediaPipeApp):
         for batch_idx, roi_4corners in enumerate(batched_roi_4corners):
             if roi_4corners is None:
                 continue
-            affines = compute_box_affine_crop_resize_matrix(
-                roi_4corners[:, :3], self.landmark_input_dims
-            )
+            with profile_stage(self, "roi_affine"):
+                affines = compute_box_affine_crop_resize_matrix(
+                    roi_4corners[:, :3], self.landmark_input_dims
+                )
 
-            # Create input images by applying the affine transforms.
-            keypoint_net_inputs = numpy_image_to_torch(
-                apply_batched_affines_to_frame(
-                    NHWC_int_numpy_frames[batch_idx], affines, self.landmark_input_dims
+                # Create input images by applying the affine transforms.
+                keypoint_net_inputs = numpy_image_to_torch(
+                    apply_batched_affines_to_frame(
+                        NHWC_int_numpy_frames[batch_idx],
+                        affines,
+                        self.landmark_input_dims,
+                    )
                 )
-            )
 
             # Compute hand landmarks.
-            ld_scores, lr, landmarks = self.landmark_detector(  # type: ignore
-                keypoint_net_inputs
-            )
-
-            # Convert [0-1] ranged values of landmarks to integer pixel space.
-            landmarks[:, :, 0] *= self.landmark_input_dims[0]
-            landmarks[:, :, 1] *= self.landmark_input_dims[1]
-
-            # 1 landmark is predicted for each ROI of each input image.
-            # For each region of interest & associated predicted landmarks...
-            all_landmarks = []
-            all_lr = []
-            for ld_batch_idx in range(landmarks.shape[0]):
-                # Exclude landmarks that don't meet the appropriate score threshold.
-                if ld_scores[ld_batch_idx] >= self.min_detector_box_score:
-                    # Apply the inverse of affine transform used above to the landmark coordinates.
-                    # This will convert the coordinates to their locations in the original input image.
-                    inverted_affine = torch.from_numpy(
-                        cv2.invertAffineTransform(affines[ld_batch_idx])
-                    ).float()
-                    landmarks[ld_batch_idx][:, :2] = apply_affine_to_coordinates(
-                        landmarks[ld_batch_idx][:, :2], inverted_affine
-                    )
+            with profile_stage(self, "landmark_forward"):
+                ld_scores, lr, landmarks = self.landmark_detector(  # type: ignore
+                    keypoint_net_inputs
+                )
 
-                    # Add the predicted landmarks to our list.
-                    all_landmarks.append(landmarks[ld_batch_idx])
-                    all_lr.append(torch.round(lr[ld_batch_idx]).item() == 1)
+            with profile_stage(self, "landmark_postprocess"):
+                # Convert [0-1] ranged values of landmarks to integer pixel space.
+                landmarks[:, :, 0] *= self.landmark_input_dims[0]
+                landmarks[:, :, 1] *= self.landmark_input_dims[1]
+
+                # 1 landmark is predicted for each ROI of each input image.
+                # For each region of interest & associated predicted landmarks...
+                all_landmarks = []
+                all_lr = []
+                for ld_batch_idx in range(landmarks.shape[0]):
+                    # Exclude landmarks that don't meet the appropriate score threshold.
+                    if ld_scores[ld_batch_idx] >= self.min_detector_box_score:
+                        # Apply the inverse of affine transform used above to the landmark coordinates.
+                        # This will convert the coordinates to their locations in the original input image.
+                        inverted_affine = torch.from_numpy(
+                            cv2.invertAffineTransform(affines[ld_batch_idx])
+                        ).float()
+                        landmarks[ld_batch_idx][:, :2] = apply_affine_to_coordinates(
+                            landmarks[ld_batch_idx][:, :2], inverted_affine
+                        )
+
+                        # Add the predicted landmarks to our list.
+                        all_landmarks.append(landmarks[ld_batch_idx])
+                        all_lr.append(torch.round(lr[ld_batch_idx]).item() == 1)
 
             # Add this batch of landmarks to the output list.
             batched_selected_landmarks.append(
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 from typing import Callable, Tuple
 
 import numpy as np
@@ -7,6 +8,7 @@ import torch
 
 from tetra_model_zoo.mediapipe.utils import MediaPipePyTorchAsRoot
 from tetra_model_zoo.utils.input_spec import InputSpec
+from tetra_model_zoo.utils.snapshot import load_or_create_snapshot
 
 MODEL_NAME = "mediapipe_hand"
 
@@ -101,7 +103,34 @@ class MediaPipeHand:
         detector_weights: str = "blazepalm.pth",
         detector_anchors: str = "anchors_palm.npy",
         landmark_detector_weights: str = "blazehand_landmark.pth",
+        use_snapshot: bool = True,
     ) -> MediaPipeHand:
+        """
+        Load the detector and landmark detector from the MediaPipePyTorch repository.
+
+        Parameters:
+            detector_weights, detector_anchors, landmark_detector_weights:
+                File names within the MediaPipePyTorch repository.
+            use_snapshot: Load from (or save) a snapshot of the constructed model.
+                See utils.snapshot.
+        """
+        if use_snapshot:
+            return load_or_create_snapshot(
+                MODEL_NAME,
+                [
+                    "MediaPipeHand",
+                    detector_weights,
+                    detector_anchors,
+                    landmark_detector_weights,
+                ],
+                lambda: MediaPipeHand.from_pretrained(
+                    detector_weights,
+                    detector_anchors,
+                    landmark_detector_weights,
+                    use_snapshot=False,
+                ),
+                MediaPipePyTorchAsRoot(),
+            )
         return MediaPipeHand(
             *MediaPipeHand._load_mediapipe_face_models(
                 detector_weights, detector_anchors, landmark_detector_weights
@@ -132,15 +161,17 @@ class MediaPipeHand:
         Load mediapipe models from the source repository.
         Returns tuple[<source repository>.blazepalm.BlazePalm, BlazePalm Anchors, <source repository>.blazehand_landmark.BlazeHandLandmark]
         """
-        with MediaPipePyTorchAsRoot():
+        with MediaPipePyTorchAsRoot() as repo_path:
             from blazehand_landmark import BlazeHandLandmark
             from blazepalm import BlazePalm
 
             palm_detector = BlazePalm()
-            palm_detector.load_weights(detector_weights)
-            palm_detector.load_anchors(detector_anchors)
+            palm_detector.load_weights(os.path.join(repo_path, detector_weights))
+            palm_detector.load_anchors(os.path.join(repo_path, detector_anchors))
             palm_detector.min_score_thresh = 0.75
             hand_regressor = BlazeHandLandmark()
-            hand_regressor.load_weights(landmark_detector_weights)
+            hand_regressor.load_weights(
+                os.path.join(repo_path, landmark_detector_weights)
+            )
 
             return (palm_detector, palm_detector.anchors, hand_regressor)
@@ -1,8 +1,10 @@
 import numpy as np
+import torch
 
 from tetra_model_zoo.mediapipe_hand.app import MediaPipeHandApp
 from tetra_model_zoo.mediapipe_hand.model import MODEL_NAME, MediaPipeHand
 from tetra_model_zoo.utils.asset_loaders import MODEL_ZOO_ASSET_PATH, load_image
+from tetra_model_zoo.utils.draw import draw_connections, draw_points
 from tetra_model_zoo.utils.testing import skip_clone_repo_check
 
 INPUT_IMAGE_ADDRESS = f"{MODEL_ZOO_ASSET_PATH}/mediapipe/v1/hand.jpeg"
@@ -25,3 +27,26 @@ def test_hand_app():
     assert np.allclose(
         app.predict_landmarks_from_image(input)[0], np.asarray(expected_output)
     )
+
+
+def _unused_model(x: torch.Tensor):
+    raise AssertionError("Drawing does not run any model.")
+
+
+def test_draw_landmarks_requires_grad():
+    # Landmark detector outputs track gradients, since apps don't run their
+    # models under no_grad.
+    app = MediaPipeHandApp(
+        MediaPipeHand(_unused_model, torch.zeros(0, 4), _unused_model)
+    )
+    landmarks = (torch.rand(2, 21, 3) * 100).requires_grad_()
+    frame = np.zeros((128, 128, 3), dtype=np.uint8)
+    app._draw_landmarks(frame, landmarks, [True, False])
+
+    points = landmarks[..., :2].detach()
+    expected = np.zeros((128, 128, 3), dtype=np.uint8)
+    draw_points(expected, points, (0, 255, 0))
+    connections = app.landmark_connections
+    draw_connections(expected, points[:1], connections, (255, 0, 0), 2)
+    draw_connections(expected, points[1:], connections, (0, 0, 255), 2)
+    np.testing.assert_array_equal(frame, expected)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import List, Tuple
+from typing import Tuple
 
 import torch
 
@@ -77,41 +77,29 @@ class MediaPipePoseApp(MediaPipeApp):
             POSE_LANDMARK_CONNECTIONS,
         )
 
-    def _compute_object_roi(
-        self,
-        batched_selected_boxes: List[torch.Tensor | None],
-        batched_selected_keypoints: List[torch.Tensor | None],
-    ) -> List[torch.Tensor | None]:
+    def _compute_roi_4corners(
+        self, boxes: torch.Tensor, keypoints: torch.Tensor
+    ) -> torch.Tensor:
         """
         See parent function for base functionality and parameter documentation.
 
         The MediaPipe pose pipeline computes the ROI not from the detector bounding box,
         but from specific detected keypoints. This override implements that behavior.
         """
-        batched_selected_roi = []
-        for boxes, keypoints in zip(batched_selected_boxes, batched_selected_keypoints):
-            if boxes is None or keypoints is None:
-                batched_selected_roi.append(None)
-                continue
-
-            # Compute bounding box center and rotation
-            theta = compute_vector_rotation(
-                keypoints[:, self.keypoint_rotation_vec_start_idx, ...],
-                keypoints[:, self.keypoint_rotation_vec_end_idx, ...],
-                self.rotation_offset_rads,
-            )
-            xc = keypoints[..., self.keypoint_rotation_vec_start_idx, 0]
-            yc = keypoints[..., self.keypoint_rotation_vec_start_idx, 1]
-            x1 = keypoints[..., self.keypoint_rotation_vec_end_idx, 0]
-            y1 = keypoints[..., self.keypoint_rotation_vec_end_idx, 1]
-
-            # Square box always
-            w = ((xc - x1) ** 2 + (yc - y1) ** 2).sqrt() * 2 * self.detect_box_scale
-            h = w
-
-            # Compute box corners from box center, width, height
-            batched_selected_roi.append(
-                compute_box_corners_with_rotation(xc, yc, w, h, theta)
-            )
-
-        return batched_selected_roi
+        # Compute bounding box center and rotation
+        theta = compute_vector_rotation(
+            keypoints[:, self.keypoint_rotation_vec_start_idx, ...],
+            keypoints[:, self.keypoint_rotation_vec_end_idx, ...],
+            self.rotation_offset_rads,
+        )
+        xc = keypoints[..., self.keypoint_rotation_vec_start_idx, 0]
+        yc = keypoints[..., self.keypoint_rotation_vec_start_idx, 1]
+        x1 = keypoints[..., self.keypoint_rotation_vec_end_idx, 0]
+        y1 = keypoints[..., self.keypoint_rotation_vec_end_idx, 1]
+
+        # Square box always
+        w = ((xc - x1) ** 2 + (yc - y1) ** 2).sqrt() * 2 * self.detect_box_scale
+        h = w
+
+        # Compute box corners from box center, width, height
+        return compute_box_corners_with_rotation(xc, yc, w, h, theta)
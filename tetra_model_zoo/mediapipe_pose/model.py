@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import os
 from typing import Callable, Tuple
 
 import torch
 
 from tetra_model_zoo.mediapipe.utils import MediaPipePyTorchAsRoot
 from tetra_model_zoo.utils.input_spec import InputSpec
+from tetra_model_zoo.utils.snapshot import load_or_create_snapshot
 
 MODEL_NAME = "mediapipe_pose"
 
@@ -94,7 +96,34 @@ class MediaPipePose:
         detector_weights: str = "blazepose.pth",
         detector_anchors: str = "anchors_pose.npy",
         landmark_detector_weights: str = "blazepose_landmark.pth",
+        use_snapshot: bool = True,
     ) -> MediaPipePose:
+        """
+        Load the detector and landmark detector from the MediaPipePyTorch repository.
+
+        Parameters:
+            detector_weights, detector_anchors, landmark_detector_weights:
+                File names within the MediaPipePyTorch repository.
+            use_snapshot: Load from (or save) a snapshot of the constructed model.
+                See utils.snapshot.
+        """
+        if use_snapshot:
+            return load_or_create_snapshot(
+                MODEL_NAME,
+                [
+                    "MediaPipePose",
+                    detector_weights,
+                    detector_anchors,
+                    landmark_detector_weights,
+                ],
+                lambda: MediaPipePose.from_pretrained(
+                    detector_weights,
+                    detector_anchors,
+                    landmark_detector_weights,
+                    use_snapshot=False,
+                ),
+                MediaPipePyTorchAsRoot(),
+            )
         return MediaPipePose(
             *MediaPipePose._load_mediapipe_pose_models(
                 detector_weights, detector_anchors, landmark_detector_weights
@@ -125,14 +154,16 @@ class MediaPipePose:
         Load mediapipe models from the source repository.
         Returns tuple[<source repository>.blazepose.BlazePose, BlazePose Anchors, <source repository>.blazepose_landmark.BlazePoseLandmark]
         """
-        with MediaPipePyTorchAsRoot():
+        with MediaPipePyTorchAsRoot() as repo_path:
             from blazepose import BlazePose
             from blazepose_landmark import BlazePoseLandmark
 
             pose_detector = BlazePose()
-            pose_detector.load_weights(detector_weights)
-            pose_detector.load_anchors(detector_anchors)
+            pose_detector.load_weights(os.path.join(repo_path, detector_weights))
+            pose_detector.load_anchors(os.path.join(repo_path, detector_anchors))
             pose_regressor = BlazePoseLandmark()
-            pose_regressor.load_weights(landmark_detector_weights)
+            pose_regressor.load_weights(
+                os.path.join(repo_path, landmark_detector_weights)
+            )
 
             return (pose_detector, pose_detector.anchors, pose_regressor)
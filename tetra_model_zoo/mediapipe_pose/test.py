@@ -1,8 +1,22 @@
+from typing import Tuple
+
 import numpy as np
+import pytest
+import torch
 
+from tetra_model_zoo.mediapipe.app import MediaPipeApp
 from tetra_model_zoo.mediapipe_pose.app import MediaPipePoseApp
-from tetra_model_zoo.mediapipe_pose.model import MODEL_NAME, MediaPipePose
+from tetra_model_zoo.mediapipe_pose.model import (
+    DETECT_DSCALE,
+    DETECT_DXY,
+    MODEL_NAME,
+    POSE_KEYPOINT_INDEX_END,
+    POSE_KEYPOINT_INDEX_START,
+    ROTATION_VECTOR_OFFSET_RADS,
+    MediaPipePose,
+)
 from tetra_model_zoo.utils.asset_loaders import MODEL_ZOO_ASSET_PATH, load_image
+from tetra_model_zoo.utils.draw import draw_connections, draw_points
 from tetra_model_zoo.utils.testing import skip_clone_repo_check
 
 INPUT_IMAGE_ADDRESS = f"{MODEL_ZOO_ASSET_PATH}/mediapipe/v1/pose.jpeg"
@@ -25,3 +39,88 @@ def test_pose_app():
     assert np.allclose(
         app.predict_landmarks_from_image(input)[0], np.asarray(expected_output)
     )
+
+
+def _unused_model(x: torch.Tensor):
+    raise AssertionError("The ROI computation does not run any model.")
+
+
+def _make_pose_model() -> MediaPipePose:
+    return MediaPipePose(_unused_model, torch.zeros(0, 4), _unused_model)
+
+
+def _make_base_app() -> MediaPipeApp:
+    # The generic MediaPipe app, with the pose app's ROI parameters. It computes
+    # ROIs from the detector box rather than from the keypoints.
+    return MediaPipeApp(
+        _unused_model,
+        torch.zeros(0, 4),
+        _unused_model,
+        MediaPipePose.get_pose_detector_input_spec()["image"][0][-2:],
+        MediaPipePose.get_pose_landmark_detector_input_spec(0)["image"][0][-2:],
+        POSE_KEYPOINT_INDEX_START,
+        POSE_KEYPOINT_INDEX_END,
+        ROTATION_VECTOR_OFFSET_RADS,
+        DETECT_DXY,
+        DETECT_DSCALE,
+    )
+
+
+def _keypoints(start: Tuple[float, float], end: Tuple[float, float]) -> torch.Tensor:
+    keypoints = torch.zeros(4, 2)
+    keypoints[POSE_KEYPOINT_INDEX_START] = torch.tensor(start)
+    keypoints[POSE_KEYPOINT_INDEX_END] = torch.tensor(end)
+    return keypoints
+
+
+@pytest.mark.parametrize(
+    "make_app,upright_roi,rotated_roi",
+    [
+        # ROI centered on the start keypoint, with sides of
+        # 2 * DETECT_DSCALE * |end - start|.
+        (
+            lambda: MediaPipePoseApp(_make_pose_model()),
+            [[40, 40], [40, 160], [160, 40], [160, 160]],
+            [[160, 40], [40, 40], [160, 160], [40, 160]],
+        ),
+        # ROI centered on the box, with its size scaled by DETECT_DSCALE.
+        (
+            _make_base_app,
+            [[15, 0], [15, 300], [165, 0], [165, 300]],
+            [[240, 75], [-60, 75], [240, 225], [-60, 225]],
+        ),
+    ],
+)
+def test_compute_object_roi_batched(make_app, upright_roi, rotated_roi):
+    app = make_app()
+    box = torch.tensor([[40.0, 50.0], [140.0, 250.0]])
+    # Upright (end keypoint above the start keypoint), and rotated by 90 degrees.
+    upright = _keypoints((100, 100), (100, 60))
+    rotated = _keypoints((100, 100), (140, 100))
+
+    boxes = [torch.stack([box, box]), None, box[None]]
+    keypoints = [torch.stack([upright, rotated]), None, rotated[None]]
+    roi_4corners = app._compute_object_roi(boxes, keypoints)
+
+    assert len(roi_4corners) == 3
+    assert roi_4corners[1] is None
+    np.testing.assert_allclose(
+        roi_4corners[0], [upright_roi, rotated_roi], rtol=1e-5, atol=1e-4
+    )
+    np.testing.assert_allclose(roi_4corners[2], [rotated_roi], rtol=1e-5, atol=1e-4)
+    assert app._compute_object_roi([None], [None]) == [None]
+
+
+def test_draw_landmarks_requires_grad():
+    # Landmark detector outputs track gradients, since apps don't run their
+    # models under no_grad.
+    app = MediaPipePoseApp(_make_pose_model())
+    landmarks = (torch.rand(2, 33, 3) * 100).requires_grad_()
+    frame = np.zeros((128, 128, 3), dtype=np.uint8)
+    app._draw_landmarks(frame, landmarks)
+
+    points = landmarks[..., :2].detach()
+    expected = np.zeros((128, 128, 3), dtype=np.uint8)
+    draw_points(expected, points, (0, 255, 0))
+    draw_connections(expected, points, app.landmark_connections, (255, 0, 0), 2)
+    np.testing.assert_array_equal(frame, expected)
@@ -1,3 +1,4 @@
+import os
 from typing import Tuple
 
 import clip
@@ -14,7 +15,10 @@ MODEL_ASSET_VERSION = "1"
 
 def load_clip():
     """Downloading pretrained weights via OpenAI and loading them."""
-    return clip.load(PRETRAINED_WEIGHTS)
+    # Same location as the clip package default, but follows XDG_CACHE_HOME
+    # (like whisper) so the weights can be pre-fetched into a model zoo store.
+    cache_dir = os.getenv("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return clip.load(PRETRAINED_WEIGHTS, download_root=os.path.join(cache_dir, "clip"))
 
 
 class Clip(torch.nn.Module):
@@ -7,6 +7,7 @@ import torch
 from PIL.Image import Image
 
 from tetra_model_zoo.utils.input_spec import InputSpec
+from tetra_model_zoo.utils.profiling import profile_stage
 
 
 class OptimizedClipApp:
@@ -57,8 +58,10 @@ class OptimizedClipApp:
 
         """
         with torch.no_grad():
-            image_features = self.image_encoder(image)
-            text_features = self.text_encoder(text)
+            with profile_stage(self, "image_encoder_forward"):
+                image_features = self.image_encoder(image)
+            with profile_stage(self, "text_encoder_forward"):
+                text_features = self.text_encoder(text)
             logits_per_image = image_features @ text_features
         return logits_per_image.cpu().numpy()
 
@@ -2,10 +2,10 @@ from __future__ import annotations
 
 import torch
 
-import tetra_hub as hub
 from tetra_model_zoo.optimized_clip.model import OptimizedClip
 from tetra_model_zoo.utils.args import base_export_parser
 from tetra_model_zoo.utils.hub import download_hub_models
+from tetra_model_zoo.utils.local_profiling import submit_local_profile_job
 
 
 def trace_clip(clip: OptimizedClip):
@@ -39,6 +39,25 @@ def main():
         image_shape,
     ) = trace_clip(clip)
 
+    if args.local:
+        submit_local_profile_job(
+            name="clip_text",
+            model=clip_text_encoder_trace,
+            input_shapes=text_shape,
+            runtimes=args.local_runtimes,
+            output_dir=args.local_output_dir,
+        )
+        submit_local_profile_job(
+            name="clip_image",
+            model=clip_image_encoder_trace,
+            input_shapes=image_shape,
+            runtimes=args.local_runtimes,
+            output_dir=args.local_output_dir,
+        )
+        return
+
+    import tetra_hub as hub
+
     # Select the device(s) you'd like to optimize for.
     devices = [hub.Device(x) for x in args.devices]
 
@@ -0,0 +1,151 @@
+"""
+Pre-fetch every asset needed by a set of zoo models, without prompting.
+
+Each model is loaded once through `Model.from_pretrained()` (models are
+loaded in parallel), so exactly the assets used at runtime are fetched:
+source repositories, checkpoints, and torch.hub / Hugging Face / whisper /
+CLIP weights (redirected into the store). The store is then described by a
+manifest (size and sha256 of every file) and can optionally be archived
+as a tarball.
+
+Example:
+    python -m tetra_model_zoo.prefetch --models yolov7 resnet50 mediapipe_face \\
+        --store ./zoo-store --bundle zoo-store.tar.gz
+
+In production (e.g. with the store mounted read-only in an air-gapped container):
+    source /mnt/zoo-store/env.sh
+    # or set TETRA_MODEL_ZOO_STORE=/mnt/zoo-store, TETRA_MODEL_ZOO_OFFLINE=1, and
+    # TORCH_HOME / HF_HOME / XDG_CACHE_HOME as listed in env.sh.
+
+To check a store against its manifest:
+    python -m tetra_model_zoo.prefetch --store /mnt/zoo-store --verify
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import importlib
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from tetra_model_zoo.benchmark.models import discover_model_names
+from tetra_model_zoo.utils import asset_loaders
+from tetra_model_zoo.utils.store_bundle import (
+    build_manifest,
+    verify_store,
+    write_bundle,
+    write_env_script,
+    write_manifest,
+)
+
+
+def prefetch_model(model_name: str) -> Dict[str, Any]:
+    """
+    Loads a zoo model once so that all of its assets are fetched into the store.
+
+    Returns:
+        Dict with the prefetch status, duration, and error (if any).
+    """
+    start = time.perf_counter()
+    try:
+        model_module = importlib.import_module(f"tetra_model_zoo.{model_name}")
+        model = model_module.Model.from_pretrained()
+        del model
+        gc.collect()
+    except Exception as e:
+        return dict(
+            status="error", seconds=time.perf_counter() - start, error=repr(e)
+        )
+    return dict(status="ok", seconds=time.perf_counter() - start)
+
+
+def prefetch_models(
+    model_names: List[str], num_workers: int = 4
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Pre-fetches the assets of several models in parallel.
+
+    Returns:
+        Model name -> prefetch result (see `prefetch_model`).
+    """
+    # Never block on a prompt.
+    os.environ[asset_loaders.ASSUME_YES_ENV_VAR] = "1"
+    with ThreadPoolExecutor(max_workers=num_workers) as pool:
+        results = dict(zip(model_names, pool.map(prefetch_model, model_names)))
+    for model_name, result in results.items():
+        status = result["status"]
+        if status == "ok":
+            print(f"{model_name}: fetched in {result['seconds']:.1f}s")
+        else:
+            print(f"{model_name}: FAILED ({result['error']})")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--models",
+        nargs="+",
+        default=["all"],
+        help="Zoo packages to pre-fetch (e.g. resnet50 yolov7), or 'all'.",
+    )
+    parser.add_argument(
+        "--store",
+        type=str,
+        default=asset_loaders.MODEL_ZOO_STORE,
+        help="Store directory to fetch into. Default: the current model zoo store.",
+    )
+    parser.add_argument(
+        "--num_workers", type=int, default=4, help="Models to fetch in parallel."
+    )
+    parser.add_argument(
+        "--bundle",
+        type=str,
+        default=None,
+        help="Also archive the store to this tarball (.tar, .tar.gz or .tgz).",
+    )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Only check the store against its manifest, then exit.",
+    )
+    args = parser.parse_args()
+
+    if args.verify:
+        problems = verify_store(args.store)
+        for problem in problems:
+            print(problem)
+        print(f"{args.store}: {'OK' if not problems else f'{len(problems)} problem(s)'}")
+        sys.exit(1 if problems else 0)
+
+    # Must be set before any model package (and its dependencies) is imported,
+    # since some libraries read their cache location at import time.
+    asset_loaders.set_model_zoo_store(args.store, include_third_party_caches=True)
+    store = asset_loaders.MODEL_ZOO_STORE
+    os.makedirs(store, exist_ok=True)
+
+    model_names = discover_model_names() if args.models == ["all"] else args.models
+    results = prefetch_models(model_names, args.num_workers)
+
+    manifest = build_manifest(store, results)
+    manifest_path = write_manifest(store, manifest)
+    env_script_path = write_env_script(store)
+    num_bytes = sum(f["size"] for f in manifest["files"].values())
+    print(
+        f"Wrote manifest of {len(manifest['files'])} files ({num_bytes / 2**30:.2f}GB) "
+        f"to {manifest_path}, and {env_script_path}"
+    )
+
+    if args.bundle:
+        print(f"Bundle written to {write_bundle(store, args.bundle)}")
+
+    if any(result["status"] != "ok" for result in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ from tetra_model_zoo.utils.image_processing import (
     app_to_net_image_inputs,
     torch_tensor_to_PIL_image,
 )
+from tetra_model_zoo.utils.profiling import profile_stage
 
 PRE_PAD = 10
 SCALE = 4
@@ -55,24 +56,27 @@ class RealESRGANApp:
                 images: List[PIL.Image.Image]
                     A list of upscaled images (one for each input image).
         """
-        _, NCHW_fp32_torch_frames = app_to_net_image_inputs(pixel_values_or_image)
+        with profile_stage(self, "input_conversion"):
+            _, NCHW_fp32_torch_frames = app_to_net_image_inputs(pixel_values_or_image)
 
-        # pre-pad with a value of 10
-        NCHW_fp32_torch_frames = F.pad(
-            NCHW_fp32_torch_frames, (0, PRE_PAD, 0, PRE_PAD), "reflect"
-        )
+            # pre-pad with a value of 10
+            NCHW_fp32_torch_frames = F.pad(
+                NCHW_fp32_torch_frames, (0, PRE_PAD, 0, PRE_PAD), "reflect"
+            )
 
         # Run prediction
-        upscaled_images = self.model(NCHW_fp32_torch_frames)
+        with profile_stage(self, "model_forward"):
+            upscaled_images = self.model(NCHW_fp32_torch_frames)
         if len(upscaled_images.shape) == 3:
             upscaled_images = torch.unsqueeze(upscaled_images, 0)
 
         # Postprocess -- Remove padding
         # preprocessing used a pre_pad value of 10
         # These weights use a scale of 4
-        _, _, h, w = upscaled_images.shape
-        upscaled_images = upscaled_images[
-            :, :, 0 : h - PRE_PAD * SCALE, 0 : w - PRE_PAD * SCALE
-        ]
+        with profile_stage(self, "postprocess"):
+            _, _, h, w = upscaled_images.shape
+            upscaled_images = upscaled_images[
+                :, :, 0 : h - PRE_PAD * SCALE, 0 : w - PRE_PAD * SCALE
+            ]
 
-        return [torch_tensor_to_PIL_image(img) for img in upscaled_images]
+            return [torch_tensor_to_PIL_image(img) for img in upscaled_images]
@@ -4,8 +4,10 @@ import os
 
 import torch
 
-from tetra_model_zoo.utils.asset_loaders import SourceAsRoot
+from tetra_model_zoo.utils.asset_loaders import SourceAsRoot, download_data
 from tetra_model_zoo.utils.input_spec import InputSpec
+from tetra_model_zoo.utils.mmap_weights import assign_state_dict, load_state_dict_mmap
+from tetra_model_zoo.utils.snapshot import load_or_create_snapshot
 
 REALESRGAN_SOURCE_REPOSITORY = "https://github.com/xinntao/Real-ESRGAN"
 REALESRGAN_SOURCE_REPO_COMMIT = "5ca1078535923d485892caee7d7804380bfc87fd"
@@ -27,8 +29,27 @@ class RealESRGAN(torch.nn.Module):
     @staticmethod
     def from_pretrained(
         weight_path: str = DEFAULT_WEIGHTS,
+        use_snapshot: bool = True,
     ) -> RealESRGAN:
-        """Load RealESRGAN from a weightfile created by the source RealESRGAN repository."""
+        """
+        Load RealESRGAN from a weightfile created by the source RealESRGAN repository.
+
+        Parameters:
+            weight_path: Name of the released weights, or path to a checkpoint.
+            use_snapshot: Load from (or save) a snapshot of the constructed model.
+                See utils.snapshot.
+        """
+        if use_snapshot:
+            return load_or_create_snapshot(
+                MODEL_NAME,
+                ["RealESRGAN", weight_path],
+                lambda: RealESRGAN.from_pretrained(weight_path, use_snapshot=False),
+                SourceAsRoot(
+                    REALESRGAN_SOURCE_REPOSITORY,
+                    REALESRGAN_SOURCE_REPO_COMMIT,
+                    MODEL_NAME,
+                ),
+            )
 
         # Load PyTorch model from disk
         realesrgan_model = _load_realesrgan_source_model_from_weights(weight_path)
@@ -78,11 +99,7 @@ def _load_realesrgan_source_model_from_weights(
 ) -> torch.nn.Module:
     with SourceAsRoot(
         REALESRGAN_SOURCE_REPOSITORY, REALESRGAN_SOURCE_REPO_COMMIT, MODEL_NAME
-    ):
-        # Patch path for this load only, since the model source
-        # code references modules via a global scope.
-        # CWD should be the repository path now
-        realesrgan_repo_path = os.getcwd()
+    ) as realesrgan_repo_path:
         # The official repo omits this folder, which causes import issues
         version_dir = os.path.join(realesrgan_repo_path, "realesrgan/version")
         if not os.path.exists(version_dir):
@@ -91,19 +108,9 @@ def _load_realesrgan_source_model_from_weights(
         if os.path.exists(os.path.expanduser(weights_name_or_path)):
             weights_path = os.path.expanduser(weights_name_or_path)
         else:
-            weights_path = os.path.join(os.getcwd(), weights_name_or_path + ".pth")
-            if not os.path.exists(weights_path):
-                # Load RealESRGAN model from the source repository using the given weights.
-                # Returns <source repository>.realesrgan.archs.srvgg_arch
-                weights_url = _get_weightsfile_from_name(weights_name_or_path)
-
-                # download the weights file
-                import requests
-
-                response = requests.get(weights_url)
-                with open(weights_path, "wb") as file:
-                    file.write(response.content)
-                print(f"Weights file downloaded as {weights_path}")
+            weights_path = download_data(
+                _get_weightsfile_from_name(weights_name_or_path), MODEL_NAME
+            )
 
         # necessary import. `archs` comes from the realesrgan repo.
         from realesrgan.archs.srvgg_arch import SRVGGNetCompact
@@ -116,12 +123,10 @@ def _load_realesrgan_source_model_from_weights(
             upscale=4,
             act_type="prelu",
         )
-        pretrained_dict = torch.load(weights_path, map_location=torch.device("cpu"))
-
-        if "params_ema" in pretrained_dict:
-            keyname = "params_ema"
-        else:
-            keyname = "params"
-        realesrgan_model.load_state_dict(pretrained_dict[keyname], strict=True)
+        # Prefer the EMA weights, if the checkpoint has them.
+        state_dict = load_state_dict_mmap(
+            weights_path, MODEL_NAME, state_dict_keys=["params_ema", "params"]
+        )
+        assign_state_dict(realesrgan_model, state_dict)
 
         return realesrgan_model
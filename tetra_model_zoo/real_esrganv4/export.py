@@ -5,11 +5,12 @@ from typing import Any, List
 
 import torch
 
-import tetra_hub as hub
 from tetra_model_zoo.real_esrgan.demo import WEIGHTS_HELP_MSG
 from tetra_model_zoo.real_esrganv4.model import DEFAULT_WEIGHTS, RealESRGANv4
 from tetra_model_zoo.utils.args import vision_export_parser
 from tetra_model_zoo.utils.hub import download_hub_models
+from tetra_model_zoo.utils.local_profiling import submit_local_profile_job
+from tetra_model_zoo.utils.shape_buckets import export_shape_buckets
 
 
 def trace(model: RealESRGANv4, input_shape: List[int] = [1, 3, 320, 320]) -> Any:
@@ -23,7 +24,10 @@ def trace(model: RealESRGANv4, input_shape: List[int] = [1, 3, 320, 320]) -> Any
 def main():
     # Export parameters
     parser = vision_export_parser(
-        default_x=320, default_y=320, include_trace_option=True
+        default_x=320,
+        default_y=320,
+        include_trace_option=True,
+        include_shape_bucket_options=True,
     )
     parser.add_argument(
         "--weights", type=str, default=DEFAULT_WEIGHTS, help=WEIGHTS_HELP_MSG
@@ -35,6 +39,17 @@ def main():
     # Instantiate the model & a sample input.
     realesrgan_model = RealESRGANv4.from_pretrained(args.weights)
 
+    if args.shape_buckets:
+        export_shape_buckets(
+            "realesrganv4",
+            realesrgan_model,
+            lambda size: [torch.ones(args.b, args.c, *size)],
+            args.shape_buckets,
+            args.output_dir,
+            args.dynamic_shapes,
+        )
+        return
+
     # Trace the model.
     traced_realesrgan = trace(realesrgan_model, [args.b, args.c, args.x, args.y])
 
@@ -45,6 +60,18 @@ def main():
         print(f"Saved torchscript to {model_path}")
         exit(0)
 
+    if args.local:
+        submit_local_profile_job(
+            name="realesrganv4",
+            model=traced_realesrgan,
+            input_shapes={"image": ((args.b, args.c, args.x, args.y), "float32")},
+            runtimes=args.local_runtimes,
+            output_dir=args.local_output_dir,
+        )
+        return
+
+    import tetra_hub as hub
+
     # Select the device(s) you'd like to optimize for.
     devices = [hub.Device(x) for x in args.devices]
 
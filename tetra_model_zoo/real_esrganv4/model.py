@@ -5,6 +5,8 @@ import torch.nn.functional as F
 
 from tetra_model_zoo.utils.asset_loaders import SourceAsRoot, download_data
 from tetra_model_zoo.utils.input_spec import InputSpec
+from tetra_model_zoo.utils.mmap_weights import assign_state_dict, load_state_dict_mmap
+from tetra_model_zoo.utils.snapshot import load_or_create_snapshot
 
 # The architecture for this RealESRGAN model comes from the original ESRGAN repo
 REALESRGAN_SOURCE_REPOSITORY = "https://github.com/xinntao/ESRGAN"
@@ -30,8 +32,27 @@ class RealESRGANv4(torch.nn.Module):
     @staticmethod
     def from_pretrained(
         weight_path: str = DEFAULT_WEIGHTS,
+        use_snapshot: bool = True,
     ) -> RealESRGANv4:
-        """Load RealESRGAN from a weightfile created by the source RealESRGAN repository."""
+        """
+        Load RealESRGAN from a weightfile created by the source RealESRGAN repository.
+
+        Parameters:
+            weight_path: Name of the released weights, or path to a checkpoint.
+            use_snapshot: Load from (or save) a snapshot of the constructed model.
+                See utils.snapshot.
+        """
+        if use_snapshot:
+            return load_or_create_snapshot(
+                MODEL_NAME,
+                ["RealESRGANv4", weight_path],
+                lambda: RealESRGANv4.from_pretrained(weight_path, use_snapshot=False),
+                SourceAsRoot(
+                    REALESRGAN_SOURCE_REPOSITORY,
+                    REALESRGAN_SOURCE_REPO_COMMIT,
+                    MODEL_NAME,
+                ),
+            )
 
         # Load PyTorch model from disk
         realesrgan_model = _load_realesrgan_source_model_from_weights(weight_path)
@@ -109,12 +130,10 @@ def _load_realesrgan_source_model_from_weights(weights_name: str) -> torch.nn.Mo
             num_grow_ch=32,
             scale=SCALE,
         )
-        pretrained_dict = torch.load(weights_path, map_location=torch.device("cpu"))
-
-        if "params_ema" in pretrained_dict:
-            keyname = "params_ema"
-        else:
-            keyname = "params"
-        realesrgan_model.load_state_dict(pretrained_dict[keyname], strict=True)
+        # Prefer the EMA weights, if the checkpoint has them.
+        state_dict = load_state_dict_mmap(
+            weights_path, MODEL_NAME, state_dict_keys=["params_ema", "params"]
+        )
+        assign_state_dict(realesrgan_model, state_dict)
 
         return realesrgan_model
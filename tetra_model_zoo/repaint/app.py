@@ -10,6 +10,7 @@ from tetra_model_zoo.utils.image_processing import (
     app_to_net_image_inputs,
     torch_tensor_to_PIL_image,
 )
+from tetra_model_zoo.utils.profiling import profile_stage
 
 
 class RepaintMaskApp:
@@ -61,19 +62,26 @@ class RepaintMaskApp:
             images: List[PIL.Image]
                 A list of predicted images (one list element per batch).
         """
-        NCHW_fp32_torch_frames = app_to_net_image_inputs(pixel_values_or_image)[1]
-        NCHW_fp32_torch_masks = app_to_net_image_inputs(mask_pixel_values_or_image)[1]
-
-        # The number of input images should equal the number of input masks.
-        if NCHW_fp32_torch_masks.shape[0] != 1:
-            NCHW_fp32_torch_masks = NCHW_fp32_torch_masks.tile(
-                (NCHW_fp32_torch_frames.shape[0], 1, 1, 1)
+        with profile_stage(self, "input_conversion"):
+            NCHW_fp32_torch_frames = app_to_net_image_inputs(pixel_values_or_image)[1]
+            NCHW_fp32_torch_masks = app_to_net_image_inputs(mask_pixel_values_or_image)[
+                1
+            ]
+
+            # The number of input images should equal the number of input masks.
+            if NCHW_fp32_torch_masks.shape[0] != 1:
+                NCHW_fp32_torch_masks = NCHW_fp32_torch_masks.tile(
+                    (NCHW_fp32_torch_frames.shape[0], 1, 1, 1)
+                )
+
+            # Mask input image
+            image_masked = (
+                NCHW_fp32_torch_frames * (1 - NCHW_fp32_torch_masks)
+                + NCHW_fp32_torch_masks
             )
 
-        # Mask input image
-        image_masked = (
-            NCHW_fp32_torch_frames * (1 - NCHW_fp32_torch_masks) + NCHW_fp32_torch_masks
-        )
-        out = self.model(image_masked, NCHW_fp32_torch_masks)
+        with profile_stage(self, "model_forward"):
+            out = self.model(image_masked, NCHW_fp32_torch_masks)
 
-        return [torch_tensor_to_PIL_image(img) for img in out]
+        with profile_stage(self, "postprocess"):
+            return [torch_tensor_to_PIL_image(img) for img in out]
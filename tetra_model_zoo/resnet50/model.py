@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import torch
 import torchvision.models as tv_models
 
 from tetra_model_zoo.imagenet_classifier.model import ImagenetClassifier
@@ -8,7 +9,8 @@ MODEL_NAME = "resnet50"
 
 
 class ResNet50(ImagenetClassifier):
+    DEFAULT_WEIGHTS = "IMAGENET1K_V2"
+
     @staticmethod
-    def from_pretrained(weights: str = "IMAGENET1K_V2") -> ImagenetClassifier:
-        net = tv_models.resnet50(weights=weights)
-        return ImagenetClassifier(net)
+    def load_net(weights: str) -> torch.nn.Module:
+        return tv_models.resnet50(weights=weights)
@@ -11,6 +11,7 @@ from tetra_model_zoo.sam.model import (
     SegmentAnythingEncoder,
     SegmentAnythingONNXDecoder,
 )
+from tetra_model_zoo.utils.profiling import profile_stage
 
 
 class SAMApp:
@@ -27,10 +28,18 @@ class SAMApp:
     """
 
     @no_type_check
-    def __init__(self, model_type=DEFAULT_MODEL_TYPE):
+    def __init__(
+        self,
+        model_type=DEFAULT_MODEL_TYPE,
+        precision="fp32",
+        sam_tetra_wrapper: SAMTetraWrapper | None = None,
+    ):
         self.orig_img_size = None
         self.image_embeddings = None
-        self.sam_tetra_wrapper = SAMTetraWrapper(model_type)
+        # An already loaded wrapper takes precedence over model_type / precision.
+        if sam_tetra_wrapper is None:
+            sam_tetra_wrapper = SAMTetraWrapper(model_type, precision)
+        self.sam_tetra_wrapper = sam_tetra_wrapper
         self.model_type = model_type
         self.sam_encoder = SegmentAnythingEncoder(self.sam_tetra_wrapper)
         self.sam_decoder = None
@@ -50,8 +59,10 @@ class SAMApp:
         if self.sam_encoder is None:
             self.sam_encoder = SegmentAnythingEncoder(self.sam)
 
-        preprocessed_image = self.sam_encoder.preprocess_input_image(input_image)
-        self.image_embeddings = self.sam_encoder(preprocessed_image)
+        with profile_stage(self, "input_conversion"):
+            preprocessed_image = self.sam_encoder.preprocess_input_image(input_image)
+        with profile_stage(self, "encoder_forward"):
+            self.image_embeddings = self.sam_encoder(preprocessed_image)
 
         # Initialize decoder
         self.orig_img_size = input_image.shape[:2]
@@ -111,24 +122,29 @@ class SAMApp:
 
         # Prepare inputs for decoder
         # Preprocess point co-ordinates for decoder
-        point_coords = self.preprocess_point_coordinates(
-            np.expand_dims(np.array(point_coords), 0), self.orig_img_size
-        )
-        point_labels = torch.Tensor(point_labels).unsqueeze(0)
-        mask_input = torch.zeros(self.sam_decoder.get_input_spec()["mask_input"][0])
-        has_mask_input = torch.zeros((1,))
-
-        upscaled_masks, scores, masks = self.sam_decoder(
-            self.image_embeddings,
-            point_coords,
-            point_labels,
-            mask_input,
-            has_mask_input,
-        )
+        with profile_stage(self, "point_preprocess"):
+            point_coords = self.preprocess_point_coordinates(
+                np.expand_dims(np.array(point_coords), 0), self.orig_img_size
+            )
+            point_labels = torch.Tensor(point_labels).unsqueeze(0)
+            mask_input = torch.zeros(
+                self.sam_decoder.get_input_spec()["mask_input"][0]
+            )
+            has_mask_input = torch.zeros((1,))
+
+        with profile_stage(self, "decoder_forward"):
+            upscaled_masks, scores, masks = self.sam_decoder(
+                self.image_embeddings,
+                point_coords,
+                point_labels,
+                mask_input,
+                has_mask_input,
+            )
 
         # Reduce noise from generated masks
-        upscaled_masks = self.postprocess_mask(upscaled_masks)
-        masks = self.postprocess_mask(masks)
+        with profile_stage(self, "mask_postprocess"):
+            upscaled_masks = self.postprocess_mask(upscaled_masks)
+            masks = self.postprocess_mask(masks)
 
         return upscaled_masks, scores, masks
 
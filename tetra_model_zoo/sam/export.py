@@ -5,7 +5,6 @@ from typing import Any, Tuple
 import torch
 from torch.utils.mobile_optimizer import MobileOptimizerType, optimize_for_mobile
 
-import tetra_hub as hub
 from tetra_model_zoo.sam.model import (
     DEFAULT_MODEL_TYPE,
     SAMTetraWrapper,
@@ -14,6 +13,7 @@ from tetra_model_zoo.sam.model import (
 )
 from tetra_model_zoo.utils.args import base_export_parser
 from tetra_model_zoo.utils.hub import download_hub_models
+from tetra_model_zoo.utils.local_profiling import submit_local_profile_job
 
 
 def trace_sam(
@@ -97,6 +97,18 @@ def main():
         sam_encoder, sam_decoder, input_img_size, args.num_of_points
     )
 
+    if args.local:
+        submit_local_profile_job(
+            name="Sam Decoder",
+            model=traced_decoder,
+            input_shapes=sam_decoder.get_input_spec(args.num_of_points),
+            runtimes=args.local_runtimes,
+            output_dir=args.local_output_dir,
+        )
+        return
+
+    import tetra_hub as hub
+
     # Select the device you'd like to optimize for.
     devices = [hub.Device(device) for device in args.devices]
 
@@ -1,14 +1,14 @@
 from __future__ import annotations
 
-import os
-import sys
 from typing import Tuple
 
 import numpy as np
 import torch
 
-from tetra_model_zoo.utils.asset_loaders import maybe_clone_git_repo
+from tetra_model_zoo.utils.asset_loaders import SourceAsRoot, download_data
 from tetra_model_zoo.utils.input_spec import InputSpec
+from tetra_model_zoo.utils.mmap_weights import assign_state_dict, load_state_dict_mmap
+from tetra_model_zoo.utils.precision import set_model_precision
 
 SAM_SOURCE_REPO = "https://github.com/tetraai/segment-anything"
 SAM_SOURCE_REPO_COMMIT = "db44f30e01c020b2522c6889186198e7c49a51a4"
@@ -31,7 +31,13 @@ class SAMTetraWrapper:
         2. SamOnnxModel accepts `orig_img_size` to use static upsample instead of dynamic upsample
     """
 
-    def __init__(self, model_type: str = DEFAULT_MODEL_TYPE):
+    def __init__(self, model_type: str = DEFAULT_MODEL_TYPE, precision: str = "fp32"):
+        """
+        Parameters:
+            model_type: SAM variant to load (see MODEL_REGISTERY).
+            precision: Precision of the image encoder: "fp32", "bf16" or "fp16".
+                The (light-weight) decoder always runs in fp32. See utils.precision.
+        """
         (
             self.sam_model_registry,
             self.SamOnnxModel,
@@ -39,6 +45,13 @@ class SAMTetraWrapper:
             self.SamPredictor,
         ) = _patch_sam_with_tetra_modules()
         self.sam = load_sam_model(self.sam_model_registry, model_type)
+        set_model_precision(self.sam.image_encoder, precision)
+
+    @staticmethod
+    def from_pretrained(
+        model_type: str = DEFAULT_MODEL_TYPE, precision: str = "fp32"
+    ) -> SAMTetraWrapper:
+        return SAMTetraWrapper(model_type, precision)
 
     def get_sam(self) -> torch.nn.Module:
         return self.sam
@@ -196,17 +209,14 @@ def load_sam_model(
     """Loads SAM model of given model type"""
     weights_url = _get_weights_url(model_type)
 
-    # download the weights file
-    import requests
+    # Download the weights file. Multi-GB checkpoints are streamed to disk
+    # and resumed if interrupted.
+    weights_path = download_data(weights_url, MODEL_NAME)
 
-    cwd = os.getcwd()
-    response = requests.get(weights_url)
-    weights_path = os.path.join(cwd, weights_url.split("/")[-1])
-    with open(weights_path, "wb") as file:
-        file.write(response.content)
-    print(f"Weights file downloaded as {weights_path}")
-
-    sam = sam_model_registry[model_type](weights_path)
+    # Build the model without weights, then map the weights in so that
+    # processes serving SAM share one copy of them.
+    sam = sam_model_registry[model_type]()
+    assign_state_dict(sam, load_state_dict_mmap(weights_path, MODEL_NAME))
     sam.eval()
     return sam
 
@@ -226,21 +236,13 @@ def _patch_sam_with_tetra_modules():
         SamPredictor: segment_anything.SamPredictor
             Python class wrapper to call image encoder - decoder
     """
-    sam_repo_path = maybe_clone_git_repo(
-        SAM_SOURCE_REPO, SAM_SOURCE_REPO_COMMIT, MODEL_NAME
-    )
-    cwd = os.getcwd()
-    try:
-        # Patch path for this load only
-        sys.path.insert(0, sam_repo_path)
-
+    # The tetra fork takes priority over any installed segment_anything package.
+    with SourceAsRoot(
+        SAM_SOURCE_REPO, SAM_SOURCE_REPO_COMMIT, MODEL_NAME, source_first=True
+    ):
         # import required modules and utilities
         from segment_anything import SamPredictor, sam_model_registry
         from segment_anything.utils.onnx import SamOnnxModel
         from segment_anything.utils.transforms import ResizeLongestSide
 
         return sam_model_registry, SamOnnxModel, ResizeLongestSide, SamPredictor
-    finally:
-        # Reset global state
-        os.chdir(cwd)
-        sys.path.remove(sam_repo_path)
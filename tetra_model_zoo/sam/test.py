@@ -3,8 +3,13 @@ import pytest
 import torch
 
 from tetra_model_zoo.sam import App
-from tetra_model_zoo.sam.model import MODEL_NAME, SAMTetraWrapper
+from tetra_model_zoo.sam.model import (
+    MODEL_NAME,
+    SAMTetraWrapper,
+    SegmentAnythingEncoder,
+)
 from tetra_model_zoo.utils.asset_loaders import load_image
+from tetra_model_zoo.utils.precision import compare_precision
 
 IMAGE_ADDRESS = "https://raw.githubusercontent.com/tetraai/segment-anything/main/notebooks/images/truck.jpg"
 # Test small model for quick turn-around.
@@ -71,3 +76,12 @@ def test_e2e_numerical(
     # Ensure segmentation upscaled mask, scores and low-res masks match with source model
     for exp, obs in zip(exp_decoder_output, obs_decoder_output):
         np.allclose(exp.detach().numpy(), obs.detach().numpy())
+
+
+def test_encoder_bf16(input_image_data: np.ndarray, monkeypatch):
+    """Verify the image embeddings of the bf16 encoder match fp32's."""
+    monkeypatch.setattr("builtins.input", lambda: "y")
+
+    encoder = SegmentAnythingEncoder(SAMTetraWrapper(TEST_MODEL_TYPE))
+    image = encoder.preprocess_input_image(input_image_data)
+    compare_precision(encoder, [image], "bf16", psnr_threshold=25)
@@ -0,0 +1,178 @@
+"""
+Dynamic batching of concurrent requests.
+
+Requests are queued, and a pool of worker threads takes them off the queue
+in batches: a worker starts a batch with the oldest request, then adds
+requests as they arrive until the batch is full or the oldest request has
+waited `max_wait_ms`. The queue is bounded; when it is full, `submit`
+raises QueueFullError immediately so callers can shed load.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, NamedTuple
+
+from tetra_model_zoo.serving.metrics import ServingMetrics
+
+
+class QueueFullError(RuntimeError):
+    """Raised when a request is submitted to a batcher whose queue is full."""
+
+
+class _Request(NamedTuple):
+    item: Any
+    future: Future
+    submit_time: float
+
+
+_STOP = object()
+
+
+class DynamicBatcher:
+    """
+    Coalesces concurrent requests into batches for a `predict_batch` function.
+    """
+
+    def __init__(
+        self,
+        predict_batch: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 8,
+        max_wait_ms: float = 5.0,
+        max_queue_size: int = 64,
+        num_workers: int = 1,
+        name: str = "model",
+        metrics: ServingMetrics | None = None,
+    ):
+        """
+        Parameters:
+            predict_batch: Takes a list of items and returns one result per item.
+            max_batch_size: Maximum number of items per predict_batch call.
+            max_wait_ms: Maximum time the oldest request in a batch waits for
+                more requests before the batch is run.
+            max_queue_size: Maximum number of queued requests.
+            num_workers: Number of threads running batches concurrently.
+            name: Name of the model, used to label metrics.
+            metrics: Metrics to record to.
+        """
+        if max_batch_size < 1 or num_workers < 1 or max_queue_size < 1:
+            raise ValueError(
+                "max_batch_size, num_workers and max_queue_size must be positive."
+            )
+        self.predict_batch = predict_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait_s = max_wait_ms / 1000
+        self.num_workers = num_workers
+        self.name = name
+        self.metrics = metrics
+        self._queue: queue.Queue = queue.Queue(max_queue_size)
+        self._closed = False
+        self._workers = [
+            threading.Thread(
+                target=self._run_worker, name=f"{name}-worker-{i}", daemon=True
+            )
+            for i in range(num_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+        if metrics is not None:
+            metrics.register_queue(name, self.queue_depth)
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def num_alive_workers(self) -> int:
+        return sum(worker.is_alive() for worker in self._workers)
+
+    def submit(self, item: Any) -> Future:
+        """
+        Queues an item.
+
+        Returns:
+            A future for the item's result.
+
+        Raises:
+            QueueFullError if the queue is full.
+            RuntimeError if the batcher is closed.
+        """
+        if self._closed:
+            raise RuntimeError(f"Batcher {self.name} is closed.")
+        request = _Request(item, Future(), time.perf_counter())
+        try:
+            self._queue.put_nowait(request)
+        except queue.Full:
+            if self.metrics is not None:
+                self.metrics.increment(self.name, "rejected")
+            raise QueueFullError(f"The request queue of {self.name} is full.")
+        return request.future
+
+    def close(self, timeout: float | None = None) -> None:
+        """
+        Stops the workers once the queued requests have been run.
+        """
+        self._closed = True
+        for _ in self._workers:
+            self._queue.put(_STOP)
+        for worker in self._workers:
+            worker.join(timeout)
+
+    def _next_batch(self) -> List[_Request] | None:
+        first = self._queue.get()
+        if first is _STOP:
+            return None
+        batch = [first]
+        deadline = first.submit_time + self.max_wait_s
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                request = (
+                    self._queue.get(timeout=remaining)
+                    if remaining > 0
+                    else self._queue.get_nowait()
+                )
+            except queue.Empty:
+                break
+            if request is _STOP:
+                # Leave the stop signal for this worker's next iteration.
+                self._queue.put(_STOP)
+                break
+            batch.append(request)
+        return batch
+
+    def _run_worker(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            # Skip requests whose caller has given up.
+            batch = [r for r in batch if r.future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            start = time.perf_counter()
+            if self.metrics is not None:
+                self.metrics.record_batch(self.name, len(batch))
+                for request in batch:
+                    self.metrics.record_latency(
+                        self.name, "queue_wait", start - request.submit_time
+                    )
+            try:
+                results = self.predict_batch([r.item for r in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(
+                        f"{self.name} returned {len(results)} results "
+                        f"for a batch of {len(batch)}."
+                    )
+            except Exception as e:
+                for request in batch:
+                    request.future.set_exception(e)
+            else:
+                for request, result in zip(batch, results):
+                    request.future.set_result(result)
+            if self.metrics is not None:
+                self.metrics.record_latency(
+                    self.name, "inference", time.perf_counter() - start
+                )
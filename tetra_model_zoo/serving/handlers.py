@@ -0,0 +1,351 @@
+"""
+Adapters between HTTP requests and zoo apps.
+
+A ModelHandler decodes a request body (and query parameters) into an item,
+and runs its app on a batch of items, returning one JSON serializable
+result per item. Request parameters are parsed and validated when decoding,
+so that one bad request fails alone (with a 400) instead of failing every
+request batched with it. Apps that accept a batch of images are called once per
+batch of same-size images; other apps are called once per item.
+"""
+
+from __future__ import annotations
+
+import base64
+import importlib
+import io
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+import torch
+from PIL import Image
+
+Params = Dict[str, str]
+
+IMAGENET_NUM_CLASSES = 1000
+
+
+class ModelHandler(NamedTuple):
+    # (request body, query parameters) -> item. Raises ValueError on bad input.
+    decode: Callable[[bytes, Params], Any]
+    # items -> one JSON serializable result per item.
+    predict_batch: Callable[[List[Any]], List[Any]]
+    # Upper bounds on the server's batch size / worker count for this model,
+    # e.g. 1 for apps that keep per-request state.
+    max_batch_size: int | None = None
+    max_workers: int | None = None
+
+
+def decode_image(body: bytes, params: Params | None = None) -> Image.Image:
+    """Decodes an encoded image (JPEG, PNG, ...) to an RGB PIL image."""
+    try:
+        image = Image.open(io.BytesIO(body))
+        return image.convert("RGB")
+    except Exception as e:
+        raise ValueError(f"Could not decode the request body as an image: {e}")
+
+
+def encode_image(image: Image.Image | np.ndarray) -> str:
+    """Encodes an image as a base64 PNG string."""
+    if isinstance(image, np.ndarray):
+        image = Image.fromarray(image)
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return base64.b64encode(buffer.getvalue()).decode()
+
+
+def parse_int_param(
+    params: Params, name: str, default: int, min_value: int, max_value: int
+) -> int:
+    """
+    Parses an integer query parameter.
+
+    Raises:
+        ValueError if the parameter is not an integer in [min_value, max_value].
+    """
+    value = params.get(name)
+    if value is None:
+        return default
+    try:
+        parsed = int(value)
+    except ValueError:
+        raise ValueError(f"The `{name}` query parameter must be an integer.")
+    if not min_value <= parsed <= max_value:
+        raise ValueError(
+            f"The `{name}` query parameter must be between {min_value} and "
+            f"{max_value}, got {parsed}."
+        )
+    return parsed
+
+
+def decode_classifier_request(body: bytes, params: Params) -> Tuple[Image.Image, int]:
+    """Decodes an image and its `top_k` query parameter (default 5)."""
+    top_k = parse_int_param(params, "top_k", 5, 1, IMAGENET_NUM_CLASSES)
+    return decode_image(body), top_k
+
+
+def _group_by_size(images: Sequence[Image.Image]) -> Dict[Tuple[int, int], List[int]]:
+    groups: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+    for i, image in enumerate(images):
+        groups[image.size].append(i)
+    return groups
+
+
+def _predict_by_size(
+    images: List[Image.Image], predict: Callable[[List[Image.Image]], List[Any]]
+) -> List[Any]:
+    """Runs `predict` once per group of same-size images."""
+    results: List[Any] = [None] * len(images)
+    for indices in _group_by_size(images).values():
+        for i, result in zip(indices, predict([images[i] for i in indices])):
+            results[i] = result
+    return results
+
+
+def _tolist(value: torch.Tensor | None) -> List | None:
+    return None if value is None else value.tolist()
+
+
+def _imagenet_classifier_handler(model_name: str) -> ModelHandler:
+    from tetra_model_zoo.imagenet_classifier.app import ImagenetClassifierApp
+
+    model_module = importlib.import_module(f"tetra_model_zoo.{model_name}")
+    app = ImagenetClassifierApp(model_module.Model.from_pretrained())
+
+    def predict_batch(items: List[Tuple[Image.Image, int]]) -> List[Any]:
+        probabilities = app.predict_batch([image for image, _ in items])
+        results = []
+        for (_, top_k), probs in zip(items, probabilities):
+            top_probs, top_indices = probs.topk(top_k)
+            results.append(
+                dict(
+                    class_indices=top_indices.tolist(),
+                    probabilities=top_probs.tolist(),
+                )
+            )
+        return results
+
+    return ModelHandler(decode_classifier_request, predict_batch)
+
+
+def _yolo_handler(model_name: str) -> ModelHandler:
+    app_classes = dict(
+        yolov6=("tetra_model_zoo.yolov6.app", "YoloV6DetectionApp"),
+        yolov7=("tetra_model_zoo.yolov7.app", "YoloV7App"),
+        yolov8_det=("tetra_model_zoo.yolov8_det.app", "YoloV8DetectionApp"),
+    )
+    app_module, app_class = app_classes[model_name]
+    model_module = importlib.import_module(f"tetra_model_zoo.{model_name}")
+    app = getattr(importlib.import_module(app_module), app_class)(
+        model_module.Model.from_pretrained()
+    )
+
+    def predict(images: List[Image.Image]) -> List[Any]:
+        boxes, scores, class_idx = app.predict_boxes_from_image(images, raw_output=True)
+        return [
+            dict(boxes=b.tolist(), scores=s.tolist(), class_indices=c.tolist())
+            for b, s, c in zip(boxes, scores, class_idx)
+        ]
+
+    return ModelHandler(decode_image, lambda images: _predict_by_size(images, predict))
+
+
+def _mediapipe_handler(model_name: str) -> ModelHandler:
+    app_class_name = "".join(part.title() for part in model_name.split("_"))
+    app_class_name = app_class_name.replace("Mediapipe", "MediaPipe") + "App"
+    app_class = getattr(
+        importlib.import_module(f"tetra_model_zoo.{model_name}.app"), app_class_name
+    )
+    model_module = importlib.import_module(f"tetra_model_zoo.{model_name}")
+    app = app_class(model_module.Model.from_pretrained())
+
+    def predict(images: List[Image.Image]) -> List[Any]:
+        boxes, keypoints, roi_4corners, landmarks = app.predict_landmarks_from_image(
+            images, raw_output=True
+        )
+        return [
+            dict(
+                boxes=_tolist(b),
+                keypoints=_tolist(k),
+                roi_4corners=_tolist(r),
+                landmarks=_tolist(lm),
+            )
+            for b, k, r, lm in zip(boxes, keypoints, roi_4corners, landmarks)
+        ]
+
+    return ModelHandler(decode_image, lambda images: _predict_by_size(images, predict))
+
+
+def _esr_gan_handler(model_name: str) -> ModelHandler:
+    from tetra_model_zoo.esr_gan.app import ESRGANApp
+    from tetra_model_zoo.esr_gan.model import ESRGAN
+
+    app = ESRGANApp(ESRGAN.from_pretrained())
+
+    def predict_batch(images: List[Image.Image]) -> List[Any]:
+        return [dict(image=encode_image(app.upscale_image(image))) for image in images]
+
+    return ModelHandler(decode_image, predict_batch)
+
+
+def _trocr_handler(model_name: str) -> ModelHandler:
+    from tetra_model_zoo.trocr.app import TrOCRApp
+    from tetra_model_zoo.trocr.model import TrOCR
+
+    app = TrOCRApp(TrOCR.from_pretrained())
+
+    def predict_batch(images: List[Image.Image]) -> List[Any]:
+        return [dict(text=app.predict_text_from_image(image)[0]) for image in images]
+
+    return ModelHandler(decode_image, predict_batch)
+
+
+def _whisper_asr_handler(model_name: str) -> ModelHandler:
+    from tetra_model_zoo.utils.asset_loaders import maybe_download_s3_data
+    from tetra_model_zoo.whisper_asr.app import (
+        N_SAMPLES,
+        WhisperApp,
+        load_mel_filter,
+        log_mel_spectrogram,
+    )
+    from tetra_model_zoo.whisper_asr.model import MODEL_NAME, Whisper
+
+    app = WhisperApp(Whisper.from_pretrained())
+    mel_filter = load_mel_filter(
+        maybe_download_s3_data("whisper/openai_assets/mel_filters.npz", MODEL_NAME)
+    )
+
+    def decode(body: bytes, params: Params) -> np.ndarray:
+        # Either a .npz file with an "audio" array (like the demo assets), or
+        # raw 16kHz mono float32 little-endian samples (?format=f32le).
+        try:
+            if params.get("format") == "f32le":
+                audio = np.frombuffer(body, dtype="<f4").astype(np.float32)
+            else:
+                with np.load(io.BytesIO(body)) as f:
+                    audio = f["audio"]
+        except Exception as e:
+            raise ValueError(f"Could not decode the request body as audio: {e}")
+        # Whisper transcribes (up to) 30 seconds of audio.
+        return log_mel_spectrogram(
+            mel_filter, audio[:N_SAMPLES], pad_to_length=N_SAMPLES
+        )
+
+    def predict_batch(mel_inputs: List[np.ndarray]) -> List[Any]:
+        return [dict(text=app.transcribe(mel_input)) for mel_input in mel_inputs]
+
+    return ModelHandler(decode, predict_batch)
+
+
+def _openai_clip_handler(model_name: str) -> ModelHandler:
+    from tetra_model_zoo.openai_clip.app import ClipApp
+    from tetra_model_zoo.openai_clip.model import Clip
+
+    app = ClipApp(Clip.from_pretrained())
+
+    def decode(body: bytes, params: Params) -> Tuple[torch.Tensor, str]:
+        if "text" not in params:
+            raise ValueError("Missing the `text` query parameter.")
+        return app.process_image(decode_image(body)), params["text"]
+
+    def predict_batch(items: List[Tuple[torch.Tensor, str]]) -> List[Any]:
+        # Each distinct text prompt in the batch is encoded once.
+        texts = sorted({text for _, text in items})
+        similarity = app.predict_similarity(
+            torch.cat([image for image, _ in items]),
+            torch.cat([app.process_text(text) for text in texts]),
+        )
+        return [
+            dict(similarity=float(similarity[i, texts.index(text)]))
+            for i, (_, text) in enumerate(items)
+        ]
+
+    return ModelHandler(decode, predict_batch)
+
+
+def _sam_handler(model_name: str) -> ModelHandler:
+    from tetra_model_zoo.sam.app import SAMApp
+
+    app = SAMApp()
+
+    def decode(body: bytes, params: Params) -> Tuple[np.ndarray, List[List[int]]]:
+        try:
+            points = [
+                [int(v) for v in point.split(",")]
+                for point in params["points"].split(";")
+                if point
+            ]
+            assert points and all(len(point) == 2 for point in points)
+        except Exception:
+            raise ValueError("Expected a `points` query parameter like x1,y1;x2,y2.")
+        return np.asarray(decode_image(body)), points
+
+    def predict_batch(items: List[Tuple[np.ndarray, List[List[int]]]]) -> List[Any]:
+        results = []
+        for image, points in items:
+            app.prepare(image)
+            masks, scores, _ = app.generate_mask_from_points(points, [1] * len(points))
+            mask = masks[0, 0].numpy()
+            results.append(
+                dict(
+                    score=float(scores[0, 0]),
+                    area=int(mask.sum()),
+                    mask=encode_image(mask.astype(np.uint8) * 255),
+                )
+            )
+        return results
+
+    # The app holds the embeddings of the last prepared image.
+    return ModelHandler(decode, predict_batch, max_batch_size=1, max_workers=1)
+
+
+_CLASSIFIERS = [
+    "convnext_tiny",
+    "densenet121",
+    "efficientnet_b0",
+    "googlenet",
+    "inception_v3",
+    "mnasnet05",
+    "mobilenet_v2",
+    "mobilenet_v3_large",
+    "mobilenet_v3_small",
+    "regnet",
+    "resnet50",
+    "resnext101",
+    "resnext50",
+    "squeezenet1_1",
+    "vit",
+    "wideresnet50",
+]
+
+# Model name -> function that loads the model's app and returns its handler.
+HANDLERS: Dict[str, Callable[[str], ModelHandler]] = {
+    **{name: _imagenet_classifier_handler for name in _CLASSIFIERS},
+    "yolov6": _yolo_handler,
+    "yolov7": _yolo_handler,
+    "yolov8_det": _yolo_handler,
+    "mediapipe_face": _mediapipe_handler,
+    "mediapipe_hand": _mediapipe_handler,
+    "mediapipe_pose": _mediapipe_handler,
+    "esr_gan": _esr_gan_handler,
+    "trocr": _trocr_handler,
+    "whisper_asr": _whisper_asr_handler,
+    "openai_clip": _openai_clip_handler,
+    "sam": _sam_handler,
+}
+
+
+def load_handler(model_name: str) -> ModelHandler:
+    """
+    Loads a zoo model's app and wraps it in a handler.
+
+    Raises:
+        ValueError if the model can't be served.
+    """
+    if model_name not in HANDLERS:
+        raise ValueError(
+            f"Serving is not supported for {model_name}. "
+            f"Supported models: {', '.join(sorted(HANDLERS))}."
+        )
+    return HANDLERS[model_name](model_name)
@@ -0,0 +1,109 @@
+"""
+Serving metrics, exported in the Prometheus text exposition format.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, DefaultDict, Dict, Tuple
+
+from tetra_model_zoo.utils.profiling import PrometheusSink
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+
+
+class LatencyHistograms(PrometheusSink):
+    """
+    Request latencies per model, split in stages:
+        * queue_wait: from submission until the request's batch starts.
+        * inference: the batch's predict call.
+        * request: end to end, including decoding the request body.
+    """
+
+    METRIC_NAME = "tetra_model_zoo_serving_seconds"
+    METRIC_HELP = "Time spent serving requests, per model and stage."
+
+
+class BatchSizeHistograms(PrometheusSink):
+    METRIC_NAME = "tetra_model_zoo_serving_batch_size"
+    METRIC_HELP = "Number of requests in each batch run by a model."
+
+    def __init__(self):
+        super().__init__(BATCH_SIZE_BUCKETS)
+
+
+class ServingMetrics:
+    """
+    Counters and histograms for every model hosted by a server.
+    Thread safe.
+    """
+
+    COUNTERS = {
+        "requests": "Requests received.",
+        "rejected": "Requests rejected because the model's queue was full.",
+        "errors": "Requests that failed.",
+        "timeouts": "Requests that timed out.",
+        "batches": "Batches run.",
+    }
+
+    def __init__(self):
+        self.latencies = LatencyHistograms()
+        self.batch_sizes = BatchSizeHistograms()
+        self._counters: DefaultDict[Tuple[str, str], int] = defaultdict(int)
+        self._lock = threading.Lock()
+        # Model name -> function returning the model's current queue depth.
+        self._queue_depths: Dict[str, Callable[[], int]] = {}
+        self.start_time = time.time()
+
+    def increment(self, model_name: str, counter: str, value: int = 1) -> None:
+        if counter not in self.COUNTERS:
+            raise ValueError(f"Unknown counter {counter}.")
+        with self._lock:
+            self._counters[(model_name, counter)] += value
+
+    def count(self, model_name: str, counter: str) -> int:
+        with self._lock:
+            return self._counters[(model_name, counter)]
+
+    def record_latency(self, model_name: str, stage: str, seconds: float) -> None:
+        self.latencies.record(model_name, stage, 0.0, seconds)
+
+    def record_batch(self, model_name: str, batch_size: int) -> None:
+        self.increment(model_name, "batches")
+        self.batch_sizes.record(model_name, "batch", 0.0, batch_size)
+
+    def register_queue(self, model_name: str, queue_depth: Callable[[], int]) -> None:
+        self._queue_depths[model_name] = queue_depth
+
+    def to_prometheus_text(self) -> str:
+        """
+        Returns:
+            All counters, queue depth gauges and histograms in the Prometheus
+            text exposition format.
+        """
+        lines = []
+        with self._lock:
+            counters = dict(self._counters)
+        for counter, help_text in self.COUNTERS.items():
+            name = f"tetra_model_zoo_serving_{counter}_total"
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            for (model_name, key), value in counters.items():
+                if key == counter:
+                    lines.append(f'{name}{{model="{model_name}"}} {value}')
+
+        name = "tetra_model_zoo_serving_queue_depth"
+        lines += [
+            f"# HELP {name} Requests waiting to be batched.",
+            f"# TYPE {name} gauge",
+        ]
+        for model_name, queue_depth in self._queue_depths.items():
+            lines.append(f'{name}{{model="{model_name}"}} {queue_depth()}')
+
+        return (
+            "\n".join(lines)
+            + "\n"
+            + self.latencies.to_prometheus_text()
+            + self.batch_sizes.to_prometheus_text()
+        )
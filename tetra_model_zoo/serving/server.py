@@ -0,0 +1,302 @@
+"""
+Local CPU inference server hosting any set of zoo apps over HTTP.
+
+Each model gets a DynamicBatcher, which coalesces concurrent requests into
+batches and runs them on a pool of worker threads. When a model's queue is
+full, requests are rejected with 503 (and a Retry-After header) instead of
+piling up.
+
+Endpoints:
+    POST /v1/models/<model>/predict    Body: encoded image (or audio for
+                                       whisper_asr). Model options are passed
+                                       as query parameters. Returns JSON.
+    GET  /v1/models                    Hosted models and their queue depths.
+    GET  /health                       200 if every model has all of its
+                                       worker threads running, else 503.
+    GET  /metrics                      Prometheus text format: request
+                                       counters, queue depths, latency and
+                                       batch size histograms, and the apps'
+                                       per-stage timings.
+
+Example:
+    python -m tetra_model_zoo.serving.server --models resnet50 yolov7 \\
+        --port 8080 --max_batch_size 8 --max_wait_ms 5
+
+    curl --data-binary @image.jpg localhost:8080/v1/models/resnet50/predict?top_k=3
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from concurrent.futures import TimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Sequence, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import torch
+
+from tetra_model_zoo.serving.batcher import DynamicBatcher, QueueFullError
+from tetra_model_zoo.serving.handlers import HANDLERS, ModelHandler, load_handler
+from tetra_model_zoo.serving.metrics import ServingMetrics
+from tetra_model_zoo.utils.profiling import (
+    PrometheusSink,
+    register_profiling_sink,
+    unregister_profiling_sink,
+)
+
+
+class ModelServer:
+    """
+    Routes requests to the dynamic batcher of each hosted model.
+    """
+
+    def __init__(
+        self,
+        handlers: Dict[str, ModelHandler],
+        max_batch_size: int = 8,
+        max_wait_ms: float = 5.0,
+        max_queue_size: int = 64,
+        num_workers: int = 1,
+        timeout_s: float = 60.0,
+    ):
+        """
+        Parameters:
+            handlers: Model name -> handler.
+            max_batch_size: Maximum requests per batch (capped by each handler).
+            max_wait_ms: Maximum time a request waits for its batch to fill.
+            max_queue_size: Maximum queued requests per model.
+            num_workers: Worker threads per model (capped by each handler).
+            timeout_s: Time after which a queued or running request fails.
+        """
+        self.handlers = handlers
+        self.timeout_s = timeout_s
+        self.metrics = ServingMetrics()
+        # Per-stage timings of the apps, exported with the serving metrics.
+        self.app_stages = PrometheusSink()
+        register_profiling_sink(self.app_stages)
+        self.batchers = {
+            name: DynamicBatcher(
+                handler.predict_batch,
+                min(max_batch_size, handler.max_batch_size or max_batch_size),
+                max_wait_ms,
+                max_queue_size,
+                min(num_workers, handler.max_workers or num_workers),
+                name,
+                self.metrics,
+            )
+            for name, handler in handlers.items()
+        }
+
+    def predict(self, model_name: str, body: bytes, params: Dict[str, str]) -> Any:
+        """
+        Decodes a request and waits for its result.
+
+        Raises:
+            KeyError if the model is not hosted.
+            ValueError if the request can't be decoded.
+            QueueFullError if the model's queue is full.
+            TimeoutError if the result isn't ready in time.
+        """
+        handler = self.handlers[model_name]
+        start = time.perf_counter()
+        self.metrics.increment(model_name, "requests")
+        try:
+            future = self.batchers[model_name].submit(handler.decode(body, params))
+            try:
+                result = future.result(self.timeout_s)
+            except TimeoutError:
+                future.cancel()
+                self.metrics.increment(model_name, "timeouts")
+                raise
+        except (QueueFullError, TimeoutError):
+            # Counted as rejected / timeouts, not as errors.
+            raise
+        except Exception:
+            self.metrics.increment(model_name, "errors")
+            raise
+        self.metrics.record_latency(model_name, "request", time.perf_counter() - start)
+        return result
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            name: dict(
+                queue_depth=batcher.queue_depth(),
+                alive_workers=batcher.num_alive_workers(),
+            )
+            for name, batcher in self.batchers.items()
+        }
+
+    def unhealthy_models(self) -> List[str]:
+        """
+        Returns:
+            The models that have worker threads which are no longer running.
+        """
+        return [
+            name
+            for name, batcher in self.batchers.items()
+            if batcher.num_alive_workers() < batcher.num_workers
+        ]
+
+    def metrics_text(self) -> str:
+        return self.metrics.to_prometheus_text() + self.app_stages.to_prometheus_text()
+
+    def close(self) -> None:
+        for batcher in self.batchers.values():
+            batcher.close()
+        unregister_profiling_sink(self.app_stages)
+
+
+def make_request_handler(server: ModelServer) -> type:
+    """
+    Returns:
+        A BaseHTTPRequestHandler class serving the endpoints of `server`.
+    """
+
+    class RequestHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send(
+            self,
+            status: int,
+            body: bytes,
+            content_type: str = "application/json",
+            headers: Sequence[Tuple[str, str]] = (),
+        ) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            for key, value in headers:
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _send_json(self, status: int, value: Any, **kwargs) -> None:
+            self._send(status, json.dumps(value).encode(), **kwargs)
+
+        def do_GET(self):
+            path = urlsplit(self.path).path
+            if path == "/health":
+                unhealthy = server.unhealthy_models()
+                self._send_json(
+                    503 if unhealthy else 200,
+                    dict(
+                        status="unhealthy" if unhealthy else "ok",
+                        models=list(server.handlers),
+                        unhealthy_models=unhealthy,
+                    ),
+                )
+            elif path == "/metrics":
+                self._send(200, server.metrics_text().encode(), "text/plain")
+            elif path == "/v1/models":
+                self._send_json(200, server.status())
+            else:
+                self._send_json(404, dict(error=f"Unknown path {path}."))
+
+        def do_POST(self):
+            url = urlsplit(self.path)
+            parts = url.path.strip("/").split("/")
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if parts[:2] != ["v1", "models"] or parts[3:] != ["predict"]:
+                self._send_json(404, dict(error=f"Unknown path {url.path}."))
+                return
+            model_name = parts[2]
+            if model_name not in server.handlers:
+                self._send_json(404, dict(error=f"Model {model_name} is not hosted."))
+                return
+            try:
+                result = server.predict(model_name, body, dict(parse_qsl(url.query)))
+            except ValueError as e:
+                self._send_json(400, dict(error=str(e)))
+            except QueueFullError as e:
+                self._send_json(503, dict(error=str(e)), headers=[("Retry-After", "1")])
+            except TimeoutError:
+                self._send_json(504, dict(error="The request timed out."))
+            except Exception as e:
+                self._send_json(500, dict(error=repr(e)))
+            else:
+                self._send_json(200, result)
+
+        def log_message(self, format, *args):
+            # Per-request logs are replaced by /metrics.
+            pass
+
+    return RequestHandler
+
+
+def make_http_server(
+    server: ModelServer, host: str = "127.0.0.1", port: int = 8080
+) -> ThreadingHTTPServer:
+    """
+    Returns:
+        An HTTP server (one thread per connection) for `server`. Call
+        `serve_forever` to start it. Port 0 picks a free port.
+    """
+    http_server = ThreadingHTTPServer((host, port), make_request_handler(server))
+    http_server.daemon_threads = True
+    return http_server
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--models",
+        nargs="+",
+        required=True,
+        choices=sorted(HANDLERS),
+        help="Zoo models to host.",
+    )
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--max_batch_size", type=int, default=8)
+    parser.add_argument(
+        "--max_wait_ms",
+        type=float,
+        default=5.0,
+        help="Maximum time a request waits for more requests to batch with.",
+    )
+    parser.add_argument(
+        "--max_queue_size",
+        type=int,
+        default=64,
+        help="Requests queued per model before new requests are rejected (503).",
+    )
+    parser.add_argument("--num_workers", type=int, default=1, help="Per model.")
+    parser.add_argument(
+        "--num_threads",
+        type=int,
+        default=None,
+        help="Torch intra-op threads, shared by all workers.",
+    )
+    parser.add_argument("--timeout_s", type=float, default=60.0)
+    args = parser.parse_args()
+
+    if args.num_threads is not None:
+        torch.set_num_threads(args.num_threads)
+
+    handlers = {}
+    for model_name in args.models:
+        print(f"Loading {model_name}...")
+        handlers[model_name] = load_handler(model_name)
+    server = ModelServer(
+        handlers,
+        args.max_batch_size,
+        args.max_wait_ms,
+        args.max_queue_size,
+        args.num_workers,
+        args.timeout_s,
+    )
+    http_server = make_http_server(server, args.host, args.port)
+    print(f"Serving {', '.join(args.models)} on http://{args.host}:{args.port}")
+    try:
+        http_server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        http_server.server_close()
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
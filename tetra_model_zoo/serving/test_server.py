@@ -0,0 +1,192 @@
+import io
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from typing import Any, List
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from tetra_model_zoo.serving.batcher import DynamicBatcher, QueueFullError
+from tetra_model_zoo.serving.handlers import (
+    ModelHandler,
+    decode_classifier_request,
+    decode_image,
+)
+from tetra_model_zoo.serving.server import ModelServer, make_http_server
+
+
+def test_batcher_coalesces_concurrent_requests():
+    batch_sizes = []
+
+    def predict_batch(items: List[int]) -> List[int]:
+        batch_sizes.append(len(items))
+        return [item * 2 for item in items]
+
+    batcher = DynamicBatcher(predict_batch, max_batch_size=4, max_wait_ms=200)
+    futures = [batcher.submit(i) for i in range(6)]
+    assert [f.result(5) for f in futures] == [0, 2, 4, 6, 8, 10]
+    assert batch_sizes == [4, 2]
+    batcher.close()
+
+
+def test_batcher_errors_and_backpressure():
+    release = threading.Event()
+
+    def predict_batch(items: List[Any]) -> List[Any]:
+        release.wait(5)
+        if "bad" in items:
+            raise RuntimeError("bad item")
+        return items
+
+    batcher = DynamicBatcher(
+        predict_batch, max_batch_size=1, max_wait_ms=0, max_queue_size=2
+    )
+    running = batcher.submit("bad")
+    time.sleep(0.1)  # Let the worker take the first request off the queue.
+    queued = [batcher.submit(i) for i in range(2)]
+    with pytest.raises(QueueFullError):
+        batcher.submit(3)
+    release.set()
+    with pytest.raises(RuntimeError):
+        running.result(5)
+    assert [f.result(5) for f in queued] == [0, 1]
+    batcher.close()
+
+
+def _image_bytes(width: int, height: int) -> bytes:
+    buffer = io.BytesIO()
+    Image.fromarray(np.zeros((height, width, 3), dtype=np.uint8)).save(
+        buffer, format="PNG"
+    )
+    return buffer.getvalue()
+
+
+def _request(url: str, data: bytes | None = None):
+    try:
+        with urllib.request.urlopen(url, data=data, timeout=10) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+
+
+@pytest.fixture
+def server_url():
+    handler = ModelHandler(
+        decode_image,
+        lambda images: [dict(size=list(image.size)) for image in images],
+    )
+    classifier_handler = ModelHandler(
+        decode_classifier_request, lambda items: [dict(top_k=k) for _, k in items]
+    )
+    server = ModelServer(
+        dict(fake=handler, classifier=classifier_handler),
+        max_batch_size=4,
+        max_wait_ms=20,
+    )
+    http_server = make_http_server(server, port=0)
+    thread = threading.Thread(target=http_server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{http_server.server_address[1]}"
+    http_server.shutdown()
+    http_server.server_close()
+    server.close()
+
+
+def test_server(server_url):
+    status, body = _request(f"{server_url}/health")
+    assert status == 200 and json.loads(body)["models"] == ["fake", "classifier"]
+
+    results: List[Any] = [None] * 8
+
+    def predict(i):
+        results[i] = _request(
+            f"{server_url}/v1/models/fake/predict", _image_bytes(10 + i, 5)
+        )
+
+    threads = [threading.Thread(target=predict, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for i, (status, body) in enumerate(results):
+        assert status == 200
+        assert json.loads(body) == dict(size=[10 + i, 5])
+
+    status, _ = _request(f"{server_url}/v1/models/fake/predict", b"not an image")
+    assert status == 400
+    status, _ = _request(f"{server_url}/v1/models/missing/predict", b"")
+    assert status == 404
+
+    status, body = _request(f"{server_url}/metrics")
+    metrics = body.decode()
+    assert status == 200
+    assert 'tetra_model_zoo_serving_requests_total{model="fake"} 9' in metrics
+    assert 'tetra_model_zoo_serving_errors_total{model="fake"} 1' in metrics
+    assert 'tetra_model_zoo_serving_batch_size_count{app="fake",stage="batch"}' in (
+        metrics
+    )
+
+
+def test_request_params_are_validated_per_request(server_url):
+    # Bad parameters fail their own request only, not the requests batched with it.
+    results = {}
+
+    def predict(top_k):
+        results[top_k] = _request(
+            f"{server_url}/v1/models/classifier/predict?top_k={top_k}",
+            _image_bytes(8, 8),
+        )
+
+    threads = [
+        threading.Thread(target=predict, args=(top_k,))
+        for top_k in ["3", "abc", "5000", "0", "7"]
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert {top_k: status for top_k, (status, _) in results.items()} == {
+        "3": 200,
+        "abc": 400,
+        "5000": 400,
+        "0": 400,
+        "7": 200,
+    }
+    assert json.loads(results["7"][1]) == dict(top_k=7)
+    assert decode_classifier_request(_image_bytes(8, 8), {})[1] == 5
+
+
+def test_timeouts_are_not_errors():
+    release = threading.Event()
+    handler = ModelHandler(lambda body, params: body, lambda items: release.wait(5))
+    server = ModelServer(dict(slow=handler), timeout_s=0.05)
+    with pytest.raises(TimeoutError):
+        server.predict("slow", b"", {})
+    release.set()
+    assert server.metrics.count("slow", "timeouts") == 1
+    assert server.metrics.count("slow", "errors") == 0
+    server.close()
+
+
+def test_health_reports_dead_workers():
+    handler = ModelHandler(lambda body, params: body, lambda items: items)
+    server = ModelServer(dict(fake=handler), num_workers=2)
+    http_server = make_http_server(server, port=0)
+    thread = threading.Thread(target=http_server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{http_server.server_address[1]}/health"
+    try:
+        assert _request(url)[0] == 200
+        # Stopping the batcher's workers makes the model unhealthy.
+        server.batchers["fake"].close()
+        status, body = _request(url)
+        assert status == 503
+        assert json.loads(body)["unhealthy_models"] == ["fake"]
+    finally:
+        http_server.shutdown()
+        http_server.server_close()
+        server.close()
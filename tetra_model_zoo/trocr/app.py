@@ -6,6 +6,7 @@ import torch
 from PIL.Image import Image
 
 from tetra_model_zoo.trocr.model import KVCache, TrOCR
+from tetra_model_zoo.utils.profiling import profile_stage
 
 
 class TrOCRApp:
@@ -95,16 +96,18 @@ class TrOCRApp:
             The prediction will be a list of strings (one string per batch) if self.io_processor != None and raw_output=False.
             Otherwise, a `torch.Tensor` of shape [batch_size, predicted_sequence_length] is returned. It contains predicted token IDs.
         """
-        if isinstance(pixel_values_or_image, Image):
-            pixel_values = self.preprocess_image(pixel_values_or_image)
-        else:
-            pixel_values = pixel_values_or_image
+        with profile_stage(self, "input_conversion"):
+            if isinstance(pixel_values_or_image, Image):
+                pixel_values = self.preprocess_image(pixel_values_or_image)
+            else:
+                pixel_values = pixel_values_or_image
 
         batch_size = pixel_values.shape[0]
         eos_token_id_tensor = torch.tensor([self.eos_token_id], dtype=torch.int32)
 
         # Run encoder
-        kv_cache_cross_attn = self.encoder(pixel_values)
+        with profile_stage(self, "encoder_forward"):
+            kv_cache_cross_attn = self.encoder(pixel_values)
 
         # Initial KV Cache
         initial_attn_cache = get_empty_attn_cache(
@@ -132,7 +135,8 @@ class TrOCRApp:
             self.max_seq_len is None or output_ids.shape[-1] < self.max_seq_len
         ):
             # Get next tokens. Shape: [batch_size]
-            outputs = self.decoder(input_ids, *kv_cache)
+            with profile_stage(self, "decoder_forward"):
+                outputs = self.decoder(input_ids, *kv_cache)
             next_tokens = outputs[0]
             kv_cache_attn = outputs[1:]
 
@@ -143,9 +147,13 @@ class TrOCRApp:
 
             input_ids = torch.unsqueeze(next_tokens, -1)
             output_ids = torch.cat([output_ids, input_ids], dim=-1)
-            yield self.io_processor.batch_decode(
-                output_ids, skip_special_tokens=True
-            ) if self.io_processor and not raw_output else output_ids
+            with profile_stage(self, "detokenize"):
+                output = (
+                    self.io_processor.batch_decode(output_ids, skip_special_tokens=True)
+                    if self.io_processor and not raw_output
+                    else output_ids
+                )
+            yield output
 
             # if eos_token was found in one sentence, set sentence to finished
             if eos_token_id_tensor is not None:
@@ -4,7 +4,6 @@ from typing import Any, Tuple
 
 import torch
 
-import tetra_hub as hub
 from tetra_model_zoo.trocr.model import (
     HUGGINGFACE_TROCR_MODEL,
     TrOCR,
@@ -13,6 +12,7 @@ from tetra_model_zoo.trocr.model import (
 )
 from tetra_model_zoo.utils.args import base_export_parser
 from tetra_model_zoo.utils.hub import download_hub_models
+from tetra_model_zoo.utils.local_profiling import submit_local_profile_job
 
 
 def trace_trocr(encoder: TrOCREncoder, decoder: TrOCRDecoder) -> Tuple[Any, Any]:
@@ -56,6 +56,18 @@ def main():
     # Trace the model.
     traced_encoder, traced_decoder = trace_trocr(encoder, decoder)  # type: ignore
 
+    if args.local:
+        submit_local_profile_job(
+            name="trocr_encoder",
+            model=traced_encoder,
+            input_shapes=encoder.get_input_spec(),
+            runtimes=args.local_runtimes,
+            output_dir=args.local_output_dir,
+        )
+        return
+
+    import tetra_hub as hub
+
     # Select the device you'd like to optimize for.
     devices = [hub.Device(device) for device in args.devices]
 
@@ -5,6 +5,9 @@ Utility Functions for parsing input args for export and other customer facing sc
 import argparse
 from typing import Optional
 
+from tetra_model_zoo.utils.local_profiling import LOCAL_RUNTIMES
+from tetra_model_zoo.utils.shape_buckets import parse_shape
+
 
 def base_export_parser(include_trace_option: bool = False) -> argparse.ArgumentParser:
     """
@@ -29,6 +32,24 @@ def base_export_parser(include_trace_option: bool = False) -> argparse.ArgumentP
             action="store_true",
             help="Write torchscript to current directory and exits.",
         )
+    parser.add_argument(
+        "--local",
+        action="store_true",
+        help="Export and profile on this machine's CPU instead of Tetra Hub.",
+    )
+    parser.add_argument(
+        "--local_runtimes",
+        nargs="+",
+        default=None,
+        choices=LOCAL_RUNTIMES,
+        help="Runtimes to profile on with --local. Default: every installed runtime.",
+    )
+    parser.add_argument(
+        "--local_output_dir",
+        type=str,
+        default=None,
+        help="Directory to write --local artifacts and profiles to. Default: current directory.",
+    )
     return parser
 
 
@@ -37,6 +58,7 @@ def vision_export_parser(
     default_y: int,
     dim_constraint: Optional[str] = None,
     include_trace_option: bool = False,
+    include_shape_bucket_options: bool = False,
 ) -> argparse.ArgumentParser:
     """
     Argument parser for a vision model's export script.
@@ -47,6 +69,8 @@ def vision_export_parser(
         default_y: Default height in pixels.
         dim_constraint: Help message stating any constraints on the input dimensions.
         include_trace_options: includes saving trace option if set.
+        include_shape_bucket_options: includes options to export a model per
+            input size (see utils.shape_buckets) if set.
 
     Returns:
         Arg parser object.
@@ -66,4 +90,29 @@ def vision_export_parser(
         help=f"Input image height. {dim_constraint}",
     )
     parser.add_argument("--b", type=int, default=1, help="Batch size.")
+    if include_shape_bucket_options:
+        parser.add_argument(
+            "--shape_buckets",
+            nargs="+",
+            type=parse_shape,
+            default=None,
+            metavar="HxW",
+            help="Export TorchScript models for these input sizes (height x width), "
+            "with a manifest for utils.shape_buckets.load_shape_bucket_models, "
+            "instead of a model for --x / --y. Sizes must meet the same "
+            "constraints as --x / --y.",
+        )
+        parser.add_argument(
+            "--dynamic_shapes",
+            action="store_true",
+            help="With --shape_buckets, export a single model that is checked to "
+            "be valid at every bucket size, instead of one model per bucket.",
+        )
+        parser.add_argument(
+            "--output_dir",
+            type=str,
+            default=None,
+            help="Directory to write --shape_buckets models to. "
+            "Default: current directory.",
+        )
     return parser
@@ -1,19 +1,96 @@
+from __future__ import annotations
+
+import hashlib
+import importlib.abc
+import importlib.machinery
 import os
+import re
 import sys
 import threading
 import time
-from typing import Any, Callable, Optional
-
-import gdown
-import requests
-from git import Repo
-from PIL import Image
-
-MODEL_ZOO_STORE = os.path.expanduser("~/.tetra/model-zoo")
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Set
+
+# gdown, requests, git and PIL are imported where they are used, so that
+# importing the zoo does not pay for them until an asset is fetched or loaded.
+if TYPE_CHECKING:
+    import requests
+    from PIL import Image
+
+# Environment variables that configure asset loading:
+#   TETRA_MODEL_ZOO_STORE: Root directory of downloaded assets, e.g. a
+#       pre-fetched (possibly read-only) bundle. See tetra_model_zoo.prefetch.
+#   TETRA_MODEL_ZOO_ASSUME_YES: Answer "yes" to all prompts (e.g. to clone
+#       source repositories) instead of asking on stdin.
+#   TETRA_MODEL_ZOO_OFFLINE: Raise instead of fetching missing assets.
+STORE_ENV_VAR = "TETRA_MODEL_ZOO_STORE"
+ASSUME_YES_ENV_VAR = "TETRA_MODEL_ZOO_ASSUME_YES"
+OFFLINE_ENV_VAR = "TETRA_MODEL_ZOO_OFFLINE"
+
+MODEL_ZOO_STORE = os.environ.get(STORE_ENV_VAR) or os.path.expanduser(
+    "~/.tetra/model-zoo"
+)
 MODEL_ZOO_ASSET_PATH = (
     "https://tetra-public-assets.s3.us-west-2.amazonaws.com/model-zoo"
 )
 
+# Third party caches (torch.hub / torchvision weights, Hugging Face,
+# and XDG_CACHE_HOME-based caches like whisper and CLIP), relative to the store.
+# Used to keep every asset of a pre-fetched store in one relocatable directory.
+THIRD_PARTY_CACHE_DIRS = {
+    "TORCH_HOME": "_third_party/torch",
+    "HF_HOME": "_third_party/huggingface",
+    "XDG_CACHE_HOME": "_third_party/cache",
+}
+
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+DOWNLOAD_TIMEOUT_SECONDS = 60
+MAX_DOWNLOAD_WORKERS = 4
+
+_SESSION: requests.Session | None = None
+_SESSION_LOCK = threading.Lock()
+# Destination path -> lock, so concurrent requests for the same asset
+# download it once.
+_DOWNLOAD_LOCKS: Dict[str, threading.Lock] = {}
+
+# Local paths of source repositories known to be cloned in this process,
+# and a lock per repository so each is cloned once.
+_CLONED_REPOS: Set[str] = set()
+_REPO_LOCKS: Dict[str, threading.Lock] = {}
+_REPO_LOCKS_LOCK = threading.Lock()
+
+
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, "").lower() in ("1", "true", "yes")
+
+
+def set_model_zoo_store(path: str, include_third_party_caches: bool = False) -> None:
+    """
+    Use `path` as the root directory of downloaded assets for this process
+    (and any subprocess it starts).
+
+    Parameters:
+        path: Store directory.
+        include_third_party_caches: If set, also point the torch.hub,
+            Hugging Face and XDG caches at directories inside the store.
+    """
+    global MODEL_ZOO_STORE
+    MODEL_ZOO_STORE = os.path.abspath(path)
+    os.environ[STORE_ENV_VAR] = MODEL_ZOO_STORE
+    if include_third_party_caches:
+        for env_var, subdir in THIRD_PARTY_CACHE_DIRS.items():
+            os.environ[env_var] = os.path.join(MODEL_ZOO_STORE, subdir)
+
+
+def _check_can_fetch(description: str) -> None:
+    """Raises if fetching assets is disabled (TETRA_MODEL_ZOO_OFFLINE is set)."""
+    if _env_flag(OFFLINE_ENV_VAR):
+        raise RuntimeError(
+            f"{description} is not in the model zoo store at {MODEL_ZOO_STORE}, "
+            f"and {OFFLINE_ENV_VAR} is set. Pre-fetch it with "
+            "`python -m tetra_model_zoo.prefetch`."
+        )
+
 
 def _query_yes_no(question, default="yes"):
     """
@@ -27,7 +104,12 @@ def _query_yes_no(question, default="yes"):
     The "answer" return value is True for "yes" or False for "no".
 
     Sourced from https://stackoverflow.com/questions/3041986/apt-command-line-interface-like-yes-no-input
+
+    Always returns True if TETRA_MODEL_ZOO_ASSUME_YES is set.
     """
+    if _env_flag(ASSUME_YES_ENV_VAR):
+        return True
+
     valid = {"yes": True, "y": True, "ye": True, "no": False, "n": False}
     if default is None:
         prompt = " [y/n] "
@@ -57,7 +139,10 @@ def _get_model_dir(model_name: str) -> str:
 
 def maybe_clone_git_repo(git_file_path: str, commit_hash, model_name: str) -> str:
     """Clone (or pull) a repository, save it to disk in a standard location,
-    and return the absolute path to the cloned location."""
+    and return the absolute path to the cloned location.
+
+    Safe to call from several threads; each repository is cloned at most once,
+    and the result is cached for the lifetime of the process."""
 
     # http://blah.come/author/name.git -> name, author
     repo_name = os.path.basename(git_file_path).split(".")[0]
@@ -66,33 +151,94 @@ def maybe_clone_git_repo(git_file_path: str, commit_hash, model_name: str) -> st
         _get_model_dir(model_name), f"{repo_author}_{repo_name}_git"
     )
 
-    if not os.path.exists(os.path.join(local_path, ".git")):
-        # Clone repo
-        should_clone = _query_yes_no(
-            f"{model_name} requires repository {git_file_path} . Ok to clone?",
-        )
-        if should_clone:
-            print(f"Cloning {git_file_path}to {local_path}...")
-            repo = Repo.clone_from(git_file_path, local_path)
-            repo.git.checkout(commit_hash)
-            print("Done")
-        else:
-            raise ValueError(
-                f"Unable to load {model_name} without its required repository."
+    with _REPO_LOCKS_LOCK:
+        if local_path in _CLONED_REPOS:
+            return local_path
+        repo_lock = _REPO_LOCKS.setdefault(local_path, threading.Lock())
+
+    with repo_lock:
+        if not os.path.exists(os.path.join(local_path, ".git")):
+            _check_can_fetch(f"Repository {git_file_path}")
+            # Clone repo
+            should_clone = _query_yes_no(
+                f"{model_name} requires repository {git_file_path} . Ok to clone?",
             )
+            if should_clone:
+                from git import Repo
+
+                print(f"Cloning {git_file_path}to {local_path}...")
+                repo = Repo.clone_from(git_file_path, local_path)
+                repo.git.checkout(commit_hash)
+                print("Done")
+            else:
+                raise ValueError(
+                    f"Unable to load {model_name} without its required repository."
+                )
+        with _REPO_LOCKS_LOCK:
+            _CLONED_REPOS.add(local_path)
 
     return local_path
 
 
-class SourceAsRoot:
-    THREAD_LOCK = threading.Lock()
+class _SourceRepoFinder(importlib.abc.MetaPathFinder):
+    """
+    Import hook that resolves top-level module names against the source
+    repositories made active (via SourceAsRoot) in the calling thread.
+    Other threads, and code outside of SourceAsRoot, are not affected.
 
+    Submodules (e.g. `models.common`) are found through their parent
+    package's __path__ by the standard import machinery.
     """
-    Context manager that runs code with:
-     * the source repository added to the system path,
-     * cwd set to the source repo's root directory.
 
-    Only one of this class should be active per Python session.
+    def __init__(self):
+        self._local = threading.local()
+
+    def active_paths(self) -> List[str]:
+        if not hasattr(self._local, "paths"):
+            self._local.paths = []
+        return self._local.paths
+
+    def find_spec(self, fullname, path=None, target=None):
+        paths = self.active_paths()
+        if path is not None or not paths:
+            return None
+        # Most recently entered repository first.
+        return importlib.machinery.PathFinder.find_spec(fullname, paths[::-1])
+
+
+# Repositories whose modules take priority over installed packages
+# (the equivalent of prepending to sys.path) ...
+_SOURCE_FIRST_FINDER = _SourceRepoFinder()
+# ... and repositories whose modules are only found if no installed package
+# has the same name (the equivalent of appending to sys.path).
+_SOURCE_LAST_FINDER = _SourceRepoFinder()
+_FINDERS_INSTALLED = False
+
+
+def _install_source_repo_finders() -> None:
+    global _FINDERS_INSTALLED
+    with _REPO_LOCKS_LOCK:
+        if not _FINDERS_INSTALLED:
+            sys.meta_path.insert(0, _SOURCE_FIRST_FINDER)
+            sys.meta_path.append(_SOURCE_LAST_FINDER)
+            _FINDERS_INSTALLED = True
+
+
+class SourceAsRoot:
+    """
+    Context manager that makes the modules of a source repository importable
+    by their top-level names (e.g. `from models.yolo import Model`) within
+    the current thread.
+
+    The source repository is cloned on first use. Neither sys.path nor the
+    working directory is modified, so models may be loaded concurrently from
+    several threads. Entering the context returns the repository's absolute
+    path; use it for any file the source code would otherwise open relative
+    to the repository root.
+
+    Note that imported modules are cached in sys.modules under their
+    top-level names, and that imports made by threads started inside the
+    context do not see the repository.
     """
 
     def __init__(
@@ -100,28 +246,31 @@ class SourceAsRoot:
         source_repo_url: str,
         source_repo_commit_hash: str,
         source_repo_name: str,
+        source_first: bool = False,
     ):
+        """
+        Parameters:
+            source_repo_url: Git URL of the source repository.
+            source_repo_commit_hash: Commit to check out after cloning.
+            source_repo_name: Model name. Determines where the clone is stored.
+            source_first: If set, modules in the repository take priority over
+                installed packages with the same name.
+        """
         self.source_repo_url = source_repo_url
         self.source_repo_commit_hash = source_repo_commit_hash
         self.source_repo_name = source_repo_name
+        self.finder = _SOURCE_FIRST_FINDER if source_first else _SOURCE_LAST_FINDER
 
-    def __enter__(self):
-        SourceAsRoot.THREAD_LOCK.acquire()
+    def __enter__(self) -> str:
         self.repository_path = maybe_clone_git_repo(
             self.source_repo_url, self.source_repo_commit_hash, self.source_repo_name
         )
-        self.cwd = os.getcwd()
-
-        # Patch path for this load only, since the model source
-        # code references modules via a global scope.
-        sys.path.append(self.repository_path)
-        os.chdir(self.repository_path)
+        _install_source_repo_finders()
+        self.finder.active_paths().append(self.repository_path)
+        return self.repository_path
 
     def __exit__(self, exc_type, exc_value, exc_tb):
-        # Reset global state
-        os.chdir(self.cwd)
-        sys.path.remove(self.repository_path)
-        SourceAsRoot.THREAD_LOCK.release()
+        self.finder.active_paths().pop()
 
 
 def maybe_download_s3_data(s3_path: str, model_name: str) -> str:
@@ -137,23 +286,197 @@ def maybe_download_s3_data(s3_path: str, model_name: str) -> str:
     return download_data(url, model_name)
 
 
-def download_data(url: str, model_name: str):
+def _get_session() -> requests.Session:
+    """Returns the session shared by all downloads, so connections are pooled."""
+    import requests
+
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=MAX_DOWNLOAD_WORKERS, pool_maxsize=MAX_DOWNLOAD_WORKERS
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _SESSION = session
+        return _SESSION
+
+
+def _get_download_lock(dst_path: str) -> threading.Lock:
+    with _SESSION_LOCK:
+        return _DOWNLOAD_LOCKS.setdefault(dst_path, threading.Lock())
+
+
+def compute_sha256(path: str) -> str:
+    """Returns the hex sha256 digest of the file at the given path."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_checksum_manifest(path: str) -> Dict[str, str]:
+    """
+    Reads a checksum manifest in `sha256sum` format ("<sha256>  <file name>" per line),
+    e.g. to pass the expected digests of published assets to `download_assets`.
+
+    Returns:
+        Dict of file name -> sha256. Empty if the manifest does not exist.
+    """
+    if not os.path.exists(path):
+        return {}
+    checksums = {}
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                sha256, filename = line.strip().split(maxsplit=1)
+                checksums[filename.lstrip("*")] = sha256
+    return checksums
+
+
+def _content_range_start(content_range: str | None) -> int | None:
+    """
+    Returns the first byte offset of a `Content-Range: bytes <start>-<end>/<size>`
+    header, or None if the header is missing or malformed.
+    """
+    match = re.match(r"bytes (\d+)-", content_range or "")
+    return int(match.group(1)) if match else None
+
+
+def _download_to_partial_file(url: str, partial_path: str) -> None:
+    """
+    Streams `url` to `partial_path`, resuming from the bytes already in
+    `partial_path` (if any) with a Range request.
+    """
+    resume_from = os.path.getsize(partial_path) if os.path.exists(partial_path) else 0
+    headers = {"Range": f"bytes={resume_from}-"} if resume_from else {}
+    with _get_session().get(
+        url, headers=headers, stream=True, timeout=DOWNLOAD_TIMEOUT_SECONDS
+    ) as response:
+        if response.status_code == 416 and resume_from:
+            # Nothing left to fetch; the partial file is already complete.
+            return
+        if response.status_code not in (200, 206):
+            raise ValueError(
+                f"Unable to download file at {url} (status code {response.status_code})"
+            )
+        range_start = _content_range_start(response.headers.get("Content-Range"))
+        if resume_from and response.status_code == 206 and range_start != resume_from:
+            # The server sent a different range than the one requested.
+            # Appending it would corrupt the file, so start over.
+            os.remove(partial_path)
+        else:
+            # A 200 means the server ignored the Range header, so start over.
+            mode = "ab" if response.status_code == 206 else "wb"
+            with open(partial_path, mode) as f:
+                for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+            return
+    _download_to_partial_file(url, partial_path)
+
+
+def download_data(
+    url: str,
+    model_name: str,
+    filename: str | None = None,
+    sha256: str | None = None,
+    num_retries: int = 3,
+) -> str:
     """
     Downloads data from the internet and stores it in the same directory as
-    other assets for the model. Returns the local filepath of the download data.
+    other assets for the model.
+
+    The file is streamed to `<filename>.part` and only moved to its final
+    path once complete (and verified, if `sha256` is given). Interrupted
+    downloads resume from the partial file, both across retries and across
+    processes.
+
+    Parameters:
+        url: URL of the file to download.
+        model_name: Model for which this asset is being downloaded.
+            Used to choose where in the local filesystem to put it.
+        filename: Local file name. Defaults to the last component of the URL.
+        sha256: Expected sha256 of the file. If not provided, the file is not
+            verified.
+        num_retries: Number of times to retry (resuming) after a network error.
+
+    Returns:
+        The local filepath of the download data.
+
+    Raises:
+        ValueError if the server returns an error, or the downloaded file
+        does not match the expected checksum.
     """
-    dst_path = os.path.join(_get_model_dir(model_name), url.rsplit("/", 1)[-1])
-    if not os.path.exists(dst_path):
-        print(f"Downloading data at {url} to {dst_path}... ", end="")
-        file_data = requests.get(url)
-        if file_data.status_code != 200:
-            raise ValueError(f"Unable to download file at {url}")
-        with open(dst_path, "wb") as dst_file:
-            dst_file.write(file_data.content)
-        print("Done")
+    import requests
+
+    model_dir = _get_model_dir(model_name)
+    filename = filename or url.rsplit("/", 1)[-1]
+    dst_path = os.path.join(model_dir, filename)
+    with _get_download_lock(dst_path):
+        if os.path.exists(dst_path):
+            return dst_path
+
+        partial_path = dst_path + ".part"
+
+        _check_can_fetch(f"Asset {url}")
+        print(f"Downloading data at {url} to {dst_path}... ")
+        for attempt in range(num_retries + 1):
+            try:
+                _download_to_partial_file(url, partial_path)
+                break
+            except requests.exceptions.RequestException as error:
+                if attempt == num_retries:
+                    raise
+                print(f"Download of {url} interrupted ({error}). Resuming...")
+                time.sleep(min(2**attempt, 10))
+
+        if sha256 is not None:
+            actual_sha256 = compute_sha256(partial_path)
+            if actual_sha256 != sha256:
+                os.remove(partial_path)
+                raise ValueError(
+                    f"Checksum mismatch for {url}: expected sha256 {sha256}, "
+                    f"got {actual_sha256}."
+                )
+        os.replace(partial_path, dst_path)
+        print(f"Downloaded {dst_path}")
     return dst_path
 
 
+def download_assets(
+    urls: Sequence[str],
+    model_name: str,
+    checksums: Dict[str, str] | None = None,
+    max_workers: int = MAX_DOWNLOAD_WORKERS,
+) -> List[str]:
+    """
+    Downloads several assets for a model concurrently. See `download_data`.
+
+    Parameters:
+        urls: URLs of the files to download.
+        model_name: Model for which these assets are being downloaded.
+        checksums: Optional manifest of file name -> expected sha256.
+        max_workers: Maximum number of concurrent downloads.
+
+    Returns:
+        The local filepath of each asset, in the same order as `urls`.
+    """
+    checksums = checksums or {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [
+            pool.submit(
+                download_data,
+                url,
+                model_name,
+                sha256=checksums.get(url.rsplit("/", 1)[-1]),
+            )
+            for url in urls
+        ]
+        return [future.result() for future in futures]
+
+
 def download_google_drive(file_id: str, model_name: str, filename: str):
     """
     Download file from google drive to the local directory.
@@ -171,7 +494,10 @@ def download_google_drive(file_id: str, model_name: str, filename: str):
     dst_path = os.path.join(_get_model_dir(model_name), filename)
     if not os.path.exists(dst_path):
         url = f"https://drive.google.com/uc?id={file_id}"
+        _check_can_fetch(f"Asset {url}")
         print(f"Downloading data at {url} to {dst_path}... ", end="")
+        import gdown
+
         gdown.download(url, dst_path, quiet=False)
         print("Done")
     return dst_path
@@ -180,6 +506,8 @@ def download_google_drive(file_id: str, model_name: str, filename: str):
 def load_image(image_path: str, model_name: str) -> Image.Image:
     """Loads an image from the specified path.
     Will first download the image to the appropriate standard location if image_path is a URL."""
+    from PIL import Image
+
     if image_path.startswith("http"):
         image_path = download_data(image_path, model_name)
 
@@ -0,0 +1,85 @@
+"""
+Utility functions for timing models and writing benchmark results.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import time
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+# A single benchmark measurement. Flat (str -> scalar) so it can be written
+# to both JSON and CSV.
+BenchmarkRecord = Dict[str, Any]
+
+
+def time_function(
+    fn: Callable[[], Any],
+    num_warmup: int = 3,
+    num_iterations: int = 20,
+) -> Tuple[float, List[float]]:
+    """
+    Times repeated calls of `fn`.
+
+    Parameters:
+        fn: Function to time. Called with no arguments.
+        num_warmup: Number of untimed calls made before measuring.
+        num_iterations: Number of timed calls.
+
+    Returns:
+        warmup_ms: Total time spent in warmup calls, in milliseconds.
+        latencies_ms: Latency of each timed call, in milliseconds.
+    """
+    start = time.perf_counter()
+    for _ in range(num_warmup):
+        fn()
+    warmup_ms = (time.perf_counter() - start) * 1000
+
+    latencies_ms = []
+    for _ in range(num_iterations):
+        start = time.perf_counter()
+        fn()
+        latencies_ms.append((time.perf_counter() - start) * 1000)
+    return warmup_ms, latencies_ms
+
+
+def compute_latency_stats(latencies_ms: Sequence[float]) -> Dict[str, float]:
+    """
+    Summarizes a list of latencies (in milliseconds).
+
+    Returns:
+        Dict with keys mean_ms, min_ms, max_ms, p50_ms, p95_ms, p99_ms.
+    """
+    latencies = np.asarray(latencies_ms, dtype=np.float64)
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return dict(
+        mean_ms=float(latencies.mean()),
+        min_ms=float(latencies.min()),
+        max_ms=float(latencies.max()),
+        p50_ms=float(p50),
+        p95_ms=float(p95),
+        p99_ms=float(p99),
+    )
+
+
+def write_json(records: List[BenchmarkRecord], path: str) -> None:
+    """Writes benchmark records to `path` as a JSON list."""
+    with open(path, "w") as f:
+        json.dump(records, f, indent=2)
+
+
+def write_csv(records: List[BenchmarkRecord], path: str) -> None:
+    """
+    Writes benchmark records to `path` as CSV. The header is the union of
+    all record keys, in order of first appearance.
+    """
+    fieldnames: List[str] = []
+    for record in records:
+        fieldnames.extend(k for k in record if k not in fieldnames)
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(records)
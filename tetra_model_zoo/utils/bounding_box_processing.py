@@ -2,10 +2,11 @@ from __future__ import annotations
 
 from typing import List, Tuple
 
-import cv2
 import numpy as np
 import torch
-from torchvision.ops import nms
+
+# cv2 and torchvision are imported by the functions that use them, since
+# importing them dominates the import time of apps that don't.
 
 
 def batched_nms(
@@ -48,6 +49,8 @@ def batched_nms(
         *args : List[torch.Tensor], ...
             "Gathered" additional arguments, if provided.
     """
+    from torchvision.ops import nms
+
     scores_out: List[torch.Tensor] = []
     boxes_out: List[torch.Tensor] = []
     args_out: List[List[torch.Tensor]] = (
@@ -154,6 +157,8 @@ def compute_box_affine_crop_resize_matrix(
         affines: List[np.ndarray]
             Computed affine transform matrices. Shape is (2 x 3)
     """
+    import cv2
+
     # Define coordinates for translated image
     network_input_points = np.array(
         [[0, 0], [0, output_image_size[1] - 1], [output_image_size[0] - 1, 0]],
@@ -4,23 +4,21 @@ import numpy as np
 import torch
 
 
-def compare_psnr(
+def compute_psnr(
     output_a: Union[torch.Tensor, np.ndarray],
     output_b: Union[torch.Tensor, np.ndarray],
-    psnr_threshold: int,
     eps: float = 1e-5,
     eps2: float = 1e-10,
-) -> None:
+) -> float:
     """
-    Computes the PSNR between two tensors.
-    Returns True if its above the PSNR threshold otherwise False.
+    Computes the PSNR between two tensors, relative to the peak magnitude of `output_b`.
     """
     if not isinstance(output_a, np.ndarray):
-        a = output_a.detach().numpy().flatten()
+        a = output_a.detach().float().numpy().flatten()
     else:
         a = output_a.flatten()
     if not isinstance(output_b, np.ndarray):
-        b = output_b.detach().numpy().flatten()
+        b = output_b.detach().float().numpy().flatten()
     else:
         b = output_b.flatten()
     max_b = np.abs(b).max()
@@ -29,5 +27,19 @@ def compare_psnr(
     sumdeltasq /= b.size
     sumdeltasq = np.sqrt(sumdeltasq)
 
-    psnr = 20 * np.log10((max_b + eps) / (sumdeltasq + eps2))
+    return float(20 * np.log10((max_b + eps) / (sumdeltasq + eps2)))
+
+
+def compare_psnr(
+    output_a: Union[torch.Tensor, np.ndarray],
+    output_b: Union[torch.Tensor, np.ndarray],
+    psnr_threshold: int,
+    eps: float = 1e-5,
+    eps2: float = 1e-10,
+) -> None:
+    """
+    Computes the PSNR between two tensors.
+    Returns True if its above the PSNR threshold otherwise False.
+    """
+    psnr = compute_psnr(output_a, output_b, eps, eps2)
     assert psnr > psnr_threshold
@@ -0,0 +1,228 @@
+"""
+CPU inference optimizations for CNN models.
+
+`optimize_for_cpu` applies, in place, the optimizations that are otherwise
+applied by hand after loading a CNN:
+    * BatchNorm layers are folded into the preceding convolution's weights.
+    * 2D convolution weights (and 4D inputs) are converted to the
+      channels_last memory format, which oneDNN convolutions run fastest in.
+    * The network is traced, frozen (`torch.jit.freeze`) and optimized with
+      `torch.jit.optimize_for_inference`, which folds the remaining
+      Conv-BN / Conv-Add / Conv-Mul patterns and removes Python overhead.
+
+The model keeps its interface: its methods (get_input_spec, ...) still
+work, and outputs are returned in the default contiguous layout.
+A frozen network is specialized to the shapes it was traced with (shape
+dependent Python logic, e.g. anchor grids, is fixed at trace time), so it
+only runs inputs of those shapes. Inputs of any other shape run eagerly.
+"""
+
+from __future__ import annotations
+
+import copy
+import warnings
+from typing import Any, List, Sequence
+
+import torch
+from torch.nn.utils.fusion import fuse_conv_bn_eval
+
+from tetra_model_zoo.utils.input_spec import make_torch_inputs
+from tetra_model_zoo.utils.precision import get_model_modules
+
+_CONV_TYPES = (torch.nn.Conv1d, torch.nn.Conv2d, torch.nn.Conv3d)
+_CONV_2D_TYPES = (torch.nn.Conv2d, torch.nn.ConvTranspose2d)
+_BN_TYPES = (torch.nn.BatchNorm1d, torch.nn.BatchNorm2d, torch.nn.BatchNorm3d)
+
+
+def fold_conv_bn(module: torch.nn.Module) -> int:
+    """
+    Folds each BatchNorm that directly follows a convolution in an
+    nn.Sequential into the convolution, in place. The module must be in eval mode.
+
+    Returns:
+        The number of BatchNorm layers folded.
+    """
+    num_folded = 0
+    for submodule in list(module.modules()):
+        if not isinstance(submodule, torch.nn.Sequential):
+            continue
+        names = list(submodule._modules)
+        for conv_name, bn_name in zip(names, names[1:]):
+            conv = submodule._modules[conv_name]
+            bn = submodule._modules[bn_name]
+            if (
+                isinstance(conv, _CONV_TYPES)
+                and type(bn) in _BN_TYPES
+                and bn.track_running_stats
+                and not conv.training
+                and not bn.training
+            ):
+                # BN may be kept in fp32 for a reduced precision conv (see
+                # utils.precision): fold in fp32, then cast to the conv's dtype.
+                dtype = conv.weight.dtype
+                submodule._modules[conv_name] = fuse_conv_bn_eval(
+                    copy.deepcopy(conv).float(), copy.deepcopy(bn).float()
+                ).to(dtype)
+                submodule._modules[bn_name] = torch.nn.Identity()
+                num_folded += 1
+    return num_folded
+
+
+def _map_tensors(value: Any, fn) -> Any:
+    if isinstance(value, torch.Tensor):
+        return fn(value)
+    if isinstance(value, tuple) and hasattr(value, "_fields"):  # NamedTuple
+        return type(value)(*(_map_tensors(v, fn) for v in value))
+    if isinstance(value, (tuple, list)):
+        return type(value)(_map_tensors(v, fn) for v in value)
+    if isinstance(value, dict):
+        return {k: _map_tensors(v, fn) for k, v in value.items()}
+    return value
+
+
+def _to_channels_last(tensor: torch.Tensor) -> torch.Tensor:
+    if tensor.dim() == 4 and tensor.is_floating_point():
+        return tensor.contiguous(memory_format=torch.channels_last)
+    return tensor
+
+
+def conv_weights_to_channels_last(module: torch.nn.Module) -> int:
+    """
+    Converts the weights of the 2D convolutions in the module to channels_last,
+    in place. Other parameters and buffers (which may be of any rank, e.g. the
+    5D anchor grids of YOLO detectors) keep their layout.
+
+    Returns:
+        The number of converted convolutions.
+    """
+    num_converted = 0
+    for submodule in module.modules():
+        if isinstance(submodule, _CONV_2D_TYPES) and submodule.weight.dim() == 4:
+            submodule.weight.data = submodule.weight.data.contiguous(
+                memory_format=torch.channels_last
+            )
+            num_converted += 1
+    return num_converted
+
+
+def _input_shapes(value: Any) -> Any:
+    return _map_tensors(value, lambda tensor: tuple(tensor.shape))
+
+
+def _to_contiguous(tensor: torch.Tensor) -> torch.Tensor:
+    return tensor.contiguous()
+
+
+def _channels_last_inputs_hook(module, args):
+    return _map_tensors(args, _to_channels_last)
+
+
+def _contiguous_outputs_hook(module, args, output):
+    return _map_tensors(output, _to_contiguous)
+
+
+def _freeze(
+    network: torch.nn.Module, example_inputs: Sequence[torch.Tensor]
+) -> torch.jit.ScriptModule:
+    example_inputs = _map_tensors(tuple(example_inputs), _to_channels_last)
+    with torch.no_grad():
+        traced = torch.jit.trace(network, example_inputs, check_trace=False)
+        frozen = torch.jit.optimize_for_inference(torch.jit.freeze(traced))
+        # The first runs specialize the graph to the inputs.
+        for _ in range(2):
+            frozen(*example_inputs)
+    return frozen
+
+
+def optimize_network_for_cpu(
+    network: torch.nn.Module,
+    example_inputs: Sequence[torch.Tensor] | None = None,
+    freeze: bool = True,
+) -> torch.nn.Module:
+    """
+    Optimizes a network for CPU inference, in place (see module docstring).
+
+    Parameters:
+        network: Network to optimize. It is put in eval mode.
+        example_inputs: Inputs to trace the network with. Defaults to inputs
+            made from the network's `get_input_spec`.
+        freeze: Trace and freeze the network. The frozen graph runs inputs of
+            the example inputs' shapes; other inputs run eagerly. If tracing
+            fails, a warning is issued and the network always runs eagerly
+            (with BN folded and channels_last weights).
+
+    Returns:
+        The network.
+    """
+    if getattr(network, "_zoo_cpu_optimized", False):
+        raise ValueError("This network has already been optimized.")
+    network.eval()
+    fold_conv_bn(network)
+    conv_weights_to_channels_last(network)
+    network.register_forward_pre_hook(_channels_last_inputs_hook)
+    network.register_forward_hook(_contiguous_outputs_hook)
+    network._zoo_cpu_optimized = True  # type: ignore
+
+    if freeze:
+        if example_inputs is None:
+            example_inputs = make_torch_inputs(network.get_input_spec())
+        try:
+            frozen = _freeze(network, example_inputs)
+        except Exception as e:
+            warnings.warn(
+                f"Could not freeze {network.__class__.__name__}, running it "
+                f"eagerly: {e!r}"
+            )
+        else:
+            # Calls go through the network's hooks, then the frozen graph if
+            # the inputs have the traced shapes.
+            network.forward = _FrozenForward(  # type: ignore
+                frozen, _input_shapes(tuple(example_inputs)), network.forward
+            )
+    return network
+
+
+class _FrozenForward:
+    """
+    Runs a frozen graph on inputs of the shapes it was traced with, and the
+    eager forward on any other input.
+    """
+
+    def __init__(
+        self, frozen: torch.jit.ScriptModule, input_shapes: Any, eager_forward
+    ):
+        self.frozen = frozen
+        self.input_shapes = input_shapes
+        self.eager_forward = eager_forward
+
+    def __call__(self, *args, **kwargs):
+        if not kwargs and _input_shapes(args) == self.input_shapes:
+            return self.frozen(*args)
+        return self.eager_forward(*args, **kwargs)
+
+
+def optimize_for_cpu(
+    model: Any,
+    example_inputs: Sequence[torch.Tensor] | None = None,
+    freeze: bool = True,
+):
+    """
+    Optimizes a zoo model for CPU inference, in place.
+
+    Parameters:
+        model: A zoo model: a torch module, or an object holding torch
+            modules (e.g. the encoder and decoder of Whisper), each of which
+            is optimized.
+        example_inputs: Inputs to trace with (only for a single network).
+            Defaults to inputs made from each network's `get_input_spec`.
+        freeze: Trace and freeze each network. See `optimize_network_for_cpu`.
+
+    Returns:
+        The model.
+    """
+    networks: List[torch.nn.Module] = get_model_modules(model)
+    if example_inputs is not None and len(networks) != 1:
+        raise ValueError("example_inputs can only be given for a single network.")
+    for network in networks:
+        optimize_network_for_cpu(network, example_inputs, freeze)
+    return model
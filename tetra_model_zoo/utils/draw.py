@@ -1,12 +1,48 @@
+"""
+Drawing of points, connections and boxes on frames.
+
+Every function accepts a single set of points / boxes or a batch of them
+(e.g. the landmarks of every detected face), converts them to numpy once,
+and draws the whole batch with a single OpenCV call or a vectorized numpy
+assignment instead of one call per point.
+"""
+
 from __future__ import annotations
 
-from typing import List, Tuple
+from functools import lru_cache
+from typing import List, Sequence, Tuple
 
 import cv2
 import numpy
 import torch
 
 
+def _to_int_points(points: numpy.ndarray | torch.Tensor | Sequence) -> numpy.ndarray:
+    """
+    Converts points to an int32 numpy array of shape [..., 2], where 2 == (x, y).
+    Coordinates are truncated, like int(). A 1D array is read as
+    x1, y1, x2, y2, ...
+    """
+    if isinstance(points, torch.Tensor):
+        points = points.detach().cpu().numpy()
+    points = numpy.asarray(points)
+    if points.ndim == 1:
+        points = points.reshape(-1, 2)
+    return points.astype(numpy.int32)
+
+
+@lru_cache(maxsize=None)
+def _circle_offsets(size: int) -> Tuple[numpy.ndarray, numpy.ndarray]:
+    """
+    Pixel offsets (y, x) from the center of cv2.circle(radius=size, thickness=size).
+    """
+    extent = 2 * size + 1
+    stamp = numpy.zeros((2 * extent + 1, 2 * extent + 1), dtype=numpy.uint8)
+    cv2.circle(stamp, (extent, extent), size, 1, thickness=size)
+    offset_y, offset_x = numpy.nonzero(stamp)
+    return offset_y - extent, offset_x - extent
+
+
 def draw_points(
     frame: numpy.ndarray,
     points: numpy.ndarray | torch.Tensor,
@@ -26,6 +62,8 @@ def draw_points(
             or
             array (N * 2,) where layout is
                 x1, y1, x2, y2, ...
+            or
+            array (..., N, 2), e.g. the keypoints of several detections.
 
         color: Tuple[int, int, int]
             Color of drawn points (RGB)
@@ -36,10 +74,28 @@ def draw_points(
     Returns:
         None; modifies frame in place.
     """
-    n2 = len(points.shape) == 2
-    for i in range(0, len(points) if n2 else len(points) // 2):
-        x, y = points[i] if n2 else (points[i * 2], points[i * 2 + 1])
-        cv2.circle(frame, (int(x), int(y)), size, color, thickness=size)
+    points = _to_int_points(points).reshape(-1, 2)
+    if len(points) == 0:
+        return
+
+    # Stamp the pixels of cv2.circle(radius=size, thickness=size) at every point
+    # whose circle is entirely inside the frame. OpenCV clips circles that cross
+    # the frame border slightly differently, so those are drawn one at a time.
+    offset_y, offset_x = _circle_offsets(size)
+    extent = max(-offset_x.min(), offset_x.max(), -offset_y.min(), offset_y.max())
+    x, y = points[:, 0], points[:, 1]
+    inside = (
+        (x >= extent)
+        & (x < frame.shape[1] - extent)
+        & (y >= extent)
+        & (y < frame.shape[0] - extent)
+    )
+    value = color[0] if frame.ndim == 2 else color[: frame.shape[2]]
+    frame[
+        (y[inside, None] + offset_y).ravel(), (x[inside, None] + offset_x).ravel()
+    ] = value
+    for point in points[~inside].tolist():
+        cv2.circle(frame, tuple(point), size, color, thickness=size)
 
 
 def draw_connections(
@@ -62,6 +118,9 @@ def draw_connections(
             or
             array (N * 2,) where layout is
                 x1, y1, x2, y2, ...
+            or
+            array (..., N, 2), e.g. the landmarks of several detections.
+            The same connections are drawn for each set of N points.
 
         connections: List[Tuple[int, int]]
             List of points that should be connected by a line.
@@ -76,21 +135,12 @@ def draw_connections(
     Returns:
         None; modifies frame in place.
     """
-    n2 = len(points.shape) == 2
-    for connection in connections:
-        x0, y0 = (
-            points[connection[0]]
-            if n2
-            else (points[connection[0] * 2], points[connection[0] * 2 + 1])
-        )
-        x1, y1 = (
-            points[connection[1]]
-            if n2
-            else (points[connection[1] * 2], points[connection[1] * 2 + 1])
-        )
-        x0, y0 = int(x0), int(y0)
-        x1, y1 = int(x1), int(y1)
-        cv2.line(frame, (x0, y0), (x1, y1), color, size)
+    points = _to_int_points(points)
+    if len(connections) == 0 or points.size == 0:
+        return
+    # [..., num connections, 2 (src, dst), 2 (x, y)]
+    lines = points[..., numpy.asarray(connections), :].reshape(-1, 2, 2)
+    cv2.polylines(frame, list(lines), False, color, size)
 
 
 def draw_box_from_corners(
@@ -109,6 +159,8 @@ def draw_box_from_corners(
             or
             array (8) where layout is
                 x1, y1, x2, y2
+            or
+            array (N, 4, 2) to draw N boxes.
 
         color: Tuple[int, int, int]
             Color of drawn points and connection lines (BGR)
@@ -119,6 +171,7 @@ def draw_box_from_corners(
     Returns:
         None; modifies frame in place.
     """
+    corners = _to_int_points(corners)
     draw_points(frame, corners, color, size)
     draw_connections(frame, corners, [(0, 1), (0, 2), (1, 3), (2, 3)], color, size)
 
@@ -183,7 +236,46 @@ def draw_box_from_xyxy(
         None; modifies frame in place.
     """
     if not isinstance(top_left, tuple):
-        top_left = (int(top_left[0].item()), int(top_left[1].item()))
+        top_left = tuple(_to_int_points(top_left)[0].tolist())
     if not isinstance(bottom_right, tuple):
-        bottom_right = (int(bottom_right[0].item()), int(bottom_right[1].item()))
+        bottom_right = tuple(_to_int_points(bottom_right)[0].tolist())
     cv2.rectangle(frame, top_left, bottom_right, color, size)
+
+
+def draw_boxes_from_xyxy(
+    frame: numpy.ndarray,
+    boxes: numpy.ndarray | torch.Tensor,
+    color: Tuple[int, int, int] = (0, 0, 0),
+    size: int = 3,
+):
+    """
+    Draw boxes given by their top left / bottom right points. Batched
+    equivalent of draw_box_from_xyxy.
+
+    Parameters:
+        frame: numpy.ndarray
+            numpy array (H W C x uint8, BGR)
+
+        boxes: numpy.ndarray | torch.Tensor
+            array (N, 4) where layout is
+                [x1, y1, x2, y2]
+            or
+            array (N, 2, 2) where layout is
+                [[x1, y1], [x2, y2]]
+
+        color: Tuple[int, int, int]
+            Color of drawn boxes (RGB)
+
+        size: int
+            Size of drawn box lines
+
+    Returns:
+        None; modifies frame in place.
+    """
+    boxes = _to_int_points(boxes).reshape(-1, 4)
+    if len(boxes) == 0:
+        return
+    x1, y1, x2, y2 = boxes.T
+    # cv2.rectangle draws the closed polyline through the 4 corners.
+    corners = numpy.stack([x1, y1, x2, y1, x2, y2, x1, y2], axis=-1).reshape(-1, 4, 2)
+    cv2.polylines(frame, list(corners), True, color, size)
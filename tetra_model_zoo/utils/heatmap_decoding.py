@@ -0,0 +1,183 @@
+"""
+Decoding of keypoint heatmaps, as predicted by top-down pose estimation
+models, to keypoint coordinates.
+
+Decoding is batched over any leading dimensions and written in torch only,
+so that it can run inside (and be traced into) the model instead of as a
+numpy post-processing step. Keypoints are the heatmap maximum, optionally
+refined to sub-pixel precision:
+    * quarter_offset: shifts each keypoint by a quarter pixel towards its
+      higher neighbor, like MMPose's default (MSRAHeatmap) decoding.
+    * dark: Distribution-Aware coordinate Representation of Keypoints
+      (https://arxiv.org/abs/1910.06278), a second order Taylor expansion of
+      the log of the blurred heatmap around its maximum.
+"""
+
+from __future__ import annotations
+
+from typing import Tuple
+
+import torch
+import torch.nn.functional as F
+
+HEATMAP_REFINEMENTS = ("none", "quarter_offset", "dark")
+
+
+def get_heatmap_maximum(heatmaps: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+    """
+    Inputs:
+        heatmaps: torch.Tensor
+            Heatmaps. Shape is [..., H, W]
+
+    Outputs:
+        keypoints: torch.Tensor
+            Location of each heatmap's maximum. Shape is [..., 2], where 2 == (x, y)
+        scores: torch.Tensor
+            Each heatmap's maximum. Shape is [...]
+    """
+    W = heatmaps.shape[-1]
+    scores, indices = heatmaps.flatten(-2).max(dim=-1)
+    keypoints = torch.stack((indices % W, indices // W), dim=-1).float()
+    return keypoints, scores
+
+
+def _heatmap_at(heatmaps: torch.Tensor, x: torch.Tensor, y: torch.Tensor):
+    """Values of heatmaps [..., H, W] at (x, y) [...], clamped to the borders."""
+    H, W = heatmaps.shape[-2:]
+    index = y.clamp(0, H - 1) * W + x.clamp(0, W - 1)
+    return heatmaps.flatten(-2).gather(-1, index.unsqueeze(-1)).squeeze(-1)
+
+
+def refine_keypoints_quarter_offset(
+    keypoints: torch.Tensor, heatmaps: torch.Tensor
+) -> torch.Tensor:
+    """
+    Shifts each keypoint by a quarter pixel towards the higher neighboring
+    heatmap value. Batched equivalent of mmpose.codecs.utils.refine_keypoints.
+
+    Inputs:
+        keypoints: torch.Tensor
+            Heatmap maximum of each keypoint. Shape is [..., 2], where 2 == (x, y)
+        heatmaps: torch.Tensor
+            Heatmaps. Shape is [..., H, W]
+
+    Outputs:
+        Refined keypoints. Shape is [..., 2]
+    """
+    H, W = heatmaps.shape[-2:]
+    x = keypoints[..., 0].long()
+    y = keypoints[..., 1].long()
+
+    dx = _heatmap_at(heatmaps, x + 1, y) - _heatmap_at(heatmaps, x - 1, y)
+    dx = torch.where((x > 1) & (x < W - 1) & (y > 0) & (y < H), dx, 0)
+    dy = _heatmap_at(heatmaps, x, y + 1) - _heatmap_at(heatmaps, x, y - 1)
+    dy = torch.where((y > 1) & (y < H - 1) & (x > 0) & (x < W), dy, 0)
+    return keypoints + torch.stack((dx, dy), dim=-1).sign() * 0.25
+
+
+def gaussian_blur_heatmaps(heatmaps: torch.Tensor, kernel_size: int = 11):
+    """
+    Blurs each heatmap (zero padded) with a Gaussian kernel, preserving its
+    maximum. Equivalent of mmpose.codecs.utils.gaussian_blur.
+
+    Inputs:
+        heatmaps: torch.Tensor
+            Heatmaps. Shape is [..., H, W]
+        kernel_size: int
+            Odd size of the Gaussian kernel. Its sigma is derived from the size
+            like cv2.getGaussianKernel does.
+
+    Outputs:
+        Blurred heatmaps. Shape is [..., H, W]
+    """
+    sigma = 0.3 * ((kernel_size - 1) * 0.5 - 1) + 0.8
+    border = (kernel_size - 1) // 2
+    coords = torch.arange(kernel_size, dtype=heatmaps.dtype) - border
+    kernel = torch.exp(-(coords**2) / (2 * sigma**2))
+    kernel = kernel / kernel.sum()
+
+    H, W = heatmaps.shape[-2:]
+    blurred = heatmaps.reshape(-1, 1, H, W)
+    blurred = F.conv2d(blurred, kernel.view(1, 1, 1, -1), padding=(0, border))
+    blurred = F.conv2d(blurred, kernel.view(1, 1, -1, 1), padding=(border, 0))
+    blurred = blurred.reshape(heatmaps.shape)
+
+    max_values = heatmaps.flatten(-2).amax(-1)[..., None, None]
+    blurred_max_values = blurred.flatten(-2).amax(-1)[..., None, None]
+    return blurred * (max_values / blurred_max_values.clamp(min=1e-10))
+
+
+def refine_keypoints_dark(
+    keypoints: torch.Tensor, heatmaps: torch.Tensor, blur_kernel_size: int = 11
+) -> torch.Tensor:
+    """
+    Refines keypoints with DARK. Batched equivalent of
+    mmpose.codecs.utils.refine_keypoints_dark.
+
+    Inputs:
+        keypoints: torch.Tensor
+            Heatmap maximum of each keypoint. Shape is [..., 2], where 2 == (x, y)
+        heatmaps: torch.Tensor
+            Heatmaps. Shape is [..., H, W]
+        blur_kernel_size: int
+            Size of the Gaussian kernel the heatmaps are smoothed with. Should
+            roughly match the size of the Gaussians the model was trained on.
+
+    Outputs:
+        Refined keypoints. Shape is [..., 2]
+    """
+    H, W = heatmaps.shape[-2:]
+    heatmaps = gaussian_blur_heatmaps(heatmaps, blur_kernel_size).clamp(min=1e-10).log()
+    x = keypoints[..., 0].long()
+    y = keypoints[..., 1].long()
+
+    def at(offset_x: int, offset_y: int) -> torch.Tensor:
+        return _heatmap_at(heatmaps, x + offset_x, y + offset_y)
+
+    center = at(0, 0)
+    dx = 0.5 * (at(1, 0) - at(-1, 0))
+    dy = 0.5 * (at(0, 1) - at(0, -1))
+    dxx = 0.25 * (at(2, 0) - 2 * center + at(-2, 0))
+    dxy = 0.25 * (at(1, 1) - at(1, -1) - at(-1, 1) + at(-1, -1))
+    dyy = 0.25 * (at(0, 2) - 2 * center + at(0, -2))
+
+    # offset = -hessian^-1 @ derivative
+    det = dxx * dyy - dxy**2
+    valid = (x > 1) & (x < W - 2) & (y > 1) & (y < H - 2) & (det != 0)
+    det = torch.where(valid, det, 1)
+    offset = torch.stack(((dxy * dy - dyy * dx) / det, (dxy * dx - dxx * dy) / det), -1)
+    return keypoints + torch.where(valid.unsqueeze(-1), offset, 0)
+
+
+def decode_heatmaps(
+    heatmaps: torch.Tensor,
+    refinement: str = "quarter_offset",
+    blur_kernel_size: int = 11,
+) -> Tuple[torch.Tensor, torch.Tensor]:
+    """
+    Inputs:
+        heatmaps: torch.Tensor
+            Heatmaps. Shape is [..., H, W], typically [B, K, H, W]
+        refinement: str
+            Sub-pixel refinement, one of HEATMAP_REFINEMENTS.
+        blur_kernel_size: int
+            See refine_keypoints_dark.
+
+    Outputs:
+        keypoints: torch.Tensor
+            Keypoint of each heatmap, in heatmap coordinates. Shape is [..., 2],
+            where 2 == (x, y)
+        scores: torch.Tensor
+            Each heatmap's maximum. Shape is [...]
+    """
+    if refinement not in HEATMAP_REFINEMENTS:
+        raise ValueError(
+            f"Unknown refinement {refinement}. "
+            f"Expected one of {', '.join(HEATMAP_REFINEMENTS)}."
+        )
+    keypoints, scores = get_heatmap_maximum(heatmaps)
+    if refinement == "quarter_offset":
+        keypoints = refine_keypoints_quarter_offset(keypoints, heatmaps)
+    elif refinement == "dark":
+        keypoints = refine_keypoints_dark(keypoints, heatmaps, blur_kernel_size)
+    return keypoints, scores
@@ -1,7 +1,10 @@
+from __future__ import annotations
+
 import os
-from typing import List, Union
+from typing import TYPE_CHECKING, List, Union
 
-import tetra_hub as hub
+if TYPE_CHECKING:
+    import tetra_hub as hub
 
 
 def download_hub_models(jobs: Union[hub.Job, List[hub.Job]]) -> List[str]:
@@ -14,6 +17,8 @@ def download_hub_models(jobs: Union[hub.Job, List[hub.Job]]) -> List[str]:
         List of local paths to which models were downloaded.
     """
 
+    import tetra_hub as hub
+
     if not isinstance(jobs, list):
         jobs = [jobs]
 
@@ -2,14 +2,14 @@ from __future__ import annotations
 
 from typing import Callable, List, Tuple
 
-import cv2
 import numpy as np
 import torch
-import torchvision.transforms as transforms
 from PIL.Image import Image
 from PIL.Image import fromarray as ImageFromArray
 from torch.nn.functional import interpolate, pad
-from torchvision import transforms
+
+# cv2 and torchvision are imported by the functions that use them, since
+# importing them dominates the import time of apps that don't.
 
 
 def app_to_net_image_inputs(
@@ -70,6 +70,8 @@ def app_to_net_image_inputs(
 
 def preprocess_PIL_image(image: Image) -> torch.Tensor:
     """Convert a PIL image into a pyTorch tensor with range [0, 1] and shape NCHW."""
+    from torchvision import transforms
+
     transform = transforms.Compose([transforms.PILToTensor()])  # bgr image
     img: torch.Tensor = transform(image)  # type: ignore
     img = img.float().unsqueeze(0) / 255.0  # int 0 - 255 to float 0.0 - 1.0
@@ -78,6 +80,8 @@ def preprocess_PIL_image(image: Image) -> torch.Tensor:
 
 def preprocess_PIL_image_mask(image_mask: Image) -> torch.Tensor:
     """Convert a PIL mask image into a pyTorch tensor with values 0. or 1."""
+    from torchvision import transforms
+
     transform = transforms.Compose([transforms.PILToTensor()])
     mask = transform(image_mask.convert("L"))
     mask = mask.unsqueeze(0).float()
@@ -110,6 +114,8 @@ def normalize_image_tranform() -> Callable:
     There are many PyTorch models that expect input images normalized with
     these specific constants, so this utility can be re-used across many models.
     """
+    from torchvision import transforms
+
     return transforms.Compose(
         [
             transforms.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225]),
@@ -140,10 +146,7 @@ def resize_pad(image: torch.Tensor, dst_size: Tuple[int, int]):
 
     h_ratio = dst_frame_height / height
     w_ratio = dst_frame_width / width
-    if width * h_ratio > dst_frame_height:
-        scale = w_ratio
-    else:
-        scale = h_ratio
+    scale = min(h_ratio, w_ratio)
 
     import math
 
@@ -235,6 +238,8 @@ def apply_batched_affines_to_frame(
     assert (
         frame.dtype == np.byte or frame.dtype == np.uint8
     )  # cv2 does not work correctly otherwise. Don't remove this assertion.
+    import cv2
+
     imgs = []
     for affine in affines:
         img = cv2.warpAffine(frame, affine, output_image_size)
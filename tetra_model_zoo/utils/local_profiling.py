@@ -0,0 +1,299 @@
+"""
+Export and profile traced models on local CPU runtimes.
+
+This is an offline counterpart to `tetra_hub.submit_profile_job`: the traced
+model is saved as TorchScript (and ONNX, when the `onnx` package is installed)
+and run on every requested runtime that is available on this machine:
+    * torchscript: always available.
+    * onnxruntime: requires the `onnxruntime` package.
+    * openvino: requires the `openvino` package.
+
+Profiles are reported in the same shape as Tetra Hub profile results
+(`{"execution_summary": {"estimated_inference_time": <us>, ...}}`), so local
+and on-device numbers can be compared with the same tooling.
+
+Export scripts call this when run with `--local`, and only import `tetra_hub`
+otherwise, so exporting locally does not require Tetra Hub to be installed.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+import os
+import re
+import resource
+import sys
+import time
+from typing import Any, Callable, Dict, List, Sequence
+
+import torch
+
+from tetra_model_zoo.utils.benchmark import compute_latency_stats, time_function
+from tetra_model_zoo.utils.input_spec import InputSpec, make_torch_inputs
+
+LOCAL_RUNTIMES = ("torchscript", "onnxruntime", "openvino")
+
+# Python package each runtime needs, other than torch.
+_RUNTIME_PACKAGES = dict(onnxruntime="onnxruntime", openvino="openvino")
+
+
+def available_local_runtimes() -> List[str]:
+    """Lists the local runtimes whose packages are installed."""
+    return [
+        runtime
+        for runtime in LOCAL_RUNTIMES
+        if runtime not in _RUNTIME_PACKAGES
+        or importlib.util.find_spec(_RUNTIME_PACKAGES[runtime]) is not None
+    ]
+
+
+class LocalProfileJob:
+    """
+    Result of profiling a model on one local runtime.
+    Mirrors the parts of `tetra_hub.ProfileJob` used by the export scripts.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        runtime: str,
+        target_model_path: str | None,
+        profile: Dict[str, Any],
+    ):
+        self.name = name
+        self.runtime = runtime
+        self.target_model_path = target_model_path
+        self.profile = profile
+
+    def download_profile(self) -> Dict[str, Any]:
+        return self.profile
+
+    def download_target_model(self, _: str | None = None) -> str | None:
+        return self.target_model_path
+
+
+def _reset_peak_rss() -> None:
+    # Resets VmHWM on Linux, so the next peak reading covers only what follows.
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def _read_proc_status_kb(field: str) -> int | None:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _current_rss_bytes() -> int:
+    rss_kb = _read_proc_status_kb("VmRSS")
+    return rss_kb * 1024 if rss_kb is not None else _peak_rss_bytes()
+
+
+def _peak_rss_bytes() -> int:
+    hwm_kb = _read_proc_status_kb("VmHWM")
+    if hwm_kb is not None:
+        return hwm_kb * 1024
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere.
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def _safe_file_name(name: str) -> str:
+    return re.sub(r"[^\w.-]+", "_", name).strip("_")
+
+
+def _export_onnx(
+    model: torch.jit.ScriptModule,
+    inputs: List[torch.Tensor],
+    input_names: List[str],
+    path: str,
+) -> None:
+    torch.onnx.export(
+        model,
+        tuple(inputs),
+        path,
+        input_names=input_names,
+        opset_version=17,
+    )
+
+
+def _load_runtime(
+    runtime: str, model_path: str, input_names: List[str]
+) -> Callable[[List[torch.Tensor]], Any]:
+    """
+    Loads the saved model on the given runtime.
+
+    Returns:
+        Function that runs one inference on the given torch inputs.
+    """
+    if runtime == "torchscript":
+        loaded = torch.jit.load(model_path, map_location="cpu")
+
+        def run_torchscript(inputs: List[torch.Tensor]) -> Any:
+            with torch.inference_mode():
+                return loaded(*inputs)
+
+        return run_torchscript
+
+    if runtime == "onnxruntime":
+        import onnxruntime
+
+        session = onnxruntime.InferenceSession(
+            model_path, providers=["CPUExecutionProvider"]
+        )
+        return lambda inputs: session.run(
+            None, {name: t.numpy() for name, t in zip(input_names, inputs)}
+        )
+
+    if runtime == "openvino":
+        from openvino.runtime import Core
+
+        compiled = Core().compile_model(model_path, "CPU")
+        return lambda inputs: compiled([t.numpy() for t in inputs])
+
+    raise ValueError(
+        f"Unknown local runtime {runtime}. Choose from {', '.join(LOCAL_RUNTIMES)}."
+    )
+
+
+def _profile_runtime(
+    runtime: str,
+    model_path: str,
+    input_names: List[str],
+    inputs: List[torch.Tensor],
+    num_warmup: int,
+    num_iterations: int,
+) -> Dict[str, Any]:
+    _reset_peak_rss()
+    rss_before = _current_rss_bytes()
+
+    start = time.perf_counter()
+    run = _load_runtime(runtime, model_path, input_names)
+    load_time_us = (time.perf_counter() - start) * 1e6
+    load_peak_memory = max(0, _peak_rss_bytes() - rss_before)
+
+    warmup_ms, latencies_ms = time_function(
+        lambda: run(inputs), num_warmup, num_iterations
+    )
+    stats = compute_latency_stats(latencies_ms)
+    inference_peak_memory = max(0, _peak_rss_bytes() - rss_before)
+
+    return dict(
+        execution_summary=dict(
+            estimated_inference_time=int(stats["p50_ms"] * 1000),
+            estimated_inference_peak_memory=inference_peak_memory,
+            first_load_time=int(load_time_us),
+            first_load_peak_memory=load_peak_memory,
+            warmup_time=int(warmup_ms * 1000),
+            all_inference_times=[int(ms * 1000) for ms in latencies_ms],
+        ),
+        runtime=runtime,
+        model_path=model_path,
+        latency_ms=stats,
+    )
+
+
+def submit_local_profile_job(
+    name: str,
+    model: torch.jit.ScriptModule,
+    input_shapes: InputSpec,
+    runtimes: Sequence[str] | None = None,
+    output_dir: str | None = None,
+    num_warmup: int = 3,
+    num_iterations: int = 20,
+) -> List[LocalProfileJob]:
+    """
+    Saves a traced model and profiles it on local CPU runtimes.
+
+    Parameters:
+        name: Name of the model. Used for artifact file names.
+        model: Traced model (as passed to tetra_hub.submit_profile_job).
+        input_shapes: Input spec of the model.
+        runtimes: Runtimes to profile on. Defaults to every installed runtime.
+        output_dir: Directory for TorchScript / ONNX artifacts and profile JSON.
+            Defaults to the current working directory.
+        num_warmup: Number of untimed inferences before measuring.
+        num_iterations: Number of timed inferences.
+
+    Returns:
+        One LocalProfileJob per runtime. Runtimes that could not be run have a
+        profile with an "error" field and no execution summary.
+    """
+    runtimes = list(runtimes or available_local_runtimes())
+    unknown = [runtime for runtime in runtimes if runtime not in LOCAL_RUNTIMES]
+    if unknown:
+        raise ValueError(
+            f"Unknown local runtime(s) {', '.join(unknown)}. "
+            f"Choose from {', '.join(LOCAL_RUNTIMES)}."
+        )
+
+    output_dir = output_dir or os.getcwd()
+    os.makedirs(output_dir, exist_ok=True)
+    file_name = _safe_file_name(name)
+    input_names = list(input_shapes.keys())
+    inputs = make_torch_inputs(input_shapes)
+
+    torchscript_path = os.path.join(output_dir, f"{file_name}.torchscript.pt")
+    torch.jit.save(model, torchscript_path)
+
+    onnx_path: str | None = None
+    onnx_error: str | None = None
+    if any(runtime != "torchscript" for runtime in runtimes):
+        onnx_path = os.path.join(output_dir, f"{file_name}.onnx")
+        try:
+            _export_onnx(model, inputs, input_names, onnx_path)
+        except Exception as e:
+            onnx_path, onnx_error = None, f"ONNX export failed: {e!r}"
+
+    jobs = []
+    for runtime in runtimes:
+        model_path = torchscript_path if runtime == "torchscript" else onnx_path
+        profile: Dict[str, Any]
+        if runtime in _RUNTIME_PACKAGES and runtime not in available_local_runtimes():
+            profile = dict(
+                runtime=runtime, error=f"{_RUNTIME_PACKAGES[runtime]} is not installed."
+            )
+        elif model_path is None:
+            profile = dict(runtime=runtime, error=onnx_error)
+        else:
+            try:
+                profile = _profile_runtime(
+                    runtime, model_path, input_names, inputs, num_warmup, num_iterations
+                )
+            except Exception as e:
+                profile = dict(runtime=runtime, model_path=model_path, error=repr(e))
+
+        profile_path = os.path.join(output_dir, f"{file_name}.{runtime}.profile.json")
+        with open(profile_path, "w") as f:
+            json.dump(profile, f, indent=2)
+        jobs.append(LocalProfileJob(name, runtime, model_path, profile))
+
+    print_local_profiles(jobs)
+    return jobs
+
+
+def print_local_profiles(jobs: List[LocalProfileJob]) -> None:
+    """Prints a one line summary per local profile job."""
+    for job in jobs:
+        profile = job.download_profile()
+        if "error" in profile:
+            print(f"{job.name} [{job.runtime}]: {profile['error']}")
+            continue
+        summary = profile["execution_summary"]
+        print(
+            f"{job.name} [{job.runtime}]: "
+            f"{summary['estimated_inference_time'] / 1000:.2f}ms median, "
+            f"{profile['latency_ms']['p99_ms']:.2f}ms p99, "
+            f"{summary['estimated_inference_peak_memory'] / 2**20:.1f}MB peak memory, "
+            f"load {summary['first_load_time'] / 1000:.1f}ms. "
+            f"Model: {job.target_model_path}"
+        )
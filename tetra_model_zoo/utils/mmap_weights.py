@@ -0,0 +1,284 @@
+"""
+Memory-mapped model weights, shared between processes.
+
+`torch.load` copies a checkpoint into the private memory of every process
+that loads it, so N worker processes serving the same model hold N copies
+of its weights. Instead, checkpoints are converted once into a flat tensor
+file (laid out like a safetensors file: a JSON header followed by the raw
+tensor bytes), which is then memory-mapped copy-on-write. Parameters are
+assigned to the module without a copy, so every process on the host reads
+the same page-cache pages, and a page is only duplicated if it is written.
+
+Set TETRA_MODEL_ZOO_MMAP_WEIGHTS=0 to load checkpoints with `torch.load` instead.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import struct
+import tempfile
+import warnings
+from functools import lru_cache
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+import torch
+
+from tetra_model_zoo.utils import asset_loaders
+
+MMAP_WEIGHTS_ENV_VAR = "TETRA_MODEL_ZOO_MMAP_WEIGHTS"
+FLAT_TENSORS_SUFFIX = ".safetensors"
+
+# safetensors dtype name -> (torch dtype, numpy dtype used to map the bytes).
+# numpy has no bfloat16, so bfloat16 is mapped as int16 and reinterpreted.
+_DTYPES = {
+    "F64": (torch.float64, np.float64),
+    "F32": (torch.float32, np.float32),
+    "F16": (torch.float16, np.float16),
+    "BF16": (torch.bfloat16, np.int16),
+    "I64": (torch.int64, np.int64),
+    "I32": (torch.int32, np.int32),
+    "I16": (torch.int16, np.int16),
+    "I8": (torch.int8, np.int8),
+    "U8": (torch.uint8, np.uint8),
+    "BOOL": (torch.bool, np.bool_),
+}
+_DTYPE_NAMES = {torch_dtype: name for name, (torch_dtype, _) in _DTYPES.items()}
+
+
+def mmap_weights_enabled() -> bool:
+    return os.environ.get(MMAP_WEIGHTS_ENV_VAR, "1").lower() not in (
+        "0",
+        "false",
+        "no",
+    )
+
+
+def save_flat_tensors(
+    tensors: Dict[str, torch.Tensor],
+    path: str,
+    metadata: Dict[str, str] | None = None,
+) -> None:
+    """
+    Writes tensors to a flat file that can be memory-mapped by `load_flat_tensors`.
+    The file is written atomically.
+    """
+    header: Dict[str, object] = {}
+    if metadata:
+        header["__metadata__"] = metadata
+    offset = 0
+    contiguous = {}
+    for name, tensor in tensors.items():
+        if tensor.dtype not in _DTYPE_NAMES:
+            raise ValueError(f"Unsupported dtype {tensor.dtype} for tensor {name}.")
+        tensor = tensor.detach().cpu().contiguous()
+        num_bytes = tensor.numel() * tensor.element_size()
+        header[name] = dict(
+            dtype=_DTYPE_NAMES[tensor.dtype],
+            shape=list(tensor.shape),
+            data_offsets=[offset, offset + num_bytes],
+        )
+        contiguous[name] = tensor
+        offset += num_bytes
+
+    header_bytes = json.dumps(header, separators=(",", ":")).encode()
+    # Pad the header so that the data starts 8-byte aligned.
+    header_bytes += b" " * (-len(header_bytes) % 8)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(struct.pack("<Q", len(header_bytes)))
+            f.write(header_bytes)
+            for tensor in contiguous.values():
+                if tensor.dtype == torch.bfloat16:
+                    tensor = tensor.view(torch.int16)
+                f.write(tensor.numpy().tobytes())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def load_flat_tensors(path: str) -> Dict[str, torch.Tensor]:
+    """
+    Memory-maps a file written by `save_flat_tensors`.
+
+    Returns:
+        Tensor name -> tensor backed by the mapped file. The mapping is
+        copy-on-write: pages are shared with every other process mapping the
+        same file, and writes to a tensor are private to this process.
+    """
+    with open(path, "rb") as f:
+        (header_size,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(header_size))
+    header.pop("__metadata__", None)
+
+    data_start = 8 + header_size
+    if os.path.getsize(path) == data_start:
+        # np.memmap can't map an empty range.
+        mapped = np.empty(0, dtype=np.uint8)
+    else:
+        mapped = np.memmap(path, dtype=np.uint8, mode="c", offset=data_start)
+
+    tensors = {}
+    for name, info in header.items():
+        torch_dtype, np_dtype = _DTYPES[info["dtype"]]
+        begin, end = info["data_offsets"]
+        array = mapped[begin:end].view(np_dtype).reshape(info["shape"])
+        tensor = torch.from_numpy(array)
+        if torch_dtype == torch.bfloat16:
+            tensor = tensor.view(torch.bfloat16)
+        tensors[name] = tensor
+    return tensors
+
+
+def _select_state_dict(checkpoint, state_dict_keys: Sequence[str]):
+    for key in state_dict_keys:
+        if isinstance(checkpoint, dict) and key in checkpoint:
+            return checkpoint[key]
+    return checkpoint
+
+
+@lru_cache(maxsize=None)
+def _get_checkpoint_digest(checkpoint_path: str, size: int, mtime_ns: int) -> str:
+    # Cached per (path, size, mtime) so each process hashes a checkpoint once.
+    return asset_loaders.compute_sha256(checkpoint_path)
+
+
+def _get_converted_path(
+    checkpoint_path: str, model_name: str, state_dict_keys: Sequence[str]
+) -> str:
+    # Keyed on the checkpoint's content, not its path, so a store that is moved
+    # (or copied to another host) keeps using its converted files.
+    checkpoint_path = os.path.abspath(checkpoint_path)
+    stat = os.stat(checkpoint_path)
+    description = "|".join(
+        [_get_checkpoint_digest(checkpoint_path, stat.st_size, stat.st_mtime_ns)]
+        + list(state_dict_keys)
+    )
+    digest = hashlib.sha256(description.encode()).hexdigest()[:16]
+    name = os.path.splitext(os.path.basename(checkpoint_path))[0]
+    return os.path.join(
+        asset_loaders.MODEL_ZOO_STORE,
+        model_name,
+        "mmap",
+        f"{name}-{digest}{FLAT_TENSORS_SUFFIX}",
+    )
+
+
+def load_state_dict_mmap(
+    checkpoint_path: str,
+    model_name: str,
+    state_dict_keys: Sequence[str] = (),
+) -> Dict[str, torch.Tensor]:
+    """
+    Loads the state dict in a torch checkpoint, memory-mapped.
+
+    The first call converts the checkpoint to a flat tensor file in the model
+    zoo store (under <store>/<model_name>/mmap), named after the checkpoint's
+    contents. Later calls, from any process, map that file. If the store is
+    not writable, the checkpoint is loaded with torch.load instead.
+
+    Parameters:
+        checkpoint_path: Path to a checkpoint saved with `torch.save`.
+        model_name: Name of the model. Determines where the converted file is stored.
+        state_dict_keys: If the checkpoint is a dict containing one of these keys
+            (tried in order), the state dict is the value of that key. Otherwise,
+            the state dict is the checkpoint itself.
+
+    Returns:
+        Parameter name -> tensor. Non-tensor entries are dropped.
+        If memory-mapped weights are disabled, the checkpoint is loaded with torch.load.
+    """
+    if not mmap_weights_enabled():
+        checkpoint = torch.load(checkpoint_path, map_location="cpu")
+        return _select_state_dict(checkpoint, state_dict_keys)
+
+    converted_path = _get_converted_path(checkpoint_path, model_name, state_dict_keys)
+    if not os.path.exists(converted_path):
+        checkpoint = torch.load(checkpoint_path, map_location="cpu")
+        state_dict = _select_state_dict(checkpoint, state_dict_keys)
+        try:
+            save_flat_tensors(
+                {k: v for k, v in state_dict.items() if isinstance(v, torch.Tensor)},
+                converted_path,
+                metadata=dict(source=os.path.abspath(checkpoint_path)),
+            )
+        except OSError as e:
+            warnings.warn(
+                f"Unable to save memory-mapped weights to {converted_path}: {e!r}. "
+                f"Loading {checkpoint_path} with torch.load instead."
+            )
+            return state_dict
+        del checkpoint, state_dict
+    return load_flat_tensors(converted_path)
+
+
+def _named_tensors(
+    module: torch.nn.Module,
+) -> Iterable[Tuple[str, torch.nn.Module, str, bool]]:
+    # (full name, owning module, attribute name, is parameter)
+    for module_name, submodule in module.named_modules(remove_duplicate=False):
+        prefix = f"{module_name}." if module_name else ""
+        for name, param in submodule._parameters.items():
+            if param is not None:
+                yield prefix + name, submodule, name, True
+        for name, buffer in submodule._buffers.items():
+            if buffer is not None:
+                yield prefix + name, submodule, name, False
+
+
+def assign_state_dict(
+    module: torch.nn.Module,
+    state_dict: Dict[str, torch.Tensor],
+    strict: bool = True,
+) -> Tuple[List[str], List[str]]:
+    """
+    Like `module.load_state_dict`, but the module's parameters and buffers are
+    replaced by the given tensors instead of being copied into. Used with
+    `load_state_dict_mmap` so the module's weights stay memory-mapped.
+
+    Parameters:
+        module: Module to load the weights into.
+        state_dict: Parameter / buffer name -> tensor.
+        strict: If set, raises if the state dict's keys don't match the module's.
+
+    Returns:
+        (missing keys, unexpected keys)
+    """
+    assigned = set()
+    missing = []
+    for full_name, owner, name, is_param in _named_tensors(module):
+        if full_name not in state_dict:
+            if is_param or name not in owner._non_persistent_buffers_set:
+                missing.append(full_name)
+            continue
+        current = getattr(owner, name)
+        value = state_dict[full_name]
+        if value.shape != current.shape:
+            raise RuntimeError(
+                f"Size mismatch for {full_name}: checkpoint has shape "
+                f"{tuple(value.shape)}, module has shape {tuple(current.shape)}."
+            )
+        value = value.to(current.dtype)
+        if is_param:
+            owner._parameters[name] = torch.nn.Parameter(
+                value, requires_grad=current.requires_grad
+            )
+        else:
+            owner._buffers[name] = value
+        assigned.add(full_name)
+    unexpected = [k for k in state_dict if k not in assigned]
+
+    if strict and (missing or unexpected):
+        raise RuntimeError(
+            f"Error assigning state dict to {module.__class__.__name__}. "
+            f"Missing keys: {missing}. Unexpected keys: {unexpected}."
+        )
+    return missing, unexpected
@@ -0,0 +1,179 @@
+"""
+Reduced precision (fp16 / bf16) inference for zoo models.
+
+`set_model_precision` converts a model's weights, and therefore its
+activations, to half precision, while keeping its interface in float32:
+floating point (positional) inputs are cast to the model's precision, and
+floating point outputs are cast back to float32. Input specs, apps and callers are
+unchanged. Normalization layers run in float32 (their inputs are upcast),
+since their statistics lose too much precision in 16 bits.
+
+On CPU, bf16 is the supported reduced precision (fp16 convolutions have no
+CPU kernels); fp16 is for devices with fp16 kernels, such as CUDA GPUs.
+
+`compare_precision` checks that a model's reduced precision outputs match its
+float32 outputs, by PSNR and (for classifiers) by top-1 class.
+"""
+
+from __future__ import annotations
+
+import copy
+from typing import Any, List, Sequence, Tuple
+
+import torch
+
+from tetra_model_zoo.utils.compare import compute_psnr
+from tetra_model_zoo.utils.testing import assert_most_same
+
+PRECISIONS = ("fp32", "fp16", "bf16")
+PRECISION_DTYPES = {
+    "fp32": torch.float32,
+    "fp16": torch.float16,
+    "bf16": torch.bfloat16,
+}
+
+# Layers that are kept in float32, with their inputs upcast.
+FP32_MODULE_TYPES: Tuple[type, ...] = (
+    torch.nn.modules.batchnorm._BatchNorm,
+    torch.nn.modules.instancenorm._InstanceNorm,
+    torch.nn.GroupNorm,
+    torch.nn.LayerNorm,
+)
+
+
+def _cast_floats(value: Any, dtype: torch.dtype) -> Any:
+    """Casts every floating point tensor in a (nested) tuple / list / dict."""
+    if isinstance(value, torch.Tensor):
+        return value.to(dtype) if value.is_floating_point() else value
+    if isinstance(value, tuple) and hasattr(value, "_fields"):  # NamedTuple
+        return type(value)(*(_cast_floats(v, dtype) for v in value))
+    if isinstance(value, (tuple, list)):
+        return type(value)(_cast_floats(v, dtype) for v in value)
+    if isinstance(value, dict):
+        return {k: _cast_floats(v, dtype) for k, v in value.items()}
+    return value
+
+
+def _cast_inputs_hook(dtype: torch.dtype):
+    # Positional only: forward pre-hooks receive keyword arguments only
+    # from torch 2.0 on.
+    def hook(module, args):
+        return _cast_floats(args, dtype)
+
+    return hook
+
+
+def _cast_outputs_hook(dtype: torch.dtype):
+    def hook(module, args, output):
+        return _cast_floats(output, dtype)
+
+    return hook
+
+
+def _set_module_precision(module: torch.nn.Module, dtype: torch.dtype) -> None:
+    if getattr(module, "_zoo_precision", torch.float32) != torch.float32:
+        raise ValueError("The precision of this module has already been set.")
+    module.to(dtype)
+    for submodule in module.modules():
+        if isinstance(submodule, FP32_MODULE_TYPES):
+            submodule.float()
+            submodule.register_forward_pre_hook(_cast_inputs_hook(torch.float32))
+            submodule.register_forward_hook(_cast_outputs_hook(dtype))
+    module.register_forward_pre_hook(_cast_inputs_hook(dtype))
+    module.register_forward_hook(_cast_outputs_hook(torch.float32))
+    module._zoo_precision = dtype  # type: ignore
+
+
+def get_model_modules(model: Any) -> List[torch.nn.Module]:
+    """
+    Returns the networks of a model: the model itself if it is a module,
+    otherwise each module it holds (e.g. the encoder and decoder of Whisper).
+    """
+    if isinstance(model, torch.nn.Module):
+        return [model]
+    return [
+        value for value in vars(model).values() if isinstance(value, torch.nn.Module)
+    ]
+
+
+def set_model_precision(model: Any, precision: str):
+    """
+    Converts a model to run in the given precision, in place.
+
+    Parameters:
+        model: A zoo model: a torch module, or an object holding torch modules.
+        precision: One of PRECISIONS.
+
+    Returns:
+        The model. Its inputs and outputs are still float32.
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(
+            f"Unsupported precision {precision}. Choose one of {PRECISIONS}."
+        )
+    if precision != "fp32":
+        for module in get_model_modules(model):
+            _set_module_precision(module, PRECISION_DTYPES[precision])
+    return model
+
+
+def _flatten_outputs(output: Any) -> List[torch.Tensor]:
+    if isinstance(output, torch.Tensor):
+        return [output]
+    if isinstance(output, dict):
+        output = list(output.values())
+    if isinstance(output, (tuple, list)):
+        return [t for value in output for t in _flatten_outputs(value)]
+    return []
+
+
+def compare_precision(
+    model: torch.nn.Module,
+    inputs: Sequence[torch.Tensor],
+    precision: str,
+    psnr_threshold: float = 30,
+    top1_tolerance: float | None = None,
+) -> float:
+    """
+    Checks that a model's outputs in reduced precision match its float32 outputs.
+
+    Parameters:
+        model: A float32 network. It is not modified.
+        inputs: Inputs to run the network on.
+        precision: Precision to compare with float32.
+        psnr_threshold: Minimum PSNR (dB) of every floating point output.
+        top1_tolerance: If set, the first output is treated as classification
+            logits [N, num_classes], and at most this fraction of top-1 classes
+            may differ.
+
+    Returns:
+        Minimum PSNR over all floating point outputs.
+
+    Raises:
+        AssertionError if the outputs don't match.
+    """
+    reduced = set_model_precision(copy.deepcopy(model), precision)
+    with torch.inference_mode():
+        expected = _flatten_outputs(model(*inputs))
+        actual = _flatten_outputs(reduced(*inputs))
+    assert len(expected) == len(actual)
+
+    psnrs = []
+    for expected_output, actual_output in zip(expected, actual):
+        if not expected_output.is_floating_point():
+            continue
+        assert actual_output.dtype == expected_output.dtype
+        psnr = compute_psnr(actual_output, expected_output)
+        assert psnr > psnr_threshold, (
+            f"{precision} output has PSNR {psnr:.1f}dB vs. fp32, "
+            f"below the threshold of {psnr_threshold}dB."
+        )
+        psnrs.append(psnr)
+
+    if top1_tolerance is not None:
+        assert_most_same(
+            actual[0].argmax(dim=-1).numpy(),
+            expected[0].argmax(dim=-1).numpy(),
+            top1_tolerance,
+        )
+    return min(psnrs) if psnrs else float("inf")
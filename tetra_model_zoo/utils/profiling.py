@@ -0,0 +1,307 @@
+"""
+Per-stage timing instrumentation for zoo apps.
+
+Apps wrap each stage of their pipeline (input conversion, model forward,
+NMS, drawing, ...) in `profile_stage`:
+
+    with profile_stage(self, "model_forward"):
+        out = self.model(x)
+
+Timings are sent to every registered sink. When no sink is registered,
+`profile_stage` returns a shared no-op context manager, so instrumentation
+costs a single tuple check per stage.
+
+Available sinks:
+    * StageTimings: in-memory durations, counters and histograms.
+    * LoggingSink: logs one line per stage.
+    * PrometheusSink: cumulative histograms in the Prometheus text exposition format.
+    * ChromeTraceSink: trace events viewable in chrome://tracing or Perfetto.
+
+Example:
+    sink = ChromeTraceSink()
+    with profiling_sinks(sink):
+        app.predict(image)
+    sink.save("trace.json")
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from typing import (
+    Any,
+    ContextManager,
+    DefaultDict,
+    Dict,
+    Iterator,
+    List,
+    Sequence,
+    Tuple,
+)
+
+_NULL_STAGE = nullcontext()
+
+# Registered sinks. Replaced (never mutated) so readers need no lock.
+_SINKS: Tuple[ProfilingSink, ...] = ()
+_SINKS_LOCK = threading.Lock()
+
+# Default histogram bucket upper bounds, in seconds.
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class ProfilingSink(ABC):
+    """
+    Base class for destinations of stage timings.
+    """
+
+    @abstractmethod
+    def record(self, app_name: str, stage: str, start: float, seconds: float) -> None:
+        """
+        Called once every time an instrumented stage finishes.
+
+        Parameters:
+            app_name: Class name of the app that ran the stage.
+            stage: Name of the stage.
+            start: Start time of the stage (time.perf_counter(), in seconds).
+            seconds: Duration of the stage.
+        """
+
+
+class StageTimings(ProfilingSink):
+    """
+    Collects the wall time spent in each (app, stage) pair in memory.
+    """
+
+    def __init__(self):
+        self.durations: DefaultDict[Tuple[str, str], List[float]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def record(self, app_name: str, stage: str, start: float, seconds: float) -> None:
+        with self._lock:
+            self.durations[(app_name, stage)].append(seconds)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.durations.clear()
+
+    def counts(self) -> Dict[Tuple[str, str], int]:
+        """Returns the number of times each (app, stage) pair ran."""
+        return {key: len(durations) for key, durations in self.durations.items()}
+
+    def histogram(
+        self, app_name: str, stage: str, buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> List[int]:
+        """
+        Returns the number of durations of the given stage that fall in each
+        bucket. Bucket i counts durations in (buckets[i-1], buckets[i]]; the
+        final element counts durations above the last bucket.
+        """
+        counts = [0] * (len(buckets) + 1)
+        for seconds in self.durations.get((app_name, stage), []):
+            counts[bisect.bisect_left(buckets, seconds)] += 1
+        return counts
+
+    def total_seconds_per_stage(self) -> Dict[str, float]:
+        """
+        Returns:
+            Total time spent in each stage (summed over all apps and calls),
+            in order of first appearance.
+        """
+        totals: Dict[str, float] = {}
+        for (_, stage), durations in self.durations.items():
+            totals[stage] = totals.get(stage, 0.0) + sum(durations)
+        return totals
+
+
+class LoggingSink(ProfilingSink):
+    """
+    Logs the duration of every stage.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger | None = None,
+        level: int = logging.DEBUG,
+    ):
+        self.logger = logger or logging.getLogger("tetra_model_zoo.profiling")
+        self.level = level
+
+    def record(self, app_name: str, stage: str, start: float, seconds: float) -> None:
+        self.logger.log(self.level, "%s.%s took %.3fms", app_name, stage, seconds * 1000)
+
+
+class PrometheusSink(ProfilingSink):
+    """
+    Aggregates stage durations into cumulative histograms that can be
+    exported in the Prometheus text exposition format.
+    """
+
+    METRIC_NAME = "tetra_model_zoo_app_stage_seconds"
+    METRIC_HELP = "Time spent in each stage of a model zoo app."
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        # (app, stage) -> [per-bucket counts..., +Inf count], sum
+        self._counts: Dict[Tuple[str, str], List[int]] = {}
+        self._sums: DefaultDict[Tuple[str, str], float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def record(self, app_name: str, stage: str, start: float, seconds: float) -> None:
+        key = (app_name, stage)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+            counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            self._sums[key] += seconds
+
+    def to_prometheus_text(self) -> str:
+        """
+        Returns:
+            All histograms in the Prometheus text exposition format.
+        """
+        lines = [
+            f"# HELP {self.METRIC_NAME} {self.METRIC_HELP}",
+            f"# TYPE {self.METRIC_NAME} histogram",
+        ]
+        with self._lock:
+            for (app_name, stage), counts in self._counts.items():
+                labels = f'app="{app_name}",stage="{stage}"'
+                cumulative = 0
+                for bound, count in zip(self.buckets, counts):
+                    cumulative += count
+                    lines.append(
+                        f'{self.METRIC_NAME}_bucket{{{labels},le="{bound}"}} {cumulative}'
+                    )
+                total = cumulative + counts[-1]
+                lines.append(f'{self.METRIC_NAME}_bucket{{{labels},le="+Inf"}} {total}')
+                lines.append(
+                    f"{self.METRIC_NAME}_sum{{{labels}}} {self._sums[(app_name, stage)]}"
+                )
+                lines.append(f"{self.METRIC_NAME}_count{{{labels}}} {total}")
+        return "\n".join(lines) + "\n"
+
+
+class ChromeTraceSink(ProfilingSink):
+    """
+    Records every stage as a Chrome trace "complete" event.
+    Saved traces can be opened in chrome://tracing or https://ui.perfetto.dev.
+    """
+
+    def __init__(self):
+        self.events: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def record(self, app_name: str, stage: str, start: float, seconds: float) -> None:
+        event = dict(
+            name=stage,
+            cat=app_name,
+            ph="X",
+            ts=start * 1e6,
+            dur=seconds * 1e6,
+            pid=os.getpid(),
+            tid=threading.get_ident(),
+        )
+        with self._lock:
+            self.events.append(event)
+
+    def save(self, path: str) -> None:
+        with self._lock:
+            with open(path, "w") as f:
+                json.dump({"traceEvents": self.events}, f)
+
+
+class _TimedStage:
+    def __init__(self, app_name: str, stage: str):
+        self.app_name = app_name
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        for sink in _SINKS:
+            sink.record(self.app_name, self.stage, self.start, elapsed)
+        return False
+
+
+def profile_stage(app: Any, stage: str) -> ContextManager:
+    """
+    Time the enclosed block as `stage` of `app`.
+
+    Parameters:
+        app: The app instance running the stage (its class name is used as a label),
+            or a string label.
+        stage: Name of the pipeline stage, e.g. "model_forward" or "nms".
+    """
+    if not _SINKS:
+        return _NULL_STAGE
+    app_name = app if isinstance(app, str) else type(app).__name__
+    return _TimedStage(app_name, stage)
+
+
+def register_profiling_sink(sink: ProfilingSink) -> None:
+    """Start sending stage timings to `sink`."""
+    global _SINKS
+    with _SINKS_LOCK:
+        _SINKS = _SINKS + (sink,)
+
+
+def unregister_profiling_sink(sink: ProfilingSink) -> None:
+    """Stop sending stage timings to `sink`."""
+    global _SINKS
+    with _SINKS_LOCK:
+        sinks = list(_SINKS)
+        sinks.remove(sink)
+        _SINKS = tuple(sinks)
+
+
+@contextmanager
+def profiling_sinks(*sinks: ProfilingSink) -> Iterator[Tuple[ProfilingSink, ...]]:
+    """
+    Send stage timings to the given sinks for the duration of this context.
+    """
+    for sink in sinks:
+        register_profiling_sink(sink)
+    try:
+        yield sinks
+    finally:
+        for sink in sinks:
+            unregister_profiling_sink(sink)
+
+
+@contextmanager
+def record_stage_timings(
+    timings: StageTimings | None = None,
+) -> Iterator[StageTimings]:
+    """
+    Collect stage timings in memory for every app call made inside this context.
+
+    Parameters:
+        timings: Recorder to add timings to. A new one is created if not provided.
+    """
+    timings = timings or StageTimings()
+    with profiling_sinks(timings):
+        yield timings
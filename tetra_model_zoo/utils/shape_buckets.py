@@ -0,0 +1,234 @@
+"""
+Input shape buckets.
+
+Models that accept several input resolutions are run (or compiled) for a
+small, fixed set of shapes ("buckets") instead of every input's exact
+shape, so traced graphs and runtime plans can be reused. Each input is
+letterboxed (see `image_processing.resize_pad`) into the smallest bucket it
+fits in.
+
+Export scripts with a `--shape_buckets` option export either one traced
+model per bucket, or (with `--dynamic_shapes`) one traced model that is
+checked to be valid at every bucket size, along with a manifest. At
+runtime, `load_shape_bucket_models` loads them as a ShapeBucketDispatcher,
+which pads each input to the smallest bucket it fits in.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import torch
+import torch.nn.functional as F
+
+Shape = Tuple[int, int]
+
+
+def stride_aligned_size(size: Shape, stride: int) -> Shape:
+    """
+    Returns:
+        The smallest (height, width) that is at least `size` and a multiple of
+        `stride` in both dimensions.
+    """
+    return (
+        math.ceil(size[0] / stride) * stride,
+        math.ceil(size[1] / stride) * stride,
+    )
+
+
+def select_shape_bucket(size: Shape, buckets: Sequence[Shape]) -> Shape:
+    """
+    Picks the bucket to letterbox an input of the given (height, width) into.
+
+    Returns:
+        The smallest bucket (by area) that the input fits in without scaling.
+        If the input doesn't fit in any bucket, the bucket it needs to be
+        scaled down the least for.
+    """
+    if not buckets:
+        raise ValueError("No shape buckets were provided.")
+    height, width = size
+    fitting = [b for b in buckets if b[0] >= height and b[1] >= width]
+    if fitting:
+        return min(fitting, key=lambda b: (b[0] * b[1], b))
+    return max(
+        buckets,
+        key=lambda b: (min(b[0] / height, b[1] / width), -b[0] * b[1]),
+    )
+
+
+def parse_shape(value: str) -> Shape:
+    """
+    Parses a "<height>x<width>" string, e.g. "720x1280".
+    """
+    try:
+        height, width = (int(v) for v in value.lower().split("x"))
+    except ValueError:
+        raise ValueError(f"Expected a shape like 720x1280, got {value}.")
+    return height, width
+
+
+def _fits(size: Shape, bucket: Shape) -> bool:
+    return bucket[0] >= size[0] and bucket[1] >= size[1]
+
+
+class ShapeBucketDispatcher:
+    """
+    Runs each input on the model for the smallest bucket it fits in.
+
+    Inputs are zero padded at the bottom and right, so coordinates predicted
+    by the models don't need to be adjusted. Every input tensor whose last two
+    dimensions are the first input's size is padded.
+    """
+
+    def __init__(
+        self, models: Dict[Shape, Callable[..., torch.Tensor]], crop_outputs: bool = True
+    ):
+        """
+        Parameters:
+            models: Bucket (height, width) -> model that runs inputs of that size.
+            crop_outputs: Crop image-like outputs (tensors of at least 3 dimensions
+                whose last two have the bucket's aspect ratio) to the input's extent.
+        """
+        if not models:
+            raise ValueError("No shape buckets were provided.")
+        self.models = models
+        self.crop_outputs = crop_outputs
+
+    @property
+    def buckets(self) -> List[Shape]:
+        return sorted(self.models, key=lambda b: (b[0] * b[1], b))
+
+    def __call__(self, *inputs: torch.Tensor):
+        size: Shape = tuple(inputs[0].shape[-2:])  # type: ignore
+        fitting = [b for b in self.buckets if _fits(size, b)]
+        if not fitting:
+            raise ValueError(
+                f"Input of size {size[0]}x{size[1]} is larger than every bucket "
+                f"({', '.join(f'{h}x{w}' for h, w in self.buckets)}). Resize it first."
+            )
+        bucket = fitting[0]
+        padding = (0, bucket[1] - size[1], 0, bucket[0] - size[0])
+        outputs = self.models[bucket](
+            *[F.pad(x, padding) if x.shape[-2:] == size else x for x in inputs]
+        )
+        if not self.crop_outputs or bucket == size:
+            return outputs
+
+        def crop(output):
+            if isinstance(output, (tuple, list)):
+                return type(output)(crop(o) for o in output)
+            if not isinstance(output, torch.Tensor) or output.dim() < 3:
+                return output
+            height, width = output.shape[-2:]
+            if height * bucket[1] != width * bucket[0]:
+                return output
+            scale = height / bucket[0]
+            return output[..., : round(size[0] * scale), : round(size[1] * scale)]
+
+        return crop(outputs)
+
+
+def export_shape_buckets(
+    name: str,
+    model: torch.nn.Module,
+    make_inputs: Callable[[Shape], List[torch.Tensor]],
+    buckets: Sequence[Shape],
+    output_dir: str | None = None,
+    dynamic: bool = False,
+    check_trace: bool = True,
+    stride: int | None = None,
+) -> str:
+    """
+    Traces a model for a set of input sizes, and saves the traces (TorchScript)
+    with a manifest for load_shape_bucket_models.
+
+    Parameters:
+        name: Name of the model. Used for file names.
+        model: Model to trace.
+        make_inputs: Returns sample inputs for the given (height, width).
+        buckets: Input sizes (height, width).
+        output_dir: Directory to write to. Defaults to the current directory.
+        dynamic: Save one model, traced at the largest bucket and checked to
+            produce the same graph and outputs at every other bucket, instead
+            of one model per bucket.
+        check_trace: Passed to torch.jit.trace when exporting one model per
+            bucket. Has no effect if `dynamic` is set.
+        stride: If set, every bucket must be a multiple of this in both dimensions
+            (e.g. the model's STRIDE_MULTIPLE).
+
+    Returns:
+        Path to the manifest.
+
+    Raises:
+        ValueError if a bucket isn't a multiple of `stride`, or if `dynamic` is
+        set and the trace isn't valid at every bucket.
+    """
+    buckets = sorted(set(buckets), key=lambda b: (b[0] * b[1], b))
+    if not buckets:
+        raise ValueError("No shape buckets were provided.")
+    if stride:
+        misaligned = [b for b in buckets if stride_aligned_size(b, stride) != b]
+        if misaligned:
+            aligned = [stride_aligned_size(b, stride) for b in misaligned]
+            raise ValueError(
+                f"{name} shape buckets must be multiples of {stride}, but "
+                f"{', '.join(f'{h}x{w}' for h, w in misaligned)} are not. "
+                f"Use {', '.join(f'{h}x{w}' for h, w in aligned)} instead."
+            )
+    output_dir = output_dir or os.getcwd()
+    os.makedirs(output_dir, exist_ok=True)
+
+    models: Dict[str, str] = {}
+    if dynamic:
+        try:
+            traced = torch.jit.trace(
+                model,
+                make_inputs(buckets[-1]),
+                check_inputs=[tuple(make_inputs(b)) for b in buckets[:-1]],
+            )
+        except torch.jit.TracingCheckError as e:
+            raise ValueError(
+                f"{name} can't be traced once for every shape bucket; export one "
+                f"model per bucket instead (without dynamic shapes). {e}"
+            )
+        file_name = f"{name}.dynamic.torchscript.pt"
+        torch.jit.save(traced, os.path.join(output_dir, file_name))
+        models = {f"{h}x{w}": file_name for h, w in buckets}
+    else:
+        for height, width in buckets:
+            traced = torch.jit.trace(
+                model, make_inputs((height, width)), check_trace=check_trace
+            )
+            file_name = f"{name}.{height}x{width}.torchscript.pt"
+            torch.jit.save(traced, os.path.join(output_dir, file_name))
+            models[f"{height}x{width}"] = file_name
+
+    manifest_path = os.path.join(output_dir, f"{name}.shape_buckets.json")
+    with open(manifest_path, "w") as f:
+        json.dump(dict(name=name, dynamic=dynamic, models=models), f, indent=2)
+    print(f"Saved {len(set(models.values()))} model(s) for {name} to {output_dir}")
+    return manifest_path
+
+
+def load_shape_bucket_models(
+    manifest_path: str, crop_outputs: bool = True
+) -> ShapeBucketDispatcher:
+    """
+    Loads the models exported by export_shape_buckets.
+    """
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    directory = os.path.dirname(manifest_path)
+    loaded: Dict[str, torch.jit.ScriptModule] = {}
+    models: Dict[Shape, Callable[..., torch.Tensor]] = {}
+    for bucket, file_name in manifest["models"].items():
+        if file_name not in loaded:
+            loaded[file_name] = torch.jit.load(
+                os.path.join(directory, file_name), map_location="cpu"
+            )
+        models[parse_shape(bucket)] = loaded[file_name]
+    return ShapeBucketDispatcher(models, crop_outputs)
@@ -0,0 +1,203 @@
+"""
+Snapshots of fully constructed models, for fast cold starts.
+
+Building some zoo models means importing a source repository, constructing
+its module graph, patching modules and loading a checkpoint. A snapshot is
+the final (wrapped) model saved with `torch.save`, so later loads skip all
+of that. Snapshots are stored in the model zoo store and keyed by model
+name, weights, zoo version, torch version and a digest of the zoo's source
+code, so that snapshots pickled by older wrapper code are never loaded.
+
+The weights are stored apart from the pickled module, in a flat tensor file
+that is memory-mapped when the snapshot is loaded (see utils.mmap_weights),
+so worker processes loading the same snapshot share one copy of the weights.
+
+Set TETRA_MODEL_ZOO_SNAPSHOTS=0 to disable snapshots.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import copy
+import hashlib
+import os
+import tempfile
+import warnings
+from functools import lru_cache
+from typing import Any, Callable, ContextManager, Dict, Sequence, TypeVar
+
+import torch
+
+import tetra_model_zoo
+from tetra_model_zoo._version import __version__
+from tetra_model_zoo.utils import asset_loaders
+from tetra_model_zoo.utils.mmap_weights import (
+    FLAT_TENSORS_SUFFIX,
+    _named_tensors,
+    assign_state_dict,
+    load_flat_tensors,
+    save_flat_tensors,
+)
+
+SNAPSHOTS_ENV_VAR = "TETRA_MODEL_ZOO_SNAPSHOTS"
+SNAPSHOT_DIR_NAME = "_snapshots"
+
+T = TypeVar("T")
+
+
+def snapshots_enabled() -> bool:
+    return os.environ.get(SNAPSHOTS_ENV_VAR, "1").lower() not in ("0", "false", "no")
+
+
+def _describe_key_part(part: Any) -> str:
+    # Local weight files are identified by content metadata, not just by name.
+    if isinstance(part, str) and os.path.isfile(os.path.expanduser(part)):
+        path = os.path.abspath(os.path.expanduser(part))
+        stat = os.stat(path)
+        return f"{path}:{stat.st_size}:{stat.st_mtime_ns}"
+    return repr(part)
+
+
+@lru_cache(maxsize=None)
+def get_zoo_source_digest() -> str:
+    """
+    Digest of every Python source file of the zoo. Snapshots pickle instances
+    of the zoo's wrapper classes, which can only be unpickled by the code that
+    saved them.
+    """
+    root = os.path.dirname(os.path.abspath(tetra_model_zoo.__file__))
+    digest = hashlib.sha256()
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d != "__pycache__")
+        for filename in sorted(filenames):
+            if filename.endswith(".py"):
+                path = os.path.join(dirpath, filename)
+                digest.update(os.path.relpath(path, root).encode())
+                with open(path, "rb") as f:
+                    digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+
+def get_snapshot_path(model_name: str, key: Sequence[Any]) -> str:
+    """
+    Returns the path of the snapshot of `model_name` built with the given key
+    (e.g. weight names). The path also depends on the zoo and torch versions
+    and on the zoo's source code.
+    """
+    description = "|".join(
+        [model_name, __version__, torch.__version__, get_zoo_source_digest()]
+        + [_describe_key_part(part) for part in key]
+    )
+    digest = hashlib.sha256(description.encode()).hexdigest()[:16]
+    return os.path.join(
+        asset_loaders.MODEL_ZOO_STORE,
+        SNAPSHOT_DIR_NAME,
+        model_name,
+        f"{model_name}-{digest}.pt",
+    )
+
+
+def _get_weights_path(path: str) -> str:
+    return os.path.splitext(path)[0] + FLAT_TENSORS_SUFFIX
+
+
+def _get_modules(model: Any) -> Dict[str, torch.nn.Module]:
+    # Name prefix -> module holding weights. Some zoo models (e.g. MediaPipe)
+    # are plain objects holding several modules.
+    if isinstance(model, torch.nn.Module):
+        return {"": model}
+    return {
+        f"{attr}.": value
+        for attr, value in vars(model).items()
+        if isinstance(value, torch.nn.Module)
+    }
+
+
+def _save_snapshot(model: Any, path: str) -> None:
+    # Split the model into a skeleton, with every weight replaced by a meta
+    # tensor of the same shape, and a flat file of weights.
+    tensors = {}
+    memo: Dict[int, Any] = {}
+    for prefix, module in _get_modules(model).items():
+        # Every name of a shared weight is saved, so assign_state_dict can
+        # assign each of them.
+        for full_name, owner, name, is_param in _named_tensors(module):
+            if is_param:
+                param = owner._parameters[name]
+                tensors[prefix + full_name] = param
+                memo[id(param)] = torch.nn.Parameter(
+                    torch.empty_like(param, device="meta"),
+                    requires_grad=param.requires_grad,
+                )
+            else:
+                buffer = owner._buffers[name]
+                tensors[prefix + full_name] = buffer
+                memo[id(buffer)] = torch.empty_like(buffer, device="meta")
+    skeleton = copy.deepcopy(model, memo)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # The skeleton is written last: a snapshot exists once its skeleton does.
+    save_flat_tensors(tensors, _get_weights_path(path))
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            torch.save(skeleton, f)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _load_snapshot(path: str) -> Any:
+    model = torch.load(path, map_location="cpu")
+    tensors = load_flat_tensors(_get_weights_path(path))
+    for prefix, module in _get_modules(model).items():
+        assign_state_dict(
+            module,
+            {
+                name[len(prefix) :]: tensor
+                for name, tensor in tensors.items()
+                if name.startswith(prefix)
+            },
+        )
+    return model
+
+
+def load_or_create_snapshot(
+    model_name: str,
+    key: Sequence[Any],
+    create: Callable[[], T],
+    source: ContextManager | None = None,
+) -> T:
+    """
+    Loads the model snapshot for the given key, or creates the model and
+    saves a snapshot of it.
+
+    Parameters:
+        model_name: Name of the model. Determines the snapshot directory.
+        key: Everything that determines the model's contents (e.g. weight names or paths).
+        create: Function that builds the model from scratch.
+        source: Context (typically a SourceAsRoot) in which the snapshot must be
+            loaded, if the model contains classes defined in a source repository.
+
+    Returns:
+        The model. Saving is best effort: if the model cannot be pickled or the
+        store is read-only, the freshly created model is returned.
+    """
+    if not snapshots_enabled():
+        return create()
+
+    path = get_snapshot_path(model_name, key)
+    if os.path.exists(path):
+        try:
+            with source or contextlib.nullcontext():
+                return _load_snapshot(path)
+        except Exception as e:
+            warnings.warn(f"Ignoring unreadable snapshot {path}: {e!r}")
+
+    model = create()
+    try:
+        _save_snapshot(model, path)
+    except Exception as e:
+        warnings.warn(f"Unable to save a snapshot of {model_name} to {path}: {e!r}")
+    return model
@@ -0,0 +1,155 @@
+"""
+Manifests and bundles for pre-fetched model zoo stores.
+
+A store directory (see `asset_loaders.MODEL_ZOO_STORE`) holds every asset
+the zoo downloads: source repositories, checkpoints and (optionally) third
+party caches. Once populated by `tetra_model_zoo.prefetch`, a store is
+relocatable: it can be copied or mounted read-only anywhere, and used by
+pointing TETRA_MODEL_ZOO_STORE at it (or sourcing its env.sh).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tarfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from tetra_model_zoo._version import __version__
+from tetra_model_zoo.utils.asset_loaders import (
+    ASSUME_YES_ENV_VAR,
+    OFFLINE_ENV_VAR,
+    STORE_ENV_VAR,
+    THIRD_PARTY_CACHE_DIRS,
+    compute_sha256,
+)
+
+MANIFEST_NAME = "manifest.json"
+ENV_SCRIPT_NAME = "env.sh"
+BUNDLE_ROOT_NAME = "model-zoo"
+
+
+def list_store_files(store: str) -> List[str]:
+    """
+    Lists the asset files in a store, relative to the store root.
+    Git internals, partial downloads and the store's own metadata are skipped.
+    """
+    files = []
+    for root, dirs, filenames in os.walk(store):
+        dirs[:] = sorted(d for d in dirs if d != ".git")
+        for filename in sorted(filenames):
+            rel_path = os.path.relpath(os.path.join(root, filename), store)
+            if rel_path in (MANIFEST_NAME, ENV_SCRIPT_NAME) or filename.endswith(
+                ".part"
+            ):
+                continue
+            files.append(rel_path)
+    return files
+
+
+def build_manifest(
+    store: str, models: Dict[str, Any] | None = None, num_workers: int = 4
+) -> Dict[str, Any]:
+    """
+    Builds a manifest of every asset file in the store.
+
+    Parameters:
+        store: Store directory.
+        models: Optional per-model metadata (e.g. prefetch status) to include.
+        num_workers: Number of files to hash concurrently.
+
+    Returns:
+        Dict with the zoo version, creation time, per-model metadata, and
+        {relative path: {"size", "sha256"}} for every file.
+    """
+    rel_paths = list_store_files(store)
+    with ThreadPoolExecutor(max_workers=num_workers) as pool:
+        digests = list(
+            pool.map(lambda p: compute_sha256(os.path.join(store, p)), rel_paths)
+        )
+    return dict(
+        zoo_version=__version__,
+        created=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        models=models or {},
+        third_party_cache_dirs=THIRD_PARTY_CACHE_DIRS,
+        files={
+            rel_path: dict(
+                size=os.path.getsize(os.path.join(store, rel_path)), sha256=digest
+            )
+            for rel_path, digest in zip(rel_paths, digests)
+        },
+    )
+
+
+def write_manifest(store: str, manifest: Dict[str, Any]) -> str:
+    """Writes the manifest to the store root. Returns its path."""
+    path = os.path.join(store, MANIFEST_NAME)
+    with open(path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    return path
+
+
+def verify_store(store: str, check_hashes: bool = True) -> List[str]:
+    """
+    Checks the store's files against its manifest.
+
+    Parameters:
+        store: Store directory (must contain a manifest).
+        check_hashes: If set, also compares sha256 digests (slower than sizes only).
+
+    Returns:
+        A description of each missing or modified file. Empty if the store is intact.
+    """
+    with open(os.path.join(store, MANIFEST_NAME)) as f:
+        manifest = json.load(f)
+    problems = []
+    for rel_path, expected in manifest["files"].items():
+        path = os.path.join(store, rel_path)
+        if not os.path.exists(path):
+            problems.append(f"missing: {rel_path}")
+        elif os.path.getsize(path) != expected["size"]:
+            problems.append(f"size mismatch: {rel_path}")
+        elif check_hashes and compute_sha256(path) != expected["sha256"]:
+            problems.append(f"checksum mismatch: {rel_path}")
+    return problems
+
+
+def write_env_script(store: str) -> str:
+    """
+    Writes a shell script that, when sourced, configures the zoo to use this
+    store wherever it is located, without fetching anything.
+
+    Returns:
+        Path to the script.
+    """
+    lines = [
+        "# Source this file to load model zoo assets from the directory it is in.",
+        f'export {STORE_ENV_VAR}="$(cd "$(dirname "${{BASH_SOURCE[0]:-$0}}")" && pwd)"',
+        f"export {OFFLINE_ENV_VAR}=1",
+        f"export {ASSUME_YES_ENV_VAR}=1",
+        "export HF_HUB_OFFLINE=1",
+    ]
+    lines += [
+        f'export {env_var}="${STORE_ENV_VAR}/{subdir}"'
+        for env_var, subdir in THIRD_PARTY_CACHE_DIRS.items()
+    ]
+    path = os.path.join(store, ENV_SCRIPT_NAME)
+    with open(path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+    return path
+
+
+def write_bundle(store: str, bundle_path: str) -> str:
+    """
+    Archives the store as a tarball (gzip-compressed if the path ends in .gz
+    or .tgz). The archive contains a single `model-zoo` directory.
+
+    Returns:
+        Path to the bundle.
+    """
+    mode = "w:gz" if bundle_path.endswith((".gz", ".tgz")) else "w"
+    with tarfile.open(bundle_path, mode) as tar:
+        tar.add(store, arcname=BUNDLE_ROOT_NAME)
+    return bundle_path
@@ -0,0 +1,210 @@
+import hashlib
+import importlib
+import importlib.util
+import os
+import subprocess
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from tetra_model_zoo.utils import asset_loaders
+from tetra_model_zoo.utils.asset_loaders import (
+    SourceAsRoot,
+    download_assets,
+    download_data,
+    read_checksum_manifest,
+)
+
+MODEL_NAME = "test_model"
+FILES = {
+    "weights.bin": os.urandom(3 * 1024 * 1024 + 17),
+    "config.json": b'{"layers": 3}',
+}
+
+
+class RangeRequestHandler(BaseHTTPRequestHandler):
+    """Serves FILES, honoring single `bytes=<start>-` Range headers."""
+
+    range_requests: list = []
+    # When set, Range requests are answered from this offset instead.
+    range_start_override = None
+
+    def do_GET(self):
+        data = FILES.get(self.path.lstrip("/"))
+        if data is None:
+            self.send_error(404)
+            return
+        range_header = self.headers.get("Range")
+        start = 0
+        if range_header:
+            RangeRequestHandler.range_requests.append(range_header)
+            start = int(range_header.split("=")[1].split("-")[0])
+            if RangeRequestHandler.range_start_override is not None:
+                start = RangeRequestHandler.range_start_override
+            if start >= len(data):
+                self.send_error(416)
+                return
+            self.send_response(206)
+            self.send_header(
+                "Content-Range", f"bytes {start}-{len(data) - 1}/{len(data)}"
+            )
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(data) - start))
+        self.end_headers()
+        self.wfile.write(data[start:])
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RangeRequestHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def model_zoo_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(asset_loaders, "MODEL_ZOO_STORE", str(tmp_path))
+    RangeRequestHandler.range_requests = []
+    RangeRequestHandler.range_start_override = None
+    return tmp_path
+
+
+def test_download_verifies_checksum(server_url, model_zoo_store):
+    sha256 = hashlib.sha256(FILES["weights.bin"]).hexdigest()
+    path = download_data(f"{server_url}/weights.bin", MODEL_NAME, sha256=sha256)
+
+    with open(path, "rb") as f:
+        assert f.read() == FILES["weights.bin"]
+    assert not os.path.exists(path + ".part")
+    assert os.listdir(os.path.dirname(path)) == ["weights.bin"]
+
+
+def test_download_checksum_mismatch(server_url, model_zoo_store):
+    with pytest.raises(ValueError):
+        download_data(f"{server_url}/weights.bin", MODEL_NAME, sha256="0" * 64)
+    model_dir = os.path.join(model_zoo_store, MODEL_NAME)
+    assert not os.path.exists(os.path.join(model_dir, "weights.bin"))
+    assert not os.path.exists(os.path.join(model_dir, "weights.bin.part"))
+
+
+def test_download_resumes_partial_file(server_url, model_zoo_store):
+    model_dir = os.path.join(model_zoo_store, MODEL_NAME)
+    os.makedirs(model_dir)
+    with open(os.path.join(model_dir, "weights.bin.part"), "wb") as f:
+        f.write(FILES["weights.bin"][:1000])
+
+    path = download_data(f"{server_url}/weights.bin", MODEL_NAME)
+
+    assert RangeRequestHandler.range_requests == ["bytes=1000-"]
+    with open(path, "rb") as f:
+        assert f.read() == FILES["weights.bin"]
+
+
+def test_download_restarts_on_mismatched_range(server_url, model_zoo_store):
+    model_dir = os.path.join(model_zoo_store, MODEL_NAME)
+    os.makedirs(model_dir)
+    with open(os.path.join(model_dir, "weights.bin.part"), "wb") as f:
+        f.write(FILES["weights.bin"][:1000])
+    RangeRequestHandler.range_start_override = 500
+
+    path = download_data(f"{server_url}/weights.bin", MODEL_NAME)
+
+    # The 206 response starting at byte 500 is discarded; the retry has no Range.
+    assert RangeRequestHandler.range_requests == ["bytes=1000-"]
+    with open(path, "rb") as f:
+        assert f.read() == FILES["weights.bin"]
+
+
+def test_download_assets_concurrently(server_url, model_zoo_store):
+    urls = [f"{server_url}/{name}" for name in FILES]
+    checksums = {name: hashlib.sha256(data).hexdigest() for name, data in FILES.items()}
+
+    manifest_path = os.path.join(model_zoo_store, "sha256sums.txt")
+    with open(manifest_path, "w") as f:
+        f.writelines(f"{digest}  {name}\n" for name, digest in checksums.items())
+
+    paths = download_assets(urls, MODEL_NAME, read_checksum_manifest(manifest_path))
+
+    assert [os.path.basename(path) for path in paths] == list(FILES)
+    for path, data in zip(paths, FILES.values()):
+        with open(path, "rb") as f:
+            assert f.read() == data
+
+
+def test_download_missing_file(server_url):
+    with pytest.raises(ValueError):
+        download_data(f"{server_url}/missing.bin", MODEL_NAME)
+
+
+def _make_fake_source_repo(model_zoo_store, module_name: str) -> str:
+    # Matches the clone location used by maybe_clone_git_repo, so no clone happens.
+    repo_path = os.path.join(model_zoo_store, MODEL_NAME, "author_fake_repo_git")
+    os.makedirs(os.path.join(repo_path, ".git"))
+    with open(os.path.join(repo_path, f"{module_name}.py"), "w") as f:
+        f.write("VALUE = 42\n")
+    return repo_path
+
+
+def test_source_as_root_is_thread_local(model_zoo_store):
+    module_name = "tetra_fake_source_module"
+    repo_path = _make_fake_source_repo(model_zoo_store, module_name)
+    cwd = os.getcwd()
+    sys_path = list(sys.path)
+    imported_in_other_thread = []
+
+    def import_in_other_thread():
+        imported_in_other_thread.append(importlib.util.find_spec(module_name))
+
+    with SourceAsRoot(
+        "https://github.com/author/fake_repo.git", "HEAD", MODEL_NAME
+    ) as path:
+        assert path == repo_path
+        thread = threading.Thread(target=import_in_other_thread)
+        thread.start()
+        thread.join()
+        module = importlib.import_module(module_name)
+        assert module.VALUE == 42
+        assert os.getcwd() == cwd
+        assert sys.path == sys_path
+
+    assert imported_in_other_thread == [None]
+    del sys.modules[module_name]
+    assert importlib.util.find_spec(module_name) is None
+
+
+def test_offline_mode_does_not_fetch(server_url, monkeypatch):
+    monkeypatch.setenv(asset_loaders.OFFLINE_ENV_VAR, "1")
+    with pytest.raises(RuntimeError):
+        download_data(f"{server_url}/weights.bin", MODEL_NAME)
+    assert RangeRequestHandler.range_requests == []
+
+
+def test_heavy_dependencies_are_imported_lazily():
+    script = (
+        "import sys\n"
+        "import tetra_model_zoo.utils.asset_loaders\n"
+        "import tetra_model_zoo.utils.bounding_box_processing\n"
+        "import tetra_model_zoo.utils.image_processing\n"
+        "import tetra_model_zoo.utils.hub\n"
+        "heavy = ['gdown', 'git', 'requests', 'tetra_hub', 'torchvision']\n"
+        "print(' '.join(m for m in heavy if m in sys.modules))\n"
+    )
+    env = dict(os.environ)
+    repo_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+    env["PYTHONPATH"] = os.pathsep.join(
+        [repo_root] + ([env["PYTHONPATH"]] if env.get("PYTHONPATH") else [])
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, env=env
+    )
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.strip() == ""
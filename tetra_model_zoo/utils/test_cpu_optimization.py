@@ -0,0 +1,119 @@
+import torch
+import torchvision.models as tv_models
+
+from tetra_model_zoo.imagenet_classifier.model import ImagenetClassifier
+from tetra_model_zoo.utils.cpu_optimization import fold_conv_bn, optimize_for_cpu
+from tetra_model_zoo.utils.input_spec import InputSpec
+from tetra_model_zoo.utils.precision import set_model_precision
+from tetra_model_zoo.yolov7.model import _YoloV7Detector
+
+
+class _Model(torch.nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.features = torch.nn.Sequential(
+            torch.nn.Conv2d(3, 16, 3, padding=1),
+            torch.nn.BatchNorm2d(16),
+            torch.nn.ReLU(),
+            torch.nn.Conv2d(16, 8, 3, padding=1, bias=False),
+            torch.nn.BatchNorm2d(8),
+        )
+
+    def forward(self, image):
+        features = self.features(image)
+        return features, features.flatten(2).mean(-1)
+
+    def get_input_spec(self, batch_size: int = 1) -> InputSpec:
+        return {"image": ((batch_size, 3, 16, 16), "float32")}
+
+
+def _make_model() -> torch.nn.Module:
+    torch.manual_seed(0)
+    model = _Model()
+    for module in model.modules():
+        if isinstance(module, torch.nn.BatchNorm2d):
+            module.running_mean.uniform_(-0.5, 0.5)
+            module.running_var.uniform_(0.5, 2.0)
+            module.weight.data.uniform_(0.5, 1.5)
+    return model.eval()
+
+
+def test_fold_conv_bn():
+    model = _make_model()
+    image = torch.rand(2, 3, 16, 16)
+    expected = model(image)
+    assert fold_conv_bn(model) == 2
+    assert not any(isinstance(m, torch.nn.BatchNorm2d) for m in model.modules())
+    for actual_output, expected_output in zip(model(image), expected):
+        torch.testing.assert_close(actual_output, expected_output)
+
+
+def test_optimize_for_cpu():
+    model = _make_model()
+    image = torch.rand(2, 3, 16, 16)
+    expected = model(image)
+    optimized = optimize_for_cpu(_make_model())
+    assert isinstance(optimized, _Model)
+    assert optimized.get_input_spec(batch_size=2)["image"][0] == (2, 3, 16, 16)
+    with torch.inference_mode():
+        actual = optimized(image)
+    for actual_output, expected_output in zip(actual, expected):
+        assert actual_output.is_contiguous()
+        torch.testing.assert_close(actual_output, expected_output)
+
+
+def test_optimize_for_cpu_reduced_precision():
+    image = torch.rand(1, 3, 16, 16)
+    expected = set_model_precision(_make_model(), "bf16")(image)
+    optimized = optimize_for_cpu(set_model_precision(_make_model(), "bf16"))
+    with torch.inference_mode():
+        actual = optimized(image)
+    for actual_output, expected_output in zip(actual, expected):
+        assert actual_output.dtype == torch.float32
+        torch.testing.assert_close(actual_output, expected_output, atol=0.1, rtol=0.05)
+
+
+def test_optimize_for_cpu_other_input_shapes():
+    model = _make_model()
+    optimized = optimize_for_cpu(_make_model())  # Traced at batch size 1.
+    frozen = optimized.forward.frozen
+    for shape in [(1, 3, 16, 16), (2, 3, 16, 16), (1, 3, 24, 32)]:
+        image = torch.rand(shape)
+        with torch.inference_mode():
+            actual = optimized(image)
+        for actual_output, expected_output in zip(actual, model(image)):
+            torch.testing.assert_close(actual_output, expected_output)
+    assert optimized.forward.frozen is frozen
+
+
+def test_optimize_imagenet_classifier():
+    torch.manual_seed(0)
+    model = ImagenetClassifier(tv_models.resnet18(weights=None)).eval()
+    image = torch.rand(2, 3, 224, 224)
+    expected = model(image)
+    optimized = optimize_for_cpu(model, [image])
+    with torch.inference_mode():
+        torch.testing.assert_close(optimized(image), expected, atol=1e-4, rtol=1e-3)
+        # Eager fallback for a batch size it wasn't traced with.
+        torch.testing.assert_close(
+            optimized(image[:1]), expected[:1], atol=1e-4, rtol=1e-3
+        )
+
+
+def test_optimize_yolov7_detector():
+    # The detector holds 5D anchor grid buffers, which can't be channels_last.
+    torch.manual_seed(0)
+    detector = _YoloV7Detector(
+        torch.tensor([8.0, 16.0, 32.0]), -1, 0, 3, 3, [16, 32, 64], 3 * 85
+    ).eval()
+    all_x = tuple(
+        torch.rand(1, c, 64 // stride, 96 // stride)
+        for c, stride in [(16, 8), (32, 16), (64, 32)]
+    )
+    expected = detector(all_x)
+    optimized = optimize_for_cpu(detector, [all_x])
+    assert optimized.anchor_grid_0.dim() == 5
+    assert hasattr(optimized.forward, "frozen")
+    assert optimized.m[0].weight.is_contiguous(memory_format=torch.channels_last)
+    with torch.inference_mode():
+        torch.testing.assert_close(optimized(all_x), expected)
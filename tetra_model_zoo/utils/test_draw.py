@@ -0,0 +1,80 @@
+import cv2
+import numpy as np
+import pytest
+import torch
+
+from tetra_model_zoo.utils.draw import (
+    draw_box_from_corners,
+    draw_box_from_xyxy,
+    draw_boxes_from_xyxy,
+    draw_connections,
+    draw_points,
+)
+
+H, W = 96, 128
+CONNECTIONS = [(0, 1), (1, 2), (2, 3), (3, 0), (0, 2)]
+
+
+def _frame() -> np.ndarray:
+    return np.zeros((H, W, 3), dtype=np.uint8)
+
+
+def _random_points(*shape: int) -> torch.Tensor:
+    # Includes points outside of the frame.
+    return torch.rand(*shape, 2) * torch.tensor([W + 40, H + 40]) - 20
+
+
+@pytest.mark.parametrize("size", [1, 2, 3])
+def test_draw_points(size):
+    points = _random_points(3, 20)
+    expected = _frame()
+    for x, y in points.reshape(-1, 2):
+        cv2.circle(expected, (int(x), int(y)), size, (0, 255, 0), thickness=size)
+
+    frame = _frame()
+    draw_points(frame, points, (0, 255, 0), size)
+    np.testing.assert_array_equal(frame, expected)
+
+    # A single set of points, flattened.
+    frame = _frame()
+    for person_points in points:
+        draw_points(frame, person_points.flatten().numpy(), (0, 255, 0), size)
+    np.testing.assert_array_equal(frame, expected)
+
+
+def test_draw_connections():
+    points = _random_points(3, 4)
+    expected = _frame()
+    for person_points in points:
+        for src, dst in CONNECTIONS:
+            x0, y0 = person_points[src]
+            x1, y1 = person_points[dst]
+            cv2.line(expected, (int(x0), int(y0)), (int(x1), int(y1)), (255, 0, 0), 2)
+
+    frame = _frame()
+    draw_connections(frame, points, CONNECTIONS, (255, 0, 0), 2)
+    np.testing.assert_array_equal(frame, expected)
+
+    # Nothing to draw.
+    draw_connections(frame, points[:0], CONNECTIONS)
+    draw_points(frame, points[:0])
+    np.testing.assert_array_equal(frame, expected)
+
+
+def test_draw_boxes():
+    corners = _random_points(5, 2)
+    expected = _frame()
+    for top_left, bottom_right in corners:
+        draw_box_from_xyxy(expected, top_left, bottom_right, (0, 0, 255), 2)
+
+    frame = _frame()
+    draw_boxes_from_xyxy(frame, corners.reshape(-1, 4), (0, 0, 255), 2)
+    np.testing.assert_array_equal(frame, expected)
+
+    roi_4corners = _random_points(2, 4)
+    expected = _frame()
+    for roi in roi_4corners:
+        draw_box_from_corners(expected, roi, (0, 255, 0))
+    frame = _frame()
+    draw_box_from_corners(frame, roi_4corners, (0, 255, 0))
+    np.testing.assert_array_equal(frame, expected)
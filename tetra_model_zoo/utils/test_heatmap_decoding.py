@@ -0,0 +1,109 @@
+from itertools import product
+
+import cv2
+import numpy as np
+import pytest
+import torch
+
+from tetra_model_zoo.utils.heatmap_decoding import (
+    decode_heatmaps,
+    get_heatmap_maximum,
+    refine_keypoints_dark,
+    refine_keypoints_quarter_offset,
+)
+
+N, K, H, W = 2, 17, 64, 48
+
+
+def _gaussian_heatmaps(centers: torch.Tensor, sigma: float = 2.0) -> torch.Tensor:
+    """Heatmaps [..., H, W] with a Gaussian at each (x, y) center [..., 2]."""
+    xs = torch.arange(W, dtype=torch.float32)
+    ys = torch.arange(H, dtype=torch.float32)
+    dx2 = (xs - centers[..., 0:1]) ** 2
+    dy2 = (ys - centers[..., 1:2]) ** 2
+    return torch.exp(-(dy2.unsqueeze(-1) + dx2.unsqueeze(-2)) / (2 * sigma**2))
+
+
+def _random_keypoints() -> torch.Tensor:
+    keypoints = torch.stack(
+        [torch.randint(0, W, (N, K)), torch.randint(0, H, (N, K))], dim=-1
+    ).float()
+    # Keypoints on the heatmap borders are not refined.
+    keypoints[0, :3] = torch.tensor([[0, 0], [W - 1, H - 1], [1, H - 1]])
+    return keypoints
+
+
+def test_get_heatmap_maximum():
+    heatmaps = torch.zeros(N, K, H, W)
+    heatmaps[1, 3, 10, 40] = 0.7
+    keypoints, scores = get_heatmap_maximum(heatmaps)
+    assert keypoints.shape == (N, K, 2)
+    assert keypoints[1, 3].tolist() == [40, 10]
+    assert scores[1, 3] == pytest.approx(0.7)
+
+
+def test_refine_keypoints_quarter_offset():
+    heatmaps = torch.rand(N, K, H, W)
+    keypoints = _random_keypoints()
+
+    # Per keypoint reference, like mmpose.codecs.utils.refine_keypoints.
+    expected = keypoints.numpy().copy()
+    for n, k in product(range(N), range(K)):
+        x, y = expected[n, k].astype(int)
+        hm = heatmaps[n, k].numpy()
+        dx = hm[y, x + 1] - hm[y, x - 1] if 1 < x < W - 1 and 0 < y < H else 0.0
+        dy = hm[y + 1, x] - hm[y - 1, x] if 1 < y < H - 1 and 0 < x < W else 0.0
+        expected[n, k] += np.sign([dx, dy]) * 0.25
+
+    np.testing.assert_allclose(
+        refine_keypoints_quarter_offset(keypoints, heatmaps), expected
+    )
+
+
+def test_refine_keypoints_dark():
+    centers = torch.rand(N, K, 2) * torch.tensor([W, H])
+    heatmaps = _gaussian_heatmaps(centers) + 0.1 * torch.rand(N, K, H, W)
+    keypoints, _ = get_heatmap_maximum(heatmaps)
+
+    # Per keypoint reference, like mmpose.codecs.utils.refine_keypoints_dark.
+    expected = keypoints.numpy().astype(np.float64)
+    for n, k in product(range(N), range(K)):
+        hm = heatmaps[n, k].numpy()
+        padded = np.pad(hm, 5)
+        blurred = cv2.GaussianBlur(padded, (11, 11), 0)[5:-5, 5:-5]
+        hm = np.log(np.maximum(blurred * hm.max() / blurred.max(), 1e-10))
+        x, y = expected[n, k].astype(int)
+        if not (1 < x < W - 2 and 1 < y < H - 2):
+            continue
+        dx = 0.5 * (hm[y, x + 1] - hm[y, x - 1])
+        dy = 0.5 * (hm[y + 1, x] - hm[y - 1, x])
+        dxx = 0.25 * (hm[y, x + 2] - 2 * hm[y, x] + hm[y, x - 2])
+        dxy = 0.25 * (
+            hm[y + 1, x + 1] - hm[y - 1, x + 1] - hm[y + 1, x - 1] + hm[y - 1, x - 1]
+        )
+        dyy = 0.25 * (hm[y + 2, x] - 2 * hm[y, x] + hm[y - 2, x])
+        hessian = np.array([[dxx, dxy], [dxy, dyy]])
+        if np.linalg.det(hessian) != 0:
+            expected[n, k] -= np.linalg.inv(hessian) @ np.array([dx, dy])
+
+    np.testing.assert_allclose(
+        refine_keypoints_dark(keypoints, heatmaps), expected, atol=1e-3
+    )
+
+
+@pytest.mark.parametrize(
+    "refinement,atol", [("none", 0.5), ("quarter_offset", 0.3), ("dark", 0.05)]
+)
+def test_decode_heatmaps(refinement, atol):
+    centers = torch.rand(N, K, 2) * torch.tensor([W - 8, H - 8]) + 4
+    heatmaps = _gaussian_heatmaps(centers)
+    keypoints, scores = decode_heatmaps(heatmaps, refinement)
+    assert keypoints.shape == (N, K, 2) and scores.shape == (N, K)
+    np.testing.assert_allclose(keypoints, centers, atol=atol)
+
+    # Decoding can be traced into a model.
+    traced = torch.jit.trace(lambda h: decode_heatmaps(h, refinement), heatmaps[:1])
+    np.testing.assert_allclose(traced(heatmaps)[0], keypoints)
+
+    with pytest.raises(ValueError):
+        decode_heatmaps(heatmaps, "unknown")
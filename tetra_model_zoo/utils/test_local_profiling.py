@@ -0,0 +1,30 @@
+import json
+import os
+
+import torch
+
+from tetra_model_zoo.utils.local_profiling import submit_local_profile_job
+
+
+def test_local_torchscript_profile(tmp_path):
+    model = torch.nn.Sequential(torch.nn.Conv2d(3, 8, 3), torch.nn.ReLU())
+    traced = torch.jit.trace(model, torch.ones(1, 3, 32, 32))
+
+    jobs = submit_local_profile_job(
+        name="tiny conv",
+        model=traced,
+        input_shapes={"image": ((1, 3, 32, 32), "float32")},
+        runtimes=["torchscript"],
+        output_dir=str(tmp_path),
+        num_warmup=1,
+        num_iterations=3,
+    )
+
+    assert len(jobs) == 1
+    summary = jobs[0].download_profile()["execution_summary"]
+    assert summary["estimated_inference_time"] >= 0
+    assert summary["estimated_inference_peak_memory"] >= 0
+    assert len(summary["all_inference_times"]) == 3
+    assert os.path.exists(jobs[0].download_target_model())
+    with open(tmp_path / "tiny_conv.torchscript.profile.json") as f:
+        assert json.load(f)["execution_summary"] == summary
@@ -0,0 +1,133 @@
+import os
+import shutil
+
+import pytest
+import torch
+
+from tetra_model_zoo.utils import asset_loaders
+from tetra_model_zoo.utils.mmap_weights import (
+    MMAP_WEIGHTS_ENV_VAR,
+    assign_state_dict,
+    load_flat_tensors,
+    load_state_dict_mmap,
+    save_flat_tensors,
+)
+
+
+def _make_model() -> torch.nn.Module:
+    return torch.nn.Sequential(
+        torch.nn.Conv2d(3, 8, 3), torch.nn.BatchNorm2d(8), torch.nn.ReLU()
+    )
+
+
+def test_flat_tensors_roundtrip(tmp_path):
+    tensors = {
+        "f32": torch.randn(3, 4),
+        "f16": torch.randn(5).half(),
+        "bf16": torch.randn(2, 3).bfloat16(),
+        "i64": torch.arange(7),
+        "bool": torch.tensor([True, False, True]),
+        "scalar": torch.tensor(3.0),
+        "empty": torch.zeros(0, 4),
+        "strided": torch.randn(4, 6)[:, ::2],
+    }
+    path = str(tmp_path / "weights.safetensors")
+    save_flat_tensors(tensors, path, metadata={"source": "test"})
+    loaded = load_flat_tensors(path)
+
+    assert list(loaded) == list(tensors)
+    for name, tensor in tensors.items():
+        assert loaded[name].dtype == tensor.dtype
+        assert torch.equal(loaded[name], tensor)
+    if os.path.exists("/proc/self/maps"):
+        with open("/proc/self/maps") as f:
+            assert path in f.read()
+
+
+def test_load_state_dict_mmap(tmp_path, monkeypatch):
+    monkeypatch.setattr(asset_loaders, "MODEL_ZOO_STORE", str(tmp_path / "store"))
+    monkeypatch.delenv(MMAP_WEIGHTS_ENV_VAR, raising=False)
+    source = _make_model()
+    checkpoint_path = str(tmp_path / "model.pth")
+    torch.save({"params_ema": source.state_dict(), "epoch": 3}, checkpoint_path)
+
+    state_dict = load_state_dict_mmap(
+        checkpoint_path, "test_model", state_dict_keys=["params_ema", "params"]
+    )
+    model = _make_model()
+    assign_state_dict(model, state_dict)
+    assert model[0].weight.data_ptr() == state_dict["0.weight"].data_ptr()
+    assert isinstance(model[0].weight, torch.nn.Parameter)
+
+    x = torch.randn(1, 3, 8, 8)
+    source.eval()
+    model.eval()
+    assert torch.equal(source(x), model(x))
+
+    # Writes are private to the process; the converted file is unchanged.
+    with torch.no_grad():
+        model[0].weight.zero_()
+    reloaded = load_state_dict_mmap(
+        checkpoint_path, "test_model", state_dict_keys=["params_ema", "params"]
+    )
+    assert torch.equal(reloaded["0.weight"], source[0].weight)
+
+
+def test_load_state_dict_mmap_disabled(tmp_path, monkeypatch):
+    monkeypatch.setattr(asset_loaders, "MODEL_ZOO_STORE", str(tmp_path / "store"))
+    monkeypatch.setenv(MMAP_WEIGHTS_ENV_VAR, "0")
+    checkpoint_path = str(tmp_path / "model.pth")
+    torch.save(_make_model().state_dict(), checkpoint_path)
+    state_dict = load_state_dict_mmap(checkpoint_path, "test_model")
+    assert "0.weight" in state_dict
+    assert not (tmp_path / "store").exists()
+
+
+def test_load_state_dict_mmap_moved_store(tmp_path, monkeypatch):
+    monkeypatch.delenv(MMAP_WEIGHTS_ENV_VAR, raising=False)
+    store = tmp_path / "store"
+    monkeypatch.setattr(asset_loaders, "MODEL_ZOO_STORE", str(store))
+    checkpoint_path = store / "test_model" / "model.pth"
+    os.makedirs(checkpoint_path.parent)
+    torch.save(_make_model().state_dict(), str(checkpoint_path))
+    load_state_dict_mmap(str(checkpoint_path), "test_model")
+    converted = os.listdir(store / "test_model" / "mmap")
+    assert len(converted) == 1
+
+    # The converted file is reused from the store's new location.
+    moved_store = tmp_path / "moved_store"
+    shutil.move(str(store), str(moved_store))
+    monkeypatch.setattr(asset_loaders, "MODEL_ZOO_STORE", str(moved_store))
+    load_state_dict_mmap(str(moved_store / "test_model" / "model.pth"), "test_model")
+    assert os.listdir(moved_store / "test_model" / "mmap") == converted
+
+
+def test_load_state_dict_mmap_unwritable_store(tmp_path, monkeypatch):
+    monkeypatch.delenv(MMAP_WEIGHTS_ENV_VAR, raising=False)
+    # The store can't be created: its path is a file.
+    (tmp_path / "store").write_text("")
+    monkeypatch.setattr(asset_loaders, "MODEL_ZOO_STORE", str(tmp_path / "store"))
+    source = _make_model()
+    checkpoint_path = str(tmp_path / "model.pth")
+    torch.save(source.state_dict(), checkpoint_path)
+
+    with pytest.warns(UserWarning, match="Unable to save memory-mapped weights"):
+        state_dict = load_state_dict_mmap(checkpoint_path, "test_model")
+    assert torch.equal(state_dict["0.weight"], source[0].weight)
+
+
+def test_assign_state_dict_errors():
+    model = _make_model()
+    state_dict = dict(_make_model().state_dict())
+    state_dict.pop("0.bias")
+    state_dict["extra"] = torch.zeros(1)
+    with pytest.raises(RuntimeError):
+        assign_state_dict(model, state_dict)
+    missing, unexpected = assign_state_dict(model, state_dict, strict=False)
+    assert missing == ["0.bias"]
+    assert unexpected == ["extra"]
+
+    state_dict = dict(_make_model().state_dict())
+    state_dict["0.weight"] = torch.zeros(1)
+    with pytest.raises(RuntimeError):
+        assign_state_dict(model, state_dict)
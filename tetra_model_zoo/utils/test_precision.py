@@ -0,0 +1,66 @@
+import pytest
+import torch
+
+from tetra_model_zoo.utils.precision import compare_precision, set_model_precision
+
+
+class _Model(torch.nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.features = torch.nn.Sequential(
+            torch.nn.Conv2d(3, 16, 3, padding=1),
+            torch.nn.BatchNorm2d(16),
+            torch.nn.ReLU(),
+            torch.nn.AdaptiveAvgPool2d(1),
+            torch.nn.Flatten(),
+        )
+        self.norm = torch.nn.LayerNorm(16)
+        self.head = torch.nn.Linear(16, 10)
+
+    def forward(self, image, scale: float = 1.0):
+        return self.head(self.norm(self.features(image))) * scale
+
+
+def _make_model() -> torch.nn.Module:
+    torch.manual_seed(0)
+    model = _Model().eval()
+    model.features[1].running_mean.uniform_(-0.5, 0.5)
+    model.features[1].running_var.uniform_(0.5, 2.0)
+    return model
+
+
+def test_set_model_precision_bf16():
+    model = set_model_precision(_make_model(), "bf16")
+    assert model.head.weight.dtype == torch.bfloat16
+    assert model.features[1].weight.dtype == torch.float32
+    assert model.norm.weight.dtype == torch.float32
+    output = model(torch.rand(2, 3, 16, 16), scale=torch.tensor(2.0))
+    assert output.dtype == torch.float32
+
+
+def test_set_model_precision_fp32_is_noop():
+    model = _make_model()
+    assert set_model_precision(model, "fp32") is model
+    assert model.head.weight.dtype == torch.float32
+    assert not model._forward_pre_hooks
+
+
+def test_set_model_precision_invalid():
+    with pytest.raises(ValueError):
+        set_model_precision(_make_model(), "int4")
+    model = set_model_precision(_make_model(), "bf16")
+    with pytest.raises(ValueError):
+        set_model_precision(model, "bf16")
+
+
+def test_compare_precision():
+    model = _make_model()
+    inputs = [torch.rand(8, 3, 16, 16)]
+    psnr = compare_precision(model, inputs, "bf16", psnr_threshold=25)
+    assert 25 < psnr < float("inf")
+    # The original model is not modified.
+    assert model.head.weight.dtype == torch.float32
+
+    compare_precision(model, inputs, "bf16", psnr_threshold=25, top1_tolerance=0.25)
+    with pytest.raises(AssertionError):
+        compare_precision(model, inputs, "bf16", psnr_threshold=200)
@@ -0,0 +1,138 @@
+import json
+import logging
+import os
+import threading
+
+import pytest
+
+from tetra_model_zoo.utils.profiling import (
+    ChromeTraceSink,
+    LoggingSink,
+    ProfilingSink,
+    PrometheusSink,
+    StageTimings,
+    profile_stage,
+    profiling_sinks,
+    record_stage_timings,
+)
+
+
+class _App:
+    pass
+
+
+def test_profiling_sink_requires_record():
+    class _NoRecordSink(ProfilingSink):
+        pass
+
+    with pytest.raises(TypeError):
+        _NoRecordSink()
+
+
+def test_stage_timings_histogram():
+    timings = StageTimings()
+    for seconds in [0.0005, 0.001, 0.002, 0.003, 1.5, 10.0]:
+        timings.record("App", "nms", 0.0, seconds)
+    timings.record("App", "model_forward", 0.0, 0.01)
+    timings.record("OtherApp", "nms", 0.0, 0.3)
+
+    # Durations equal to a bucket bound are counted in that bucket.
+    assert timings.histogram("App", "nms", buckets=(0.001, 0.01, 1.0)) == [2, 2, 0, 2]
+    # DEFAULT_BUCKETS: 0.5ms, 1ms, 2.5ms, 5ms, ..., 1s, 2.5s, 5s, 10s, +Inf.
+    histogram = timings.histogram("App", "nms")
+    assert histogram == [1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 1, 0]
+    assert timings.histogram("App", "drawing", buckets=(0.001, 0.01)) == [0, 0, 0]
+    assert timings.counts() == {
+        ("App", "nms"): 6,
+        ("App", "model_forward"): 1,
+        ("OtherApp", "nms"): 1,
+    }
+    assert list(timings.total_seconds_per_stage()) == ["nms", "model_forward"]
+    assert timings.total_seconds_per_stage()["nms"] == pytest.approx(11.8065)
+
+    timings.reset()
+    assert timings.counts() == {}
+
+
+def test_prometheus_sink_text():
+    sink = PrometheusSink(buckets=(0.01, 0.1))
+    assert sink.to_prometheus_text() == (
+        "# HELP tetra_model_zoo_app_stage_seconds "
+        "Time spent in each stage of a model zoo app.\n"
+        "# TYPE tetra_model_zoo_app_stage_seconds histogram\n"
+    )
+
+    sink.record("YoloV7App", "nms", 0.0, 0.005)
+    sink.record("YoloV7App", "nms", 0.0, 0.01)
+    sink.record("YoloV7App", "nms", 0.0, 0.25)
+    sink.record("DDRNetApp", "upsample", 0.0, 0.05)
+    metric = "tetra_model_zoo_app_stage_seconds"
+    yolo = 'app="YoloV7App",stage="nms"'
+    ddrnet = 'app="DDRNetApp",stage="upsample"'
+    assert sink.to_prometheus_text() == (
+        f"# HELP {metric} Time spent in each stage of a model zoo app.\n"
+        f"# TYPE {metric} histogram\n"
+        f'{metric}_bucket{{{yolo},le="0.01"}} 2\n'
+        f'{metric}_bucket{{{yolo},le="0.1"}} 2\n'
+        f'{metric}_bucket{{{yolo},le="+Inf"}} 3\n'
+        f"{metric}_sum{{{yolo}}} 0.265\n"
+        f"{metric}_count{{{yolo}}} 3\n"
+        f'{metric}_bucket{{{ddrnet},le="0.01"}} 0\n'
+        f'{metric}_bucket{{{ddrnet},le="0.1"}} 1\n'
+        f'{metric}_bucket{{{ddrnet},le="+Inf"}} 1\n'
+        f"{metric}_sum{{{ddrnet}}} 0.05\n"
+        f"{metric}_count{{{ddrnet}}} 1\n"
+    )
+
+
+def test_chrome_trace_sink(tmp_path):
+    sink = ChromeTraceSink()
+    sink.record("YoloV7App", "model_forward", 1.5, 0.25)
+    sink.record("YoloV7App", "nms", 1.75, 0.002)
+    path = str(tmp_path / "trace.json")
+    sink.save(path)
+
+    with open(path) as f:
+        trace = json.load(f)
+    common = dict(cat="YoloV7App", ph="X", pid=os.getpid(), tid=threading.get_ident())
+    assert trace == {
+        "traceEvents": [
+            dict(common, name="model_forward", ts=1.5e6, dur=0.25e6),
+            dict(common, name="nms", ts=1.75e6, dur=0.002e6),
+        ]
+    }
+
+
+def test_logging_sink(caplog):
+    sink = LoggingSink(level=logging.INFO)
+    with caplog.at_level(logging.INFO, logger="tetra_model_zoo.profiling"):
+        sink.record("YoloV7App", "nms", 0.0, 0.0012345)
+        # Below the sink's level.
+        LoggingSink().record("YoloV7App", "drawing", 0.0, 0.5)
+    assert [(r.name, r.levelno, r.getMessage()) for r in caplog.records] == [
+        ("tetra_model_zoo.profiling", logging.INFO, "YoloV7App.nms took 1.234ms")
+    ]
+
+
+def test_profile_stage():
+    app = _App()
+    # No sink registered: a shared no-op context.
+    assert profile_stage(app, "nms") is profile_stage("Other", "drawing")
+
+    trace = ChromeTraceSink()
+    with record_stage_timings() as timings, profiling_sinks(trace):
+        with profile_stage(app, "model_forward"):
+            pass
+        with profile_stage("CustomLabel", "nms"):
+            pass
+    with profile_stage(app, "model_forward"):
+        pass
+
+    assert timings.counts() == {
+        ("_App", "model_forward"): 1,
+        ("CustomLabel", "nms"): 1,
+    }
+    assert [(e["cat"], e["name"]) for e in trace.events] == [
+        ("_App", "model_forward"),
+        ("CustomLabel", "nms"),
+    ]
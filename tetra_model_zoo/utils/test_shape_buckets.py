@@ -0,0 +1,119 @@
+import json
+
+import pytest
+import torch
+
+from tetra_model_zoo.utils.shape_buckets import (
+    export_shape_buckets,
+    load_shape_bucket_models,
+    parse_shape,
+    select_shape_bucket,
+    stride_aligned_size,
+)
+
+
+def test_stride_aligned_size():
+    assert stride_aligned_size((720, 1280), 32) == (736, 1280)
+    assert stride_aligned_size((640, 640), 32) == (640, 640)
+    assert stride_aligned_size((1, 33), 32) == (32, 64)
+
+
+def test_select_shape_bucket():
+    buckets = [(640, 640), (384, 640), (736, 1280)]
+    assert select_shape_bucket((360, 640), buckets) == (384, 640)
+    assert select_shape_bucket((500, 500), buckets) == (640, 640)
+    assert select_shape_bucket((720, 1280), buckets) == (736, 1280)
+    # Doesn't fit anywhere: the bucket that needs the least downscaling.
+    assert select_shape_bucket((1440, 2560), buckets) == (736, 1280)
+    with pytest.raises(ValueError):
+        select_shape_bucket((10, 10), [])
+
+
+def test_parse_shape():
+    assert parse_shape("720x1280") == (720, 1280)
+    with pytest.raises(ValueError):
+        parse_shape("720")
+
+
+class _Upscaler(torch.nn.Module):
+    """Image to image model: pointwise conv + 2x upsampling, plus a global pool."""
+
+    def __init__(self):
+        super().__init__()
+        self.conv = torch.nn.Conv2d(3, 3, 1)
+
+    def forward(self, image, mask):
+        upscaled = self.conv(image) * mask
+        upscaled = torch.nn.functional.interpolate(upscaled, scale_factor=2)
+        return upscaled, image.mean(dim=(2, 3))
+
+
+class _ShapeSpecialized(torch.nn.Module):
+    """Converts the input size to a python int, which tracing bakes into the graph."""
+
+    def forward(self, image):
+        return image + torch.arange(int(image.shape[-1]))
+
+
+@pytest.mark.parametrize("dynamic", [False, True])
+def test_export_shape_buckets(tmp_path, dynamic):
+    model = _Upscaler().eval()
+    buckets = [(64, 64), (32, 64), (64, 128)]
+    manifest_path = export_shape_buckets(
+        "upscaler",
+        model,
+        lambda size: [torch.rand(1, 3, *size), torch.ones(1, 1, *size)],
+        buckets,
+        str(tmp_path),
+        dynamic,
+    )
+    with open(manifest_path) as f:
+        files = set(json.load(f)["models"].values())
+    assert len(files) == (1 if dynamic else 3)
+
+    dispatcher = load_shape_bucket_models(manifest_path)
+    assert dispatcher.buckets == [(32, 64), (64, 64), (64, 128)]
+    image, mask = torch.rand(1, 3, 40, 50), torch.ones(1, 1, 40, 50)
+    upscaled, mean = dispatcher(image, mask)
+    expected_upscaled, _ = model(image, mask)
+    # Outputs are cropped to the input's extent; reductions see the padding.
+    torch.testing.assert_close(upscaled, expected_upscaled)
+    assert mean.shape == (1, 3)
+
+    with pytest.raises(ValueError):
+        dispatcher(torch.rand(1, 3, 65, 65), torch.ones(1, 1, 65, 65))
+
+
+def test_export_shape_buckets_dynamic_check(tmp_path):
+    with pytest.raises(ValueError):
+        export_shape_buckets(
+            "specialized",
+            _ShapeSpecialized(),
+            lambda size: [torch.rand(1, 3, *size)],
+            [(32, 32), (32, 64)],
+            str(tmp_path),
+            dynamic=True,
+        )
+
+
+def test_export_shape_buckets_stride(tmp_path):
+    with pytest.raises(ValueError, match="640x650 .* Use 640x672"):
+        export_shape_buckets(
+            "upscaler",
+            _Upscaler().eval(),
+            lambda size: [torch.rand(1, 3, *size), torch.ones(1, 1, *size)],
+            [(64, 64), (640, 650)],
+            str(tmp_path),
+            stride=32,
+        )
+    # Nothing is traced or saved for invalid buckets.
+    assert not list(tmp_path.iterdir())
+
+    export_shape_buckets(
+        "upscaler",
+        _Upscaler().eval(),
+        lambda size: [torch.rand(1, 3, *size), torch.ones(1, 1, *size)],
+        [(32, 64), (64, 64)],
+        str(tmp_path),
+        stride=32,
+    )
@@ -0,0 +1,134 @@
+import torch
+
+from tetra_model_zoo.utils import asset_loaders, snapshot
+from tetra_model_zoo.utils.snapshot import (
+    SNAPSHOTS_ENV_VAR,
+    get_snapshot_path,
+    load_or_create_snapshot,
+)
+
+
+class _TinyModel(torch.nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.conv = torch.nn.Conv2d(3, 4, 3)
+
+    def forward(self, x):
+        return self.conv(x)
+
+
+def test_snapshot_roundtrip(tmp_path, monkeypatch):
+    monkeypatch.setattr(asset_loaders, "MODEL_ZOO_STORE", str(tmp_path))
+    monkeypatch.delenv(SNAPSHOTS_ENV_VAR, raising=False)
+    num_created = []
+
+    def create():
+        num_created.append(1)
+        return _TinyModel()
+
+    model = load_or_create_snapshot("tiny", ["weights_a"], create)
+    loaded = load_or_create_snapshot("tiny", ["weights_a"], create)
+    assert len(num_created) == 1
+    assert isinstance(loaded, _TinyModel)
+    assert torch.equal(model.conv.weight, loaded.conv.weight)
+
+    # A different key builds (and saves) a different snapshot.
+    load_or_create_snapshot("tiny", ["weights_b"], create)
+    assert len(num_created) == 2
+    assert get_snapshot_path("tiny", ["weights_a"]) != get_snapshot_path(
+        "tiny", ["weights_b"]
+    )
+
+
+class _TiedModel(torch.nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.encoder = torch.nn.Linear(4, 4)
+        self.decoder = torch.nn.Linear(4, 4)
+        self.decoder.weight = self.encoder.weight
+        self.norm = torch.nn.BatchNorm1d(4)
+
+
+def test_snapshot_tied_weights(tmp_path, monkeypatch):
+    monkeypatch.setattr(asset_loaders, "MODEL_ZOO_STORE", str(tmp_path))
+    monkeypatch.delenv(SNAPSHOTS_ENV_VAR, raising=False)
+    model = load_or_create_snapshot("tied", ["weights"], _TiedModel)
+    loaded = load_or_create_snapshot("tied", ["weights"], _TiedModel)
+    assert loaded is not model
+    assert torch.equal(loaded.decoder.weight, model.encoder.weight)
+    assert torch.equal(loaded.norm.running_var, model.norm.running_var)
+    assert not loaded.encoder.weight.is_meta and not loaded.decoder.weight.is_meta
+
+
+def test_snapshot_key_tracks_local_files(tmp_path):
+    weights = tmp_path / "weights.pt"
+    weights.write_bytes(b"a")
+    path_a = get_snapshot_path("tiny", [str(weights)])
+    weights.write_bytes(b"ab")
+    assert get_snapshot_path("tiny", [str(weights)]) != path_a
+
+
+def test_snapshots_disabled(tmp_path, monkeypatch):
+    monkeypatch.setattr(asset_loaders, "MODEL_ZOO_STORE", str(tmp_path))
+    monkeypatch.setenv(SNAPSHOTS_ENV_VAR, "0")
+    load_or_create_snapshot("tiny", ["weights_a"], _TinyModel)
+    assert not (tmp_path / "_snapshots").exists()
+
+
+def test_unreadable_snapshot_is_rebuilt(tmp_path, monkeypatch):
+    monkeypatch.setattr(asset_loaders, "MODEL_ZOO_STORE", str(tmp_path))
+    monkeypatch.delenv(SNAPSHOTS_ENV_VAR, raising=False)
+    load_or_create_snapshot("tiny", ["weights_a"], _TinyModel)
+    path = get_snapshot_path("tiny", ["weights_a"])
+    with open(path, "wb") as f:
+        f.write(b"corrupt")
+    model = load_or_create_snapshot("tiny", ["weights_a"], _TinyModel)
+    assert isinstance(model, _TinyModel)
+
+
+class _TwoModels:
+    def __init__(self):
+        self.detector = _TinyModel()
+        self.landmark_detector = _TinyModel()
+        self.anchors = torch.randn(4, 2)
+
+
+def test_snapshot_of_plain_object(tmp_path, monkeypatch):
+    monkeypatch.setattr(asset_loaders, "MODEL_ZOO_STORE", str(tmp_path))
+    monkeypatch.delenv(SNAPSHOTS_ENV_VAR, raising=False)
+    model = load_or_create_snapshot("tiny", ["two"], _TwoModels)
+    loaded = load_or_create_snapshot("tiny", ["two"], _TwoModels)
+    assert loaded is not model
+    assert torch.equal(model.detector.conv.weight, loaded.detector.conv.weight)
+    assert torch.equal(
+        model.landmark_detector.conv.bias, loaded.landmark_detector.conv.bias
+    )
+    assert torch.equal(model.anchors, loaded.anchors)
+    assert loaded.detector.conv.weight.device.type == "cpu"
+
+
+def test_snapshot_key_tracks_zoo_source(monkeypatch):
+    # Snapshots saved by other versions of the zoo's wrapper code aren't loaded.
+    path = get_snapshot_path("tiny", ["weights_a"])
+    monkeypatch.setattr(snapshot, "get_zoo_source_digest", lambda: "changed")
+    assert get_snapshot_path("tiny", ["weights_a"]) != path
+
+
+def test_zoo_source_digest_covers_wrapper_code(tmp_path, monkeypatch):
+    package = tmp_path / "tetra_model_zoo"
+    (package / "yolov7").mkdir(parents=True)
+    (package / "__init__.py").write_text("")
+    model_file = package / "yolov7" / "model.py"
+    model_file.write_text("class Detector: pass\n")
+    monkeypatch.setattr(
+        snapshot.tetra_model_zoo, "__file__", str(package / "__init__.py")
+    )
+
+    try:
+        snapshot.get_zoo_source_digest.cache_clear()
+        digest = snapshot.get_zoo_source_digest()
+        model_file.write_text("class Detector:\n    grids = {}\n")
+        snapshot.get_zoo_source_digest.cache_clear()
+        assert snapshot.get_zoo_source_digest() != digest
+    finally:
+        snapshot.get_zoo_source_digest.cache_clear()
@@ -0,0 +1,53 @@
+import os
+import tarfile
+
+from tetra_model_zoo.utils.store_bundle import (
+    BUNDLE_ROOT_NAME,
+    build_manifest,
+    verify_store,
+    write_bundle,
+    write_env_script,
+    write_manifest,
+)
+
+
+def _make_store(store) -> None:
+    os.makedirs(store / "yolov7" / "WongKinYiu_yolov7_git" / ".git")
+    (store / "yolov7" / "WongKinYiu_yolov7_git" / ".git" / "HEAD").write_text("ref")
+    (store / "yolov7" / "WongKinYiu_yolov7_git" / "train.py").write_text("pass\n")
+    (store / "yolov7" / "yolov7-tiny.pt").write_bytes(os.urandom(1024))
+    (store / "yolov7" / "partial.pt.part").write_bytes(b"partial")
+
+
+def test_manifest_and_verify(tmp_path):
+    store = tmp_path / "store"
+    _make_store(store)
+
+    manifest = build_manifest(str(store), {"yolov7": {"status": "ok"}})
+    write_manifest(str(store), manifest)
+
+    assert sorted(manifest["files"]) == [
+        os.path.join("yolov7", "WongKinYiu_yolov7_git", "train.py"),
+        os.path.join("yolov7", "yolov7-tiny.pt"),
+    ]
+    assert verify_store(str(store)) == []
+
+    (store / "yolov7" / "yolov7-tiny.pt").write_bytes(os.urandom(1024))
+    os.remove(store / "yolov7" / "WongKinYiu_yolov7_git" / "train.py")
+    assert sorted(verify_store(str(store))) == [
+        f"checksum mismatch: {os.path.join('yolov7', 'yolov7-tiny.pt')}",
+        f"missing: {os.path.join('yolov7', 'WongKinYiu_yolov7_git', 'train.py')}",
+    ]
+
+
+def test_bundle_is_relocatable(tmp_path):
+    store = tmp_path / "store"
+    _make_store(store)
+    write_manifest(str(store), build_manifest(str(store)))
+    write_env_script(str(store))
+
+    bundle_path = write_bundle(str(store), str(tmp_path / "bundle.tar.gz"))
+    with tarfile.open(bundle_path) as tar:
+        tar.extractall(tmp_path / "extracted")
+
+    assert verify_store(str(tmp_path / "extracted" / BUNDLE_ROOT_NAME)) == []
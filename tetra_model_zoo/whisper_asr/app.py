@@ -8,6 +8,7 @@ import torch
 import whisper  # type: ignore
 
 from tetra_model_zoo.utils.model_adapters import TorchNumpyAdapter
+from tetra_model_zoo.utils.profiling import profile_stage
 from tetra_model_zoo.whisper_asr.model import Whisper
 
 # hard-coded audio hyperparameters
@@ -58,7 +59,8 @@ class WhisperApp:
 
         - transcribed texts
         """
-        cross_attn_cache = self.encoder(mel_input)
+        with profile_stage(self, "encoder_forward"):
+            cross_attn_cache = self.encoder(mel_input)
         # Start decoding
         # coreml only takes float tensors
         x = np.array([[TOKEN_SOT]])
@@ -71,21 +73,23 @@ class WhisperApp:
         sample_len = 224  # max # of tokens to sample
         sum_logprobs = 0
         for i in range(sample_len):
-            decoder_out = self.decoder(x, *cross_attn_cache, *self_attn_cache)
+            with profile_stage(self, "decoder_forward"):
+                decoder_out = self.decoder(x, *cross_attn_cache, *self_attn_cache)
             # logit has shape (1, decoded_len, 51864)
             logits = decoder_out[0]
             self_attn_cache = decoder_out[1:]  # type: ignore
             # logit has shape (51864,)
             logits = logits[0, -1]  # consider only the last token
 
-            # Filters
-            # SuppressBlank
-            if i == 0:
-                logits[[TOKEN_EOT, TOKEN_BLANK]] = -np.inf
-            # SuppressTokens
-            logits[NON_SPEECH_TOKENS] = -np.inf
+            with profile_stage(self, "token_decode"):
+                # Filters
+                # SuppressBlank
+                if i == 0:
+                    logits[[TOKEN_EOT, TOKEN_BLANK]] = -np.inf
+                # SuppressTokens
+                logits[NON_SPEECH_TOKENS] = -np.inf
 
-            logits, logprobs = apply_timestamp_rules(logits, decoded_tokens)
+                logits, logprobs = apply_timestamp_rules(logits, decoded_tokens)
 
             if i == 0:
                 # detect no_speech
@@ -102,11 +106,12 @@ class WhisperApp:
             x = np.array([[next_token]])
             decoded_tokens.append(int(next_token))
 
-        tokenizer = whisper.decoding.get_tokenizer(
-            multilingual=False, language="en", task="transcribe"
-        )
+        with profile_stage(self, "detokenize"):
+            tokenizer = whisper.decoding.get_tokenizer(
+                multilingual=False, language="en", task="transcribe"
+            )
 
-        text = tokenizer.decode(decoded_tokens[1:])  # remove TOKEN_SOT
+            text = tokenizer.decode(decoded_tokens[1:])  # remove TOKEN_SOT
         return text.strip()
 
 
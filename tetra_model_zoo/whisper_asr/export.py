@@ -2,11 +2,17 @@ import os
 
 import torch
 
-import tetra_hub as hub
+from tetra_model_zoo.utils.args import base_export_parser
 from tetra_model_zoo.utils.input_spec import make_torch_inputs
+from tetra_model_zoo.utils.local_profiling import submit_local_profile_job
 from tetra_model_zoo.whisper_asr.model import Whisper
 
-if __name__ == "__main__":
+
+def main():
+    # Export parameters
+    parser = base_export_parser()
+    args = parser.parse_args()
+
     # For other model sizes, see https://github.com/openai/whisper/blob/main/whisper/__init__.py#L17
     model_version = "tiny.en"
     model = Whisper.from_pretrained(model_version)
@@ -20,11 +26,28 @@ if __name__ == "__main__":
     # Trace decoder
     torch_inputs = make_torch_inputs(decoder.get_input_spec())
     decoder_trace = torch.jit.trace(decoder, torch_inputs)
+
+    if args.local:
+        submit_local_profile_job(
+            name=f"whisper_{model_version}_encoder",
+            model=encoder_trace,
+            input_shapes=encoder.get_input_spec(),
+            runtimes=args.local_runtimes,
+            output_dir=args.local_output_dir,
+        )
+        submit_local_profile_job(
+            name=f"whisper_{model_version}_decoder",
+            model=decoder_trace,
+            input_shapes=decoder.get_input_spec(),
+            runtimes=args.local_runtimes,
+            output_dir=args.local_output_dir,
+        )
+        return
+
+    import tetra_hub as hub
+
     # Select the device you'd like to optimize for.
-    devices = [
-        hub.Device("Apple iPhone 14 Pro"),
-        hub.Device("Samsung Galaxy S23 Ultra"),
-    ]
+    devices = [hub.Device(x) for x in args.devices]
 
     # Submit the traced models for optimization and profiling.
     encoder_jobs = hub.submit_profile_job(
@@ -51,3 +74,7 @@ if __name__ == "__main__":
 
     print("Exported encoder(s):\n" + "\n".join(encoder_model_paths))
     print("Exported decoder(s):\n" + "\n".join(decoder_model_paths))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ import torch
 import whisper  # type: ignore
 
 from tetra_model_zoo.utils.input_spec import InputSpec
+from tetra_model_zoo.utils.precision import set_model_precision
 
 MAX_DECODE_LEN = 448
 
@@ -24,9 +25,16 @@ class Whisper:
         self.attention_dim = attention_dim
 
     @staticmethod
-    def from_pretrained(model: str = "tiny.en"):
-        # For other model sizes, see https://github.com/openai/whisper/blob/main/whisper/__init__.py#L17
-        return Whisper.from_source_model(whisper.load_model(model))
+    def from_pretrained(model: str = "tiny.en", precision: str = "fp32"):
+        """
+        Parameters:
+            model: Whisper model size. For other model sizes, see
+                https://github.com/openai/whisper/blob/main/whisper/__init__.py#L17
+            precision: "fp32", "bf16" or "fp16". See utils.precision.
+        """
+        return set_model_precision(
+            Whisper.from_source_model(whisper.load_model(model)), precision
+        )
 
     @staticmethod
     def from_source_model(whisper_model: Any):
@@ -146,8 +154,8 @@ class WhisperDecoderInf(torch.nn.Module):
         kv_cache_new = []
         for block in self.blocks:
             x, k_cache, v_cache = block(x, kv_cache=kv_cache)
-            kv_cache_new.append(k_cache.float())
-            kv_cache_new.append(v_cache.float())
+            kv_cache_new.append(k_cache)
+            kv_cache_new.append(v_cache)
 
         x = self.ln(x)
         logits = (
@@ -7,6 +7,7 @@ import torch
 import whisper
 
 from tetra_model_zoo.utils.asset_loaders import maybe_download_s3_data
+from tetra_model_zoo.utils.precision import compare_precision
 from tetra_model_zoo.whisper_asr.app import WhisperApp, load_audio, load_mel_filter
 from tetra_model_zoo.whisper_asr.model import (
     MODEL_NAME,
@@ -80,3 +81,26 @@ def test_transcribe(mel_input):
     # Perform transcription
     transcription = app.transcribe(mel_input)
     assert transcription == text_orig
+
+
+def test_bf16(mel_input):
+    """
+    Test that the bf16 encoder and decoder match fp32, and that the decoder
+    predicts the same first token.
+    """
+    model = Whisper.from_pretrained()
+    mel_input = torch.from_numpy(mel_input)
+    compare_precision(model.encoder, [mel_input], "bf16", psnr_threshold=25)
+
+    with torch.no_grad():
+        cross_attn_cache = model.encoder(mel_input)
+    tokens = torch.LongTensor([[50257]])
+    empty_cache = torch.zeros(1, 0, model.attention_dim)
+    self_attn_cache = [empty_cache] * 2 * model.num_decoder_blocks
+    compare_precision(
+        model.decoder,
+        [tokens, *cross_attn_cache, *self_attn_cache],
+        "bf16",
+        psnr_threshold=20,
+        top1_tolerance=0,
+    )
@@ -1,14 +1,17 @@
 from __future__ import annotations
 
-from typing import Callable, List, Tuple
+from typing import Callable, List, Sequence, Tuple
 
 import numpy as np
 import torch
 from PIL.Image import Image
 
 from tetra_model_zoo.utils.bounding_box_processing import batched_nms
-from tetra_model_zoo.utils.draw import draw_box_from_xyxy
-from tetra_model_zoo.utils.image_processing import app_to_net_image_inputs
+from tetra_model_zoo.utils.draw import draw_boxes_from_xyxy
+from tetra_model_zoo.utils.image_processing import app_to_net_image_inputs, resize_pad
+from tetra_model_zoo.utils.profiling import profile_stage
+from tetra_model_zoo.utils.shape_buckets import select_shape_bucket, stride_aligned_size
+from tetra_model_zoo.yolo.utils import compute_slice_origins
 
 
 class YoloObjectDetectionApp:
@@ -22,7 +25,9 @@ class YoloObjectDetectionApp:
 
     For a given image input, the app will:
         * pre-process the image (convert to range[0, 1])
+        * letterbox the image to a size the model accepts (see get_network_input_size)
         * Run Yolo inference
+        * map the predicted boxes back to the original image's coordinates
         * if requested, post-process YoloV7 output using non maximum suppression
         * if requested, draw the predicted bounding boxes on the input image
     """
@@ -34,6 +39,7 @@ class YoloObjectDetectionApp:
         ],
         nms_score_threshold: float = 0.45,
         nms_iou_threshold: float = 0.7,
+        input_shape_buckets: Sequence[Tuple[int, int]] | None = None,
     ):
         """
         Initialize a YoloObjectDetectionApp application.
@@ -59,10 +65,17 @@ class YoloObjectDetectionApp:
 
             nms_iou_threshold
                 Intersection over Union threshold for non maximum suppression.
+
+            input_shape_buckets
+                Optional fixed set of (height, width) network input sizes. Each image
+                is letterboxed into the smallest bucket it fits in, so the model only
+                ever sees these shapes. By default, images are letterboxed to the
+                nearest multiple of the model's STRIDE_MULTIPLE (if it has one).
         """
         self.model = model
         self.nms_score_threshold = nms_score_threshold
         self.nms_iou_threshold = nms_iou_threshold
+        self.input_shape_buckets = input_shape_buckets
 
     def check_image_size(self, pixel_values: torch.Tensor) -> None:
         """
@@ -70,6 +83,20 @@ class YoloObjectDetectionApp:
         """
         raise NotImplementedError
 
+    def get_network_input_size(self, image_size: Tuple[int, int]) -> Tuple[int, int]:
+        """
+        Returns the (height, width) that an image of the given (height, width)
+        is letterboxed to before it is fed to the model.
+        """
+        stride = getattr(self.model, "STRIDE_MULTIPLE", None)
+        if self.input_shape_buckets:
+            if stride:
+                image_size = stride_aligned_size(image_size, stride)
+            return select_shape_bucket(image_size, self.input_shape_buckets)
+        if stride:
+            return stride_aligned_size(image_size, stride)
+        return image_size
+
     def predict(self, *args, **kwargs):
         # See predict_boxes_from_image.
         return self.predict_boxes_from_image(*args, **kwargs)
@@ -110,37 +137,169 @@ class YoloObjectDetectionApp:
         """
 
         # Input Prep
-        NHWC_int_numpy_frames, NCHW_fp32_torch_frames = app_to_net_image_inputs(
-            pixel_values_or_image
-        )
-        self.check_image_size(NCHW_fp32_torch_frames)
+        with profile_stage(self, "input_conversion"):
+            NHWC_int_numpy_frames, NCHW_fp32_torch_frames = app_to_net_image_inputs(
+                pixel_values_or_image
+            )
 
         # Run prediction
-        pred_boxes, pred_scores, pred_class_idx = self.model(NCHW_fp32_torch_frames)
+        pred_boxes, pred_scores, pred_class_idx = self._run_model(NCHW_fp32_torch_frames)
 
         # Non Maximum Suppression on each batch
-        pred_boxes, pred_scores, pred_class_idx = batched_nms(
-            self.nms_iou_threshold,
-            self.nms_score_threshold,
-            pred_boxes,
-            pred_scores,
-            pred_class_idx,
-        )
+        with profile_stage(self, "nms"):
+            pred_boxes, pred_scores, pred_class_idx = batched_nms(
+                self.nms_iou_threshold,
+                self.nms_score_threshold,
+                pred_boxes,
+                pred_scores,
+                pred_class_idx,
+            )
 
         # Return raw output if requested
         if raw_output or isinstance(pixel_values_or_image, torch.Tensor):
             return (pred_boxes, pred_scores, pred_class_idx)
 
-        # Add boxes to each batch
-        for batch_idx in range(len(pred_boxes)):
-            pred_boxes_batch = pred_boxes[batch_idx]
-            for box in pred_boxes_batch:
-                draw_box_from_xyxy(
-                    NHWC_int_numpy_frames[batch_idx],
-                    box[0:2].int(),
-                    box[2:4].int(),
-                    color=(0, 255, 0),
-                    size=2,
-                )
+        self._draw_boxes(NHWC_int_numpy_frames, pred_boxes)
+        return NHWC_int_numpy_frames
+
+    def predict_boxes_from_image_sliced(
+        self,
+        pixel_values_or_image: torch.Tensor | np.ndarray | Image | List[Image],
+        slice_size: Tuple[int, int] = (640, 640),
+        overlap: float = 0.2,
+        slice_batch_size: int = 8,
+        include_full_frame: bool = True,
+        raw_output: bool = False,
+    ) -> Tuple[List[torch.Tensor], List[torch.Tensor], List[torch.Tensor]] | List[
+        np.ndarray
+    ]:
+        """
+        Sliced inference, for small objects in large frames (e.g. 4K aerial or CCTV
+        frames), which disappear when the whole frame is run at the model's
+        resolution.
+
+        Each frame is tiled into overlapping slices of `slice_size`, which are run
+        through the model in batches. The predicted boxes are mapped back to frame
+        coordinates and merged with NMS across slices (and, if requested, with the
+        predictions on the full frame, which catch objects larger than a slice).
+        Like in SAHI, the full frame is downscaled to the slice's network input
+        size, so it costs one more slice rather than a full resolution pass.
+
+        Parameters:
+            pixel_values_or_image: See predict_boxes_from_image.
+            slice_size: (height, width) of each slice. Slices are letterboxed like
+                full images (see get_network_input_size).
+            overlap: Fraction of the slice size by which neighboring slices overlap.
+            slice_batch_size: Number of slices per model forward pass.
+            include_full_frame: Also run the model on the full frame, letterboxed
+                to the network input size of a slice.
+            raw_output: See predict_boxes_from_image.
+
+        Returns:
+            See predict_boxes_from_image.
+        """
+        with profile_stage(self, "input_conversion"):
+            NHWC_int_numpy_frames, NCHW_fp32_torch_frames = app_to_net_image_inputs(
+                pixel_values_or_image
+            )
+            batch_size = NCHW_fp32_torch_frames.shape[0]
+            height, width = NCHW_fp32_torch_frames.shape[-2:]
+            origins = compute_slice_origins((height, width), slice_size, overlap)
+            slice_height = min(slice_size[0], height)
+            slice_width = min(slice_size[1], width)
+            # [batch * num slices, C, slice height, slice width]
+            slices = torch.stack(
+                [
+                    NCHW_fp32_torch_frames[
+                        :, :, y : y + slice_height, x : x + slice_width
+                    ]
+                    for y, x in origins
+                ],
+                dim=1,
+            ).flatten(0, 1)
+
+        slice_boxes, slice_scores, slice_class_idx = [], [], []
+        for start in range(0, slices.shape[0], slice_batch_size):
+            boxes, scores, class_idx = self._run_model(
+                slices[start : start + slice_batch_size]
+            )
+            slice_boxes.append(boxes)
+            slice_scores.append(scores)
+            slice_class_idx.append(class_idx)
+
+        with profile_stage(self, "merge_slices"):
+            # Map boxes to frame coordinates, then gather each frame's predictions.
+            offsets = torch.tensor(
+                [[x, y, x, y] for y, x in origins], dtype=slice_boxes[0].dtype
+            ).repeat(batch_size, 1)
+            pred_boxes = (torch.cat(slice_boxes) + offsets.unsqueeze(1)).view(
+                batch_size, -1, 4
+            )
+            pred_scores = torch.cat(slice_scores).view(batch_size, -1)
+            pred_class_idx = torch.cat(slice_class_idx).view(batch_size, -1)
+
+        if include_full_frame and len(origins) > 1:
+            boxes, scores, class_idx = self._run_model(
+                NCHW_fp32_torch_frames, self.get_network_input_size(slice_size)
+            )
+            pred_boxes = torch.cat([pred_boxes, boxes], 1)
+            pred_scores = torch.cat([pred_scores, scores], 1)
+            pred_class_idx = torch.cat([pred_class_idx, class_idx], 1)
 
+        # Non Maximum Suppression across slices
+        with profile_stage(self, "nms"):
+            pred_boxes, pred_scores, pred_class_idx = batched_nms(
+                self.nms_iou_threshold,
+                self.nms_score_threshold,
+                pred_boxes,
+                pred_scores,
+                pred_class_idx,
+            )
+
+        if raw_output or isinstance(pixel_values_or_image, torch.Tensor):
+            return (pred_boxes, pred_scores, pred_class_idx)
+
+        self._draw_boxes(NHWC_int_numpy_frames, pred_boxes)
         return NHWC_int_numpy_frames
+
+    def _run_model(
+        self,
+        NCHW_fp32_torch_frames: torch.Tensor,
+        network_input_size: Tuple[int, int] | None = None,
+    ) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """
+        Letterboxes the frames to `network_input_size` (by default, see
+        get_network_input_size), runs the model, and maps the predicted boxes
+        back to the frames' coordinates.
+        """
+        with profile_stage(self, "input_conversion"):
+            image_size = tuple(NCHW_fp32_torch_frames.shape[-2:])
+            if network_input_size is None:
+                network_input_size = self.get_network_input_size(image_size)
+            scale, (pad_left, pad_top) = 1.0, (0, 0)
+            if network_input_size != image_size:
+                NCHW_fp32_torch_frames, scale, (pad_left, pad_top) = resize_pad(
+                    NCHW_fp32_torch_frames, network_input_size
+                )
+            self.check_image_size(NCHW_fp32_torch_frames)
+
+        with profile_stage(self, "model_forward"):
+            pred_boxes, pred_scores, pred_class_idx = self.model(NCHW_fp32_torch_frames)
+
+        # Map boxes from the letterboxed network input back to the image.
+        if network_input_size != image_size:
+            with profile_stage(self, "undo_letterbox"):
+                offset = pred_boxes.new_tensor([pad_left, pad_top, pad_left, pad_top])
+                max_xy = pred_boxes.new_tensor([image_size[1], image_size[0]] * 2)
+                pred_boxes = torch.minimum(
+                    ((pred_boxes - offset) / scale).clamp_(min=0), max_xy
+                )
+        return pred_boxes, pred_scores, pred_class_idx
+
+    def _draw_boxes(
+        self, NHWC_int_numpy_frames: List[np.ndarray], pred_boxes: List[torch.Tensor]
+    ) -> None:
+        # Add boxes to each batch
+        with profile_stage(self, "drawing"):
+            for frame, pred_boxes_batch in zip(NHWC_int_numpy_frames, pred_boxes):
+                draw_boxes_from_xyxy(frame, pred_boxes_batch, color=(0, 255, 0), size=2)
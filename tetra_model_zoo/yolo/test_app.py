@@ -0,0 +1,101 @@
+from typing import List, Tuple
+
+import numpy as np
+import pytest
+import torch
+
+from tetra_model_zoo.yolo.utils import compute_slice_origins
+from tetra_model_zoo.yolov7.app import YoloV7App
+
+
+class _ImageExtentDetector(torch.nn.Module):
+    """
+    Predicts one box: the extent of the non-zero pixels of the input
+    (with score 0 if every pixel is zero).
+    """
+
+    STRIDE_MULTIPLE = 32
+
+    def __init__(self):
+        super().__init__()
+        self.input_sizes: List[Tuple[int, int]] = []
+
+    def forward(self, image: torch.Tensor):
+        self.input_sizes.append(tuple(image.shape[-2:]))
+        boxes, scores = [], []
+        for frame in image:
+            ys, xs = torch.nonzero(frame.amax(dim=0) > 0, as_tuple=True)
+            if len(xs) == 0:
+                boxes.append(torch.zeros(4))
+                scores.append(0.0)
+                continue
+            boxes.append(
+                torch.stack([xs.min(), ys.min(), xs.max() + 1, ys.max() + 1]).float()
+            )
+            scores.append(1.0)
+        return (
+            torch.stack(boxes).unsqueeze(1),
+            torch.tensor(scores).unsqueeze(1),
+            torch.zeros(image.shape[0], 1),
+        )
+
+
+@pytest.mark.parametrize(
+    "image_size,input_shape_buckets,network_input_size",
+    [
+        ((720, 1280), None, (736, 1280)),
+        ((640, 640), None, (640, 640)),
+        ((100, 90), None, (128, 96)),
+        ((360, 640), [(640, 640), (384, 640)], (384, 640)),
+        ((1440, 2560), [(736, 1280)], (736, 1280)),
+    ],
+)
+def test_letterbox(image_size, input_shape_buckets, network_input_size):
+    model = _ImageExtentDetector()
+    app = YoloV7App(model, input_shape_buckets=input_shape_buckets)
+    frame = np.full((*image_size, 3), 255, dtype=np.uint8)
+    boxes, _, _ = app.predict_boxes_from_image(frame, raw_output=True)
+    assert model.input_sizes == [network_input_size]
+    np.testing.assert_allclose(
+        boxes[0][0].numpy(), [0, 0, image_size[1], image_size[0]], atol=2.5
+    )
+
+
+@pytest.mark.parametrize(
+    "image_size,slice_size,overlap,origins",
+    [
+        ((640, 640), (640, 640), 0.2, [(0, 0)]),
+        ((300, 200), (640, 640), 0.2, [(0, 0)]),
+        ((640, 1152), (640, 640), 0.2, [(0, 0), (0, 512)]),
+        ((640, 1200), (640, 640), 0.2, [(0, 0), (0, 280), (0, 560)]),
+        ((1000, 640), (640, 640), 0.0, [(0, 0), (360, 0)]),
+    ],
+)
+def test_compute_slice_origins(image_size, slice_size, overlap, origins):
+    assert compute_slice_origins(image_size, slice_size, overlap) == origins
+
+
+def test_sliced_inference():
+    model = _ImageExtentDetector()
+    app = YoloV7App(model, nms_iou_threshold=0.5)
+    # Two small objects in opposite corners of a large frame.
+    frame = np.zeros((2, 1080, 1920, 3), dtype=np.uint8)
+    frame[:, 10:30, 20:50] = 255
+    frame[:, 1050:1070, 1880:1910] = 255
+    boxes, scores, _ = app.predict_boxes_from_image_sliced(
+        frame, slice_size=(640, 640), slice_batch_size=4, raw_output=True
+    )
+    num_slices = len(compute_slice_origins((1080, 1920), (640, 640), 0.2))
+    # Slices are batched, followed by one pass on the full frame, downscaled to
+    # the size of a slice.
+    assert model.input_sizes == [(640, 640)] * ((2 * num_slices + 3) // 4 + 1)
+
+    for frame_boxes in boxes:
+        # The slices with one object in the corner detect it exactly.
+        detected = {tuple(box) for box in frame_boxes.round().int().tolist()}
+        assert (20, 10, 50, 30) in detected
+        assert (1880, 1050, 1910, 1070) in detected
+        # The full frame pass sees both objects, mapped back to frame coordinates
+        # (up to the 3x downscaling).
+        full_frame_box = max(frame_boxes, key=lambda box: box[2] - box[0])
+        np.testing.assert_allclose(full_frame_box, [20, 10, 1910, 1070], atol=4)
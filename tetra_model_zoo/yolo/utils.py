@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import math
+from typing import List, Tuple
+
 import torch
 
 
@@ -77,3 +80,38 @@ def get_most_likely_score(scores: torch.Tensor):
     """
     scores, class_idx = torch.max(scores, -1, keepdim=False)
     return scores, class_idx.float()
+
+
+def compute_slice_origins(
+    image_size: Tuple[int, int], slice_size: Tuple[int, int], overlap: float = 0.2
+) -> List[Tuple[int, int]]:
+    """
+    Tiles an image with overlapping slices, for sliced inference.
+
+    Parameters:
+        image_size: (height, width) of the image.
+        slice_size: (height, width) of each slice. Clamped to the image size.
+        overlap: Minimum fraction of the slice size by which neighboring
+            slices overlap, in [0, 1).
+
+    Returns:
+        (y, x) top left corner of each slice, in row major order. Slices are
+        spread evenly, so the last row / column ends at the image's edge.
+    """
+    if not 0 <= overlap < 1:
+        raise ValueError("overlap must be in [0, 1).")
+
+    def axis_origins(length: int, slice_length: int) -> List[int]:
+        slice_length = min(slice_length, length)
+        if slice_length == length:
+            return [0]
+        max_step = slice_length * (1 - overlap)
+        num_slices = math.ceil((length - slice_length) / max_step) + 1
+        step = (length - slice_length) / (num_slices - 1)
+        return [round(i * step) for i in range(num_slices)]
+
+    return [
+        (y, x)
+        for y in axis_origins(image_size[0], slice_size[0])
+        for x in axis_origins(image_size[1], slice_size[1])
+    ]
@@ -8,7 +8,9 @@ from tetra_model_zoo.yolo.app import YoloObjectDetectionApp
 class YoloV6DetectionApp(YoloObjectDetectionApp):
     def check_image_size(self, pixel_values: torch.Tensor) -> None:
         """
-        Verify image size is valid model input.
+        Verify image size is valid model input. The app letterboxes images to a
+        multiple of STRIDE_MULTIPLE (see get_network_input_size), so this only
+        fails for custom input_shape_buckets that aren't stride aligned.
         """
         if len(pixel_values.shape) != 4:
             raise ValueError("Pixel Values must be rank 4: [batch, channels, x, y]")
@@ -5,6 +5,7 @@ import torch.nn as nn
 
 from tetra_model_zoo.utils.asset_loaders import SourceAsRoot, download_data
 from tetra_model_zoo.utils.input_spec import InputSpec
+from tetra_model_zoo.utils.snapshot import load_or_create_snapshot
 from tetra_model_zoo.yolo.utils import detect_postprocess
 
 YOLOV6_SOURCE_REPOSITORY = "https://github.com/meituan/YOLOv6"
@@ -27,7 +28,24 @@ class YoloV6(torch.nn.Module):
     STRIDE_MULTIPLE = 32
 
     @staticmethod
-    def from_pretrained(ckpt_name: str = DEFAULT_WEIGHTS):
+    def from_pretrained(ckpt_name: str = DEFAULT_WEIGHTS, use_snapshot: bool = True):
+        """
+        Load YoloV6 from a checkpoint released by the source YoloV6 repository.
+
+        Parameters:
+            ckpt_name: Name of the released checkpoint.
+            use_snapshot: Load from (or save) a snapshot of the constructed model.
+                See utils.snapshot.
+        """
+        if use_snapshot:
+            return load_or_create_snapshot(
+                MODEL_NAME,
+                ["YoloV6", ckpt_name],
+                lambda: YoloV6.from_pretrained(ckpt_name, use_snapshot=False),
+                SourceAsRoot(
+                    YOLOV6_SOURCE_REPOSITORY, YOLOV6_SOURCE_REPO_COMMIT, MODEL_NAME
+                ),
+            )
         model_url = f"{WEIGHTS_PATH}{ckpt_name}"
         model = _load_yolov6_source_model_from_weights(model_url)
         return YoloV6(model)
@@ -28,7 +28,8 @@ def main():
         "--image",
         type=str,
         default=f"https://tetra-public-assets.s3.us-west-2.amazonaws.com/model-zoo/yolov7/v{MODEL_ASSET_VERSION}/yolov7_demo_640.jpg",
-        help=f"image file path or URL. Image spatial dimensions (x and y) must be multiples of {YoloV7.STRIDE_MULTIPLE}",
+        help="image file path or URL. The image is letterboxed to a multiple of "
+        f"{YoloV7.STRIDE_MULTIPLE} pixels.",
     )
     parser.add_argument(
         "--score_threshold",
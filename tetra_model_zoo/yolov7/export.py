@@ -5,9 +5,10 @@ from typing import Any, List
 
 import torch
 
-import tetra_hub as hub
 from tetra_model_zoo.utils.args import vision_export_parser
 from tetra_model_zoo.utils.hub import download_hub_models
+from tetra_model_zoo.utils.local_profiling import submit_local_profile_job
+from tetra_model_zoo.utils.shape_buckets import export_shape_buckets
 from tetra_model_zoo.yolov7.demo import WEIGHTS_HELP_MSG
 from tetra_model_zoo.yolov7.model import YoloV7
 
@@ -27,6 +28,7 @@ def main():
         default_y=640,
         dim_constraint=f"Must be a multiple of of {YoloV7.STRIDE_MULTIPLE}",
         include_trace_option=True,
+        include_shape_bucket_options=True,
     )
     parser.add_argument(
         "--weights", type=str, default="yolov7-tiny.pt", help=WEIGHTS_HELP_MSG
@@ -38,6 +40,18 @@ def main():
     # Instantiate the model & a sample input.
     yolo_model = YoloV7.from_pretrained(args.weights)
 
+    if args.shape_buckets:
+        export_shape_buckets(
+            "yolov7",
+            yolo_model,
+            lambda size: [torch.ones(args.b, args.c, *size)],
+            args.shape_buckets,
+            args.output_dir,
+            args.dynamic_shapes,
+            stride=YoloV7.STRIDE_MULTIPLE,
+        )
+        return
+
     # Trace the model.
     traced_yolo = trace(yolo_model, [args.b, args.c, args.y, args.x])
 
@@ -48,6 +62,18 @@ def main():
         print(f"Saved torchscript to {model_path}")
         exit(0)
 
+    if args.local:
+        submit_local_profile_job(
+            name="yolov7",
+            model=traced_yolo,
+            input_shapes=yolo_model.get_input_spec([args.y, args.x], args.b, args.c),
+            runtimes=args.local_runtimes,
+            output_dir=args.local_output_dir,
+        )
+        return
+
+    import tetra_hub as hub
+
     # Select the device(s) you'd like to optimize for.
     devices = [hub.Device(x) for x in args.devices]
 
@@ -55,7 +81,7 @@ def main():
     jobs = hub.submit_profile_job(
         name="yolov7",
         model=traced_yolo,
-        input_shapes=yolo_model.get_input_spec(),
+        input_shapes=yolo_model.get_input_spec([args.y, args.x], args.b, args.c),
         device=devices,
     )
 
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-from typing import Any, List, Mapping
+import os
+from typing import Any, Dict, List, Mapping, Tuple
 
 import torch
 
-from tetra_model_zoo.utils.asset_loaders import SourceAsRoot
+from tetra_model_zoo.utils.asset_loaders import SourceAsRoot, download_data
 from tetra_model_zoo.utils.input_spec import InputSpec
+from tetra_model_zoo.utils.snapshot import load_or_create_snapshot
 from tetra_model_zoo.yolo.utils import detect_postprocess
 
 YOLOV7_SOURCE_REPOSITORY = "https://github.com/WongKinYiu/yolov7"
@@ -13,6 +15,11 @@ YOLOV7_SOURCE_REPO_COMMIT = "84932d70fb9e2932d0a70e4a1f02a1d6dd1dd6ca"
 MODEL_NAME = "yolov7"
 DEFAULT_WEIGHTS = "yolov7-tiny.pt"
 MODEL_ASSET_VERSION = "1"
+YOLOV7_WEIGHTS_URL = "https://github.com/WongKinYiu/yolov7/releases/download/v0.1/{}"
+
+# (grid sizes of every layer, dtype, device) -> (xy_offset, xy_gain, wh_gain)
+DecodeGridKey = Tuple[Tuple[Tuple[int, int], ...], torch.dtype, torch.device]
+DecodeGrids = Tuple[torch.Tensor, torch.Tensor, torch.Tensor]
 
 
 class YoloV7(torch.nn.Module):
@@ -31,8 +38,24 @@ class YoloV7(torch.nn.Module):
     STRIDE_MULTIPLE = 32
 
     @staticmethod
-    def from_pretrained(weight_path: str = "yolov7-tiny.pt"):
-        """Load YoloV7 from a weightfile created by the source YoloV7 repository."""
+    def from_pretrained(weight_path: str = "yolov7-tiny.pt", use_snapshot: bool = True):
+        """
+        Load YoloV7 from a weightfile created by the source YoloV7 repository.
+
+        Parameters:
+            weight_path: Name of a released YoloV7 checkpoint, or path to a checkpoint.
+            use_snapshot: Load from (or save) a snapshot of the constructed model.
+                See utils.snapshot.
+        """
+        if use_snapshot:
+            return load_or_create_snapshot(
+                MODEL_NAME,
+                ["YoloV7", weight_path],
+                lambda: YoloV7.from_pretrained(weight_path, use_snapshot=False),
+                SourceAsRoot(
+                    YOLOV7_SOURCE_REPOSITORY, YOLOV7_SOURCE_REPO_COMMIT, MODEL_NAME
+                ),
+            )
 
         # Load PyTorch model from disk
         yolov7_model = _load_yolov7_source_model_from_weights(weight_path)
@@ -119,6 +142,12 @@ class _YoloV7Detector(torch.nn.Module):  # YoloV7 Detection
             for m_in_channel in m_in_channels
         )  # output conv
 
+        # Decode constants for every prediction of every layer (see
+        # _get_decode_grids), keyed by (grid sizes, dtype, device). forward only
+        # ever adds entries, so one detector can run several input resolutions
+        # from several threads at once.
+        self._decode_grids: Dict[DecodeGridKey, DecodeGrids] = {}
+
     @staticmethod
     def from_yolov7_state_dict(state_dict: Mapping[str, Any], strict: bool = True):
         """
@@ -169,42 +198,127 @@ class _YoloV7Detector(torch.nn.Module):  # YoloV7 Detection
             pred: [batch_size, # of predictions, 5 + # of classes]
                 Where the rightmost dim contains [center_x, center_y, w, h, confidence score, n per-class scores]
         """
-        z = []  # inference output
+        z = []  # raw predictions of every layer, [bs, na, ny * nx, no] views
+        grid_shapes = []
         for i in range(self.nl):
             x = self.m[i](all_x[i])  # conv
-            bs, _, ny, nx = x.shape  # x(bs,255,20,20) to x(bs,3,20,20,85)
-            x = x.view(bs, self.na, self.no, ny, nx).permute(0, 1, 3, 4, 2).contiguous()
-            grid = self._make_grid(nx, ny)
-            y = x.sigmoid()
-            xy = (y[..., 0:2] * 2.0 - 0.5 + grid) * self.stride[i]
-            wh = (y[..., 2:4] * 2) ** 2 * self.__getattr__(f"anchor_grid_{i}")
-
-            cat = torch.cat((xy, wh, y[..., 4:]), -1)
-            z.append(cat.view(bs, -1, self.no))
-
-        return torch.cat(z, 1)
+            bs, _, ny, nx = x.shape  # x(bs,255,20,20) to x(bs,3,20*20,85)
+            grid_shapes.append((ny, nx))
+            z.append(x.view(bs, self.na, self.no, ny * nx).transpose(2, 3))
+        x = z[0]
+        xy_offset, xy_gain, wh_gain = self._get_decode_grids(
+            tuple(grid_shapes), x.dtype, x.device
+        )
 
-    @staticmethod
-    def _make_grid(nx=20, ny=20):
-        yv, xv = torch.meshgrid([torch.arange(ny), torch.arange(nx)], indexing="ij")
-        return torch.stack((xv, yv), 2).view((1, 1, ny, nx, 2)).float()
+        # Decode all layers at once:
+        #     xy = (2 * sigmoid - 0.5 + grid) * stride
+        #     wh = (2 * sigmoid) ** 2 * anchor
+        if torch.jit.is_tracing() or torch.is_grad_enabled():
+            # Out of place, for export and autograd.
+            y = torch.cat([p.reshape(bs, -1, self.no) for p in z], 1).sigmoid()
+            xy = torch.addcmul(xy_offset, y[..., 0:2], xy_gain)
+            wh = y[..., 2:4].square() * wh_gain
+            return torch.cat((xy, wh, y[..., 4:]), -1)
+
+        # In place: each layer's predictions are copied once, into the output.
+        y = x.new_empty(bs, xy_offset.shape[1], self.no)
+        start = 0
+        for p in z:
+            end = start + p.shape[1] * p.shape[2]
+            y[:, start:end].view(p.shape).copy_(p)
+            start = end
+        y.sigmoid_()
+        y[..., 0:2].mul_(xy_gain).add_(xy_offset)
+        y[..., 2:4].square_().mul_(wh_gain)
+        return y
+
+    def _get_decode_grids(
+        self,
+        grid_shapes: Tuple[Tuple[int, int], ...],
+        dtype: torch.dtype,
+        device: torch.device,
+    ) -> DecodeGrids:
+        """
+        Returns, for every prediction of every layer (in output order):
+            xy_offset: [1, N, 2] (grid - 0.5) * stride
+            xy_gain: [1, N, 1] 2 * stride
+            wh_gain: [1, N, 2] 4 * anchor
+        These only depend on the layers' grid sizes, so they are cached.
+        """
+        key = (grid_shapes, dtype, device)
+        grids = self._decode_grids.get(key)
+        if grids is None:
+            # The cache must stay usable outside of inference mode.
+            with torch.inference_mode(False):
+                grids = self._compute_decode_grids(grid_shapes, dtype, device)
+            # Threads racing on a new key compute equal grids; either one is kept.
+            self._decode_grids[key] = grids
+        return grids
+
+    def _compute_decode_grids(
+        self,
+        grid_shapes: Tuple[Tuple[int, int], ...],
+        dtype: torch.dtype,
+        device: torch.device,
+    ) -> DecodeGrids:
+        xy_offsets, xy_gains, wh_gains = [], [], []
+        for i, (ny, nx) in enumerate(grid_shapes):
+            stride = float(self.stride[i])
+            yv, xv = torch.meshgrid(
+                [torch.arange(ny, device=device), torch.arange(nx, device=device)],
+                indexing="ij",
+            )
+            grid = torch.stack((xv, yv), -1).view(1, 1, ny * nx, 2)
+            anchor = self.__getattr__(f"anchor_grid_{i}").view(1, self.na, 1, 2)
+            xy_offsets.append(
+                ((grid - 0.5) * stride).expand(1, self.na, -1, -1).reshape(1, -1, 2)
+            )
+            xy_gains.append(
+                torch.full((1, self.na * ny * nx, 1), 2 * stride, device=device)
+            )
+            wh_gains.append((anchor * 4).expand(-1, -1, ny * nx, -1).reshape(1, -1, 2))
+        return (
+            torch.cat(xy_offsets, 1).to(dtype),
+            torch.cat(xy_gains, 1).to(dtype),
+            torch.cat(wh_gains, 1).to(device, dtype),
+        )
 
 
 def _load_yolov7_source_model_from_weights(weights_name: str) -> torch.nn.Module:
     # Load YoloV7 model from the source repository using the given weights.
     # Returns <source repository>.models.yolo.Model
+    if os.path.exists(os.path.expanduser(weights_name)):
+        weights_path = os.path.expanduser(weights_name)
+    else:
+        weights_path = download_data(
+            YOLOV7_WEIGHTS_URL.format(weights_name), MODEL_NAME
+        )
+
     with SourceAsRoot(YOLOV7_SOURCE_REPOSITORY, YOLOV7_SOURCE_REPO_COMMIT, MODEL_NAME):
         # necessary imports. `models` and `utils` come from the yolov7 repo.
         from models.common import Conv
-        from models.experimental import attempt_load
         from models.yolo import Model
         from utils.activations import Hardswish, SiLU
 
-        yolov7_model = attempt_load(weights_name, map_location="cpu")  # load FP32 model
+        # Equivalent to the source repo's `attempt_load`, which downloads
+        # missing weights relative to the cwd.
+        ckpt = torch.load(weights_path, map_location="cpu")
+        yolov7_model = ckpt["ema" if ckpt.get("ema") else "model"]
+        yolov7_model = yolov7_model.float().fuse().eval()  # load FP32 model
 
         # Patch model for modern pyTorch
         for _, m in yolov7_model.named_modules():
             m._non_persistent_buffers_set = set()  # pytorch 1.6.0 compatibility
+            if type(m) in [
+                torch.nn.Hardswish,
+                torch.nn.LeakyReLU,
+                torch.nn.ReLU,
+                torch.nn.ReLU6,
+                torch.nn.SiLU,
+            ]:
+                m.inplace = True  # pytorch 1.7.0 compatibility
+            elif type(m) is torch.nn.Upsample:
+                m.recompute_scale_factor = None  # torch 1.11.0 compatibility
             if isinstance(m, Conv):  # assign export-friendly activations
                 if isinstance(m.act, torch.nn.Hardswish):
                     m.act = Hardswish()
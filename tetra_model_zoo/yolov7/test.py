@@ -1,3 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import torch
 
@@ -11,6 +13,7 @@ from tetra_model_zoo.yolov7.model import (
     MODEL_NAME,
     YoloV7,
     _load_yolov7_source_model_from_weights,
+    _YoloV7Detector,
 )
 
 IMAGE_ADDRESS = f"https://tetra-public-assets.s3.us-west-2.amazonaws.com/model-zoo/yolov7/v{MODEL_ASSET_VERSION}/yolov7_demo_640.jpg"
@@ -43,3 +46,74 @@ def test_yolov7_app():
     output_image = load_image(OUTPUT_IMAGE_ADDRESS, MODEL_NAME).convert("RGB")
     app = YoloV7App(YoloV7.from_pretrained(WEIGHTS))
     assert np.allclose(app.predict_boxes_from_image(image)[0], np.asarray(output_image))
+
+
+def _reference_decode(detector: _YoloV7Detector, all_x):
+    # Per-layer decode of the source repository's Detect module.
+    z = []
+    for i in range(detector.nl):
+        x = detector.m[i](all_x[i])
+        bs, _, ny, nx = x.shape
+        x = x.view(bs, detector.na, detector.no, ny, nx).permute(0, 1, 3, 4, 2)
+        yv, xv = torch.meshgrid([torch.arange(ny), torch.arange(nx)], indexing="ij")
+        grid = torch.stack((xv, yv), 2).view((1, 1, ny, nx, 2)).float()
+        y = x.sigmoid()
+        xy = (y[..., 0:2] * 2.0 - 0.5 + grid) * detector.stride[i]
+        wh = (y[..., 2:4] * 2) ** 2 * getattr(detector, f"anchor_grid_{i}")
+        z.append(torch.cat((xy, wh, y[..., 4:]), -1).reshape(bs, -1, detector.no))
+    return torch.cat(z, 1)
+
+
+def _make_detector() -> _YoloV7Detector:
+    torch.manual_seed(0)
+    detector = _YoloV7Detector(
+        torch.tensor([8.0, 16.0, 32.0]), -1, 0, 3, 3, [16, 32, 64], 3 * 85
+    )
+    for i in range(3):
+        getattr(detector, f"anchor_grid_{i}").uniform_(10, 100)
+    return detector
+
+
+def _make_features(image_size, batch_size: int = 2):
+    return tuple(
+        torch.rand(batch_size, c, image_size[0] // stride, image_size[1] // stride)
+        for c, stride in [(16, 8), (32, 16), (64, 32)]
+    )
+
+
+def test_detector_decode():
+    detector = _make_detector()
+    for image_size in [(64, 96), (32, 32), (64, 96)]:
+        all_x = _make_features(image_size)
+        expected = _reference_decode(detector, all_x)
+        with torch.inference_mode():
+            torch.testing.assert_close(detector(all_x), expected)
+        # Export / autograd path.
+        torch.testing.assert_close(detector(all_x), expected)
+    # One cache entry per resolution.
+    assert {grid_shapes for grid_shapes, _, _ in detector._decode_grids} == {
+        ((8, 12), (4, 6), (2, 3)),
+        ((4, 4), (2, 2), (1, 1)),
+    }
+    # The cached grids are not part of the state dict (anchor grids + conv weights).
+    assert len(detector.state_dict()) == 3 + 2 * 3
+    # ... and can be used outside of inference mode.
+    detector(all_x).sum().backward()
+    with torch.no_grad():
+        traced = torch.jit.trace(detector, (all_x,))
+    torch.testing.assert_close(traced(all_x), _reference_decode(detector, all_x))
+
+
+def test_detector_decode_multithreaded():
+    # One detector shared by server worker threads running different resolutions.
+    detector = _make_detector()
+    inputs = [_make_features(size, 1) for size in [(64, 96), (128, 128)]]
+    expected = [_reference_decode(detector, all_x) for all_x in inputs]
+
+    def run(i: int):
+        with torch.inference_mode():
+            return i % 2, detector(inputs[i % 2])
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        for input_idx, output in pool.map(run, range(400)):
+            torch.testing.assert_close(output, expected[input_idx])
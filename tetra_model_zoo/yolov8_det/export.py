@@ -4,9 +4,10 @@ from typing import Any, List
 
 import torch
 
-import tetra_hub as hub
 from tetra_model_zoo.utils.args import vision_export_parser
 from tetra_model_zoo.utils.hub import download_hub_models
+from tetra_model_zoo.utils.local_profiling import submit_local_profile_job
+from tetra_model_zoo.utils.shape_buckets import export_shape_buckets
 from tetra_model_zoo.yolov8_det.model import (
     DEFAULT_WEIGHTS,
     SUPPORTED_WEIGHTS,
@@ -30,6 +31,7 @@ def main():
         default_x=640,
         default_y=640,
         include_trace_option=True,
+        include_shape_bucket_options=True,
     )
     parser.add_argument(
         "--weights", type=str, default=DEFAULT_WEIGHTS, help=WEIGHTS_HELP_MSG
@@ -41,9 +43,34 @@ def main():
     # Instantiate the model & a sample input.
     model = YoloV8Detector.from_pretrained(args.weights)
 
+    if args.shape_buckets:
+        export_shape_buckets(
+            "yolov8_det",
+            model,
+            lambda size: [torch.ones(args.b, args.c, *size)],
+            args.shape_buckets,
+            args.output_dir,
+            args.dynamic_shapes,
+            check_trace=False,
+            stride=YoloV8Detector.STRIDE_MULTIPLE,
+        )
+        return
+
     # Trace the model.
     traced_model = trace(model, [args.b, args.c, args.y, args.x])
 
+    if args.local:
+        submit_local_profile_job(
+            name="yolov8_det",
+            model=traced_model,
+            input_shapes=model.get_input_spec([args.y, args.x], args.b, args.c),
+            runtimes=args.local_runtimes,
+            output_dir=args.local_output_dir,
+        )
+        return
+
+    import tetra_hub as hub
+
     # Select the device(s) you'd like to optimize for.
     devices = [hub.Device(x) for x in args.devices]
 
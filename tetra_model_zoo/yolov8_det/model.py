@@ -30,6 +30,9 @@ class YoloV8Detector(nn.Module):
         super().__init__()
         self.model = model
 
+    # All image input spatial dimensions should be a multiple of this stride.
+    STRIDE_MULTIPLE = 32
+
     @staticmethod
     def from_pretrained(ckpt_name: str = DEFAULT_WEIGHTS):
         model = ultralytics_YOLO(ckpt_name).model